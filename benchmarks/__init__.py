@@ -0,0 +1,6 @@
+"""
+Benchmarks do PyInterface
+
+Execute a partir da raiz do projeto, por exemplo:
+    python -m benchmarks.bench_inp_reader
+"""
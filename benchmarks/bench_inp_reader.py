@@ -0,0 +1,41 @@
+"""
+Compara o parser nativo com a leitura via WNTR em redes sintéticas
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from src.services.inp_reader import InpReader, wntr
+from benchmarks.synthetic import write_grid_inp
+
+
+def _time_read(engine: str, path: str):
+    start = time.perf_counter()
+    network = InpReader(engine=engine).read_inp_file(path)
+    elapsed = time.perf_counter() - start
+    return elapsed, len(network.junctions) + len(network.reservoirs) + len(network.pipes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--max-wntr", type=int, default=100_000,
+                        help="Tamanho máximo para executar a leitura via WNTR")
+    args = parser.parse_args()
+
+    print(f"{'elementos':>10} {'nativo (s)':>11} {'wntr (s)':>10} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = os.path.join(tmp, f"grid_{size}.inp")
+            write_grid_inp(path, size)
+            native_time, count = _time_read("native", path)
+            if wntr is not None and size <= args.max_wntr:
+                wntr_time, _ = _time_read("wntr", path)
+                print(f"{count:>10} {native_time:>11.3f} {wntr_time:>10.3f} {wntr_time / native_time:>7.1f}x")
+            else:
+                print(f"{count:>10} {native_time:>11.3f} {'-':>10} {'-':>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Mede com tracemalloc a memória (bytes por elemento) de cada tipo do modelo
+"""
+import argparse
+import tracemalloc
+
+from src.models import (
+    Coordinate, Junction, Reservoir, Tank, Pipe, Pump, Valve, Pattern, Curve,
+    CompactJunction, CompactReservoir, CompactTank, CompactPipe, CompactPump,
+    CompactValve, WaterNetwork, ColumnarNetwork
+)
+
+# Fábricas de elementos: recebem o id e um índice numérico
+FACTORIES = {
+    "Coordinate": lambda i, n: Coordinate(n * 1.5, n * 2.5),
+    "Junction": lambda i, n: Junction(i, n * 1.5, n * 0.1, "1", Coordinate(n * 1.5, n * 2.5)),
+    "CompactJunction": lambda i, n: CompactJunction(i, n * 1.5, n * 0.1, "1", n * 1.5, n * 2.5),
+    "Reservoir": lambda i, n: Reservoir(i, n * 1.5, None, Coordinate(n * 1.5, n * 2.5)),
+    "CompactReservoir": lambda i, n: CompactReservoir(i, n * 1.5, None, n * 1.5, n * 2.5),
+    "Tank": lambda i, n: Tank(i, n * 1.5, n * 0.2, n * 0.1, n * 0.3, n * 0.4, n * 0.5, None,
+                              Coordinate(n * 1.5, n * 2.5)),
+    "CompactTank": lambda i, n: CompactTank(i, n * 1.5, n * 0.2, n * 0.1, n * 0.3, n * 0.4, n * 0.5,
+                                            None, n * 1.5, n * 2.5),
+    "Pipe": lambda i, n: Pipe(i, "A", "B", n * 1.5, n * 0.1, n * 0.2, 0.0, "Open"),
+    "CompactPipe": lambda i, n: CompactPipe(i, "A", "B", n * 1.5, n * 0.1, n * 0.2, 0.0, "Open"),
+    "Pump": lambda i, n: Pump(i, "A", "B", "C1", None, n * 0.5, None),
+    "CompactPump": lambda i, n: CompactPump(i, "A", "B", "C1", None, n * 0.5, None),
+    "Valve": lambda i, n: Valve(i, "A", "B", n * 0.1, "PRV", n * 0.2, 0.0),
+    "CompactValve": lambda i, n: CompactValve(i, "A", "B", n * 0.1, "PRV", n * 0.2, 0.0),
+    "Pattern": lambda i, n: Pattern(i, [n * 0.1] * 24),
+    "Curve": lambda i, n: Curve(i, "HEAD", [n * 0.1, n * 0.2], [n * 0.3, n * 0.4]),
+}
+
+
+def measure(factory, count: int) -> float:
+    """Retorna os bytes alocados por elemento (ids pré-alocados não contam)"""
+    ids = [f"E{i}" for i in range(count)]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    elements = [factory(ids[i], i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del elements
+    return (after - before) / count
+
+
+def measure_columnar(count: int) -> float:
+    """Bytes por tubo de uma ColumnarNetwork (apenas os arrays)"""
+    network = WaterNetwork(
+        junctions=[Junction("A", 0.0, 0.0), Junction("B", 0.0, 0.0)],
+        pipes=[FACTORIES["Pipe"](f"E{i}", i) for i in range(count)]
+    )
+    columnar = ColumnarNetwork.from_network(network)
+    return columnar.pipes.nbytes / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'tipo':<20} {'bytes/elemento':>15}")
+    for name, factory in FACTORIES.items():
+        print(f"{name:<20} {measure(factory, args.count):>15.1f}")
+    print(f"{'ColumnarNetwork.pipes':<20} {measure_columnar(args.count):>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
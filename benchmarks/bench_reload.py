@@ -0,0 +1,56 @@
+"""
+Compara a recarga de uma rede a partir do JSON (network_from_file) com a
+releitura do arquivo INP original
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from src.services.inp_reader import InpReader, wntr
+from src.services.json_converter import JsonConverter
+from benchmarks.synthetic import write_grid_inp
+
+
+def _time(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--max-wntr", type=int, default=100_000,
+                        help="Tamanho máximo para executar a leitura via WNTR")
+    args = parser.parse_args()
+
+    engines = ["native"] + (["wntr"] if wntr is not None else [])
+    header = " ".join(f"{engine + ' (s)':>11} {'vs ' + engine:>10}" for engine in engines)
+    print(f"{'elementos':>10} {'json (s)':>9} {header}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            inp_path = os.path.join(tmp, f"grid_{size}.inp")
+            json_path = os.path.join(tmp, f"grid_{size}.json")
+            write_grid_inp(inp_path, size)
+
+            times = {}
+            for engine in engines:
+                if engine == "wntr" and size > args.max_wntr:
+                    continue
+                times[engine], network = _time(InpReader(engine=engine).read_inp_file, inp_path)
+            JsonConverter.network_to_file(network, json_path)
+            json_time, reloaded = _time(JsonConverter.network_from_file, json_path)
+            assert reloaded.to_dict() == network.to_dict()
+
+            count = len(network.junctions) + len(network.reservoirs) + len(network.pipes)
+            columns = " ".join(
+                f"{times[engine]:>11.3f} {times[engine] / json_time:>9.1f}x" if engine in times
+                else f"{'-':>11} {'-':>10}"
+                for engine in engines
+            )
+            print(f"{count:>10} {json_time:>9.3f} {columns}")
+
+
+if __name__ == "__main__":
+    main()
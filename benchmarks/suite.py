@@ -0,0 +1,343 @@
+"""
+Suíte de benchmarks reprodutível sobre redes sintéticas, com resultados de
+referência (baseline) e relatório de comparação
+
+Exemplos:
+    python -m benchmarks.suite --sizes 10000 100000 --save benchmarks/baselines/baseline.json
+    python -m benchmarks.suite --sizes 10000 100000 --compare benchmarks/baselines/baseline.json
+    python -m benchmarks.suite --cases read_inp to_dict --topologies tree --repeat 3
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from src.models.network import WaterNetwork
+from src.services.inp_reader import InpReader, wntr
+from src.services.json_converter import JsonConverter
+from src.utils.json_backend import get_backend
+from benchmarks.synthetic import TOPOLOGIES, write_synthetic_inp
+
+
+@dataclass
+class Fixture:
+    """Arquivos e rede de um tamanho/topologia, preparados antes das medições"""
+    size: int
+    topology: str
+    inp_path: str
+    json_path: str
+    network: WaterNetwork
+
+    @property
+    def elements(self) -> int:
+        stats = self.network.statistics()
+        return stats["total_nodes"] + stats["total_links"]
+
+
+@dataclass
+class Case:
+    """Um benchmark: função medida e, opcionalmente, limite de tamanho"""
+    name: str
+    run: Callable[[Fixture], Any]
+    kind: str = "time"
+    max_size: Optional[int] = None
+    available: bool = True
+
+
+@dataclass
+class BenchmarkResult:
+    """Resultado de um caso em um tamanho/topologia"""
+    case: str
+    topology: str
+    size: int
+    elements: int
+    kind: str
+    # Tempos em segundos (kind="time") ou bytes por elemento (kind="memory")
+    samples: List[float] = field(default_factory=list)
+
+    @property
+    def key(self) -> str:
+        return f"{self.case}[{self.topology}-{self.size}]"
+
+    @property
+    def best(self) -> float:
+        return min(self.samples)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    @property
+    def elements_per_second(self) -> float:
+        return self.elements / self.best if self.kind == "time" and self.best else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.update(best=self.best, median=self.median)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BenchmarkResult":
+        return cls(data["case"], data["topology"], data["size"], data["elements"],
+                   data["kind"], list(data["samples"]))
+
+
+def _bytes_per_element(function: Callable[[Fixture], Any], fixture: Fixture) -> float:
+    """Memória retida pelo resultado de function, por elemento da rede"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = function(fixture)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return (after - before) / fixture.elements
+
+
+CASES = [
+    Case("read_inp.native", lambda f: InpReader().read_inp_file(f.inp_path)),
+    Case("read_inp.wntr", lambda f: InpReader(engine="wntr").read_inp_file(f.inp_path),
+         max_size=100_000, available=wntr is not None),
+    Case("to_dict", lambda f: f.network.to_dict()),
+    Case("network_to_json", lambda f: JsonConverter.network_to_json(f.network)),
+    Case("network_to_json.stdlib", lambda f: JsonConverter.network_to_json(f.network, backend="json")),
+    Case("file_to_dict", lambda f: JsonConverter.file_to_dict(f.json_path)),
+    Case("network_from_file", lambda f: JsonConverter.network_from_file(f.json_path)),
+    Case("memory.network", lambda f: InpReader().read_inp_file(f.inp_path), kind="memory"),
+    Case("memory.to_dict", lambda f: f.network.to_dict(), kind="memory"),
+]
+
+
+def prepare(size: int, topology: str, directory: str, seed: int = 0) -> Fixture:
+    """Gera (ou reaproveita) o INP sintético e o JSON correspondente"""
+    inp_path = os.path.join(directory, f"{topology}_{size}_{seed}.inp")
+    json_path = os.path.join(directory, f"{topology}_{size}_{seed}.json")
+    if not os.path.exists(inp_path):
+        write_synthetic_inp(inp_path, size, topology=topology, seed=seed)
+    network = InpReader().read_inp_file(inp_path)
+    if not os.path.exists(json_path):
+        JsonConverter.network_to_file(network, json_path)
+    return Fixture(size, topology, inp_path, json_path, network)
+
+
+def measure(case: Case, fixture: Fixture, repeat: int = 5, warmup: int = 1) -> BenchmarkResult:
+    """
+    Executa um caso: tempos de parede de repeat execuções (após warmup
+    execuções descartadas) ou a memória por elemento
+
+    Args:
+        case: Caso a medir
+        fixture: Rede e arquivos preparados
+        repeat: Número de execuções medidas
+        warmup: Execuções iniciais descartadas
+
+    Returns:
+        BenchmarkResult: Amostras do caso
+    """
+    result = BenchmarkResult(case.name, fixture.topology, fixture.size, fixture.elements, case.kind)
+    if case.kind == "memory":
+        result.samples.append(_bytes_per_element(case.run, fixture))
+        return result
+    for i in range(warmup + repeat):
+        gc.collect()
+        start = time.perf_counter()
+        case.run(fixture)
+        elapsed = time.perf_counter() - start
+        if i >= warmup:
+            result.samples.append(elapsed)
+    return result
+
+
+def machine_info() -> Dict[str, Any]:
+    """Ambiente da medição, gravado junto da baseline"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "json_backend": get_backend().name,
+        "commit": commit,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def run_suite(sizes: List[int], topologies: List[str], cases: Optional[List[str]] = None,
+              repeat: int = 5, seed: int = 0, directory: Optional[str] = None,
+              progress: Optional[Callable[[BenchmarkResult], None]] = None) -> List[BenchmarkResult]:
+    """
+    Executa os casos selecionados em todos os tamanhos e topologias
+
+    Args:
+        sizes: Tamanhos aproximados das redes (elementos)
+        topologies: "grid" e/ou "tree"
+        cases: Prefixos dos nomes dos casos a executar (None = todos)
+        repeat: Execuções medidas por caso
+        seed: Semente das redes sintéticas
+        directory: Diretório dos arquivos gerados (padrão: temporário)
+        progress: Função opcional chamada com cada resultado
+
+    Returns:
+        List: Resultados na ordem de execução
+    """
+    selected = [c for c in CASES if c.available and
+                (not cases or any(c.name.startswith(prefix) for prefix in cases))]
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for topology in topologies:
+            for size in sizes:
+                fixture = prepare(size, topology, directory or tmp, seed)
+                for case in selected:
+                    if case.max_size is not None and size > case.max_size:
+                        continue
+                    result = measure(case, fixture, repeat)
+                    results.append(result)
+                    if progress is not None:
+                        progress(result)
+    return results
+
+
+def save_baseline(path: str, results: List[BenchmarkResult], seed: int = 0) -> None:
+    """Grava os resultados e o ambiente da medição em um arquivo JSON"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    data = {"machine": machine_info(), "seed": seed, "results": [r.to_dict() for r in results]}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    """Lê uma baseline gravada por save_baseline"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    data["results"] = [BenchmarkResult.from_dict(r) for r in data["results"]]
+    return data
+
+
+@dataclass
+class Comparison:
+    """Comparação de um resultado com a baseline"""
+    current: BenchmarkResult
+    baseline: Optional[BenchmarkResult]
+    threshold: float
+
+    @property
+    def ratio(self) -> Optional[float]:
+        if self.baseline is None or not self.baseline.best:
+            return None
+        return self.current.best / self.baseline.best
+
+    @property
+    def status(self) -> str:
+        ratio = self.ratio
+        if ratio is None:
+            return "novo"
+        if ratio > 1 + self.threshold:
+            return "REGRESSÃO"
+        if ratio < 1 - self.threshold:
+            return "melhora"
+        return "ok"
+
+
+def compare(results: List[BenchmarkResult], baseline: List[BenchmarkResult],
+            threshold: float = 0.10) -> List[Comparison]:
+    """
+    Compara os melhores tempos (e a memória por elemento) com a baseline
+
+    Args:
+        results: Resultados atuais
+        baseline: Resultados de referência
+        threshold: Variação relativa tolerada antes de indicar regressão/melhora
+
+    Returns:
+        List: Uma comparação por resultado atual
+    """
+    reference = {r.key: r for r in baseline}
+    return [Comparison(r, reference.get(r.key), threshold) for r in results]
+
+
+def _format_value(result: BenchmarkResult, value: float) -> str:
+    return f"{value * 1000:,.1f} ms" if result.kind == "time" else f"{value:,.0f} B/el"
+
+
+def format_results(results: List[BenchmarkResult]) -> str:
+    """Tabela dos resultados de uma execução"""
+    lines = [f"{'caso':<44} {'elementos':>10} {'melhor':>14} {'mediana':>14} {'elem/s':>12}"]
+    for r in results:
+        lines.append(f"{r.key:<44} {r.elements:>10,} {_format_value(r, r.best):>14} "
+                     f"{_format_value(r, r.median):>14} "
+                     f"{(f'{r.elements_per_second:,.0f}' if r.kind == 'time' else '-'):>12}")
+    return "\n".join(lines)
+
+
+def format_comparison(comparisons: List[Comparison]) -> str:
+    """Tabela da comparação com a baseline"""
+    lines = [f"{'caso':<44} {'baseline':>14} {'atual':>14} {'razão':>7}  situação"]
+    for c in comparisons:
+        r = c.current
+        before = _format_value(r, c.baseline.best) if c.baseline is not None else "-"
+        ratio = f"{c.ratio:.2f}x" if c.ratio is not None else "-"
+        lines.append(f"{r.key:<44} {before:>14} {_format_value(r, r.best):>14} {ratio:>7}  {c.status}")
+    regressions = sum(c.status == "REGRESSÃO" for c in comparisons)
+    lines.append(f"\n{regressions} regressão(ões) acima de {comparisons[0].threshold:.0%}"
+                 if comparisons else "\nNenhum resultado")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--topologies", nargs="+", choices=TOPOLOGIES, default=["grid"])
+    parser.add_argument("--cases", nargs="+", default=None,
+                        help="Prefixos dos casos a executar (ex.: read_inp memory)")
+    parser.add_argument("--repeat", type=int, default=5, help="Execuções medidas por caso")
+    parser.add_argument("--seed", type=int, default=0, help="Semente das redes sintéticas")
+    parser.add_argument("--data-dir", default=None,
+                        help="Diretório onde as redes geradas são guardadas e reaproveitadas")
+    parser.add_argument("--save", default=None, help="Grava os resultados como baseline")
+    parser.add_argument("--compare", default=None, help="Baseline a comparar")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Variação tolerada na comparação (padrão: 0.10)")
+    parser.add_argument("--list", action="store_true", help="Lista os casos disponíveis")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for case in CASES:
+            print(f"{case.name:<28} {case.kind:<7} {'' if case.available else '(indisponível)'}")
+        return 0
+
+    if args.data_dir:
+        os.makedirs(args.data_dir, exist_ok=True)
+    results = run_suite(args.sizes, args.topologies, args.cases, args.repeat, args.seed,
+                        args.data_dir, progress=lambda r: print(f"  {r.key}", file=sys.stderr))
+    print(format_results(results))
+    if args.save:
+        save_baseline(args.save, results, args.seed)
+        print(f"\nBaseline gravada em {args.save}")
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        print(f"\n=== Comparação com {args.compare} ({baseline['machine'].get('commit')}) ===")
+        comparisons = compare(results, baseline["results"], args.threshold)
+        print(format_comparison(comparisons))
+        return 1 if any(c.status == "REGRESSÃO" for c in comparisons) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
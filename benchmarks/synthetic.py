@@ -0,0 +1,237 @@
+import math
+import random
+from typing import List, Optional, Tuple
+
+from src.models.elements import Coordinate, Junction, Reservoir, Tank, Pipe, Pump, Valve
+from src.models.network import WaterNetwork, Pattern, Curve, NetworkOptions
+from src.services.inp_parser import UnitConverter
+from src.services.inp_writer import InpWriter
+
+TOPOLOGIES = ("grid", "tree")
+# Diâmetros comerciais (mm ou pol., conforme as unidades) e tipos de válvula
+DIAMETERS = {"SI": (100, 150, 200, 250, 300, 400, 500, 600, 800, 1000, 1200),
+             "US": (4, 6, 8, 10, 12, 16, 20, 24, 30, 36, 48)}
+VALVE_TYPES = ("PRV", "PSV", "FCV", "TCV", "PBV")
+# Velocidade (m/s) usada para dimensionar os tubos da rede ramificada
+DESIGN_VELOCITY = 1.0
+
+
+def write_grid_inp(path: str, n_elements: int) -> None:
+    """
+    Gera um arquivo INP sintético em malha com aproximadamente n_elements
+    elementos (nós + tubos)
+
+    Args:
+        path: Caminho do arquivo de saída
+        n_elements: Número aproximado de elementos da rede
+    """
+    # Uma malha lado x lado tem ~lado² nós e ~2·lado² tubos
+    side = max(2, int(math.sqrt(n_elements / 3.0)))
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("[TITLE]\nRede sintética em malha\n\n")
+
+        f.write("[JUNCTIONS]\n")
+        for i in range(side):
+            for j in range(side):
+                f.write(f"J{i}_{j}\t{100 + (i + j) % 17}\t{(i * j) % 5 + 1}\t1\n")
+
+        f.write("\n[RESERVOIRS]\nR1\t200\n\n")
+
+        f.write("[PIPES]\nP_R1\tR1\tJ0_0\t100\t16\t130\n")
+        for i in range(side):
+            for j in range(side):
+                if j + 1 < side:
+                    f.write(f"PH{i}_{j}\tJ{i}_{j}\tJ{i}_{j + 1}\t{50 + j % 7}\t{6 + i % 4}\t120\n")
+                if i + 1 < side:
+                    f.write(f"PV{i}_{j}\tJ{i}_{j}\tJ{i + 1}_{j}\t{60 + i % 5}\t{6 + j % 4}\t110\n")
+
+        f.write("\n[PATTERNS]\n1\t1.0\t1.2\t0.8\t0.6\n\n")
+        f.write("[OPTIONS]\nUNITS\tLPS\nHEADLOSS\tH-W\n\n")
+        f.write("[TIMES]\nDURATION\t24:00\nHYDRAULIC TIMESTEP\t1:00\n\n")
+
+        f.write("[COORDINATES]\nR1\t-10\t-10\n")
+        for i in range(side):
+            for j in range(side):
+                f.write(f"J{i}_{j}\t{j * 10.0}\t{i * 10.0}\n")
+        f.write("\n[END]\n")
+
+
+def _grid_layout(n_nodes: int, rng: random.Random) -> Tuple[List[Tuple[float, float]], List[Tuple[int, int]]]:
+    """Nós em malha (com pequeno deslocamento aleatório) e arestas entre vizinhos"""
+    side = max(2, int(math.sqrt(n_nodes)))
+    points = [(j * 100.0 + rng.uniform(-20, 20), i * 100.0 + rng.uniform(-20, 20))
+              for i in range(side) for j in range(side)]
+    edges = []
+    for i in range(side):
+        for j in range(side):
+            k = i * side + j
+            if j + 1 < side:
+                edges.append((k, k + 1))
+            if i + 1 < side:
+                edges.append((k, k + side))
+    return points, edges
+
+
+def _tree_layout(n_nodes: int, rng: random.Random) -> Tuple[List[Tuple[float, float]], List[Tuple[int, int]]]:
+    """Rede ramificada: cada nó se liga a um pai, crescendo a partir da origem"""
+    n_nodes = max(2, n_nodes)
+    points = [(0.0, 0.0)]
+    angles = [0.0]
+    edges = []
+    for k in range(1, n_nodes):
+        parent = (k - 1) // 3
+        angle = angles[parent] + rng.uniform(-1.0, 1.0)
+        length = rng.uniform(60, 140)
+        x, y = points[parent]
+        points.append((x + length * math.cos(angle), y + length * math.sin(angle)))
+        angles.append(angle)
+        edges.append((parent, k))
+    return points, edges
+
+
+def _elevation(x: float, y: float) -> float:
+    """Relevo suave, para que as cotas variem de forma contínua"""
+    return round(50 + 20 * math.sin(x / 1500.0) + 15 * math.cos(y / 2000.0), 2)
+
+
+def generate_network(n_elements: int, topology: str = "grid", seed: int = 0,
+                     patterns: int = 4, sources: Optional[int] = None,
+                     tanks: Optional[int] = None, valve_fraction: float = 0.005,
+                     vertex_fraction: float = 0.1, units: str = "LPS") -> WaterNetwork:
+    """
+    Gera uma rede sintética reprodutível com aproximadamente n_elements
+    elementos (nós + links)
+
+    Além dos nós e tubos da topologia, a rede tem reservatórios abastecendo
+    por bombas (com curva HEAD), tanques (metade com curva de volume),
+    válvulas de todos os tipos no lugar de alguns tubos, padrões diários de
+    demanda e vértices em parte dos tubos.
+
+    Args:
+        n_elements: Número aproximado de elementos
+        topology: "grid" (malhada) ou "tree" (ramificada)
+        seed: Semente do gerador; a mesma semente gera a mesma rede
+        patterns: Número de padrões de demanda
+        sources: Reservatórios com bomba (padrão: 1 a cada 20.000 nós)
+        tanks: Tanques (padrão: 1 a cada 10.000 nós)
+        valve_fraction: Fração dos tubos substituída por válvulas
+        vertex_fraction: Fração dos tubos com vértices
+        units: Unidade de vazão do arquivo (ex.: "LPS", "GPM")
+
+    Returns:
+        WaterNetwork: Rede gerada (valores no SI, como as lidas pelo InpReader)
+    """
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Topologia desconhecida: {topology}")
+    rng = random.Random(seed)
+    # Os valores são sorteados nas unidades do arquivo e convertidos com os
+    # mesmos fatores do parser, então a rede relida é idêntica à gerada
+    conv = UnitConverter(units)
+    diameters = [d * conv.pipe_diameter for d in DIAMETERS["US" if conv.traditional else "SI"]]
+    # Malha: ~n nós e ~2n tubos; árvore: ~n nós e ~n tubos
+    n_nodes = n_elements // 3 if topology == "grid" else n_elements // 2
+    layout = _grid_layout if topology == "grid" else _tree_layout
+    points, edges = layout(n_nodes, rng)
+    n_nodes = len(points)
+    sources = max(1, n_nodes // 20_000) if sources is None else sources
+    tanks = max(1, n_nodes // 10_000) if tanks is None else tanks
+
+    network = WaterNetwork(title=f"Rede sintética ({topology}, {n_nodes} nós, semente {seed})")
+    network.options = NetworkOptions(headloss="H-W", units=units,
+                                     pressure="PSI" if conv.traditional else "METERS",
+                                     pattern="1" if patterns else None,
+                                     hydraulic_timestep=3600.0, quality_timestep=300.0,
+                                     duration=86400.0)
+    for p in range(1, patterns + 1):
+        phase = rng.uniform(-2, 2)
+        network.patterns.append(Pattern(str(p), [
+            round(1 + 0.4 * math.sin(2 * math.pi * (h - 6 + phase) / 24) + rng.uniform(-0.05, 0.05), 3)
+            for h in range(24)
+        ]))
+
+    ids = [f"J{k}" for k in range(n_nodes)]
+    network.junctions = [
+        Junction(ids[k], _elevation(x, y) * conv.length, round(rng.uniform(0.05, 0.5), 3) * conv.flow,
+                 str(rng.randint(1, patterns)) if patterns else None, Coordinate(round(x, 2), round(y, 2)))
+        for k, (x, y) in enumerate(points)
+    ]
+    total_demand = sum(j.demand for j in network.junctions)
+    tree = topology == "tree"
+    if tree:
+        # Vazão de cada tubo = demanda do ramo a jusante (filhos têm índice maior)
+        carried = [j.demand for j in network.junctions]
+        for parent, child in reversed(edges):
+            carried[parent] += carried[child]
+    # Malha: tubos de diâmetros variados, sem os maiores da tabela
+    grid_diameters = diameters[:6]
+    # Na rede ramificada uma PSV fecharia com pressão baixa e isolaria o ramo
+    valve_types = tuple(v for v in VALVE_TYPES if not (tree and v == "PSV"))
+
+    valve_every = round(1 / valve_fraction) if valve_fraction > 0 else 0
+    for e, (a, b) in enumerate(edges):
+        (xa, ya), (xb, yb) = points[a], points[b]
+        if tree:
+            needed = math.sqrt(4 * carried[b] / (math.pi * DESIGN_VELOCITY))
+            diameter = next((d for d in diameters if d >= needed), diameters[-1])
+        else:
+            diameter = rng.choice(grid_diameters)
+        if valve_every and e % valve_every == valve_every // 2:
+            valve_type = valve_types[(e // valve_every) % len(valve_types)]
+            setting = {"PRV": 40.0 * conv.pressure, "PSV": 20.0 * conv.pressure,
+                       "PBV": 5.0 * conv.pressure, "FCV": 10.0 * conv.flow, "TCV": 10.0}[valve_type]
+            network.valves.append(Valve(f"V{e}", ids[a], ids[b], diameter, valve_type, setting, 0.0))
+            continue
+        pipe = Pipe(f"P{e}", ids[a], ids[b], round(math.hypot(xb - xa, yb - ya), 2) * conv.length, diameter,
+                    float(rng.randint(100, 140)), 0.0 if rng.random() < 0.9 else 0.5,
+                    "Closed" if not tree and rng.random() < 0.001 else "Open")
+        if rng.random() < vertex_fraction:
+            pipe.vertices = [
+                Coordinate(round(xa + (xb - xa) * t + rng.uniform(-5, 5), 2),
+                           round(ya + (yb - ya) * t + rng.uniform(-5, 5), 2))
+                for t in sorted(rng.uniform(0.1, 0.9) for _ in range(rng.randint(1, 3)))
+            ]
+        network.pipes.append(pipe)
+
+    for s in range(1, sources + 1):
+        # A rede ramificada é abastecida pela raiz
+        k = 0 if tree else rng.randrange(n_nodes)
+        x, y = points[k]
+        head = round(_elevation(x, y) + 10, 2) * conv.length
+        network.reservoirs.append(Reservoir(f"R{s}", head, None, Coordinate(round(x - 50, 2), round(y - 50, 2))))
+        # Curva de 3 pontos: vazão de projeto = demanda média por fonte, 60 m
+        flow = round(total_demand / conv.flow / sources, 2)
+        network.curves.append(Curve(f"C{s}", "HEAD", [0.0, flow * conv.flow, 2 * flow * conv.flow],
+                                    [80.0 * conv.length, 60.0 * conv.length, 0.0]))
+        network.pumps.append(Pump(f"PU{s}", f"R{s}", ids[k], f"C{s}"))
+
+    for t in range(1, tanks + 1):
+        k = rng.randrange(n_nodes)
+        x, y = points[k]
+        m = conv.length
+        tank = Tank(f"T{t}", round(_elevation(x, y) + 30, 2) * m, 3.0 * m, 1.0 * m, 6.0 * m,
+                    15.0 * m, 0.0, None, Coordinate(round(x + 50, 2), round(y + 50, 2)))
+        if t % 2 == 0:
+            tank.volume_curve = f"VC{t}"
+            network.curves.append(Curve(f"VC{t}", "VOLUME", [0.0, 3.0 * m, 6.0 * m],
+                                        [0.0, 550.0 * conv.volume, 1100.0 * conv.volume]))
+        network.tanks.append(tank)
+        network.pipes.append(Pipe(f"PT{t}", f"T{t}", ids[k], 70.7 * m, diameters[-2], 130.0,
+                                  0.0, "Open"))
+    return network
+
+
+def write_synthetic_inp(path: str, n_elements: int, **options) -> WaterNetwork:
+    """
+    Gera uma rede com generate_network e grava em um arquivo INP
+
+    Args:
+        path: Caminho do arquivo de saída
+        n_elements: Número aproximado de elementos
+        **options: Demais parâmetros de generate_network (topology, seed, ...)
+
+    Returns:
+        WaterNetwork: Rede gravada
+    """
+    network = generate_network(n_elements, **options)
+    InpWriter().write_inp_file(network, path)
+    return network
@@ -1,63 +1,79 @@
 """
-Exemplo de uso do leitor de arquivos INP
+Converte arquivos INP (um arquivo, um diretório ou um padrão glob) para JSON
+
+Exemplos:
+    python main.py exemplo.inp
+    python main.py redes/ -o saida/ --workers 8 --timeout 120
+    python main.py "redes/**/*.inp" -o saida/ --compact --cache-dir cache/
+    python main.py rede_grande.inp -o saida/ --profile --profile-memory
 """
+import argparse
+import json
 import sys
 import os
 
 # Adiciona o diretório pai ao path para importar o módulo src
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from src.services.batch import BatchConverter
 from src.services.inp_reader import InpReader
-from src.services.json_converter import JsonConverter
-
-
-def main():
-    # Caminho para o arquivo INP
-    inp_file_path = "D:\\YOUTUBE\\01 - CANAIS\\01 - OPENEPA\\exemplo-3.inp"
-    # Cria o leitor
-    reader = InpReader()
-    # Lê o arquivo INP
-    print(f"Lendo arquivo INP: {inp_file_path}")
-    network = reader.read_inp_file(inp_file_path)
-    # Converte para JSON
-    json_output = JsonConverter.network_to_json(network, indent=2)  
-    # Exibe estatísticas
-    stats = network.to_dict()['statistics']
-    print(f"\n=== Estatísticas da Rede ===")
-    print(f"Total de Junções: {stats['total_junctions']}")
-    print(f"Total de Reservatórios: {stats['total_reservoirs']}")
-    print(f"Total de Tanques: {stats['total_tanks']}")
-    print(f"Total de Tubos: {stats['total_pipes']}")
-    print(f"Total de Bombas: {stats['total_pumps']}")
-    print(f"Total de Válvulas: {stats['total_valves']}")
-    # Salva em arquivo
-    output_file = "network_output.json"
-    JsonConverter.network_to_file(network, output_file, indent=2)
-    print(f"\nArquivo JSON salvo em: {output_file}") 
-    # Exemplo de como acessar dados específicos
-    print(f"\n=== Exemplo de Dados ===")
-    if network.junctions:
-        first_junction = network.junctions[0]
-        print(f"Primeira Junção: {first_junction.id}")
-        print(f"  Elevação: {first_junction.elevation}")
-        print(f"  Demanda: {first_junction.demand}")
-        if first_junction.coordinates:
-            print(f"  Coordenadas: X={first_junction.coordinates.x}, Y={first_junction.coordinates.y}")
-    
-    if network.pipes:
-        first_pipe = network.pipes[0]
-        print(f"\nPrimeiro Tubo: {first_pipe.id}")
-        print(f"  De: {first_pipe.from_node} -> Para: {first_pipe.to_node}")
-        print(f"  Comprimento: {first_pipe.length}")
-        print(f"  Diâmetro: {first_pipe.diameter}")
-    
-    # Desserialização (lendo de volta)
-    print(f"\n=== Teste de Desserialização ===")
-    loaded_data = JsonConverter.file_to_dict(output_file)
-    print(f"Dados carregados com sucesso!")
-    print(f"Título da rede: {loaded_data.get('title', 'N/A')}")
-    print(f"Total de nós: {loaded_data['statistics']['total_nodes']}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("sources", nargs="+",
+                        help="Arquivos INP, diretórios ou padrões glob")
+    parser.add_argument("-o", "--output-dir", default=".",
+                        help="Diretório dos arquivos JSON (padrão: diretório atual)")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Número de processos (padrão: número de CPUs)")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Tempo limite por arquivo, em segundos")
+    parser.add_argument("--engine", choices=InpReader.ENGINES, default="native",
+                        help="Engine de leitura dos arquivos INP")
+    parser.add_argument("--compact", action="store_true",
+                        help="Grava JSON compacto (sem indentação)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Diretório do cache de leitura compartilhado")
+    parser.add_argument("--profile", action="store_true",
+                        help="Mostra o tempo, os elementos e a memória de cada etapa")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="Mede o pico de memória por etapa (tracemalloc, mais lento)")
+    parser.add_argument("--profile-json", default=None,
+                        help="Grava o relatório de etapas neste arquivo JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    converter = BatchConverter(
+        args.output_dir, workers=args.workers, timeout=args.timeout,
+        engine=args.engine, compact=args.compact, cache_dir=args.cache_dir,
+        profile=args.profile or bool(args.profile_json), profile_memory=args.profile_memory
+    )
+
+    def report(result):
+        if not result.ok:
+            print(f"ERRO {result.input_path}: {result.error}", file=sys.stderr)
+
+    summary = converter.convert(args.sources, progress=report)
+    if not summary.results:
+        print("Nenhum arquivo INP encontrado", file=sys.stderr)
+        return 1
+
+    print(f"\n=== Resumo ===")
+    print(summary.format())
+    if converter.profile or converter.profile_memory:
+        profile = summary.profile_report()
+        print(f"\n=== Etapas ===")
+        print(profile.format())
+        if args.profile_json:
+            with open(args.profile_json, "w", encoding="utf-8") as f:
+                json.dump(profile.to_dict(), f, indent=2)
+    return 1 if summary.failed else 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -19,6 +19,38 @@ from .network import (
     NetworkOptions,
     WaterNetwork
 )
+from .compact import (
+    CompactJunction,
+    CompactReservoir,
+    CompactTank,
+    CompactPipe,
+    CompactPump,
+    CompactValve,
+    compact_network
+)
+from .columnar import (
+    ColumnarNetwork,
+    ColumnTable,
+    RowView
+)
+from .topology import (
+    TopologyIndex,
+    build_topology
+)
+from .spatial import SpatialIndex
+from .statistics import NetworkStatistics
+from .timeseries import (
+    PatternTable,
+    CurveTable,
+    PumpCurves,
+    demand_matrix,
+    simulation_times
+)
+from .delta import (
+    NetworkDelta,
+    GroupDelta,
+    diff_networks
+)
 
 __all__ = [
     'Coordinate',
@@ -33,5 +65,27 @@ __all__ = [
     'Pattern',
     'Curve',
     'NetworkOptions',
-    'WaterNetwork'
+    'WaterNetwork',
+    'CompactJunction',
+    'CompactReservoir',
+    'CompactTank',
+    'CompactPipe',
+    'CompactPump',
+    'CompactValve',
+    'compact_network',
+    'ColumnarNetwork',
+    'ColumnTable',
+    'RowView',
+    'TopologyIndex',
+    'build_topology',
+    'SpatialIndex',
+    'NetworkStatistics',
+    'PatternTable',
+    'CurveTable',
+    'PumpCurves',
+    'demand_matrix',
+    'simulation_times',
+    'NetworkDelta',
+    'GroupDelta',
+    'diff_networks'
 ]
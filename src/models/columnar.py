@@ -0,0 +1,365 @@
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+
+from .elements import Coordinate, Junction, Reservoir, Tank, Pipe, Pump, Valve
+from .network import WaterNetwork, Pattern, Curve, NetworkOptions, gc_paused
+
+
+# Tipos de coluna
+FLOAT = "float"          # float64
+OPT_FLOAT = "opt_float"  # float64, NaN representa None
+LABEL = "label"          # int32, código na tabela de rótulos (-1 = None)
+NODE = "node"            # int32, índice do nó na ordem junções/reservatórios/tanques
+
+NODE_TABLES = ("junctions", "reservoirs", "tanks")
+LINK_TABLES = ("pipes", "pumps", "valves")
+
+# Esquema de cada tipo de elemento: (classe, ((campo, tipo), ...))
+SCHEMAS: Dict[str, Tuple[type, Tuple[Tuple[str, str], ...]]] = {
+    "junctions": (Junction, (
+        ("elevation", FLOAT), ("demand", FLOAT), ("demand_pattern", LABEL),
+    )),
+    "reservoirs": (Reservoir, (
+        ("head", FLOAT), ("head_pattern", LABEL),
+    )),
+    "tanks": (Tank, (
+        ("elevation", FLOAT), ("init_level", FLOAT), ("min_level", FLOAT),
+        ("max_level", FLOAT), ("diameter", FLOAT), ("min_volume", FLOAT),
+        ("volume_curve", LABEL),
+    )),
+    "pipes": (Pipe, (
+        ("from_node", NODE), ("to_node", NODE), ("length", FLOAT),
+        ("diameter", FLOAT), ("roughness", FLOAT), ("minor_loss", FLOAT),
+        ("status", LABEL),
+    )),
+    "pumps": (Pump, (
+        ("from_node", NODE), ("to_node", NODE), ("pump_curve", LABEL),
+        ("power", OPT_FLOAT), ("speed", FLOAT), ("pattern", LABEL),
+        ("efficiency_curve", LABEL),
+    )),
+    "valves": (Valve, (
+        ("from_node", NODE), ("to_node", NODE), ("diameter", FLOAT),
+        ("valve_type", LABEL), ("setting", FLOAT), ("minor_loss", FLOAT),
+    )),
+}
+
+_DTYPES = {FLOAT: np.float64, OPT_FLOAT: np.float64, LABEL: np.int32, NODE: np.int32}
+
+
+class LabelTable:
+    """Tabela de rótulos internados (padrões, curvas, status, tipos de válvula)"""
+
+    def __init__(self, labels: Optional[List[str]] = None):
+        self.labels: List[str] = list(labels or [])
+        self._codes: Dict[str, int] = {label: i for i, label in enumerate(self.labels)}
+
+    def code(self, value: Optional[str]) -> int:
+        """Retorna o código de um rótulo, registrando-o se necessário"""
+        if value is None:
+            return -1
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.labels)
+            self.labels.append(value)
+            self._codes[value] = code
+        return code
+
+    def get(self, code: int) -> Optional[str]:
+        return self.labels[code] if code >= 0 else None
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+
+class ColumnTable:
+    """Tabela colunar (struct-of-arrays) de um tipo de elemento"""
+
+    def __init__(self, network: "ColumnarNetwork", name: str, ids: np.ndarray,
+                 columns: Dict[str, np.ndarray]):
+        self.network = network
+        self.name = name
+        self.element_class, self.schema = SCHEMAS[name]
+        self.kinds = dict(self.schema)
+        self.ids = ids
+        self.columns = columns
+        self._index: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        columns = self.__dict__.get("columns")
+        if columns is not None and name in columns:
+            return columns[name]
+        raise AttributeError(name)
+
+    def __getitem__(self, index: int) -> "RowView":
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return RowView(self, index)
+
+    def __iter__(self) -> Iterator["RowView"]:
+        for i in range(len(self)):
+            yield RowView(self, i)
+
+    @property
+    def is_node_table(self) -> bool:
+        return self.name in NODE_TABLES
+
+    def id_list(self) -> List[str]:
+        """Retorna os ids como strings Python"""
+        return [i.decode("utf-8") for i in self.ids.tolist()]
+
+    def index_of(self, element_id: str) -> int:
+        """Retorna a posição de um elemento pelo id"""
+        if self._index is None:
+            self._index = {element_id: i for i, element_id in enumerate(self.id_list())}
+        return self._index[element_id]
+
+    def get(self, element_id: str) -> "RowView":
+        return RowView(self, self.index_of(element_id))
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.ids.nbytes + sum(c.nbytes for c in self.columns.values()))
+
+
+class RowView:
+    """
+    Visão sem cópia de uma linha de uma ColumnTable
+
+    Expõe os mesmos atributos (e to_dict) da classe de elemento equivalente,
+    lendo e escrevendo diretamente nos arrays da tabela.
+    """
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: ColumnTable, index: int):
+        object.__setattr__(self, "_table", table)
+        object.__setattr__(self, "_index", index)
+
+    def __getattr__(self, name: str) -> Any:
+        table = self._table
+        i = self._index
+        if name == "id":
+            return table.ids[i].decode("utf-8")
+        kind = table.kinds.get(name)
+        if kind is not None:
+            value = table.columns[name][i]
+            if kind == FLOAT:
+                return float(value)
+            if kind == OPT_FLOAT:
+                return None if np.isnan(value) else float(value)
+            if kind == LABEL:
+                return table.network.labels.get(int(value))
+            return table.network.node_id(int(value))
+        if name == "coordinates" and table.is_node_table:
+            x, y = table.columns["x"][i], table.columns["y"][i]
+            if np.isnan(x):
+                return None
+            return Coordinate(x=float(x), y=float(y))
+        if name == "vertices" and not table.is_node_table:
+            start, end = table.columns["vertex_offsets"][i:i + 2]
+            return [Coordinate(x=float(x), y=float(y))
+                    for x, y in zip(table.columns["vertex_x"][start:end], table.columns["vertex_y"][start:end])]
+        raise AttributeError(name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        table = self._table
+        kind = table.kinds.get(name)
+        if kind is None:
+            if name == "coordinates" and table.is_node_table:
+                table.columns["x"][self._index] = np.nan if value is None else value.x
+                table.columns["y"][self._index] = np.nan if value is None else value.y
+                return
+            raise AttributeError(f"'{name}' não pode ser alterado em uma visão colunar")
+        if kind in (FLOAT, OPT_FLOAT):
+            value = np.nan if value is None else value
+        elif kind == LABEL:
+            value = table.network.labels.code(value)
+        else:
+            value = table.network.node_index(value)
+        table.columns[name][self._index] = value
+
+    def __repr__(self) -> str:
+        return f"{self._table.element_class.__name__}View(id={self.id!r})"
+
+    def to_element(self):
+        """Materializa a linha como um objeto da classe de elemento original"""
+        table = self._table
+        kwargs = {"id": self.id}
+        for name, _ in table.schema:
+            kwargs[name] = getattr(self, name)
+        if table.is_node_table:
+            kwargs["coordinates"] = self.coordinates
+        else:
+            kwargs["vertices"] = self.vertices
+        return table.element_class(**kwargs)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.to_element().to_dict()
+
+
+def _encode_ids(ids: List[str]) -> np.ndarray:
+    if not ids:
+        return np.array([], dtype="S1")
+    return np.array([i.encode("utf-8") for i in ids], dtype=np.bytes_)
+
+
+class ColumnarNetwork:
+    """
+    Representação colunar (NumPy) de uma WaterNetwork
+
+    Cada tipo de elemento é uma ColumnTable com uma coluna float64 por atributo
+    numérico, ids como array de bytes e índices int32 para os nós dos links.
+    Padrões, curvas e opções permanecem como objetos, pois são pequenos.
+    """
+
+    def __init__(self):
+        self.title: str = ""
+        self.labels = LabelTable()
+        self.tables: Dict[str, ColumnTable] = {}
+        self.patterns: List[Pattern] = []
+        self.curves: List[Curve] = []
+        self.options: NetworkOptions = NetworkOptions()
+        self._node_ids: Optional[np.ndarray] = None
+        self._node_index: Optional[Dict[str, int]] = None
+
+    def __getattr__(self, name: str) -> ColumnTable:
+        tables = self.__dict__.get("tables")
+        if tables is not None and name in tables:
+            return tables[name]
+        raise AttributeError(name)
+
+    @property
+    def node_ids(self) -> np.ndarray:
+        """Ids de todos os nós, na ordem usada pelos índices de from/to"""
+        if self._node_ids is None:
+            self._node_ids = np.concatenate([self.tables[t].ids for t in NODE_TABLES])
+        return self._node_ids
+
+    @property
+    def node_count(self) -> int:
+        return sum(len(self.tables[t]) for t in NODE_TABLES)
+
+    def node_id(self, index: int) -> str:
+        return self.node_ids[index].decode("utf-8")
+
+    def node_index(self, node_id: str) -> int:
+        if self._node_index is None:
+            self._node_index = {
+                n.decode("utf-8"): i for i, n in enumerate(self.node_ids.tolist())
+            }
+        return self._node_index[node_id]
+
+    @property
+    def nbytes(self) -> int:
+        """Memória ocupada pelos arrays numéricos e de ids"""
+        return sum(t.nbytes for t in self.tables.values())
+
+    @classmethod
+    def from_network(cls, network: WaterNetwork) -> "ColumnarNetwork":
+        """
+        Converte uma WaterNetwork (listas de objetos) para a forma colunar
+
+        Args:
+            network: Rede baseada em listas
+
+        Returns:
+            ColumnarNetwork: Rede colunar equivalente
+        """
+        columnar = cls()
+        columnar.title = network.title
+        columnar.patterns = list(network.patterns)
+        columnar.curves = list(network.curves)
+        columnar.options = network.options
+        labels = columnar.labels
+
+        node_index: Dict[str, int] = {}
+        for name in NODE_TABLES:
+            for element in getattr(network, name):
+                node_index[element.id] = len(node_index)
+
+        for name, (_, schema) in SCHEMAS.items():
+            elements = getattr(network, name)
+            n = len(elements)
+            columns: Dict[str, np.ndarray] = {}
+            for field_name, kind in schema:
+                values = (getattr(e, field_name) for e in elements)
+                if kind == LABEL:
+                    values = (labels.code(v) for v in values)
+                elif kind == NODE:
+                    values = (node_index[v] for v in values)
+                elif kind == OPT_FLOAT:
+                    values = (np.nan if v is None else v for v in values)
+                columns[field_name] = np.fromiter(values, dtype=_DTYPES[kind], count=n)
+
+            if name in NODE_TABLES:
+                coords = [e.coordinates for e in elements]
+                columns["x"] = np.fromiter((np.nan if c is None else c.x for c in coords), np.float64, n)
+                columns["y"] = np.fromiter((np.nan if c is None else c.y for c in coords), np.float64, n)
+            else:
+                counts = np.fromiter((len(e.vertices) for e in elements), np.int64, n)
+                offsets = np.zeros(n + 1, dtype=np.int64)
+                np.cumsum(counts, out=offsets[1:])
+                columns["vertex_offsets"] = offsets
+                columns["vertex_x"] = np.fromiter((v.x for e in elements for v in e.vertices), np.float64, int(offsets[-1]))
+                columns["vertex_y"] = np.fromiter((v.y for e in elements for v in e.vertices), np.float64, int(offsets[-1]))
+
+            ids = _encode_ids([e.id for e in elements])
+            columnar.tables[name] = ColumnTable(columnar, name, ids, columns)
+        return columnar
+
+    def to_network(self) -> WaterNetwork:
+        """
+        Converte de volta para a WaterNetwork baseada em listas
+
+        Returns:
+            WaterNetwork: Rede com um objeto por elemento
+        """
+        with gc_paused():
+            network = WaterNetwork(
+                title=self.title,
+                patterns=list(self.patterns),
+                curves=list(self.curves),
+                options=self.options
+            )
+            node_ids = [n.decode("utf-8") for n in self.node_ids.tolist()]
+            labels = self.labels.labels + [None]  # código -1 -> None
+
+            for name, table in self.tables.items():
+                cls = table.element_class
+                decoded = []
+                for field_name, kind in table.schema:
+                    values = table.columns[field_name].tolist()
+                    if kind == LABEL:
+                        values = [labels[v] for v in values]
+                    elif kind == NODE:
+                        values = [node_ids[v] for v in values]
+                    elif kind == OPT_FLOAT:
+                        values = [None if v != v else v for v in values]
+                    decoded.append(values)
+                field_names = [f for f, _ in table.schema]
+                elements = [
+                    cls(id=element_id, **dict(zip(field_names, row)))
+                    for element_id, row in zip(table.id_list(), zip(*decoded) if decoded else [])
+                ]
+                if table.is_node_table:
+                    xs = table.columns["x"].tolist()
+                    ys = table.columns["y"].tolist()
+                    for element, x, y in zip(elements, xs, ys):
+                        if x == x:
+                            element.coordinates = Coordinate(x=x, y=y)
+                else:
+                    offsets = table.columns["vertex_offsets"]
+                    if offsets[-1]:
+                        vx = table.columns["vertex_x"].tolist()
+                        vy = table.columns["vertex_y"].tolist()
+                        bounds = offsets.tolist()
+                        for i, element in enumerate(elements):
+                            start, end = bounds[i], bounds[i + 1]
+                            if end > start:
+                                element.vertices = [Coordinate(x=x, y=y) for x, y in zip(vx[start:end], vy[start:end])]
+                setattr(network, name, elements)
+            return network
@@ -0,0 +1,252 @@
+import math
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Tuple, List
+from .elements import Coordinate, Junction, Reservoir, Tank, Pipe, Pump, Valve
+from .network import WaterNetwork
+
+NAN = math.nan
+
+
+def _coordinates(x: float, y: float) -> Optional[Coordinate]:
+    return None if x != x else Coordinate(x=x, y=y)
+
+
+def _inline(coordinates: Optional[Coordinate]) -> Tuple[float, float]:
+    return (NAN, NAN) if coordinates is None else (coordinates.x, coordinates.y)
+
+
+def _flatten(vertices: List[Coordinate]) -> Tuple[float, ...]:
+    return tuple(value for v in vertices for value in (v.x, v.y))
+
+
+def _unflatten(vertices: Tuple[float, ...]) -> List[Coordinate]:
+    return [Coordinate(x=vertices[i], y=vertices[i + 1]) for i in range(0, len(vertices), 2)]
+
+
+@dataclass(slots=True)
+class CompactJunction:
+    """Junção compacta: coordenadas guardadas como dois floats (NaN = ausente)"""
+    id: str
+    elevation: float
+    demand: float
+    demand_pattern: Optional[str] = None
+    x: float = NAN
+    y: float = NAN
+
+    @property
+    def coordinates(self) -> Optional[Coordinate]:
+        return _coordinates(self.x, self.y)
+
+    @classmethod
+    def from_element(cls, junction: Junction) -> "CompactJunction":
+        return cls(junction.id, junction.elevation, junction.demand,
+                   junction.demand_pattern, *_inline(junction.coordinates))
+
+    def to_element(self) -> Junction:
+        return Junction(self.id, self.elevation, self.demand, self.demand_pattern, self.coordinates)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.to_element().to_dict()
+
+
+@dataclass(slots=True)
+class CompactReservoir:
+    """Reservatório compacto: coordenadas guardadas como dois floats"""
+    id: str
+    head: float
+    head_pattern: Optional[str] = None
+    x: float = NAN
+    y: float = NAN
+
+    @property
+    def coordinates(self) -> Optional[Coordinate]:
+        return _coordinates(self.x, self.y)
+
+    @classmethod
+    def from_element(cls, reservoir: Reservoir) -> "CompactReservoir":
+        return cls(reservoir.id, reservoir.head, reservoir.head_pattern,
+                   *_inline(reservoir.coordinates))
+
+    def to_element(self) -> Reservoir:
+        return Reservoir(self.id, self.head, self.head_pattern, self.coordinates)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.to_element().to_dict()
+
+
+@dataclass(slots=True)
+class CompactTank:
+    """Tanque compacto: coordenadas guardadas como dois floats"""
+    id: str
+    elevation: float
+    init_level: float
+    min_level: float
+    max_level: float
+    diameter: float
+    min_volume: float
+    volume_curve: Optional[str] = None
+    x: float = NAN
+    y: float = NAN
+
+    @property
+    def coordinates(self) -> Optional[Coordinate]:
+        return _coordinates(self.x, self.y)
+
+    @classmethod
+    def from_element(cls, tank: Tank) -> "CompactTank":
+        return cls(tank.id, tank.elevation, tank.init_level, tank.min_level,
+                   tank.max_level, tank.diameter, tank.min_volume, tank.volume_curve,
+                   *_inline(tank.coordinates))
+
+    def to_element(self) -> Tank:
+        return Tank(self.id, self.elevation, self.init_level, self.min_level,
+                    self.max_level, self.diameter, self.min_volume, self.volume_curve,
+                    self.coordinates)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.to_element().to_dict()
+
+
+@dataclass(slots=True)
+class CompactPipe:
+    """Tubo compacto: vértices guardados como tupla plana (x0, y0, x1, y1, ...)
+
+    vertices continua retornando a lista de Coordinate, como em Pipe.
+    """
+    id: str
+    from_node: str
+    to_node: str
+    length: float
+    diameter: float
+    roughness: float
+    minor_loss: float = 0.0
+    status: str = "OPEN"
+    flat_vertices: Tuple[float, ...] = ()
+
+    @property
+    def vertices(self) -> List[Coordinate]:
+        return _unflatten(self.flat_vertices)
+
+    @vertices.setter
+    def vertices(self, vertices: List[Coordinate]) -> None:
+        self.flat_vertices = _flatten(vertices)
+
+    @classmethod
+    def from_element(cls, pipe: Pipe) -> "CompactPipe":
+        return cls(pipe.id, pipe.from_node, pipe.to_node, pipe.length, pipe.diameter,
+                   pipe.roughness, pipe.minor_loss, pipe.status, _flatten(pipe.vertices))
+
+    def to_element(self) -> Pipe:
+        return Pipe(self.id, self.from_node, self.to_node, self.length, self.diameter,
+                    self.roughness, self.minor_loss, self.status, self.vertices)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.to_element().to_dict()
+
+
+@dataclass(slots=True)
+class CompactPump:
+    """Bomba compacta: vértices guardados como tupla plana"""
+    id: str
+    from_node: str
+    to_node: str
+    pump_curve: Optional[str] = None
+    power: Optional[float] = None
+    speed: float = 1.0
+    pattern: Optional[str] = None
+    efficiency_curve: Optional[str] = None
+    flat_vertices: Tuple[float, ...] = ()
+
+    @property
+    def vertices(self) -> List[Coordinate]:
+        return _unflatten(self.flat_vertices)
+
+    @vertices.setter
+    def vertices(self, vertices: List[Coordinate]) -> None:
+        self.flat_vertices = _flatten(vertices)
+
+    @classmethod
+    def from_element(cls, pump: Pump) -> "CompactPump":
+        return cls(pump.id, pump.from_node, pump.to_node, pump.pump_curve, pump.power,
+                   pump.speed, pump.pattern, pump.efficiency_curve, _flatten(pump.vertices))
+
+    def to_element(self) -> Pump:
+        return Pump(self.id, self.from_node, self.to_node, self.pump_curve, self.power,
+                    self.speed, self.pattern, self.efficiency_curve, self.vertices)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.to_element().to_dict()
+
+
+@dataclass(slots=True)
+class CompactValve:
+    """Válvula compacta: vértices guardados como tupla plana"""
+    id: str
+    from_node: str
+    to_node: str
+    diameter: float
+    valve_type: str
+    setting: float
+    minor_loss: float = 0.0
+    flat_vertices: Tuple[float, ...] = ()
+
+    @property
+    def vertices(self) -> List[Coordinate]:
+        return _unflatten(self.flat_vertices)
+
+    @vertices.setter
+    def vertices(self, vertices: List[Coordinate]) -> None:
+        self.flat_vertices = _flatten(vertices)
+
+    @classmethod
+    def from_element(cls, valve: Valve) -> "CompactValve":
+        return cls(valve.id, valve.from_node, valve.to_node, valve.diameter, valve.valve_type,
+                   valve.setting, valve.minor_loss, _flatten(valve.vertices))
+
+    def to_element(self) -> Valve:
+        return Valve(self.id, self.from_node, self.to_node, self.diameter, self.valve_type,
+                     self.setting, self.minor_loss, self.vertices)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.to_element().to_dict()
+
+
+COMPACT_CLASSES = {
+    Junction: CompactJunction,
+    Reservoir: CompactReservoir,
+    Tank: CompactTank,
+    Pipe: CompactPipe,
+    Pump: CompactPump,
+    Valve: CompactValve,
+}
+
+
+def to_compact(element):
+    """Converte um elemento da rede para a sua variante compacta"""
+    return COMPACT_CLASSES[type(element)].from_element(element)
+
+
+def compact_network(network: WaterNetwork) -> WaterNetwork:
+    """
+    Retorna uma cópia da rede com os elementos nas variantes compactas
+
+    A rede resultante serializa para o mesmo to_dict da original.
+
+    Args:
+        network: Rede com elementos padrão
+
+    Returns:
+        WaterNetwork: Rede com elementos compactos
+    """
+    return WaterNetwork(
+        title=network.title,
+        junctions=[CompactJunction.from_element(e) for e in network.junctions],
+        reservoirs=[CompactReservoir.from_element(e) for e in network.reservoirs],
+        tanks=[CompactTank.from_element(e) for e in network.tanks],
+        pipes=[CompactPipe.from_element(e) for e in network.pipes],
+        pumps=[CompactPump.from_element(e) for e in network.pumps],
+        valves=[CompactValve.from_element(e) for e in network.valves],
+        patterns=network.patterns,
+        curves=network.curves,
+        options=network.options
+    )
@@ -0,0 +1,192 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .network import WaterNetwork
+
+DELTA_VERSION = 1
+
+# Localização de cada grupo de elementos no dicionário de to_dict()
+GROUP_PATHS: Dict[str, Tuple[Optional[str], str]] = {
+    "junctions": ("nodes", "junctions"),
+    "reservoirs": ("nodes", "reservoirs"),
+    "tanks": ("nodes", "tanks"),
+    "pipes": ("links", "pipes"),
+    "pumps": ("links", "pumps"),
+    "valves": ("links", "valves"),
+    "patterns": (None, "patterns"),
+    "curves": (None, "curves"),
+}
+
+# Chaves que o to_dict() omite quando vazias: None no patch significa remoção
+_OPTIONAL_KEYS = frozenset({"coordinates", "vertices"})
+
+
+def element_changes(old: Dict[str, Any], new: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Compara dois dicionários de elemento e retorna apenas os campos alterados
+
+    Args:
+        old: to_dict() anterior
+        new: to_dict() atual
+
+    Returns:
+        Dict: {"id": ..., campo: novo valor, ...} ou None se forem iguais
+    """
+    if old == new:
+        return None
+    changes = {"id": new["id"]}
+    for key, value in new.items():
+        if old.get(key, None) != value or key not in old:
+            changes[key] = value
+    for key in old:
+        if key not in new:
+            changes[key] = None
+    return changes
+
+
+@dataclass
+class GroupDelta:
+    """Alterações de um grupo de elementos (junções, tubos, padrões...)"""
+    added: List[Dict[str, Any]] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    modified: List[Dict[str, Any]] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"added": self.added, "removed": self.removed, "modified": self.modified}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GroupDelta":
+        return cls(data.get("added", []), data.get("removed", []), data.get("modified", []))
+
+
+@dataclass
+class NetworkDelta:
+    """
+    Diferença entre duas versões de uma rede, no layout de to_dict()
+
+    Elementos adicionados vêm completos, removidos apenas pelo id e
+    modificados com o id e os campos alterados. Título e opções só aparecem
+    quando mudam.
+    """
+    groups: Dict[str, GroupDelta] = field(default_factory=dict)
+    title: Optional[str] = None
+    options: Optional[Dict[str, Any]] = None
+
+    @property
+    def is_empty(self) -> bool:
+        return self.title is None and self.options is None and not any(self.groups.values())
+
+    def group(self, name: str) -> GroupDelta:
+        """Retorna (criando se necessário) as alterações de um grupo"""
+        if name not in self.groups:
+            self.groups[name] = GroupDelta()
+        return self.groups[name]
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"version": DELTA_VERSION}
+        if self.title is not None:
+            data["title"] = self.title
+        if self.options is not None:
+            data["options"] = self.options
+        data["changes"] = {name: g.to_dict() for name, g in self.groups.items() if g}
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "NetworkDelta":
+        if data.get("version") != DELTA_VERSION:
+            raise ValueError(f"Versão de delta não suportada: {data.get('version')}")
+        return cls(
+            groups={name: GroupDelta.from_dict(g) for name, g in data.get("changes", {}).items()},
+            title=data.get("title"),
+            options=data.get("options")
+        )
+
+    def apply(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Aplica o delta a um dicionário no layout de to_dict() (no próprio objeto)
+
+        Elementos adicionados entram no fim da lista do seu grupo, que é onde
+        ficam quando são acrescentados ao fim da seção do INP.
+
+        Args:
+            data: Dicionário da versão anterior da rede (ex.: JSON carregado)
+
+        Returns:
+            Dict: O mesmo dicionário, atualizado para a nova versão
+        """
+        if self.title is not None:
+            data["title"] = self.title
+        if self.options is not None:
+            data["options"] = dict(self.options)
+
+        for name, changes in self.groups.items():
+            if not changes:
+                continue
+            parent, key = GROUP_PATHS[name]
+            container = data.setdefault(parent, {}) if parent else data
+            elements = container.get(key, [])
+            removed = set(changes.removed)
+            if removed:
+                elements = [e for e in elements if e["id"] not in removed]
+            if changes.modified:
+                by_id = {e["id"]: e for e in elements}
+                for patch in changes.modified:
+                    element = by_id[patch["id"]]
+                    for field_name, value in patch.items():
+                        if value is None and field_name in _OPTIONAL_KEYS:
+                            element.pop(field_name, None)
+                        else:
+                            element[field_name] = value
+            elements.extend(dict(e) for e in changes.added)
+            container[key] = elements
+
+        nodes, links = data.get("nodes", {}), data.get("links", {})
+        counts = {name: len(nodes.get(name, [])) for name in ("junctions", "reservoirs", "tanks")}
+        counts.update({name: len(links.get(name, [])) for name in ("pipes", "pumps", "valves")})
+        data["statistics"] = {
+            **{f"total_{name}": count for name, count in counts.items()},
+            "total_nodes": counts["junctions"] + counts["reservoirs"] + counts["tanks"],
+            "total_links": counts["pipes"] + counts["pumps"] + counts["valves"],
+        }
+        return data
+
+
+def diff_elements(delta: GroupDelta, old: Iterable[Any], new: Iterable[Any]) -> None:
+    """Acumula em delta a diferença entre duas listas de elementos, pelo id"""
+    old_by_id = {e.id: e for e in old}
+    new_ids = set()
+    for element in new:
+        new_ids.add(element.id)
+        previous = old_by_id.get(element.id)
+        if previous is None:
+            delta.added.append(element.to_dict())
+        elif previous is not element:
+            changes = element_changes(previous.to_dict(), element.to_dict())
+            if changes:
+                delta.modified.append(changes)
+    delta.removed.extend(element_id for element_id in old_by_id if element_id not in new_ids)
+
+
+def diff_networks(old: WaterNetwork, new: WaterNetwork) -> NetworkDelta:
+    """
+    Calcula o delta completo entre duas redes, elemento por elemento
+
+    Elementos que são o mesmo objeto nas duas redes não são comparados.
+
+    Args:
+        old: Versão anterior
+        new: Versão atual
+
+    Returns:
+        NetworkDelta: Alterações de old para new
+    """
+    delta = NetworkDelta()
+    if old.title != new.title:
+        delta.title = new.title
+    if old.options.to_dict() != new.options.to_dict():
+        delta.options = new.options.to_dict()
+    for name in GROUP_PATHS:
+        diff_elements(delta.group(name), getattr(old, name), getattr(new, name))
+    return delta
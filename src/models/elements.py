@@ -1,5 +1,5 @@
-from dataclasses import dataclass, asdict
-from typing import Optional, Dict, Any
+from dataclasses import dataclass, asdict, field
+from typing import Optional, Dict, Any, List
 from enum import Enum
 
 
@@ -15,7 +15,7 @@ class LinkType(Enum):
     VALVE = "VALVE"
 
 
-@dataclass
+@dataclass(slots=True)
 class Coordinate:
     """Representa coordenadas X, Y de um elemento"""
     x: float
@@ -23,9 +23,22 @@ class Coordinate:
     
     def to_dict(self) -> Dict[str, float]:
         return {"x": self.x, "y": self.y}
+    
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, float]]) -> Optional["Coordinate"]:
+        """Cria a coordenada a partir do to_dict() (None se ausente)"""
+        if data is None:
+            return None
+        return cls(data["x"], data["y"])
+
 
+def _vertices_from_dicts(data: Optional[List[Dict[str, float]]]) -> List[Coordinate]:
+    if not data:
+        return []
+    return [Coordinate(v["x"], v["y"]) for v in data]
 
-@dataclass
+
+@dataclass(slots=True)
 class Junction:
     """Representa um nó de junção"""
     id: str
@@ -45,9 +58,15 @@ class Junction:
         if self.coordinates:
             data["coordinates"] = self.coordinates.to_dict()
         return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Junction":
+        """Cria o elemento a partir do dicionário gerado por to_dict()"""
+        return cls(data["id"], data["elevation"], data["demand"],
+                   data.get("demand_pattern"), Coordinate.from_dict(data.get("coordinates")))
 
 
-@dataclass
+@dataclass(slots=True)
 class Reservoir:
     """Representa um reservatório"""
     id: str
@@ -65,9 +84,15 @@ class Reservoir:
         if self.coordinates:
             data["coordinates"] = self.coordinates.to_dict()
         return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Reservoir":
+        """Cria o elemento a partir do dicionário gerado por to_dict()"""
+        return cls(data["id"], data["head"], data.get("head_pattern"),
+                   Coordinate.from_dict(data.get("coordinates")))
 
 
-@dataclass
+@dataclass(slots=True)
 class Tank:
     """Representa um tanque"""
     id: str
@@ -95,9 +120,16 @@ class Tank:
         if self.coordinates:
             data["coordinates"] = self.coordinates.to_dict()
         return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Tank":
+        """Cria o elemento a partir do dicionário gerado por to_dict()"""
+        return cls(data["id"], data["elevation"], data["init_level"], data["min_level"],
+                   data["max_level"], data["diameter"], data["min_volume"],
+                   data.get("volume_curve"), Coordinate.from_dict(data.get("coordinates")))
 
 
-@dataclass
+@dataclass(slots=True)
 class Pipe:
     """Representa um tubo"""
     id: str
@@ -108,9 +140,10 @@ class Pipe:
     roughness: float
     minor_loss: float = 0.0
     status: str = "OPEN"
+    vertices: List[Coordinate] = field(default_factory=list)
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
+        data = {
             "id": self.id,
             "type": LinkType.PIPE.value,
             "from_node": self.from_node,
@@ -121,9 +154,19 @@ class Pipe:
             "minor_loss": self.minor_loss,
             "status": self.status
         }
+        if self.vertices:
+            data["vertices"] = [v.to_dict() for v in self.vertices]
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Pipe":
+        """Cria o elemento a partir do dicionário gerado por to_dict()"""
+        return cls(data["id"], data["from_node"], data["to_node"], data["length"],
+                   data["diameter"], data["roughness"], data.get("minor_loss", 0.0),
+                   data.get("status", "OPEN"), _vertices_from_dicts(data.get("vertices")))
 
 
-@dataclass
+@dataclass(slots=True)
 class Pump:
     """Representa uma bomba"""
     id: str
@@ -133,9 +176,11 @@ class Pump:
     power: Optional[float] = None
     speed: float = 1.0
     pattern: Optional[str] = None
+    efficiency_curve: Optional[str] = None
+    vertices: List[Coordinate] = field(default_factory=list)
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
+        data = {
             "id": self.id,
             "type": LinkType.PUMP.value,
             "from_node": self.from_node,
@@ -143,11 +188,22 @@ class Pump:
             "pump_curve": self.pump_curve,
             "power": self.power,
             "speed": self.speed,
-            "pattern": self.pattern
+            "pattern": self.pattern,
+            "efficiency_curve": self.efficiency_curve
         }
+        if self.vertices:
+            data["vertices"] = [v.to_dict() for v in self.vertices]
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Pump":
+        """Cria o elemento a partir do dicionário gerado por to_dict()"""
+        return cls(data["id"], data["from_node"], data["to_node"], data.get("pump_curve"),
+                   data.get("power"), data.get("speed", 1.0), data.get("pattern"),
+                   data.get("efficiency_curve"), _vertices_from_dicts(data.get("vertices")))
 
 
-@dataclass
+@dataclass(slots=True)
 class Valve:
     """Representa uma válvula"""
     id: str
@@ -157,9 +213,10 @@ class Valve:
     valve_type: str
     setting: float
     minor_loss: float = 0.0
+    vertices: List[Coordinate] = field(default_factory=list)
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
+        data = {
             "id": self.id,
             "type": LinkType.VALVE.value,
             "from_node": self.from_node,
@@ -169,3 +226,13 @@ class Valve:
             "setting": self.setting,
             "minor_loss": self.minor_loss
         }
+        if self.vertices:
+            data["vertices"] = [v.to_dict() for v in self.vertices]
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Valve":
+        """Cria o elemento a partir do dicionário gerado por to_dict()"""
+        return cls(data["id"], data["from_node"], data["to_node"], data["diameter"],
+                   data["valve_type"], data["setting"], data.get("minor_loss", 0.0),
+                   _vertices_from_dicts(data.get("vertices")))
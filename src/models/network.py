@@ -1,9 +1,32 @@
+import gc
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, TYPE_CHECKING
 from .elements import Junction, Reservoir, Tank, Pipe, Pump, Valve
 
+if TYPE_CHECKING:
+    from .spatial import SpatialIndex
+    from .statistics import NetworkStatistics
 
-@dataclass
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """
+    Suspende o coletor de lixo cíclico durante a criação em massa de objetos
+
+    Os objetos da rede não formam ciclos, mas cada alocação conta para as
+    coletas automáticas, que passam a dominar o tempo em redes grandes.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+@dataclass(slots=True)
 class Pattern:
     """Representa um padrão de demanda/operação"""
     id: str
@@ -14,9 +37,13 @@ class Pattern:
             "id": self.id,
             "multipliers": self.multipliers
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Pattern":
+        return cls(data["id"], data["multipliers"])
 
 
-@dataclass
+@dataclass(slots=True)
 class Curve:
     """Representa uma curva (bomba, eficiência, volume, etc)"""
     id: str
@@ -30,9 +57,14 @@ class Curve:
             "type": self.curve_type,
             "points": [{"x": x, "y": y} for x, y in zip(self.x_values, self.y_values)]
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Curve":
+        points = data["points"]
+        return cls(data["id"], data["type"], [p["x"] for p in points], [p["y"] for p in points])
 
 
-@dataclass
+@dataclass(slots=True)
 class NetworkOptions:
     """Opções e configurações da rede"""
     headloss: str = "H-W"
@@ -53,6 +85,11 @@ class NetworkOptions:
             "quality_timestep": self.quality_timestep,
             "duration": self.duration
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "NetworkOptions":
+        # Chaves desconhecidas são ignoradas e as ausentes ficam com o padrão
+        return cls(**{name: data[name] for name in cls.__dataclass_fields__ if name in data})
 
 
 @dataclass
@@ -68,32 +105,165 @@ class WaterNetwork:
     patterns: List[Pattern] = field(default_factory=list)
     curves: List[Curve] = field(default_factory=list)
     options: NetworkOptions = field(default_factory=NetworkOptions)
+    # Resultados derivados (agregados, índice espacial) e a "forma" da rede
+    # quando foram calculados; ver _cached
+    _cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Atribuir qualquer campo (ex.: network.pipes = [...]) invalida o cache
+        object.__setattr__(self, name, value)
+        if name != "_cache":
+            object.__setattr__(self, "_cache", None)
+    
+    def _shape(self) -> tuple:
+        """Identidade e tamanho de cada lista: muda ao incluir ou remover elementos"""
+        return tuple((id(items), len(items)) for items in (
+            self.junctions, self.reservoirs, self.tanks, self.pipes,
+            self.pumps, self.valves, self.patterns, self.curves
+        )) + (id(self.options),)
+    
+    def _cached(self, key: str, factory: Callable[[], Any]) -> Any:
+        """
+        Retorna o valor derivado guardado em cache, recalculando se a rede mudou
+        
+        Atribuições de campos da rede e inclusões ou remoções de elementos são
+        detectadas automaticamente (identidade e tamanho das listas). Alterar
+        um elemento existente (ex.: pipe.length = 10, junction.coordinates.x = 5
+        ou network.pipes[i] = outro_tubo) não é detectado: quem altera deve
+        chamar invalidate_caches(). Detectar essas alterações exigiria resumir
+        o conteúdo a cada consulta, quase tão caro quanto recalcular.
+        
+        Args:
+            key: Nome do valor em cache
+            factory: Calcula o valor
+        """
+        shape = self._shape()
+        if self._cache is None or self._cache.get("_shape") != shape:
+            object.__setattr__(self, "_cache", {"_shape": shape})
+        if key not in self._cache:
+            self._cache[key] = factory()
+        return self._cache[key]
+    
+    def invalidate_caches(self) -> None:
+        """
+        Descarta agregados e índices em cache (libera a memória)
+        
+        Deve ser chamado após alterar elementos existentes da rede, que o
+        cache não detecta sozinho (ver _cached).
+        """
+        object.__setattr__(self, "_cache", None)
     
     def to_dict(self) -> Dict[str, Any]:
         """Converte toda a rede para um dicionário serializável"""
+        # Import local: o pacote utils depende de models
+        from ..utils.profiling import stage
+        with stage("network.to_dict") as span:
+            statistics = self.statistics()
+            span.set_elements(statistics["total_nodes"] + statistics["total_links"])
+            return {
+                "title": self.title,
+                "nodes": {
+                    "junctions": [j.to_dict() for j in self.junctions],
+                    "reservoirs": [r.to_dict() for r in self.reservoirs],
+                    "tanks": [t.to_dict() for t in self.tanks]
+                },
+                "links": {
+                    "pipes": [p.to_dict() for p in self.pipes],
+                    "pumps": [p.to_dict() for p in self.pumps],
+                    "valves": [v.to_dict() for v in self.valves]
+                },
+                "patterns": [p.to_dict() for p in self.patterns],
+                "curves": [c.to_dict() for c in self.curves],
+                "options": self.options.to_dict(),
+                "statistics": statistics
+            }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WaterNetwork":
+        """
+        Reconstrói a rede a partir do dicionário gerado por to_dict()
+        
+        Args:
+            data: Dicionário da rede (ex.: JSON carregado)
+            
+        Returns:
+            WaterNetwork: Rede com todos os elementos, padrões, curvas e opções
+        """
+        nodes = data.get("nodes", {})
+        links = data.get("links", {})
+        # A seção "statistics" é derivada e não precisa ser lida
+        with gc_paused():
+            return cls(
+                title=data.get("title", ""),
+                junctions=list(map(Junction.from_dict, nodes.get("junctions", ()))),
+                reservoirs=list(map(Reservoir.from_dict, nodes.get("reservoirs", ()))),
+                tanks=list(map(Tank.from_dict, nodes.get("tanks", ()))),
+                pipes=list(map(Pipe.from_dict, links.get("pipes", ()))),
+                pumps=list(map(Pump.from_dict, links.get("pumps", ()))),
+                valves=list(map(Valve.from_dict, links.get("valves", ()))),
+                patterns=list(map(Pattern.from_dict, data.get("patterns", ()))),
+                curves=list(map(Curve.from_dict, data.get("curves", ()))),
+                options=NetworkOptions.from_dict(data.get("options", {}))
+            )
+    
+    def to_shallow_dict(self) -> Dict[str, Any]:
+        """
+        Mesma estrutura de to_dict, mas com as listas de elementos ainda como
+        objetos (usada pelos serializadores que convertem elemento a elemento)
+        """
         return {
             "title": self.title,
             "nodes": {
-                "junctions": [j.to_dict() for j in self.junctions],
-                "reservoirs": [r.to_dict() for r in self.reservoirs],
-                "tanks": [t.to_dict() for t in self.tanks]
+                "junctions": self.junctions,
+                "reservoirs": self.reservoirs,
+                "tanks": self.tanks
             },
             "links": {
-                "pipes": [p.to_dict() for p in self.pipes],
-                "pumps": [p.to_dict() for p in self.pumps],
-                "valves": [v.to_dict() for v in self.valves]
+                "pipes": self.pipes,
+                "pumps": self.pumps,
+                "valves": self.valves
             },
-            "patterns": [p.to_dict() for p in self.patterns],
-            "curves": [c.to_dict() for c in self.curves],
+            "patterns": self.patterns,
+            "curves": self.curves,
             "options": self.options.to_dict(),
-            "statistics": {
-                "total_junctions": len(self.junctions),
-                "total_reservoirs": len(self.reservoirs),
-                "total_tanks": len(self.tanks),
-                "total_pipes": len(self.pipes),
-                "total_pumps": len(self.pumps),
-                "total_valves": len(self.valves),
-                "total_nodes": len(self.junctions) + len(self.reservoirs) + len(self.tanks),
-                "total_links": len(self.pipes) + len(self.pumps) + len(self.valves)
-            }
+            "statistics": self.statistics()
+        }
+    
+    def spatial_index(self, cell_size: Optional[float] = None) -> "SpatialIndex":
+        """
+        Índice espacial (nós e geometria dos links) da rede, em cache (após
+        mover nós ou vértices, chame invalidate_caches())
+
+        Args:
+            cell_size: Lado das células da grade (padrão: automático)
+
+        Returns:
+            SpatialIndex: Índice para consultas por caixa, raio e vizinhos
+        """
+        from .spatial import SpatialIndex
+        return self._cached(f"spatial:{cell_size}", lambda: SpatialIndex(self, cell_size))
+    
+    def aggregates(self) -> "NetworkStatistics":
+        """
+        Agregados da rede (comprimentos por diâmetro, rugosidade, cotas,
+        demandas por padrão, volume dos tanques), calculados com NumPy e
+        guardados em cache (após alterar elementos, chame invalidate_caches())
+        
+        Returns:
+            NetworkStatistics: Agregados (use to_dict() para serializar)
+        """
+        from .statistics import NetworkStatistics
+        return self._cached("aggregates", lambda: NetworkStatistics.compute(self))
+
+    def statistics(self) -> Dict[str, int]:
+        """Contagem de elementos da rede"""
+        return {
+            "total_junctions": len(self.junctions),
+            "total_reservoirs": len(self.reservoirs),
+            "total_tanks": len(self.tanks),
+            "total_pipes": len(self.pipes),
+            "total_pumps": len(self.pumps),
+            "total_valves": len(self.valves),
+            "total_nodes": len(self.junctions) + len(self.reservoirs) + len(self.tanks),
+            "total_links": len(self.pipes) + len(self.pumps) + len(self.valves)
         }
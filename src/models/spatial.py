@@ -0,0 +1,359 @@
+import math
+from itertools import repeat
+from operator import attrgetter
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+from .columnar import NODE_TABLES, LINK_TABLES
+from .network import WaterNetwork, gc_paused
+
+BBox = Tuple[float, float, float, float]  # (min_x, min_y, max_x, max_y)
+
+# Número médio de itens por célula usado para escolher o tamanho da grade
+_ITEMS_PER_CELL = 4
+
+
+class _Grid:
+    """
+    Grade uniforme em formato CSR: cada célula guarda os itens cuja caixa
+    envolvente a toca (pontos ficam em uma célula, segmentos podem ocupar várias)
+    """
+
+    def __init__(self, min_x: np.ndarray, min_y: np.ndarray, max_x: np.ndarray,
+                 max_y: np.ndarray, bounds: BBox, cell_size: Optional[float] = None):
+        self.origin_x, self.origin_y = bounds[0], bounds[1]
+        width = max(bounds[2] - bounds[0], 0.0)
+        height = max(bounds[3] - bounds[1], 0.0)
+        if cell_size is None:
+            area = max(width * height, 1e-12)
+            cell_size = math.sqrt(area * _ITEMS_PER_CELL / max(len(min_x), 1))
+            # Limita o número de células por eixo (redes alinhadas têm área ~0)
+            cell_size = max(cell_size, max(width, height) / max(len(min_x), 1), 1e-9)
+        self.cell_size = float(cell_size)
+        self.nx = max(1, int(width // self.cell_size) + 1)
+        self.ny = max(1, int(height // self.cell_size) + 1)
+
+        x0, y0 = self._cell(min_x, min_y)
+        x1, y1 = self._cell(max_x, max_y)
+        widths = x1 - x0 + 1
+        counts = widths * (y1 - y0 + 1)
+        total = int(counts.sum())
+        items = np.repeat(np.arange(len(min_x), dtype=np.int32), counts)
+        # Posição de cada entrada dentro do retângulo de células do seu item
+        local = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(counts) - counts, counts)
+        row_width = np.repeat(widths, counts)
+        cells = (np.repeat(y0, counts) + local // row_width) * self.nx \
+            + np.repeat(x0, counts) + local % row_width
+        order = np.argsort(cells, kind="stable")
+        self.items = items[order]
+        self.ptr = np.zeros(self.nx * self.ny + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cells, minlength=self.nx * self.ny), out=self.ptr[1:])
+
+    def _cell(self, x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        cx = np.clip(np.floor((np.asarray(x) - self.origin_x) / self.cell_size), 0, self.nx - 1)
+        cy = np.clip(np.floor((np.asarray(y) - self.origin_y) / self.cell_size), 0, self.ny - 1)
+        return cx.astype(np.int64), cy.astype(np.int64)
+
+    def candidates(self, bbox: BBox) -> np.ndarray:
+        """Itens das células tocadas pela caixa (sem repetições, em ordem)"""
+        (x0, x1), (y0, y1) = self._cell([bbox[0], bbox[2]], [bbox[1], bbox[3]])
+        rows = np.arange(y0, y1 + 1) * self.nx
+        starts, ends = self.ptr[rows + x0], self.ptr[rows + x1 + 1]
+        parts = [self.items[s:e] for s, e in zip(starts.tolist(), ends.tolist()) if e > s]
+        if not parts:
+            return np.empty(0, dtype=np.int32)
+        return np.unique(np.concatenate(parts))
+
+
+def _segments_in_bbox(x0, y0, x1, y1, bbox: BBox) -> np.ndarray:
+    """Máscara dos segmentos que cruzam a caixa (recorte de Liang-Barsky)"""
+    dx, dy = x1 - x0, y1 - y0
+    t0 = np.zeros(len(x0))
+    t1 = np.ones(len(x0))
+    inside = np.ones(len(x0), dtype=bool)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for p, q in ((-dx, x0 - bbox[0]), (dx, bbox[2] - x0),
+                     (-dy, y0 - bbox[1]), (dy, bbox[3] - y0)):
+            inside &= ~((p == 0) & (q < 0))
+            ratio = q / p
+            t0 = np.where(p < 0, np.maximum(t0, ratio), t0)
+            t1 = np.where(p > 0, np.minimum(t1, ratio), t1)
+    return inside & (t0 <= t1)
+
+
+def _segment_distances(x0, y0, x1, y1, x: float, y: float) -> np.ndarray:
+    """Distância do ponto (x, y) a cada segmento"""
+    dx, dy = x1 - x0, y1 - y0
+    length2 = dx * dx + dy * dy
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(length2 > 0, ((x - x0) * dx + (y - y0) * dy) / length2, 0.0)
+    t = np.clip(t, 0.0, 1.0)
+    return np.hypot(x0 + t * dx - x, y0 + t * dy - y)
+
+
+class SpatialIndex:
+    """
+    Índice espacial (grade uniforme em NumPy) de nós e da geometria dos links
+
+    Os nós entram pelas coordenadas e os links como segmentos da polilinha
+    nó inicial -> vértices -> nó final. Nós sem coordenadas (e links sem
+    nenhum ponto conhecido) ficam fora do índice. As consultas por caixa
+    testam a interseção exata de cada segmento, não apenas a caixa do link.
+
+    O índice guarda referências aos elementos da rede; se a rede for
+    alterada, um novo índice deve ser construído (em WaterNetwork.spatial_index,
+    chamando invalidate_caches() após alterar elementos existentes).
+    """
+
+    def __init__(self, network: WaterNetwork, cell_size: Optional[float] = None):
+        """
+        Args:
+            network: Rede a indexar
+            cell_size: Lado das células da grade (padrão: escolhido para
+                ~4 nós por célula)
+        """
+        self.network = network
+        with gc_paused():
+            self.nodes = [(name, e) for name in NODE_TABLES for e in getattr(network, name)
+                          if e.coordinates is not None]
+            coordinates = [e.coordinates for _, e in self.nodes]
+            self.node_x = np.fromiter(map(attrgetter("x"), coordinates), np.float64, len(coordinates))
+            self.node_y = np.fromiter(map(attrgetter("y"), coordinates), np.float64, len(coordinates))
+            self._build_segments(network)
+
+        all_x = np.concatenate([self.node_x, self.seg_x0, self.seg_x1])
+        all_y = np.concatenate([self.node_y, self.seg_y0, self.seg_y1])
+        if len(all_x):
+            self.bounds: BBox = (float(all_x.min()), float(all_y.min()),
+                                 float(all_x.max()), float(all_y.max()))
+        else:
+            self.bounds = (0.0, 0.0, 0.0, 0.0)
+        self._node_grid = _Grid(self.node_x, self.node_y, self.node_x, self.node_y,
+                                self.bounds, cell_size)
+        self._link_grid = _Grid(
+            np.minimum(self.seg_x0, self.seg_x1), np.minimum(self.seg_y0, self.seg_y1),
+            np.maximum(self.seg_x0, self.seg_x1), np.maximum(self.seg_y0, self.seg_y1),
+            self.bounds, cell_size
+        )
+
+    @classmethod
+    def from_network(cls, network: WaterNetwork, cell_size: Optional[float] = None) -> "SpatialIndex":
+        return cls(network, cell_size)
+
+    def _build_segments(self, network: WaterNetwork) -> None:
+        """
+        Decompõe os links em segmentos; links sem vértices e com os dois nós
+        posicionados (o caso comum) são tratados de uma vez com NumPy
+        """
+        links = [(name, link) for name in LINK_TABLES for link in getattr(network, name)]
+        n = len(links)
+        position = dict(zip([e.id for _, e in self.nodes], range(len(self.nodes))))
+        elements = [link for _, link in links]
+        from_index = np.fromiter(
+            map(position.get, map(attrgetter("from_node"), elements), repeat(-1)), np.int64, n
+        )
+        to_index = np.fromiter(
+            map(position.get, map(attrgetter("to_node"), elements), repeat(-1)), np.int64, n
+        )
+        has_vertices = np.fromiter(map(bool, map(attrgetter("vertices"), elements)), bool, n)
+        simple = ~has_vertices & (from_index >= 0) & (to_index >= 0)
+
+        # Demais links: polilinha nó inicial -> vértices -> nó final, só com
+        # os pontos conhecidos (um único ponto vira um segmento degenerado)
+        xs: List[float] = []
+        ys: List[float] = []
+        owners: List[int] = []
+        has_points = simple.copy()
+        for i in np.flatnonzero(~simple).tolist():
+            link = elements[i]
+            ends = (from_index[i], to_index[i])
+            points = [(c.x, c.y) for c in link.vertices]
+            if ends[0] >= 0:
+                points.insert(0, (self.node_x[ends[0]], self.node_y[ends[0]]))
+            if ends[1] >= 0:
+                points.append((self.node_x[ends[1]], self.node_y[ends[1]]))
+            if not points:
+                continue
+            has_points[i] = True
+            if len(points) == 1:
+                points.append(points[0])
+            for (x0, y0), (x1, y1) in zip(points, points[1:]):
+                xs.extend((x0, x1))
+                ys.extend((y0, y1))
+                owners.append(i)
+
+        other_x = np.array(xs, dtype=np.float64).reshape(-1, 2)
+        other_y = np.array(ys, dtype=np.float64).reshape(-1, 2)
+        simple_links = np.flatnonzero(simple)
+        start, end = from_index[simple_links], to_index[simple_links]
+        self.seg_x0 = np.concatenate([self.node_x[start], other_x[:, 0]])
+        self.seg_y0 = np.concatenate([self.node_y[start], other_y[:, 0]])
+        self.seg_x1 = np.concatenate([self.node_x[end], other_x[:, 1]])
+        self.seg_y1 = np.concatenate([self.node_y[end], other_y[:, 1]])
+        # Links sem nenhum ponto ficam fora; os índices são renumerados
+        renumber = np.cumsum(has_points) - 1
+        self.seg_link = renumber[np.concatenate([simple_links, np.array(owners, dtype=np.int64)])].astype(np.int32)
+        self.links: List[Tuple[str, Any]] = [links[i] for i in np.flatnonzero(has_points).tolist()]
+
+    def node_indices_in_bbox(self, bbox: BBox) -> np.ndarray:
+        """Índices (em self.nodes) dos nós dentro da caixa, bordas incluídas"""
+        candidates = self._node_grid.candidates(bbox)
+        x, y = self.node_x[candidates], self.node_y[candidates]
+        return candidates[(x >= bbox[0]) & (x <= bbox[2]) & (y >= bbox[1]) & (y <= bbox[3])]
+
+    def link_indices_in_bbox(self, bbox: BBox) -> np.ndarray:
+        """Índices (em self.links) dos links com algum trecho dentro da caixa"""
+        segments = self._link_grid.candidates(bbox)
+        hit = _segments_in_bbox(self.seg_x0[segments], self.seg_y0[segments],
+                                self.seg_x1[segments], self.seg_y1[segments], bbox)
+        return np.unique(self.seg_link[segments[hit]])
+
+    def nodes_in_bbox(self, bbox: BBox) -> List[str]:
+        """
+        Nós dentro de uma caixa
+
+        Args:
+            bbox: (min_x, min_y, max_x, max_y)
+
+        Returns:
+            List: Ids dos nós
+        """
+        return [self.nodes[i][1].id for i in self.node_indices_in_bbox(bbox).tolist()]
+
+    def links_in_bbox(self, bbox: BBox) -> List[str]:
+        """
+        Links que cruzam uma caixa (considerando os vértices)
+
+        Args:
+            bbox: (min_x, min_y, max_x, max_y)
+
+        Returns:
+            List: Ids dos links
+        """
+        return [self.links[i][1].id for i in self.link_indices_in_bbox(bbox).tolist()]
+
+    def nodes_within(self, x: float, y: float, radius: float) -> List[Tuple[str, float]]:
+        """
+        Nós a até radius do ponto, do mais próximo ao mais distante
+
+        Returns:
+            List: Pares (id, distância)
+        """
+        indices, distances = self._nodes_around(x, y, radius)
+        keep = distances <= radius
+        return self._ranked(self.nodes, indices[keep], distances[keep])
+
+    def nearest_nodes(self, x: float, y: float, k: int = 1) -> List[Tuple[str, float]]:
+        """
+        Os k nós mais próximos do ponto
+
+        A busca começa nas células vizinhas e dobra o raio até que os k
+        encontrados estejam garantidamente mais perto que qualquer outro.
+
+        Returns:
+            List: Pares (id, distância), do mais próximo ao mais distante
+        """
+        indices, distances = self._nearest(x, y, k, self._nodes_around, len(self.nodes))
+        return self._ranked(self.nodes, indices, distances)
+
+    def links_within(self, x: float, y: float, radius: float) -> List[Tuple[str, float]]:
+        """
+        Links com algum trecho a até radius do ponto, do mais próximo ao mais distante
+
+        Returns:
+            List: Pares (id, distância)
+        """
+        indices, distances = self._links_around(x, y, radius)
+        keep = distances <= radius
+        return self._ranked(self.links, indices[keep], distances[keep])
+
+    def nearest_links(self, x: float, y: float, k: int = 1) -> List[Tuple[str, float]]:
+        """
+        Os k links mais próximos do ponto (distância à polilinha)
+
+        Returns:
+            List: Pares (id, distância), do mais próximo ao mais distante
+        """
+        indices, distances = self._nearest(x, y, k, self._links_around, len(self.links))
+        return self._ranked(self.links, indices, distances)
+
+    def export_bbox(self, bbox: BBox) -> Dict[str, Any]:
+        """
+        Exporta apenas os elementos visíveis em uma área, no layout de to_dict()
+
+        Args:
+            bbox: (min_x, min_y, max_x, max_y)
+
+        Returns:
+            Dict: {"bbox": [...], "nodes": {...}, "links": {...}}
+        """
+        nodes: Dict[str, List[Dict[str, Any]]] = {name: [] for name in NODE_TABLES}
+        for i in self.node_indices_in_bbox(bbox).tolist():
+            name, element = self.nodes[i]
+            nodes[name].append(element.to_dict())
+        links: Dict[str, List[Dict[str, Any]]] = {name: [] for name in LINK_TABLES}
+        for i in self.link_indices_in_bbox(bbox).tolist():
+            name, element = self.links[i]
+            links[name].append(element.to_dict())
+        return {"bbox": list(bbox), "nodes": nodes, "links": links}
+
+    def tile_bbox(self, z: int, x: int, y: int) -> BBox:
+        """
+        Caixa do tile (z, x, y) de uma pirâmide sobre a extensão da rede
+
+        No nível z a extensão (um quadrado que envolve a rede) é dividida em
+        2^z x 2^z tiles; como nos mapas web, y = 0 é a linha do topo.
+        """
+        n = 1 << z
+        if not (0 <= x < n and 0 <= y < n):
+            raise ValueError(f"Tile fora da pirâmide: {z}/{x}/{y}")
+        side = max(self.bounds[2] - self.bounds[0], self.bounds[3] - self.bounds[1]) or 1.0
+        size = side / n
+        min_x = self.bounds[0] + x * size
+        max_y = self.bounds[1] + side - y * size
+        return (min_x, max_y - size, min_x + size, max_y)
+
+    def export_tile(self, z: int, x: int, y: int) -> Dict[str, Any]:
+        """Exporta os elementos visíveis no tile (z, x, y); ver tile_bbox"""
+        data = self.export_bbox(self.tile_bbox(z, x, y))
+        data["tile"] = [z, x, y]
+        return data
+
+    def _nodes_around(self, x: float, y: float, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        indices = self._node_grid.candidates((x - radius, y - radius, x + radius, y + radius))
+        return indices, np.hypot(self.node_x[indices] - x, self.node_y[indices] - y)
+
+    def _links_around(self, x: float, y: float, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        segments = self._link_grid.candidates((x - radius, y - radius, x + radius, y + radius))
+        distances = _segment_distances(self.seg_x0[segments], self.seg_y0[segments],
+                                       self.seg_x1[segments], self.seg_y1[segments], x, y)
+        # Distância de cada link = menor distância entre os seus segmentos
+        links = self.seg_link[segments]
+        order = np.lexsort((distances, links))
+        links, distances = links[order], distances[order]
+        first = np.ones(len(links), dtype=bool)
+        first[1:] = links[1:] != links[:-1]
+        return links[first], distances[first]
+
+    def _nearest(self, x: float, y: float, k: int, around, total: int) -> Tuple[np.ndarray, np.ndarray]:
+        k = min(k, total)
+        if k <= 0:
+            return np.empty(0, dtype=np.int32), np.empty(0)
+        radius = self._node_grid.cell_size
+        while True:
+            indices, distances = around(x, y, radius)
+            # Só os itens a até radius são garantidos (a caixa cobre o círculo)
+            keep = distances <= radius
+            if keep.sum() >= k or len(indices) == total:
+                if len(indices) == total:
+                    keep = np.ones(len(indices), dtype=bool)
+                indices, distances = indices[keep], distances[keep]
+                order = np.lexsort((indices, distances))[:k]
+                return indices[order], distances[order]
+            radius *= 2
+
+    @staticmethod
+    def _ranked(elements, indices: np.ndarray, distances: np.ndarray) -> List[Tuple[str, float]]:
+        order = np.lexsort((indices, distances))
+        return [(elements[i][1].id, d) for i, d in
+                zip(indices[order].tolist(), distances[order].tolist())]
@@ -0,0 +1,206 @@
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import Any, Dict, List, Optional, Sequence, Union
+import numpy as np
+
+from .columnar import ColumnarNetwork, NODE_TABLES, LINK_TABLES
+from .network import WaterNetwork
+
+# Classes de diâmetro padrão (mm) para o comprimento total de tubos
+DIAMETER_CLASSES_MM = (0, 50, 75, 100, 150, 200, 300, 400, 600, 1000)
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def _summary(values: np.ndarray) -> Dict[str, Any]:
+    """Mínimo, máximo, média e percentis (None para arrays vazios)"""
+    if not len(values):
+        return {"count": 0, "min": None, "max": None, "mean": None,
+                "percentiles": {str(p): None for p in PERCENTILES}}
+    percentiles = np.percentile(values, PERCENTILES)
+    return {
+        "count": int(len(values)),
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "mean": float(values.mean()),
+        "percentiles": {str(p): float(v) for p, v in zip(PERCENTILES, percentiles)},
+    }
+
+
+def _labels(values: Sequence[Optional[str]]) -> np.ndarray:
+    return np.array(values, dtype=object)
+
+
+@dataclass
+class NetworkStatistics:
+    """
+    Agregados da rede calculados a partir dos atributos dos elementos
+
+    Todas as grandezas estão em SI, como no modelo (m, m³, m³/s).
+    """
+    counts: Dict[str, int] = field(default_factory=dict)
+    pipes: Dict[str, Any] = field(default_factory=dict)
+    elevation: Dict[str, Any] = field(default_factory=dict)
+    demand: Dict[str, Any] = field(default_factory=dict)
+    tanks: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "counts": self.counts,
+            "pipes": self.pipes,
+            "elevation": self.elevation,
+            "demand": self.demand,
+            "tanks": self.tanks,
+        }
+
+    @classmethod
+    def compute(cls, network: Union[WaterNetwork, ColumnarNetwork],
+                diameter_classes_mm: Sequence[float] = DIAMETER_CLASSES_MM,
+                roughness_bins: Union[int, Sequence[float]] = 10) -> "NetworkStatistics":
+        """
+        Calcula os agregados com NumPy
+
+        Para uma WaterNetwork, apenas as colunas necessárias são extraídas
+        dos objetos; uma ColumnarNetwork é usada diretamente.
+
+        Args:
+            network: WaterNetwork ou ColumnarNetwork
+            diameter_classes_mm: Limites inferiores das classes de diâmetro
+                (mm); a última classe não tem limite superior
+            roughness_bins: Número de faixas ou limites do histograma de
+                rugosidade (np.histogram)
+
+        Returns:
+            NetworkStatistics: Agregados da rede
+        """
+        if isinstance(network, ColumnarNetwork):
+            columns = _columnar_columns(network)
+        else:
+            columns = _object_columns(network)
+        stats = cls()
+        stats.counts = columns["counts"]
+        stats.pipes = _pipe_statistics(columns, diameter_classes_mm, roughness_bins)
+        stats.elevation = _summary(np.concatenate([columns["junction_elevation"],
+                                                   columns["tank_elevation"]]))
+        stats.demand = _demand_statistics(columns)
+        stats.tanks = _tank_statistics(columns, {c.id: c for c in network.curves})
+        return stats
+
+
+def _counts(sizes: Dict[str, int]) -> Dict[str, int]:
+    counts = {f"total_{name}": sizes[name] for name in NODE_TABLES + LINK_TABLES}
+    counts["total_nodes"] = sum(sizes[name] for name in NODE_TABLES)
+    counts["total_links"] = sum(sizes[name] for name in LINK_TABLES)
+    return counts
+
+
+def _object_columns(network: WaterNetwork) -> Dict[str, Any]:
+    """Extrai das listas de objetos só as colunas usadas nos agregados"""
+    def column(elements: List[Any], name: str) -> np.ndarray:
+        return np.fromiter(map(attrgetter(name), elements), np.float64, len(elements))
+
+    pipes, junctions, tanks = network.pipes, network.junctions, network.tanks
+    return {
+        "counts": network.statistics(),
+        "pipe_length": column(pipes, "length"),
+        "pipe_diameter": column(pipes, "diameter"),
+        "pipe_roughness": column(pipes, "roughness"),
+        "junction_elevation": column(junctions, "elevation"),
+        "junction_demand": column(junctions, "demand"),
+        "demand_pattern": _labels([j.demand_pattern for j in junctions]),
+        "tank_elevation": column(tanks, "elevation"),
+        "tank_diameter": column(tanks, "diameter"),
+        "tank_min_level": column(tanks, "min_level"),
+        "tank_max_level": column(tanks, "max_level"),
+        "tank_min_volume": column(tanks, "min_volume"),
+        "volume_curve": _labels([t.volume_curve for t in tanks]),
+    }
+
+
+def _columnar_columns(network: ColumnarNetwork) -> Dict[str, Any]:
+    """Usa as colunas da ColumnarNetwork diretamente (rótulos decodificados)"""
+    labels = _labels(network.labels.labels + [None])  # código -1 -> None
+    pipes, junctions, tanks = (network.tables[name] for name in ("pipes", "junctions", "tanks"))
+    return {
+        "counts": _counts({name: len(network.tables[name]) for name in NODE_TABLES + LINK_TABLES}),
+        "pipe_length": pipes.length,
+        "pipe_diameter": pipes.diameter,
+        "pipe_roughness": pipes.roughness,
+        "junction_elevation": junctions.elevation,
+        "junction_demand": junctions.demand,
+        "demand_pattern": labels[junctions.demand_pattern],
+        "tank_elevation": tanks.elevation,
+        "tank_diameter": tanks.diameter,
+        "tank_min_level": tanks.min_level,
+        "tank_max_level": tanks.max_level,
+        "tank_min_volume": tanks.min_volume,
+        "volume_curve": labels[tanks.volume_curve],
+    }
+
+
+def _pipe_statistics(columns: Dict[str, Any], diameter_classes_mm: Sequence[float],
+                     roughness_bins: Union[int, Sequence[float]]) -> Dict[str, Any]:
+    length, diameter = columns["pipe_length"], columns["pipe_diameter"]
+    bounds = np.asarray(diameter_classes_mm, dtype=np.float64)
+    classes = np.searchsorted(bounds, diameter * 1000.0, side="right") - 1
+    valid = classes >= 0  # diâmetros abaixo do primeiro limite ficam de fora
+    n_classes = len(bounds)
+    lengths = np.bincount(classes[valid], weights=length[valid], minlength=n_classes)
+    counts = np.bincount(classes[valid], minlength=n_classes)
+    by_diameter = [
+        {
+            "min_diameter_mm": float(bounds[i]),
+            "max_diameter_mm": float(bounds[i + 1]) if i + 1 < n_classes else None,
+            "count": int(counts[i]),
+            "length": float(lengths[i]),
+        }
+        for i in range(n_classes)
+    ]
+
+    roughness = columns["pipe_roughness"]
+    if len(roughness):
+        histogram, edges = np.histogram(roughness, bins=roughness_bins)
+    else:
+        histogram, edges = np.zeros(0, dtype=np.int64), np.zeros(0)
+    return {
+        "total_length": float(length.sum()),
+        "length_by_diameter": by_diameter,
+        "roughness_histogram": {"edges": edges.tolist(), "counts": histogram.tolist()},
+        "diameter": _summary(diameter),
+    }
+
+
+def _demand_statistics(columns: Dict[str, Any]) -> Dict[str, Any]:
+    demand, patterns = columns["junction_demand"], columns["demand_pattern"]
+    by_pattern = []
+    if len(demand):
+        keys = np.array(["" if p is None else "\0" + p for p in patterns.tolist()])
+        names, inverse = np.unique(keys, return_inverse=True)
+        totals = np.bincount(inverse, weights=demand, minlength=len(names))
+        counts = np.bincount(inverse, minlength=len(names))
+        by_pattern = [
+            {"pattern": name[1:] if name else None, "count": int(count), "demand": float(total)}
+            for name, count, total in zip(names.tolist(), counts.tolist(), totals.tolist())
+        ]
+    return {"total": float(demand.sum()), "by_pattern": by_pattern}
+
+
+def _tank_statistics(columns: Dict[str, Any], curves: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Volume dos tanques: cilíndricos pela área e pelos níveis (com o volume
+    mínimo, como no EPANET); com curva de volume, interpolando a curva
+    """
+    area = np.pi * columns["tank_diameter"] ** 2 / 4.0
+    min_level, max_level = columns["tank_min_level"], columns["tank_max_level"]
+    min_volume = np.where(columns["tank_min_volume"] > 0, columns["tank_min_volume"], area * min_level)
+    max_volume = min_volume + area * (max_level - min_level)
+
+    for i, name in enumerate(columns["volume_curve"].tolist()):
+        curve = curves.get(name) if name else None
+        if curve is not None and curve.x_values:
+            min_volume[i] = np.interp(min_level[i], curve.x_values, curve.y_values)
+            max_volume[i] = np.interp(max_level[i], curve.x_values, curve.y_values)
+    return {
+        "count": int(len(area)),
+        "total_capacity": float(max_volume.sum()),
+        "usable_volume": float((max_volume - min_volume).sum()),
+    }
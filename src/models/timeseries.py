@@ -0,0 +1,308 @@
+import math
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+import numpy as np
+
+from .network import WaterNetwork, Pattern, Curve
+
+# Passo padrão dos padrões no EPANET (PATTERN TIMESTEP, 1 hora); não faz parte
+# de NetworkOptions, por isso é um parâmetro das funções abaixo
+DEFAULT_PATTERN_TIMESTEP = 3600.0
+
+ArrayLike = Union[Sequence[float], np.ndarray]
+
+
+def simulation_times(network: WaterNetwork) -> np.ndarray:
+    """
+    Instantes de 0 a duration (inclusive) a cada hydraulic_timestep, em segundos
+
+    Simulações em regime permanente (duration = 0) têm um único instante.
+    """
+    duration = network.options.duration
+    step = network.options.hydraulic_timestep
+    if duration <= 0 or step <= 0:
+        return np.zeros(1)
+    count = int(math.floor(duration / step + 1e-9)) + 1
+    return np.arange(count, dtype=np.float64) * step
+
+
+class PatternTable:
+    """
+    Todos os padrões da rede em uma matriz (padrões x maior padrão)
+
+    A linha extra ao final (código -1) é o padrão constante 1.0, usado para
+    elementos sem padrão, de modo que as consultas nunca precisam de desvios.
+    Padrões vazios também valem 1.0, como no EPANET.
+    """
+
+    def __init__(self, patterns: Iterable[Pattern], timestep: float = DEFAULT_PATTERN_TIMESTEP,
+                 start: float = 0.0):
+        """
+        Args:
+            patterns: Padrões da rede
+            timestep: Duração de cada multiplicador, em segundos
+            start: Instante do padrão correspondente ao início da simulação (s)
+        """
+        if timestep <= 0:
+            raise ValueError("timestep deve ser positivo")
+        patterns = list(patterns)
+        self.ids: List[str] = [p.id for p in patterns]
+        self.timestep = float(timestep)
+        self.start = float(start)
+        self._index: Dict[str, int] = {pattern_id: i for i, pattern_id in enumerate(self.ids)}
+
+        lengths = np.array([len(p.multipliers) or 1 for p in patterns] + [1], dtype=np.int64)
+        self.multipliers = np.ones((len(lengths), int(lengths.max())))
+        for i, pattern in enumerate(patterns):
+            if pattern.multipliers:
+                self.multipliers[i, :len(pattern.multipliers)] = pattern.multipliers
+        self.lengths = lengths
+
+    @classmethod
+    def from_network(cls, network: WaterNetwork, timestep: float = DEFAULT_PATTERN_TIMESTEP,
+                     start: float = 0.0) -> "PatternTable":
+        return cls(network.patterns, timestep, start)
+
+    def codes(self, pattern_ids: Iterable[Optional[str]]) -> np.ndarray:
+        """
+        Converte ids de padrão em códigos de linha (-1 = sem padrão)
+
+        Raises:
+            KeyError: Se algum padrão não existir
+        """
+        index = self._index
+        return np.fromiter((-1 if p is None else index[p] for p in pattern_ids), np.int64)
+
+    def periods(self, times: ArrayLike) -> np.ndarray:
+        """Índice do período de padrão (sem o módulo) de cada instante"""
+        times = np.asarray(times, dtype=np.float64)
+        return np.floor((times + self.start) / self.timestep + 1e-9).astype(np.int64)
+
+    def at(self, times: ArrayLike) -> np.ndarray:
+        """
+        Multiplicador de cada padrão em cada instante
+
+        Args:
+            times: Instantes da simulação, em segundos
+
+        Returns:
+            np.ndarray: Matriz (padrões + 1) x len(times); a última linha é
+                o padrão constante (código -1)
+        """
+        periods = self.periods(times)
+        columns = periods[np.newaxis, :] % self.lengths[:, np.newaxis]
+        return np.take_along_axis(self.multipliers, columns, axis=1)
+
+    def values(self, pattern_ids: Union[Iterable[Optional[str]], np.ndarray],
+               times: ArrayLike) -> np.ndarray:
+        """
+        Multiplicadores para uma lista de padrões (com repetições)
+
+        Args:
+            pattern_ids: Ids (ou códigos, de codes()) de um padrão por linha
+            times: Instantes da simulação, em segundos
+
+        Returns:
+            np.ndarray: Matriz len(pattern_ids) x len(times)
+        """
+        codes = pattern_ids if isinstance(pattern_ids, np.ndarray) else self.codes(pattern_ids)
+        periods = self.periods(times)
+        rows = self.multipliers[codes]
+        columns = periods[np.newaxis, :] % self.lengths[codes][:, np.newaxis]
+        return np.take_along_axis(rows, columns, axis=1)
+
+
+def demand_matrix(network: WaterNetwork, times: Optional[ArrayLike] = None,
+                  patterns: Optional[PatternTable] = None,
+                  base_demands: Optional[ArrayLike] = None) -> np.ndarray:
+    """
+    Demanda de todas as junções ao longo do tempo
+
+    Args:
+        network: Rede
+        times: Instantes em segundos (padrão: simulation_times(network))
+        patterns: PatternTable já montada (reaproveitada entre cenários)
+        base_demands: Demandas-base por junção, no lugar das da rede (m³/s)
+
+    Returns:
+        np.ndarray: Matriz junções x instantes, em m³/s
+    """
+    if times is None:
+        times = simulation_times(network)
+    if patterns is None:
+        patterns = PatternTable.from_network(network)
+    junctions = network.junctions
+    if base_demands is None:
+        base = np.fromiter((j.demand for j in junctions), np.float64, len(junctions))
+    else:
+        base = np.asarray(base_demands, dtype=np.float64)
+    codes = patterns.codes(j.demand_pattern for j in junctions)
+    return base[:, np.newaxis] * patterns.at(times)[codes]
+
+
+class CurveTable:
+    """
+    Curvas da rede em matrizes preenchidas (curvas x maior curva)
+
+    Os pontos além do tamanho de cada curva repetem o último ponto, o que
+    permite interpolar várias curvas diferentes em uma única operação.
+    """
+
+    def __init__(self, curves: Iterable[Curve]):
+        curves = list(curves)
+        self.ids: List[str] = [c.id for c in curves]
+        self.types: List[str] = [c.curve_type for c in curves]
+        self._index: Dict[str, int] = {curve_id: i for i, curve_id in enumerate(self.ids)}
+        self.counts = np.array([len(c.x_values) for c in curves], dtype=np.int64)
+        # Ao menos duas colunas, para que todo valor caia em um segmento
+        width = max(int(self.counts.max()) if len(curves) else 0, 2)
+        self.x = np.zeros((len(curves), width))
+        self.y = np.zeros((len(curves), width))
+        for i, curve in enumerate(curves):
+            n = len(curve.x_values)
+            if n:
+                self.x[i, :n], self.y[i, :n] = curve.x_values, curve.y_values
+                self.x[i, n:], self.y[i, n:] = curve.x_values[-1], curve.y_values[-1]
+
+    @classmethod
+    def from_network(cls, network: WaterNetwork) -> "CurveTable":
+        return cls(network.curves)
+
+    def codes(self, curve_ids: Iterable[str]) -> np.ndarray:
+        """Converte ids de curva em índices de linha (KeyError se não existir)"""
+        index = self._index
+        return np.fromiter((index[c] for c in curve_ids), np.int64)
+
+    def interpolate(self, curve_ids: Union[Iterable[str], np.ndarray], x: ArrayLike) -> np.ndarray:
+        """
+        Interpolação linear em lote, com valores constantes fora da curva
+        (como np.interp)
+
+        Args:
+            curve_ids: Ids (ou códigos, de codes()) das curvas, um por valor;
+                com um único id, a mesma curva é usada para todos
+            x: Abscissas a interpolar (mesmo tamanho de curve_ids)
+
+        Returns:
+            np.ndarray: Valores interpolados
+        """
+        if isinstance(curve_ids, str):
+            curve_ids = [curve_ids]
+        codes = curve_ids if isinstance(curve_ids, np.ndarray) else self.codes(curve_ids)
+        x = np.asarray(x, dtype=np.float64)
+        codes = np.broadcast_to(codes, x.shape).ravel()
+        flat_x = x.ravel()
+        xs, ys, counts = self.x[codes], self.y[codes], self.counts[codes]
+        if (counts == 0).any():
+            raise ValueError("Curva sem pontos")
+
+        # Segmento de cada valor: último ponto com abscissa <= x
+        right = (xs <= flat_x[:, np.newaxis]).sum(axis=1)
+        right = np.clip(right, 1, np.maximum(counts - 1, 1))
+        rows = np.arange(len(codes))
+        x0, x1 = xs[rows, right - 1], xs[rows, right]
+        y0, y1 = ys[rows, right - 1], ys[rows, right]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.clip((flat_x - x0) / (x1 - x0), 0.0, 1.0)
+        values = np.where(x1 > x0, y0 + t * (y1 - y0), y0)
+        return values.reshape(x.shape)
+
+    def tank_volumes(self, network: WaterNetwork, levels: ArrayLike) -> np.ndarray:
+        """
+        Volume dos tanques para os níveis dados (um nível por tanque, ou uma
+        matriz tanques x instantes)
+
+        Tanques com curva de volume usam a curva; os demais, a área do
+        cilindro com o volume mínimo, como no EPANET.
+
+        Returns:
+            np.ndarray: Volumes em m³, no formato de levels
+        """
+        tanks = network.tanks
+        levels = np.asarray(levels, dtype=np.float64)
+        shape = (len(tanks),) + (1,) * (levels.ndim - 1)
+        area = np.array([math.pi * t.diameter ** 2 / 4.0 for t in tanks]).reshape(shape)
+        min_level = np.array([t.min_level for t in tanks]).reshape(shape)
+        min_volume = np.array([t.min_volume for t in tanks]).reshape(shape)
+        min_volume = np.where(min_volume > 0, min_volume, area * min_level)
+        volumes = min_volume + area * (levels - min_level)
+
+        with_curve = [i for i, t in enumerate(tanks) if t.volume_curve in self._index]
+        if with_curve:
+            codes = self.codes(tanks[i].volume_curve for i in with_curve)
+            curve_levels = levels[with_curve]
+            volumes[with_curve] = self.interpolate(
+                np.broadcast_to(codes.reshape((-1,) + (1,) * (levels.ndim - 1)), curve_levels.shape),
+                curve_levels
+            )
+        return volumes
+
+
+class PumpCurves:
+    """
+    Curvas de carga das bombas, avaliadas em lote como no EPANET
+
+    Curvas de 1 ponto (q, h) viram a função potência com carga de shutoff
+    4/3·h e vazão máxima 2·q; curvas de 3 pontos começando em vazão zero são
+    ajustadas por h = A - B·q^C; as demais são interpoladas linearmente.
+    """
+
+    def __init__(self, curves: CurveTable):
+        self.curves = curves
+        n = len(curves.ids)
+        self.power = np.zeros(n, dtype=bool)
+        self.a = np.zeros(n)
+        self.b = np.zeros(n)
+        self.c = np.ones(n)
+        for i in range(n):
+            count = int(curves.counts[i])
+            xs, ys = curves.x[i, :count], curves.y[i, :count]
+            if count == 1:
+                q = (0.0, xs[0], 2.0 * xs[0])
+                h = (4.0 / 3.0 * ys[0], ys[0], 0.0)
+            elif count == 3 and xs[0] == 0.0:
+                q, h = tuple(xs), tuple(ys)
+            else:
+                continue
+            fitted = self._fit(q, h)
+            if fitted is not None:
+                self.power[i] = True
+                self.a[i], self.b[i], self.c[i] = fitted
+
+    @staticmethod
+    def _fit(q, h):
+        """Parâmetros (A, B, C) de h = A - B·q^C por três pontos, ou None"""
+        h0, h1, h2 = h
+        if not (h0 > h1 > h2 >= 0 and q[2] > q[1] > 0):
+            return None
+        if h2 == 0:
+            # Vazão máxima com carga zero (curva de 1 ponto)
+            c = math.log(h0 / (h0 - h1)) / math.log(q[2] / q[1])
+        else:
+            c = math.log((h0 - h2) / (h0 - h1)) / math.log(q[2] / q[1])
+        if c <= 0 or c > 20:
+            return None
+        return h0, (h0 - h1) / q[1] ** c, c
+
+    @classmethod
+    def from_network(cls, network: WaterNetwork) -> "PumpCurves":
+        return cls(CurveTable.from_network(network))
+
+    def head(self, curve_ids: Union[Iterable[str], np.ndarray], flows: ArrayLike) -> np.ndarray:
+        """
+        Carga fornecida por cada bomba para as vazões dadas
+
+        Args:
+            curve_ids: Ids (ou códigos) das curvas de bomba, um por vazão
+            flows: Vazões (m³/s)
+
+        Returns:
+            np.ndarray: Cargas (m), no formato de flows
+        """
+        if isinstance(curve_ids, str):
+            curve_ids = [curve_ids]
+        codes = curve_ids if isinstance(curve_ids, np.ndarray) else self.curves.codes(curve_ids)
+        flows = np.asarray(flows, dtype=np.float64)
+        codes = np.broadcast_to(codes, flows.shape)
+        linear = self.curves.interpolate(codes, flows)
+        power = self.a[codes] - self.b[codes] * np.abs(flows) ** self.c[codes]
+        return np.where(self.power[codes], power, linear)
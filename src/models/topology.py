@@ -0,0 +1,328 @@
+import heapq
+from operator import attrgetter
+from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
+
+from .columnar import ColumnarNetwork, NODE_TABLES, LINK_TABLES
+from .network import WaterNetwork
+
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import connected_components as _scipy_components
+except ImportError:  # componentes conexos têm uma implementação em NumPy
+    csr_matrix = None
+
+
+class TopologyIndex:
+    """
+    Grafo (não direcionado) da rede em formato CSR
+
+    Os nós recebem índices densos na ordem junções, reservatórios, tanques
+    (a mesma da ColumnarNetwork) e os links, na ordem tubos, bombas, válvulas.
+    Cada link entra nos dois sentidos: os vizinhos do nó i são
+    indices[indptr[i]:indptr[i + 1]] e edges, na mesma posição, guarda o
+    índice do link correspondente. Bombas e válvulas têm comprimento zero
+    nos caminhos mínimos.
+    """
+
+    def __init__(self, node_ids: List[str], link_ids: List[str], link_types: np.ndarray,
+                 from_nodes: np.ndarray, to_nodes: np.ndarray, lengths: np.ndarray):
+        """
+        Args:
+            node_ids: Ids dos nós, na ordem dos índices
+            link_ids: Ids dos links, na ordem dos índices
+            link_types: Índice em LINK_TABLES de cada link (int8)
+            from_nodes: Índice do nó inicial de cada link
+            to_nodes: Índice do nó final de cada link
+            lengths: Comprimento de cada link (m)
+        """
+        self.node_ids = node_ids
+        self.link_ids = link_ids
+        self.link_types = link_types
+        self.from_nodes = np.asarray(from_nodes, dtype=np.int32)
+        self.to_nodes = np.asarray(to_nodes, dtype=np.int32)
+        self.lengths = np.asarray(lengths, dtype=np.float64)
+        self._node_index: Optional[Dict[str, int]] = None
+        self._link_index: Optional[Dict[str, int]] = None
+        self._components: Optional[np.ndarray] = None
+        self._lists: Optional[Tuple[list, list, list]] = None
+
+        n = len(node_ids)
+        sources = np.concatenate([self.from_nodes, self.to_nodes])
+        targets = np.concatenate([self.to_nodes, self.from_nodes])
+        links = np.arange(len(link_ids), dtype=np.int32)
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n), out=self.indptr[1:])
+        order = np.argsort(sources, kind="stable")
+        self.indices = targets[order]
+        self.edges = np.concatenate([links, links])[order]
+
+    @classmethod
+    def from_network(cls, network: WaterNetwork) -> "TopologyIndex":
+        """
+        Monta o índice a partir de uma WaterNetwork
+
+        Args:
+            network: Rede baseada em listas
+
+        Returns:
+            TopologyIndex: Grafo da rede
+
+        Raises:
+            ValueError: Se algum link referenciar um nó inexistente
+        """
+        get_id = attrgetter("id")
+        node_ids = [node_id for name in NODE_TABLES for node_id in map(get_id, getattr(network, name))]
+        index = dict(zip(node_ids, range(len(node_ids))))
+        links = [link for name in LINK_TABLES for link in getattr(network, name)]
+        try:
+            from_nodes = np.fromiter(
+                map(index.__getitem__, map(attrgetter("from_node"), links)), np.int32, len(links)
+            )
+            to_nodes = np.fromiter(
+                map(index.__getitem__, map(attrgetter("to_node"), links)), np.int32, len(links)
+            )
+        except KeyError as e:
+            raise ValueError(f"Link referencia nó inexistente: {e.args[0]}") from None
+        link_types = np.repeat(
+            np.arange(len(LINK_TABLES), dtype=np.int8),
+            [len(getattr(network, name)) for name in LINK_TABLES]
+        )
+        lengths = np.zeros(len(links))
+        lengths[:len(network.pipes)] = np.fromiter(
+            map(attrgetter("length"), network.pipes), np.float64, len(network.pipes)
+        )
+        topology = cls(node_ids, list(map(get_id, links)), link_types, from_nodes, to_nodes, lengths)
+        topology._node_index = index
+        return topology
+
+    @classmethod
+    def from_columnar(cls, network: ColumnarNetwork) -> "TopologyIndex":
+        """
+        Monta o índice a partir de uma ColumnarNetwork (os links já guardam
+        os índices dos nós, então nenhum id precisa ser resolvido)
+        """
+        tables = [network.tables[name] for name in LINK_TABLES]
+        lengths = np.zeros(sum(len(t) for t in tables))
+        lengths[:len(tables[0])] = tables[0].length
+        return cls(
+            [n.decode("utf-8") for n in network.node_ids.tolist()],
+            [i.decode("utf-8") for t in tables for i in t.ids.tolist()],
+            np.repeat(np.arange(len(tables), dtype=np.int8), [len(t) for t in tables]),
+            np.concatenate([t.from_node for t in tables]),
+            np.concatenate([t.to_node for t in tables]),
+            lengths
+        )
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def link_count(self) -> int:
+        return len(self.link_ids)
+
+    def node_index(self, node_id: str) -> int:
+        """Índice denso de um nó (KeyError se não existir)"""
+        if self._node_index is None:
+            self._node_index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        return self._node_index[node_id]
+
+    def link_index(self, link_id: str) -> int:
+        """Índice denso de um link (KeyError se não existir)"""
+        if self._link_index is None:
+            self._link_index = {link_id: i for i, link_id in enumerate(self.link_ids)}
+        return self._link_index[link_id]
+
+    def link_type(self, link_id: str) -> str:
+        """Tabela do link: "pipes", "pumps" ou "valves" """
+        return LINK_TABLES[self.link_types[self.link_index(link_id)]]
+
+    @property
+    def degrees(self) -> np.ndarray:
+        """Grau de cada nó (links paralelos contam separadamente)"""
+        return np.diff(self.indptr)
+
+    def degree(self, node_id: str) -> int:
+        i = self.node_index(node_id)
+        return int(self.indptr[i + 1] - self.indptr[i])
+
+    def neighbor_indices(self, index: int) -> np.ndarray:
+        """Índices dos vizinhos do nó (view do array CSR, sem cópia)"""
+        return self.indices[self.indptr[index]:self.indptr[index + 1]]
+
+    def neighbors(self, node_id: str) -> List[str]:
+        """
+        Vizinhos de um nó, em O(grau)
+
+        Args:
+            node_id: Id do nó
+
+        Returns:
+            List: Ids dos nós vizinhos, sem repetições
+        """
+        seen = dict.fromkeys(self.neighbor_indices(self.node_index(node_id)).tolist())
+        return [self.node_ids[i] for i in seen]
+
+    def incident_links(self, node_id: str) -> List[str]:
+        """Ids dos links conectados a um nó"""
+        i = self.node_index(node_id)
+        edges = self.edges[self.indptr[i]:self.indptr[i + 1]]
+        return [self.link_ids[e] for e in dict.fromkeys(edges.tolist())]
+
+    def isolated_nodes(self) -> List[str]:
+        """Nós sem nenhum link"""
+        return [self.node_ids[i] for i in np.flatnonzero(self.degrees == 0).tolist()]
+
+    def component_labels(self) -> np.ndarray:
+        """
+        Componente conexo de cada nó (int32, numerados a partir de 0 na ordem
+        do primeiro nó de cada componente)
+        """
+        if self._components is None:
+            n = self.node_count
+            if csr_matrix is not None:
+                graph = csr_matrix(
+                    (np.ones(len(self.indices), dtype=np.int8), self.indices, self.indptr),
+                    shape=(n, n)
+                )
+                _, labels = _scipy_components(graph, directed=False)
+            else:
+                labels = self._label_components()
+            # Renumera na ordem de primeira ocorrência, independente do método
+            _, first, inverse = np.unique(labels, return_index=True, return_inverse=True)
+            rank = np.empty(len(first), dtype=np.int32)
+            rank[np.argsort(first, kind="stable")] = np.arange(len(first), dtype=np.int32)
+            self._components = rank[inverse]
+        return self._components
+
+    def connected_components(self) -> List[List[str]]:
+        """
+        Componentes conexos da rede, do maior para o menor
+
+        Returns:
+            List: Uma lista de ids de nós por componente
+        """
+        labels = self.component_labels()
+        order = np.argsort(labels, kind="stable")
+        bounds = np.cumsum(np.bincount(labels))[:-1] if len(labels) else []
+        groups = [[self.node_ids[i] for i in part.tolist()] for part in np.split(order, bounds)]
+        groups.sort(key=len, reverse=True)
+        return groups
+
+    def bfs_depths(self, source: str, max_depth: Optional[int] = None) -> np.ndarray:
+        """
+        Busca em largura a partir de um nó, processando um nível por vez
+
+        Args:
+            source: Id do nó de origem
+            max_depth: Profundidade máxima (None = sem limite)
+
+        Returns:
+            np.ndarray: Número de links até cada nó (-1 = não alcançado)
+        """
+        depths = np.full(self.node_count, -1, dtype=np.int32)
+        frontier = np.array([self.node_index(source)], dtype=np.int64)
+        depth = 0
+        depths[frontier] = 0
+        while len(frontier) and (max_depth is None or depth < max_depth):
+            depth += 1
+            starts, ends = self.indptr[frontier], self.indptr[frontier + 1]
+            counts = ends - starts
+            # Posições de todos os vizinhos da fronteira em indices
+            positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            candidates = np.unique(self.indices[positions])
+            frontier = candidates[depths[candidates] < 0]
+            depths[frontier] = depth
+        return depths
+
+    def bfs(self, source: str, max_depth: Optional[int] = None) -> List[str]:
+        """
+        Nós alcançáveis a partir de source, em ordem de distância (em links)
+
+        Args:
+            source: Id do nó de origem
+            max_depth: Profundidade máxima (None = sem limite)
+
+        Returns:
+            List: Ids dos nós, começando por source
+        """
+        depths = self.bfs_depths(source, max_depth)
+        reached = np.flatnonzero(depths >= 0)
+        reached = reached[np.argsort(depths[reached], kind="stable")]
+        return [self.node_ids[i] for i in reached.tolist()]
+
+    def shortest_path(self, source: str, target: str) -> Tuple[List[str], float]:
+        """
+        Caminho mínimo por comprimento (Dijkstra, parando ao chegar no destino)
+
+        Args:
+            source: Id do nó de origem
+            target: Id do nó de destino
+
+        Returns:
+            Tuple: (ids dos nós do caminho, comprimento total em m); ([], inf)
+                se o destino não for alcançável
+        """
+        start, goal = self.node_index(source), self.node_index(target)
+        indptr, indices, weights = self._adjacency_lists()
+        distances = {start: 0.0}
+        previous: Dict[int, int] = {}
+        done = set()
+        heap = [(0.0, start)]
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if node in done:
+                continue
+            if node == goal:
+                break
+            done.add(node)
+            for k in range(indptr[node], indptr[node + 1]):
+                neighbor = indices[k]
+                candidate = distance + weights[k]
+                if candidate < distances.get(neighbor, float("inf")):
+                    distances[neighbor] = candidate
+                    previous[neighbor] = node
+                    heapq.heappush(heap, (candidate, neighbor))
+        if goal not in distances:
+            return [], float("inf")
+
+        path = [goal]
+        while path[-1] != start:
+            path.append(previous[path[-1]])
+        return [self.node_ids[i] for i in reversed(path)], distances[goal]
+
+    def _adjacency_lists(self) -> Tuple[list, list, list]:
+        """Arrays CSR como listas Python, mais rápidas de indexar em laços"""
+        if self._lists is None:
+            self._lists = (
+                self.indptr.tolist(), self.indices.tolist(), self.lengths[self.edges].tolist()
+            )
+        return self._lists
+
+    def _label_components(self) -> np.ndarray:
+        """Componentes conexos sem SciPy: uma busca em largura por componente"""
+        labels = [-1] * self.node_count
+        indptr, indices, _ = self._adjacency_lists()
+        label = 0
+        for root in range(self.node_count):
+            if labels[root] >= 0:
+                continue
+            labels[root] = label
+            stack = [root]
+            while stack:
+                node = stack.pop()
+                for k in range(indptr[node], indptr[node + 1]):
+                    neighbor = indices[k]
+                    if labels[neighbor] < 0:
+                        labels[neighbor] = label
+                        stack.append(neighbor)
+            label += 1
+        return np.array(labels, dtype=np.int32)
+
+
+def build_topology(network: Union[WaterNetwork, ColumnarNetwork]) -> TopologyIndex:
+    """Monta o TopologyIndex de uma WaterNetwork ou ColumnarNetwork"""
+    if isinstance(network, ColumnarNetwork):
+        return TopologyIndex.from_columnar(network)
+    return TopologyIndex.from_network(network)
@@ -2,10 +2,53 @@
 Serviços para leitura e conversão de redes EPANET
 """
 
+from .arrow_converter import ArrowConverter
+from .async_api import AsyncConverter
+from .batch import BatchConverter, BatchResult, BatchSummary
+from .hydraulics import HydraulicSolver, HydraulicResults, HydraulicError
+from .incremental import IncrementalParser
+from .inp_parser import InpParser, InpParseError
 from .inp_reader import InpReader
+from .inp_stream import InpStreamReader, iter_pipes, iter_nodes
+from .inp_writer import InpWriter
 from .json_converter import JsonConverter
+from .json_index import NetworkJsonIndex
+from .json_writer import JsonStreamWriter
+from .parse_cache import ParseCache, CacheStats
+from .scenarios import (
+    Scenario, ScenarioRunner, ScenarioResult, ScenarioSummary,
+    JsonLinesResultWriter, BinaryResultWriter
+)
+from .snapshot import NetworkSnapshot, SnapshotError
 
 __all__ = [
+    'ArrowConverter',
+    'AsyncConverter',
+    'BatchConverter',
+    'BatchResult',
+    'BatchSummary',
+    'HydraulicSolver',
+    'HydraulicResults',
+    'HydraulicError',
+    'IncrementalParser',
+    'InpParser',
+    'InpParseError',
     'InpReader',
-    'JsonConverter'
+    'InpStreamReader',
+    'iter_pipes',
+    'iter_nodes',
+    'InpWriter',
+    'JsonConverter',
+    'NetworkJsonIndex',
+    'JsonStreamWriter',
+    'ParseCache',
+    'CacheStats',
+    'Scenario',
+    'ScenarioRunner',
+    'ScenarioResult',
+    'ScenarioSummary',
+    'JsonLinesResultWriter',
+    'BinaryResultWriter',
+    'NetworkSnapshot',
+    'SnapshotError'
 ]
@@ -0,0 +1,365 @@
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple, Union
+import numpy as np
+
+from ..models.columnar import (
+    ColumnarNetwork, ColumnTable, LabelTable, NODE_TABLES, LINK_TABLES, SCHEMAS,
+    FLOAT, OPT_FLOAT, LABEL, _encode_ids
+)
+from ..models.network import WaterNetwork, Pattern, Curve, NetworkOptions
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # a exportação colunar é opcional
+    pa = None
+    pq = None
+
+# Versão do layout das tabelas, gravada nos metadados de cada uma
+ARROW_LAYOUT_VERSION = 1
+# Tabelas exportadas, na ordem de gravação
+TABLES = NODE_TABLES + LINK_TABLES + ("patterns", "curves")
+_METADATA_KEY = b"pyinterface"
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("O pacote 'pyarrow' é necessário para a exportação Arrow/Parquet")
+
+
+def _dictionary(codes: np.ndarray, values: List[str]) -> "pa.DictionaryArray":
+    """
+    Coluna dicionário a partir de códigos int32 (-1 = nulo) em values,
+    mantendo no dicionário apenas os valores usados pela coluna
+    """
+    used, indices = np.unique(codes, return_inverse=True)
+    mask = codes < 0
+    if len(used) and used[0] < 0:
+        used, indices = used[1:], indices - 1
+    dictionary = pa.array([values[code] for code in used.tolist()], type=pa.string())
+    return pa.DictionaryArray.from_arrays(
+        pa.array(indices.astype(np.int32, copy=False), mask=mask if mask.any() else None),
+        dictionary
+    )
+
+
+def _ids(ids: List[str]) -> "pa.DictionaryArray":
+    """Ids dos elementos como coluna dicionário (índices 0..n-1)"""
+    return pa.DictionaryArray.from_arrays(pa.array(np.arange(len(ids), dtype=np.int32)),
+                                          pa.array(ids, type=pa.string()))
+
+
+def _nullable(values: np.ndarray) -> "pa.Array":
+    """float64 com NaN como nulo; sem NaN, o buffer do NumPy é usado sem cópia"""
+    missing = np.isnan(values)
+    return pa.array(values, mask=missing if missing.any() else None)
+
+
+def _codes(column: "pa.ChunkedArray") -> Tuple[np.ndarray, List[Optional[str]]]:
+    """Códigos int32 (-1 = nulo) e valores de uma coluna dicionário ou de texto"""
+    array = column.combine_chunks() if isinstance(column, pa.ChunkedArray) else column
+    if not pa.types.is_dictionary(array.type):
+        array = array.dictionary_encode()
+    indices = array.indices.fill_null(-1).to_numpy(zero_copy_only=False).astype(np.int32, copy=False)
+    return indices, array.dictionary.to_pylist()
+
+
+def _floats(column: "pa.ChunkedArray") -> np.ndarray:
+    """float64 com nulos como NaN"""
+    array = column.combine_chunks() if isinstance(column, pa.ChunkedArray) else column
+    return array.cast(pa.float64()).fill_null(np.nan).to_numpy(zero_copy_only=False)
+
+
+def _strings(column: "pa.ChunkedArray") -> List[Optional[str]]:
+    codes, values = _codes(column)
+    values = values + [None]  # código -1 -> None
+    return [values[c] for c in codes.tolist()]
+
+
+def _has_vertices(table: "pa.Table") -> bool:
+    """
+    Se a tabela tem vértices a ler: após um to_pandas/from_pandas, uma coluna
+    só com listas vazias vira list<null> (ou null, sem linhas) e é tratada
+    como "sem vértices"
+    """
+    if "vertices" not in table.column_names:
+        return False
+    column_type = table.column("vertices").type
+    return not (pa.types.is_null(column_type) or pa.types.is_null(column_type.value_type))
+
+
+class ArrowConverter:
+    """
+    Exporta a rede como tabelas Arrow tipadas ou arquivos Parquet, para
+    consumo analítico (pandas, Polars, DuckDB, Spark)
+
+    Cada tipo de elemento vira uma tabela com uma coluna por atributo:
+        - números em float64 (potência ausente e coordenadas ausentes são nulos)
+        - ids, nós de origem/destino, padrões, curvas, status e tipos de
+          válvula como colunas dicionário (categóricas no pandas)
+        - nós com as colunas x e y; links com "vertices" (lista de {x, y})
+    Padrões e curvas viram tabelas com listas de valores; título e opções
+    ficam nos metadados de cada tabela. Os dados vêm da ColumnarNetwork, e
+    as colunas numéricas e de vértices reaproveitam os buffers do NumPy.
+    """
+
+    @staticmethod
+    def network_to_tables(network: Union[WaterNetwork, ColumnarNetwork]) -> Dict[str, "pa.Table"]:
+        """
+        Converte a rede em tabelas Arrow, uma por tipo de elemento
+
+        Args:
+            network: WaterNetwork ou ColumnarNetwork
+
+        Returns:
+            Dict: Nome da tabela ("junctions", ..., "patterns", "curves") -> pa.Table
+        """
+        _require_pyarrow()
+        columnar = network if isinstance(network, ColumnarNetwork) else ColumnarNetwork.from_network(network)
+        labels = columnar.labels.labels
+        node_ids = [n.decode("utf-8") for n in columnar.node_ids.tolist()]
+        metadata = {_METADATA_KEY: json.dumps({
+            "version": ARROW_LAYOUT_VERSION,
+            "title": columnar.title,
+            "options": columnar.options.to_dict(),
+        }, ensure_ascii=False).encode("utf-8")}
+
+        tables: Dict[str, "pa.Table"] = {}
+        for name, table in columnar.tables.items():
+            columns: Dict[str, "pa.Array"] = {"id": _ids(table.id_list())}
+            for field_name, kind in table.schema:
+                values = table.columns[field_name]
+                if kind == FLOAT:
+                    columns[field_name] = pa.array(values)
+                elif kind == OPT_FLOAT:
+                    columns[field_name] = _nullable(values)
+                elif kind == LABEL:
+                    columns[field_name] = _dictionary(values, labels)
+                else:
+                    columns[field_name] = _dictionary(values, node_ids)
+            if table.is_node_table:
+                columns["x"] = _nullable(table.columns["x"])
+                columns["y"] = _nullable(table.columns["y"])
+            else:
+                points = pa.StructArray.from_arrays(
+                    [pa.array(table.columns["vertex_x"]), pa.array(table.columns["vertex_y"])],
+                    names=["x", "y"]
+                )
+                columns["vertices"] = pa.LargeListArray.from_arrays(
+                    pa.array(table.columns["vertex_offsets"]), points)
+            tables[name] = pa.table(columns).replace_schema_metadata(metadata)
+
+        tables["patterns"] = pa.table({
+            "id": _ids([p.id for p in columnar.patterns]),
+            "multipliers": pa.array([list(p.multipliers) for p in columnar.patterns],
+                                    type=pa.list_(pa.float64())),
+        }).replace_schema_metadata(metadata)
+        curve_types = LabelTable()
+        tables["curves"] = pa.table({
+            "id": _ids([c.id for c in columnar.curves]),
+            "type": _dictionary(np.array([curve_types.code(c.curve_type) for c in columnar.curves],
+                                         dtype=np.int32), curve_types.labels),
+            "x_values": pa.array([list(c.x_values) for c in columnar.curves], type=pa.list_(pa.float64())),
+            "y_values": pa.array([list(c.y_values) for c in columnar.curves], type=pa.list_(pa.float64())),
+        }).replace_schema_metadata(metadata)
+        return tables
+
+    @staticmethod
+    def tables_to_columnar(tables: Dict[str, "pa.Table"]) -> ColumnarNetwork:
+        """
+        Reconstrói a ColumnarNetwork a partir das tabelas de network_to_tables
+
+        Colunas de texto sem codificação dicionário também são aceitas, e
+        tabelas ausentes são tratadas como vazias.
+
+        Args:
+            tables: Nome da tabela -> pa.Table
+
+        Returns:
+            ColumnarNetwork: Rede colunar equivalente
+        """
+        _require_pyarrow()
+        columnar = ColumnarNetwork()
+        meta: Dict[str, Any] = {}
+        for table in tables.values():
+            raw = (table.schema.metadata or {}).get(_METADATA_KEY)
+            if raw:
+                meta = json.loads(raw.decode("utf-8"))
+                break
+        columnar.title = meta.get("title", "")
+        columnar.options = NetworkOptions.from_dict(meta.get("options", {}))
+        labels = columnar.labels
+
+        node_index: Dict[str, int] = {}
+        for name in NODE_TABLES:
+            if name in tables:
+                for node_id in _strings(tables[name].column("id")):
+                    node_index[node_id] = len(node_index)
+
+        for name, (_, schema) in SCHEMAS.items():
+            table = tables.get(name)
+            if table is None:
+                table = pa.table({"id": pa.array([], type=pa.string())})
+            ids = _strings(table.column("id"))
+            n = len(ids)
+            columns: Dict[str, np.ndarray] = {}
+            for field_name, kind in schema:
+                if field_name not in table.column_names:
+                    # Colunas ausentes ficam com o valor "vazio" do tipo
+                    columns[field_name] = (np.full(n, np.nan) if kind in (FLOAT, OPT_FLOAT)
+                                           else np.full(n, -1, dtype=np.int32))
+                    continue
+                column = table.column(field_name)
+                if kind in (FLOAT, OPT_FLOAT):
+                    columns[field_name] = _floats(column)
+                    continue
+                codes, values = _codes(column)
+                if kind == LABEL:
+                    mapping = np.array([labels.code(v) for v in values] + [-1], dtype=np.int32)
+                else:
+                    mapping = np.array([node_index[v] for v in values] + [-1], dtype=np.int32)
+                # Código -1 (nulo) indexa o último item do mapeamento, também -1
+                columns[field_name] = mapping[codes]
+
+            if name in NODE_TABLES:
+                for axis in ("x", "y"):
+                    columns[axis] = (_floats(table.column(axis)) if axis in table.column_names
+                                     else np.full(n, np.nan))
+            elif _has_vertices(table):
+                vertices = table.column("vertices").combine_chunks()
+                if not pa.types.is_large_list(vertices.type):
+                    vertices = vertices.cast(pa.large_list(vertices.type.value_type))
+                vertices = vertices.fill_null([]) if vertices.null_count else vertices
+                offsets = vertices.offsets.to_numpy()
+                points = vertices.values.slice(int(offsets[0]), int(offsets[-1] - offsets[0]))
+                columns["vertex_offsets"] = (offsets - offsets[0]).astype(np.int64, copy=False)
+                columns["vertex_x"] = _floats(points.field("x"))
+                columns["vertex_y"] = _floats(points.field("y"))
+            else:
+                columns["vertex_offsets"] = np.zeros(n + 1, dtype=np.int64)
+                columns["vertex_x"] = np.empty(0)
+                columns["vertex_y"] = np.empty(0)
+            columnar.tables[name] = ColumnTable(columnar, name, _encode_ids(ids), columns)
+
+        if "patterns" in tables:
+            patterns = tables["patterns"]
+            columnar.patterns = [
+                Pattern(pattern_id, multipliers or [])
+                for pattern_id, multipliers in zip(_strings(patterns.column("id")),
+                                                   patterns.column("multipliers").to_pylist())
+            ]
+        if "curves" in tables:
+            curves = tables["curves"]
+            columnar.curves = [
+                Curve(curve_id, curve_type, x_values or [], y_values or [])
+                for curve_id, curve_type, x_values, y_values in zip(
+                    _strings(curves.column("id")), _strings(curves.column("type")),
+                    curves.column("x_values").to_pylist(), curves.column("y_values").to_pylist())
+            ]
+        return columnar
+
+    @staticmethod
+    def tables_to_network(tables: Dict[str, "pa.Table"]) -> WaterNetwork:
+        """Reconstrói a WaterNetwork a partir das tabelas de network_to_tables"""
+        return ArrowConverter.tables_to_columnar(tables).to_network()
+
+    @staticmethod
+    def network_to_parquet(network: Union[WaterNetwork, ColumnarNetwork], directory: str,
+                           compression: str = "zstd") -> List[str]:
+        """
+        Grava cada tabela em um arquivo Parquet (<directory>/<tabela>.parquet)
+
+        Args:
+            network: WaterNetwork ou ColumnarNetwork
+            directory: Diretório de saída (criado se necessário)
+            compression: Compressão do Parquet ("zstd", "snappy", "none", ...)
+
+        Returns:
+            List: Caminhos dos arquivos gravados
+        """
+        tables = ArrowConverter.network_to_tables(network)
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for name, table in tables.items():
+            path = os.path.join(directory, f"{name}.parquet")
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            try:
+                pq.write_table(table, tmp_path, compression=compression)
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            paths.append(path)
+        return paths
+
+    @staticmethod
+    def network_from_parquet(directory: str) -> WaterNetwork:
+        """
+        Lê a rede gravada por network_to_parquet
+
+        Args:
+            directory: Diretório com os arquivos <tabela>.parquet
+
+        Returns:
+            WaterNetwork: Objeto da rede
+        """
+        _require_pyarrow()
+        return ArrowConverter.tables_to_network(ArrowConverter._read_tables(
+            directory, "parquet", lambda path: pq.read_table(path)))
+
+    @staticmethod
+    def network_to_ipc(network: Union[WaterNetwork, ColumnarNetwork], directory: str) -> List[str]:
+        """
+        Grava cada tabela em um arquivo Arrow IPC (<directory>/<tabela>.arrow),
+        que pode ser lido sem cópia via memory map
+
+        Args:
+            network: WaterNetwork ou ColumnarNetwork
+            directory: Diretório de saída (criado se necessário)
+
+        Returns:
+            List: Caminhos dos arquivos gravados
+        """
+        tables = ArrowConverter.network_to_tables(network)
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for name, table in tables.items():
+            path = os.path.join(directory, f"{name}.arrow")
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            try:
+                with pa.OSFile(tmp_path, "wb") as sink:
+                    with pa.ipc.new_file(sink, table.schema) as writer:
+                        writer.write_table(table)
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            paths.append(path)
+        return paths
+
+    @staticmethod
+    def network_from_ipc(directory: str) -> WaterNetwork:
+        """
+        Lê a rede gravada por network_to_ipc (arquivos mapeados em memória)
+
+        Args:
+            directory: Diretório com os arquivos <tabela>.arrow
+
+        Returns:
+            WaterNetwork: Objeto da rede
+        """
+        _require_pyarrow()
+        return ArrowConverter.tables_to_network(ArrowConverter._read_tables(
+            directory, "arrow", lambda path: pa.ipc.open_file(pa.memory_map(path)).read_all()))
+
+    @staticmethod
+    def _read_tables(directory: str, extension: str, read) -> Dict[str, "pa.Table"]:
+        tables = {}
+        for name in TABLES:
+            path = os.path.join(directory, f"{name}.{extension}")
+            if os.path.exists(path):
+                tables[name] = read(path)
+        if not tables:
+            raise FileNotFoundError(f"Nenhuma tabela .{extension} encontrada em {directory}")
+        return tables
@@ -0,0 +1,236 @@
+import asyncio
+import os
+import tempfile
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import AsyncIterable, Callable, Iterable, Iterator, Optional, TypeVar
+
+from ..models.network import WaterNetwork
+from .inp_parser import InpParser, InpParseError, split_sections
+from .inp_reader import InpReader
+from .json_converter import JsonConverter
+from .json_writer import JsonStreamWriter
+from .parse_cache import ParseCache
+
+T = TypeVar("T")
+
+# Intervalo (em linhas do INP) entre verificações de cancelamento na leitura
+_CHECK_EVERY = 10_000
+
+
+class _Cancelled(Exception):
+    """Interrompe uma operação em andamento em um worker após o cancelamento"""
+
+
+def _checked_lines(lines: Iterable[str], cancel: threading.Event) -> Iterator[str]:
+    """Repassa as linhas, abortando se o cancelamento for pedido"""
+    for number, line in enumerate(lines):
+        if number % _CHECK_EVERY == 0 and cancel.is_set():
+            raise _Cancelled()
+        yield line
+
+
+class _CheckedWriter:
+    """Stream de texto que aborta a escrita quando o cancelamento é pedido"""
+
+    def __init__(self, stream, cancel: threading.Event):
+        self._stream = stream
+        self._cancel = cancel
+
+    def write(self, text: str) -> int:
+        if self._cancel.is_set():
+            raise _Cancelled()
+        return self._stream.write(text)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class AsyncConverter:
+    """
+    Versões assíncronas da leitura de INP e da gravação de JSON
+
+    As etapas pesadas (leitura e serialização) rodam em um pool de threads,
+    sem bloquear o loop de eventos, e no máximo max_concurrency delas rodam
+    ao mesmo tempo: as demais aguardam na fila sem ocupar o loop.
+
+    Cancelar a tarefa (task.cancel(), asyncio.wait_for...) interrompe a
+    operação no próximo ponto de verificação (a cada bloco de linhas lido ou
+    trecho de JSON escrito) e remove os arquivos parciais. A vaga só é
+    liberada quando o worker de fato termina, então o limite de concorrência
+    vale mesmo para operações canceladas.
+    """
+
+    def __init__(self, max_concurrency: int = 4, engine: str = "native",
+                 cache: Optional[ParseCache] = None, executor: Optional[Executor] = None):
+        """
+        Args:
+            max_concurrency: Número máximo de leituras/serializações simultâneas
+            engine: Engine do InpReader ("native" ou "wntr")
+            cache: Cache em disco opcional, repassado ao InpReader
+            executor: Pool de threads a usar (padrão: um pool próprio com
+                max_concurrency threads)
+        """
+        if engine not in InpReader.ENGINES:
+            raise ValueError(f"Engine desconhecida: {engine}")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency deve ser pelo menos 1")
+        self.max_concurrency = max_concurrency
+        self.engine = engine
+        self.cache = cache
+        self._own_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="pyepa-async"
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def read_inp_file(self, inp_file_path: str) -> WaterNetwork:
+        """
+        Lê um arquivo INP sem bloquear o loop de eventos
+
+        Args:
+            inp_file_path: Caminho para o arquivo .inp
+
+        Returns:
+            WaterNetwork: Objeto contendo toda a rede
+        """
+        return await self._run(self._read, inp_file_path)
+
+    async def read_inp_stream(self, chunks: AsyncIterable[bytes]) -> WaterNetwork:
+        """
+        Lê um INP recebido em blocos (ex.: corpo de um upload HTTP)
+
+        Os blocos são gravados em um arquivo temporário à medida que chegam,
+        sem acumular o conteúdo em memória; o temporário é removido ao final,
+        inclusive em caso de erro ou cancelamento.
+
+        Args:
+            chunks: Iterável assíncrono de bytes (ex.: request.stream())
+
+        Returns:
+            WaterNetwork: Objeto contendo toda a rede
+        """
+        loop = asyncio.get_running_loop()
+        fd, tmp_path = tempfile.mkstemp(suffix=".inp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                async for chunk in chunks:
+                    await loop.run_in_executor(None, f.write, chunk)
+            return await self.read_inp_file(tmp_path)
+        finally:
+            _remove(tmp_path)
+
+    async def network_to_file(self, network: WaterNetwork, output_path: str,
+                              indent: int = 2, compact: bool = False) -> None:
+        """
+        Salva a rede em um arquivo JSON sem bloquear o loop de eventos
+
+        O JSON é escrito em um temporário e movido para output_path ao final,
+        de modo que erros e cancelamentos não deixam arquivos parciais.
+
+        Args:
+            network: Objeto WaterNetwork
+            output_path: Caminho do arquivo de saída
+            indent: Indentação do JSON
+            compact: Se True, gera JSON sem indentação nem espaços
+        """
+        await self._run(self._write, network, output_path, indent, compact)
+
+    async def network_to_bytes(self, network: WaterNetwork, indent: int = 2,
+                               compact: bool = False, backend: Optional[str] = None) -> bytes:
+        """
+        Serializa a rede para JSON em UTF-8 (ex.: corpo de uma resposta HTTP)
+
+        A serialização em si não é interrompível: um cancelamento só tem
+        efeito se ela ainda estiver na fila.
+
+        Returns:
+            bytes: JSON em UTF-8
+        """
+        return await self._run(
+            lambda cancel: JsonConverter.network_to_bytes(network, indent, compact, backend)
+        )
+
+    async def convert_file(self, inp_file_path: str, output_path: str,
+                           indent: int = 2, compact: bool = False) -> WaterNetwork:
+        """
+        Converte um arquivo INP em JSON
+
+        Returns:
+            WaterNetwork: Rede lida
+        """
+        network = await self.read_inp_file(inp_file_path)
+        await self.network_to_file(network, output_path, indent, compact)
+        return network
+
+    def close(self) -> None:
+        """Encerra o pool de threads próprio (sem esperar operações em andamento)"""
+        if self._own_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self) -> "AsyncConverter":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        """
+        Executa func(*args, cancel) no pool, respeitando o limite de concorrência
+
+        Em caso de cancelamento, sinaliza o worker e propaga o CancelledError
+        imediatamente; a vaga é devolvida quando o worker termina.
+        """
+        loop = asyncio.get_running_loop()
+        await self._semaphore.acquire()
+        cancel = threading.Event()
+        try:
+            future = self._executor.submit(func, *args, cancel)
+        except BaseException:
+            self._semaphore.release()
+            raise
+        future.add_done_callback(lambda _: self._release(loop))
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            cancel.set()
+            future.cancel()
+            raise
+
+    def _release(self, loop: asyncio.AbstractEventLoop) -> None:
+        try:
+            loop.call_soon_threadsafe(self._semaphore.release)
+        except RuntimeError:
+            pass  # loop já encerrado
+
+    def _read(self, inp_file_path: str, cancel: threading.Event) -> WaterNetwork:
+        if cancel.is_set():
+            raise _Cancelled()
+        if self.engine == "native" and self.cache is None:
+            # Caminho sem cache: as linhas são lidas com verificações de
+            # cancelamento; erros de leitura seguem para o fallback do InpReader
+            try:
+                with open(inp_file_path, "r", encoding="utf-8") as f:
+                    sections = split_sections(_checked_lines(f, cancel))
+                return InpParser().parse_sections(sections)
+            except InpParseError:
+                pass
+        return InpReader(engine=self.engine, cache=self.cache).read_inp_file(inp_file_path)
+
+    @staticmethod
+    def _write(network: WaterNetwork, output_path: str, indent: int, compact: bool,
+               cancel: threading.Event) -> None:
+        tmp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                writer = JsonStreamWriter(_CheckedWriter(f, cancel), indent, compact=compact)
+                writer.write_network(network)
+            if cancel.is_set():
+                raise _Cancelled()
+            os.replace(tmp_path, output_path)
+        finally:
+            _remove(tmp_path)
@@ -0,0 +1,404 @@
+import glob
+import os
+import signal
+import time
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, asdict
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from .inp_reader import InpReader
+from .json_converter import JsonConverter
+from .parse_cache import ParseCache
+from ..utils.profiling import Profiler, ProfileReport
+
+# Dentro do processo, o timeout por arquivo usa SIGALRM (apenas POSIX, e sem
+# interromper chamadas longas em C); o BatchConverter o impõe também a partir
+# do processo principal, com esta folga para o alarme agir primeiro
+_HAS_ALARM = hasattr(signal, "setitimer")
+_TIMEOUT_GRACE = 1.0
+
+
+class ConversionTimeout(Exception):
+    """Conversão de um arquivo excedeu o tempo limite"""
+
+
+@dataclass
+class BatchResult:
+    """Resultado da conversão de um arquivo"""
+    input_path: str
+    output_path: str
+    ok: bool
+    elements: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+    # Relatório de etapas (ProfileReport.to_dict), quando profile=True
+    profile: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class BatchSummary:
+    """Resumo de uma conversão em lote"""
+    results: List[BatchResult] = field(default_factory=list)
+    elapsed: float = 0.0
+    workers: int = 1
+
+    @property
+    def succeeded(self) -> List[BatchResult]:
+        return [r for r in self.results if r.ok]
+
+    @property
+    def failed(self) -> List[BatchResult]:
+        return [r for r in self.results if not r.ok]
+
+    @property
+    def elements(self) -> int:
+        return sum(r.elements for r in self.results)
+
+    @property
+    def files_per_second(self) -> float:
+        return len(self.results) / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def elements_per_second(self) -> float:
+        return self.elements / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "files": len(self.results),
+            "succeeded": len(self.succeeded),
+            "failed": len(self.failed),
+            "elements": self.elements,
+            "elapsed": self.elapsed,
+            "workers": self.workers,
+            "files_per_second": self.files_per_second,
+            "elements_per_second": self.elements_per_second,
+            "errors": {r.input_path: r.error for r in self.failed},
+        }
+
+    def profile_report(self) -> ProfileReport:
+        """Etapas de todos os arquivos somadas (requer profile=True na conversão)"""
+        return ProfileReport.merge(
+            ProfileReport.from_dict(r.profile) for r in self.results if r.profile
+        )
+
+    def format(self) -> str:
+        """Resumo legível da conversão"""
+        return (
+            f"{len(self.succeeded)}/{len(self.results)} arquivos convertidos em "
+            f"{self.elapsed:.2f}s com {self.workers} processo(s) - "
+            f"{self.files_per_second:.1f} arquivos/s, "
+            f"{self.elements_per_second:,.0f} elementos/s"
+        )
+
+
+def collect_inputs(sources: Iterable[str]) -> List[Tuple[str, str]]:
+    """
+    Expande diretórios, padrões glob e arquivos em pares (arquivo, caminho relativo)
+
+    O caminho relativo (usado para montar o nome do JSON de saída) é relativo
+    ao diretório informado ou, para globs, ao diretório base do padrão.
+    Arquivos que terminariam com o mesmo caminho relativo (ex.: a/net.inp e
+    b/net.inp informados diretamente) passam a ser relativos à pasta comum
+    a eles ("a/net.inp" e "b/net.inp").
+
+    Args:
+        sources: Diretórios, padrões glob ("redes/**/*.inp") ou arquivos
+
+    Returns:
+        List: Pares (caminho do INP, caminho relativo), sem repetições
+    """
+    inputs: List[Tuple[str, str]] = []
+    seen = set()
+
+    def add(path: str, root: str) -> None:
+        key = os.path.abspath(path)
+        if key not in seen:
+            seen.add(key)
+            inputs.append((path, os.path.relpath(path, root)))
+
+    for source in sources:
+        if os.path.isdir(source):
+            for name in sorted(os.listdir(source)):
+                path = os.path.join(source, name)
+                if name.lower().endswith(".inp") and os.path.isfile(path):
+                    add(path, source)
+        elif glob.has_magic(source):
+            root = source
+            while glob.has_magic(root):
+                root = os.path.dirname(root)
+            for path in sorted(glob.glob(source, recursive=True)):
+                if os.path.isfile(path):
+                    add(path, root or ".")
+        else:
+            add(source, os.path.dirname(source) or ".")
+
+    groups: Dict[str, List[int]] = {}
+    for i, (_, relative) in enumerate(inputs):
+        groups.setdefault(_output_stem(relative), []).append(i)
+    for indices in groups.values():
+        if len(indices) > 1:
+            paths = [os.path.abspath(inputs[i][0]) for i in indices]
+            root = os.path.commonpath([os.path.dirname(path) for path in paths])
+            for i, path in zip(indices, paths):
+                inputs[i] = (inputs[i][0], os.path.relpath(path, root))
+    return inputs
+
+
+def _output_stem(relative_path: str) -> str:
+    return os.path.normcase(os.path.splitext(relative_path)[0])
+
+
+def _raise_timeout(signum, frame):
+    raise ConversionTimeout()
+
+
+def _timeout_result(job: Tuple[str, str], timeout: float, seconds: float) -> BatchResult:
+    return BatchResult(job[0], job[1], False, seconds=seconds,
+                       error=f"Tempo limite de {timeout}s excedido")
+
+
+def _remove_partial(output_path: str) -> None:
+    """Remove os temporários deixados por um processo encerrado à força"""
+    for tmp_path in glob.glob(f"{glob.escape(output_path)}.*.tmp"):
+        os.remove(tmp_path)
+
+
+def _terminate_workers(executor: ProcessPoolExecutor) -> None:
+    """Encerra os processos do pool (sem API pública antes do Python 3.14)"""
+    terminate = getattr(executor, "terminate_workers", None)
+    if terminate is not None:
+        terminate()
+        return
+    for process in list((executor._processes or {}).values()):
+        process.terminate()
+
+
+def convert_file(input_path: str, output_path: str, engine: str = "native",
+                 compact: bool = False, timeout: Optional[float] = None,
+                 cache_dir: Optional[str] = None, profile: bool = False,
+                 profile_memory: bool = False) -> BatchResult:
+    """
+    Converte um arquivo INP em JSON, capturando qualquer erro no resultado
+
+    Cada chamada usa o seu próprio InpReader, então a função pode rodar em
+    processos distintos. O JSON é gravado em um temporário e movido ao final,
+    de modo que uma falha não deixa arquivos parciais.
+
+    Args:
+        input_path: Arquivo INP
+        output_path: Arquivo JSON de saída
+        engine: Engine do InpReader
+        compact: Se True, grava JSON compacto
+        timeout: Tempo limite em segundos, aplicado aqui apenas em sistemas
+            com SIGALRM (o BatchConverter o impõe em qualquer sistema)
+        cache_dir: Diretório de um ParseCache compartilhado (opcional)
+        profile: Se True, mede cada etapa e guarda o relatório no resultado
+        profile_memory: Se True, mede também o pico de memória por etapa
+            (tracemalloc; deixa a conversão mais lenta)
+
+    Returns:
+        BatchResult: Resultado da conversão
+    """
+    start = time.perf_counter()
+    profiler = Profiler(trace_memory=profile_memory) if profile or profile_memory else None
+    report = lambda: profiler.report().to_dict() if profiler is not None else None
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    use_alarm = bool(timeout) and _HAS_ALARM
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        with profiler if profiler is not None else nullcontext():
+            cache = ParseCache(cache_dir) if cache_dir else None
+            network = InpReader(engine=engine, cache=cache).read_inp_file(input_path)
+            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+            JsonConverter.network_to_file(network, tmp_path, compact=compact)
+            os.replace(tmp_path, output_path)
+        stats = network.statistics()
+        return BatchResult(input_path, output_path, True,
+                           stats["total_nodes"] + stats["total_links"],
+                           time.perf_counter() - start, profile=report())
+    except ConversionTimeout:
+        result = _timeout_result((input_path, output_path), timeout, time.perf_counter() - start)
+        result.profile = report()
+        return result
+    except Exception as e:
+        return BatchResult(input_path, output_path, False, seconds=time.perf_counter() - start,
+                           error=f"{type(e).__name__}: {e}", profile=report())
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class BatchConverter:
+    """
+    Converte muitos arquivos INP para JSON em paralelo (ProcessPoolExecutor)
+
+    Falhas ficam isoladas por arquivo: exceções e timeouts viram resultados com
+    erro, e se um processo morrer (ex.: falta de memória) os arquivos que
+    estavam em andamento são refeitos isoladamente e o restante continua em
+    um novo pool. O timeout é controlado pelo processo principal: um arquivo
+    que o excede tem os processos do pool encerrados, e os demais arquivos
+    em andamento voltam para a fila.
+    """
+
+    def __init__(self, output_dir: str, workers: Optional[int] = None,
+                 timeout: Optional[float] = None, engine: str = "native",
+                 compact: bool = False, cache_dir: Optional[str] = None,
+                 profile: bool = False, profile_memory: bool = False):
+        """
+        Args:
+            output_dir: Diretório dos arquivos JSON
+            workers: Número de processos (padrão: número de CPUs)
+            timeout: Tempo limite por arquivo, em segundos
+            engine: Engine do InpReader ("native" ou "wntr")
+            compact: Se True, grava JSON compacto
+            cache_dir: Diretório de um ParseCache compartilhado pelos processos
+            profile: Se True, mede as etapas de cada arquivo (ver
+                BatchSummary.profile_report)
+            profile_memory: Se True, mede também o pico de memória por etapa
+        """
+        if engine not in InpReader.ENGINES:
+            raise ValueError(f"Engine desconhecida: {engine}")
+        self.output_dir = output_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.engine = engine
+        self.compact = compact
+        self.cache_dir = cache_dir
+        self.profile = profile
+        self.profile_memory = profile_memory
+
+    def output_path(self, relative_path: str) -> str:
+        """Caminho do JSON correspondente a um INP (mesma estrutura de pastas)"""
+        return os.path.join(self.output_dir, os.path.splitext(relative_path)[0] + ".json")
+
+    def convert(self, sources: Iterable[str], progress=None) -> BatchSummary:
+        """
+        Converte todos os arquivos encontrados em sources
+
+        Args:
+            sources: Diretórios, padrões glob ou arquivos INP
+            progress: Função opcional chamada com cada BatchResult concluído
+
+        Returns:
+            BatchSummary: Resultados e vazão da conversão
+        """
+        summary = BatchSummary(workers=self.workers)
+        start = time.perf_counter()
+
+        def record(result: BatchResult) -> None:
+            summary.results.append(result)
+            if progress is not None:
+                progress(result)
+
+        # Um JSON nunca é sobrescrito por outro arquivo do mesmo lote (ex.:
+        # net.inp e net.INP na mesma pasta)
+        jobs: Deque[Tuple[str, str]] = deque()
+        owners: Dict[str, str] = {}
+        for path, relative in collect_inputs(sources):
+            output_path = self.output_path(relative)
+            owner = owners.setdefault(os.path.normcase(os.path.abspath(output_path)), path)
+            if owner != path:
+                record(BatchResult(path, output_path, False,
+                                   error=f"Saída {output_path} já gerada a partir de {owner}"))
+            else:
+                jobs.append((path, output_path))
+
+        while jobs:
+            suspects = self._run_pool(jobs, record)
+            # Os arquivos em execução quando o pool caiu são refeitos um a um,
+            # cada um em um processo próprio, para achar o responsável
+            for job in suspects:
+                record(self._run_isolated(job))
+
+        summary.elapsed = time.perf_counter() - start
+        return summary
+
+    def _submit(self, executor: ProcessPoolExecutor, job: Tuple[str, str]) -> Future:
+        input_path, output_path = job
+        return executor.submit(convert_file, input_path, output_path, self.engine,
+                               self.compact, self.timeout, self.cache_dir,
+                               self.profile, self.profile_memory)
+
+    def _run_pool(self, jobs: Deque[Tuple[str, str]], record) -> List[Tuple[str, str]]:
+        """
+        Consome a fila de jobs em um pool de processos
+
+        No máximo 2 * workers arquivos ficam enviados ao pool ao mesmo tempo,
+        o que limita quantos são afetados se um processo morrer. Com timeout,
+        apenas workers arquivos, de modo que cada um começa ao ser enviado e
+        o prazo pode ser contado a partir do envio.
+
+        Returns:
+            List: Jobs em andamento quando o pool caiu por conta própria
+        """
+        suspects: List[Tuple[str, str]] = []
+        in_flight: Dict[Future, Tuple[str, str]] = {}
+        deadlines: Dict[Future, float] = {}
+        limit = self.workers if self.timeout else 2 * self.workers
+        broken = killed = False
+        interrupted: List[Tuple[str, str]] = []
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs))) as executor:
+            while in_flight or (jobs and not broken):
+                while jobs and not broken and len(in_flight) < limit:
+                    job = jobs.popleft()
+                    future = self._submit(executor, job)
+                    in_flight[future] = job
+                    if self.timeout:
+                        deadlines[future] = time.monotonic() + self.timeout + _TIMEOUT_GRACE
+                wait_for = max(0.0, min(deadlines.values()) - time.monotonic()) if deadlines else None
+                done, _ = wait(in_flight, timeout=wait_for, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = in_flight.pop(future)
+                    deadlines.pop(future, None)
+                    try:
+                        record(future.result())
+                    except BrokenProcessPool:
+                        broken = True
+                        if killed:
+                            # Interrompido junto com um arquivo que excedeu o tempo
+                            jobs.appendleft(job)
+                            interrupted.append(job)
+                        else:
+                            suspects.append(job)
+                now = time.monotonic()
+                expired = [f for f, deadline in deadlines.items() if deadline <= now and not f.done()]
+                if expired:
+                    for future in expired:
+                        job = in_flight.pop(future)
+                        interrupted.append(job)
+                        record(_timeout_result(job, self.timeout,
+                                               now - deadlines.pop(future) + self.timeout + _TIMEOUT_GRACE))
+                    _terminate_workers(executor)
+                    broken = killed = True
+        # Com o pool encerrado, nenhum processo escreve mais nos temporários
+        for job in interrupted:
+            _remove_partial(job[1])
+        return suspects
+
+    def _run_isolated(self, job: Tuple[str, str]) -> BatchResult:
+        """Converte um único arquivo em um processo exclusivo"""
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            try:
+                timeout = self.timeout + _TIMEOUT_GRACE if self.timeout else None
+                return self._submit(executor, job).result(timeout=timeout)
+            except FutureTimeoutError:
+                _terminate_workers(executor)
+                result = _timeout_result(job, self.timeout, time.perf_counter() - start)
+            except BrokenProcessPool:
+                result = BatchResult(job[0], job[1], False,
+                                     error="Processo de conversão encerrado inesperadamente")
+        _remove_partial(job[1])
+        return result
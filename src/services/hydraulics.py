@@ -0,0 +1,674 @@
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
+
+from ..models.network import WaterNetwork
+from ..models.timeseries import PatternTable, CurveTable, PumpCurves, DEFAULT_PATTERN_TIMESTEP
+from ..models.topology import TopologyIndex
+
+try:
+    from scipy.sparse import csc_matrix
+    from scipy.sparse.linalg import splu
+except ImportError:  # o solver hidráulico é o único recurso que exige o SciPy
+    csc_matrix = splu = None
+
+# Constantes físicas do EPANET, definidas em unidades americanas e convertidas
+# para o SI (ex.: g = 32,2 ft/s², e não 9,81 m/s²) para reproduzir seus resultados
+G = 32.2 * 0.3048                      # aceleração da gravidade (m/s²)
+GAMMA = 62.4 * 4.4482216152605 / 0.3048 ** 3  # peso específico da água (N/m³)
+VISCOSITY = 1.1e-5 * 0.3048 ** 2       # viscosidade cinemática padrão do EPANET (m²/s)
+HW_COEFF = 10.666829500036352          # Hazen-Williams em SI
+HW_EXPONENT = 1.852
+CM_COEFF = 10.294                      # Chezy-Manning em SI
+DW_COEFF = 8.0 / (G * math.pi ** 2)    # Darcy-Weisbach: DW_COEFF·f·L/D⁵·Q²
+MINOR_COEFF = 0.02517 / 0.3048         # perda localizada: MINOR_COEFF·K/D⁴·Q²
+
+# Constantes do método gradiente, como no EPANET (convertidas para o SI)
+CBIG = 1.0e8                           # resistência de links fechados / penalidade
+CSMALL = 1.0e-6                        # resistência de válvulas abertas sem perda
+RQTOL = 1.0e-7                         # gradiente mínimo de perda de carga
+HTOL = 0.0005 * 0.3048                 # tolerância de carga nas mudanças de estado (m)
+QTOL = 0.0001 * 0.3048 ** 3            # tolerância de vazão nas mudanças de estado (m³/s)
+INITIAL_VELOCITY = 0.3048              # velocidade inicial dos links (1 ft/s)
+
+# Tipos de link e estados das válvulas
+PIPE, PUMP, VALVE = 0, 1, 2
+OPEN, CLOSED, ACTIVE = 0, 1, 2
+VALVE_TYPES = ("PRV", "PSV", "PBV", "FCV", "TCV", "GPV")
+PRV, PSV, PBV, FCV, TCV, GPV = range(len(VALVE_TYPES))
+
+
+class HydraulicError(Exception):
+    """A rede não pode ser resolvida (nós sem fonte, SciPy ausente, curva inválida...)"""
+
+
+@dataclass
+class HydraulicResults:
+    """Resultado de uma solução em regime permanente (SI: m, m³/s, m/s)"""
+    node_ids: List[str]
+    link_ids: List[str]
+    heads: np.ndarray
+    pressures: np.ndarray
+    demands: np.ndarray
+    flows: np.ndarray
+    headlosses: np.ndarray
+    velocities: np.ndarray
+    iterations: int = 0
+    converged: bool = False
+    relative_error: float = 0.0
+    time: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Resultados por id, prontos para serializar em JSON"""
+        return {
+            "time": self.time,
+            "converged": self.converged,
+            "iterations": self.iterations,
+            "relative_error": self.relative_error,
+            "nodes": {
+                node_id: {"head": h, "pressure": p, "demand": d}
+                for node_id, h, p, d in zip(self.node_ids, self.heads.tolist(),
+                                            self.pressures.tolist(), self.demands.tolist())
+            },
+            "links": {
+                link_id: {"flow": q, "headloss": h, "velocity": v}
+                for link_id, q, h, v in zip(self.link_ids, self.flows.tolist(),
+                                            self.headlosses.tolist(), self.velocities.tolist())
+            },
+        }
+
+
+@dataclass
+class _LinkState:
+    """Parâmetros de um solve() e as vazões e estados que evoluem nas iterações"""
+    flows: np.ndarray
+    valve_status: np.ndarray
+    pump_closed: np.ndarray
+    pipe_r: np.ndarray
+    pipe_relative_roughness: Optional[np.ndarray]
+    valve_setting: np.ndarray
+    valve_minor: np.ndarray
+    valve_head_setting: np.ndarray
+    changed: bool = False
+
+
+class HydraulicSolver:
+    """
+    Solver em regime permanente pelo método gradiente (Todini-Pilati)
+
+    Resolve as cargas nas junções e as vazões em tubos, bombas e válvulas,
+    com reservatórios e tanques (no nível inicial) como cargas fixas. A
+    perda de carga segue NetworkOptions.headloss (H-W, D-W ou C-M).
+
+    Tudo o que depende apenas da rede é preparado uma vez no construtor:
+    topologia, resistências, curvas e a estrutura esparsa da matriz do
+    sistema, já na ordem de eliminação (mínimo grau) calculada na primeira
+    fatoração. Cada solve() apenas preenche os valores da matriz e fatora,
+    o que permite rodar muitos cenários (demandas, cargas fixas, links
+    fechados) sobre o mesmo solver.
+
+    Limitações em relação ao EPANET: o modelo não guarda válvulas de
+    retenção (CV), estados iniciais de bombas/válvulas nem a curva de GPVs
+    (tratadas como abertas); tanques não fecham links ao encher ou esvaziar.
+    """
+
+    def __init__(self, network: WaterNetwork, accuracy: float = 0.001, max_trials: int = 200,
+                 pattern_timestep: float = DEFAULT_PATTERN_TIMESTEP):
+        """
+        Args:
+            network: Rede a simular
+            accuracy: Critério de convergência do EPANET (soma das variações
+                de vazão / soma das vazões)
+            max_trials: Número máximo de iterações por solve()
+            pattern_timestep: Passo dos padrões (s), para demandas em t > 0
+
+        Raises:
+            HydraulicError: Sem SciPy, com junções sem ligação a uma carga
+                fixa, tipo de perda de carga desconhecido ou curva inválida
+        """
+        if splu is None:
+            raise HydraulicError("O pacote 'scipy' é necessário para o solver hidráulico")
+        self.network = network
+        self.accuracy = accuracy
+        self.max_trials = max_trials
+        self.topology = TopologyIndex.from_network(network)
+        self.n_junctions = len(network.junctions)
+        self.patterns = PatternTable.from_network(network, pattern_timestep)
+        self.curves = CurveTable.from_network(network)
+        self.pump_curves = PumpCurves(self.curves)
+
+        topology = self.topology
+        self.link_kinds = topology.link_types.astype(np.int64)
+        self.from_nodes = topology.from_nodes.astype(np.int64)
+        self.to_nodes = topology.to_nodes.astype(np.int64)
+        self.elevations = np.array(
+            [j.elevation for j in network.junctions]
+            + [0.0] * len(network.reservoirs) + [t.elevation for t in network.tanks]
+        )
+        self._check_connectivity()
+        self._prepare_pipes(network)
+        self._prepare_pumps(network)
+        self._prepare_valves(network)
+        self._prepare_nodes(network)
+        self._prepare_matrix()
+
+    # ------------------------------------------------------------------
+    # Preparação (uma vez por rede)
+
+    def _check_connectivity(self) -> None:
+        labels = self.topology.component_labels()
+        fed = np.zeros(labels.max() + 1 if len(labels) else 0, dtype=bool)
+        fed[labels[self.n_junctions:]] = True
+        orphans = np.flatnonzero(~fed[labels[:self.n_junctions]])
+        if len(orphans):
+            sample = ", ".join(self.topology.node_ids[i] for i in orphans[:5].tolist())
+            raise HydraulicError(
+                f"{len(orphans)} junção(ões) sem ligação a reservatório ou tanque: {sample}"
+            )
+
+    def _prepare_pipes(self, network: WaterNetwork) -> None:
+        pipes = network.pipes
+        self.pipe_links = np.arange(len(pipes))
+        self.pipe_length = np.array([p.length for p in pipes], dtype=np.float64)
+        self.pipe_diameter = diameter = np.array([p.diameter for p in pipes], dtype=np.float64)
+        self.pipe_roughness = np.array([p.roughness for p in pipes], dtype=np.float64)
+        self.pipe_closed = np.array([p.status.upper() == "CLOSED" for p in pipes], dtype=bool)
+        self.pipe_minor = MINOR_COEFF * np.array([p.minor_loss for p in pipes]) / diameter ** 4
+        self.headloss = network.options.headloss.upper()
+        if self.headloss not in ("H-W", "D-W", "C-M"):
+            raise HydraulicError(f"Fórmula de perda de carga desconhecida: {self.headloss}")
+        self.pipe_n = HW_EXPONENT if self.headloss == "H-W" else 2.0
+        self.pipe_r, self.pipe_relative_roughness = self._pipe_resistance(self.pipe_roughness)
+
+    def _pipe_resistance(self, roughness: np.ndarray):
+        """
+        Resistência r de cada tubo (perda = r·Q^n) e, na D-W, a rugosidade
+        relativa; nesse caso r·f·Q², com o fator de atrito f a cada iteração
+        """
+        length, diameter = self.pipe_length, self.pipe_diameter
+        if self.headloss == "H-W":
+            return HW_COEFF * roughness ** -HW_EXPONENT * diameter ** -4.871 * length, None
+        if self.headloss == "C-M":
+            return CM_COEFF * roughness ** 2 * diameter ** -5.333 * length, None
+        return DW_COEFF * length / diameter ** 5, roughness / diameter
+
+    def _prepare_pumps(self, network: WaterNetwork) -> None:
+        pumps = network.pumps
+        self.pump_links = len(network.pipes) + np.arange(len(pumps))
+        curves, fit = self.curves, self.pump_curves
+        self.pump_speed = np.array([p.speed for p in pumps], dtype=np.float64)
+        self.pump_pattern = self.patterns.codes(p.pattern for p in pumps)
+        self.pump_power = np.array([p.power or 0.0 for p in pumps])
+        self.pump_has_curve = np.array([bool(p.pump_curve) for p in pumps], dtype=bool)
+        for pump in pumps:
+            if pump.pump_curve is None and not pump.power:
+                raise HydraulicError(f"Bomba {pump.id} sem curva nem potência")
+        try:
+            self.pump_curve = np.array(
+                [curves.codes([p.pump_curve])[0] if p.pump_curve else 0 for p in pumps],
+                dtype=np.int64,
+            )
+        except KeyError as e:
+            raise HydraulicError(f"Curva de bomba inexistente: {e.args[0]}") from e
+        # Vazão de projeto (ponto do meio da curva) para a vazão inicial
+        design = []
+        for pump, code in zip(pumps, self.pump_curve.tolist()):
+            if pump.pump_curve:
+                count = int(curves.counts[code])
+                design.append(curves.x[code, count // 2] if count > 1 else curves.x[code, 0])
+            else:
+                design.append(1.0e-3)
+        self.pump_design_flow = np.maximum(np.array(design, dtype=np.float64), 1.0e-6)
+        self.pump_power_law = self.pump_has_curve.copy()
+        self.pump_power_law[self.pump_has_curve] = fit.power[self.pump_curve[self.pump_has_curve]]
+
+    def _prepare_valves(self, network: WaterNetwork) -> None:
+        valves = network.valves
+        self.valve_links = len(network.pipes) + len(network.pumps) + np.arange(len(valves))
+        self.valve_type = np.array([VALVE_TYPES.index(v.valve_type.upper()) for v in valves],
+                                   dtype=np.int64)
+        self.valve_diameter = np.array([v.diameter for v in valves], dtype=np.float64)
+        self.valve_minor_loss = np.array([v.minor_loss for v in valves], dtype=np.float64)
+        # Carga de controle das PRV (a jusante) e PSV (a montante)
+        a, b = self.from_nodes[self.valve_links], self.to_nodes[self.valve_links]
+        control_node = np.where(self.valve_type == PSV, a, b)
+        self.valve_control_node = control_node
+        # Válvulas que controlam a carga precisam de uma junção no nó de controle
+        self.valve_regulates = np.isin(self.valve_type, (PRV, PSV)) & (control_node < self.n_junctions)
+        self.valve_setting = np.array([v.setting for v in valves], dtype=np.float64)
+        self.valve_minor, self.valve_head_setting = self._valve_parameters(self.valve_setting)
+
+    def _valve_parameters(self, settings: np.ndarray):
+        """Coeficiente de perda localizada e carga de controle de cada válvula"""
+        minor = np.where(self.valve_type == TCV, settings, self.valve_minor_loss)
+        minor = MINOR_COEFF * minor / self.valve_diameter ** 4
+        return minor, settings + self.elevations[self.valve_control_node]
+
+    def _prepare_nodes(self, network: WaterNetwork) -> None:
+        junctions = network.junctions
+        self.base_demands = np.array([j.demand for j in junctions], dtype=np.float64)
+        self.demand_pattern = self.patterns.codes(j.demand_pattern for j in junctions)
+        self.reservoir_heads = np.array([r.head for r in network.reservoirs], dtype=np.float64)
+        self.reservoir_pattern = self.patterns.codes(r.head_pattern for r in network.reservoirs)
+        self.tank_heads = np.array([t.elevation + t.init_level for t in network.tanks])
+        self.link_diameter = np.concatenate([
+            self.pipe_diameter, np.zeros(len(network.pumps)), self.valve_diameter
+        ])
+
+    def _prepare_matrix(self) -> None:
+        """
+        Estrutura esparsa de A21·P·A12 (junções x junções), com a ordem de
+        eliminação fixada pela primeira fatoração
+        """
+        nj = self.n_junctions
+        a, b = self.from_nodes, self.to_nodes
+        links = np.arange(len(a))
+        a_free, b_free = a < nj, b < nj
+        both = a_free & b_free
+        # Cada link contribui +p nas diagonais dos seus nós e -p fora dela
+        rows = np.concatenate([a[a_free], b[b_free], a[both], b[both], np.arange(nj)])
+        cols = np.concatenate([a[a_free], b[b_free], b[both], a[both], np.arange(nj)])
+        self._entry_links = np.concatenate([links[a_free], links[b_free], links[both], links[both]])
+        self._entry_signs = np.concatenate([
+            np.ones(a_free.sum() + b_free.sum()), -np.ones(2 * both.sum())
+        ])
+        n_link_entries = len(self._entry_links)
+
+        # Ordem de mínimo grau calculada uma vez, sobre a estrutura com p = 1
+        self._order = np.zeros(0, dtype=np.int64)
+        if nj:
+            keys = cols * nj + rows
+            unique, inverse = np.unique(keys, return_inverse=True)
+            data = np.bincount(inverse[:n_link_entries], weights=self._entry_signs,
+                               minlength=len(unique))
+            indptr = np.searchsorted(unique // nj, np.arange(nj + 1))
+            factor = splu(csc_matrix((data, unique % nj, indptr), shape=(nj, nj)),
+                          permc_spec="MMD_AT_PLUS_A", diag_pivot_thresh=0.0,
+                          options={"SymmetricMode": True})
+            self._order = factor.perm_c.astype(np.int64)
+        self._inverse_order = np.argsort(self._order)
+
+        # Estrutura já permutada: cada solve só preenche data
+        keys = self._order[cols] * nj + self._order[rows]
+        unique, inverse = np.unique(keys, return_inverse=True)
+        self._nnz = len(unique)
+        self._indices = (unique % nj).astype(np.int32)
+        self._indptr = np.searchsorted(unique // nj, np.arange(nj + 1)).astype(np.int32)
+        self._link_positions = inverse[:n_link_entries]
+        self._diagonal_positions = inverse[n_link_entries:]
+
+    # ------------------------------------------------------------------
+    # Solução
+
+    def solve(self, time: float = 0.0, demands: Optional[np.ndarray] = None,
+              fixed_heads: Optional[np.ndarray] = None,
+              closed_links: Optional[Iterable[str]] = None,
+              initial_flows: Optional[np.ndarray] = None,
+              roughness: Optional[np.ndarray] = None,
+              valve_settings: Optional[np.ndarray] = None) -> HydraulicResults:
+        """
+        Resolve a rede em regime permanente
+
+        Args:
+            time: Instante da simulação (s), usado nos padrões de demanda,
+                de carga dos reservatórios e de velocidade das bombas
+            demands: Demanda de cada junção (m³/s), no lugar de base x padrão
+            fixed_heads: Carga de cada reservatório e tanque, nessa ordem (m)
+            closed_links: Ids de links fechados neste cenário (além dos
+                tubos fechados na rede)
+            initial_flows: Vazões iniciais (ex.: de um solve anterior)
+            roughness: Rugosidade de cada tubo, no lugar da rugosidade da rede
+            valve_settings: Configuração de cada válvula (unidades do modelo)
+
+        Returns:
+            HydraulicResults: Cargas, pressões, vazões e convergência
+        """
+        nj = self.n_junctions
+        if demands is None:
+            demands = self.base_demands * self.patterns.values(self.demand_pattern, [time])[:, 0]
+        demands = np.asarray(demands, dtype=np.float64)
+        if fixed_heads is None:
+            reservoir = self.reservoir_heads * self.patterns.values(self.reservoir_pattern, [time])[:, 0]
+            fixed_heads = np.concatenate([reservoir, self.tank_heads])
+        heads = np.concatenate([self.elevations[:nj], np.asarray(fixed_heads, dtype=np.float64)])
+
+        closed = np.zeros(len(self.link_kinds), dtype=bool)
+        closed[self.pipe_links] = self.pipe_closed
+        if closed_links is not None:
+            closed[[self.topology.link_index(i) for i in closed_links]] = True
+        speed = self.pump_speed * self.patterns.values(self.pump_pattern, [time])[:, 0]
+        closed[self.pump_links[speed <= 0]] = True
+
+        if initial_flows is None:
+            flows = np.pi * self.link_diameter ** 2 / 4.0 * INITIAL_VELOCITY
+            flows[self.pump_links] = self.pump_design_flow
+        else:
+            flows = np.array(initial_flows, dtype=np.float64)
+        flows[closed] = 1.0e-6
+        pipe_r, relative_roughness = self.pipe_r, self.pipe_relative_roughness
+        if roughness is not None:
+            pipe_r, relative_roughness = self._pipe_resistance(np.asarray(roughness, dtype=np.float64))
+        valve_setting, valve_minor, head_setting = \
+            self.valve_setting, self.valve_minor, self.valve_head_setting
+        if valve_settings is not None:
+            valve_setting = np.asarray(valve_settings, dtype=np.float64)
+            valve_minor, head_setting = self._valve_parameters(valve_setting)
+        state = _LinkState(
+            flows=flows,
+            valve_status=np.where(np.isin(self.valve_type, (PRV, PSV, FCV)), ACTIVE, OPEN),
+            pump_closed=np.zeros(len(self.pump_links), dtype=bool),
+            pipe_r=pipe_r,
+            pipe_relative_roughness=relative_roughness,
+            valve_setting=valve_setting,
+            valve_minor=valve_minor,
+            valve_head_setting=head_setting,
+        )
+
+        relative_error = 1.0
+        converged = False
+        trial = 0
+        for trial in range(1, self.max_trials + 1):
+            p, y = self._coefficients(state, closed, speed, heads)
+            new_heads = self._solve_heads(p, y, state, heads, demands)
+            heads[:nj] = new_heads
+            new_flows = state.flows - y + p * (heads[self.from_nodes] - heads[self.to_nodes])
+            self._regulated_flows(new_flows, state, demands)
+
+            total = np.abs(new_flows).sum()
+            relative_error = float(np.abs(new_flows - state.flows).sum() / total) if total else 0.0
+            state.flows = new_flows
+
+            state.changed = False
+            if relative_error <= self.accuracy or (trial <= 10 and trial % 2 == 0):
+                self._update_status(state, heads, speed)
+            if relative_error <= self.accuracy and not state.changed:
+                converged = True
+                break
+        return self._results(heads, demands, state, closed, trial, converged, relative_error, time)
+
+    def _coefficients(self, state: _LinkState, closed: np.ndarray, speed: np.ndarray,
+                      heads: np.ndarray):
+        """
+        Coeficientes do método gradiente para cada link: p = 1/(dh/dQ) e
+        y = p·h(Q), de modo que Q_novo = Q - y + p·(H_montante - H_jusante)
+        """
+        q = state.flows
+        p = np.empty_like(q)
+        y = np.empty_like(q)
+
+        # Tubos: atrito + perda localizada
+        idx = self.pipe_links
+        qp = q[idx]
+        aq = np.abs(qp)
+        if self.headloss == "D-W":
+            friction = state.pipe_r * self._friction_factor(aq, state.pipe_relative_roughness)
+            h_friction = friction * aq * qp
+            g_friction = 2.0 * friction * aq
+        else:
+            h_friction = state.pipe_r * aq ** (self.pipe_n - 1.0) * qp
+            g_friction = self.pipe_n * state.pipe_r * aq ** (self.pipe_n - 1.0)
+        self._set(p, y, idx, h_friction + self.pipe_minor * aq * qp,
+                  g_friction + 2.0 * self.pipe_minor * aq, qp)
+
+        # Bombas: perda = -ganho de carga
+        idx = self.pump_links
+        if len(idx):
+            gain, slope = self._pump_gain(np.abs(q[idx]), speed)
+            self._set(p, y, idx, -gain, -slope)
+
+        # Válvulas
+        idx = self.valve_links
+        if len(idx):
+            self._valve_coefficients(p, y, state, heads)
+
+        # Links fechados: vazão forçada a ~0
+        shut = closed.copy()
+        shut[self.pump_links[state.pump_closed]] = True
+        shut[self.valve_links[state.valve_status == CLOSED]] = True
+        p[shut] = 1.0 / CBIG
+        y[shut] = q[shut]
+        return p, y
+
+    @staticmethod
+    def _set(p: np.ndarray, y: np.ndarray, idx: np.ndarray, h: np.ndarray, g: np.ndarray,
+             flows: Optional[np.ndarray] = None) -> None:
+        """
+        p e y a partir da perda h e do gradiente g; abaixo de RQTOL o
+        gradiente é limitado e, se as vazões forem dadas, a perda é linear
+        """
+        small = g < RQTOL
+        g = np.where(small, RQTOL, g)
+        if flows is not None:
+            h = np.where(small, RQTOL * flows, h)
+        p[idx] = 1.0 / g
+        y[idx] = h / g
+
+    def _friction_factor(self, flow: np.ndarray, eps: np.ndarray) -> np.ndarray:
+        """
+        Fator de atrito de Darcy: laminar (64/Re), Swamee-Jain acima de
+        Re = 4000 e, na transição, a interpolação cúbica de Dunlop do EPANET
+        """
+        d = self.pipe_diameter
+        reynolds = np.maximum(4.0 * flow / (np.pi * d * VISCOSITY), 1.0e-3)
+
+        laminar = 64.0 / reynolds
+        turbulent = 0.25 / np.log10(eps / 3.7 + 5.74 / np.maximum(reynolds, 4000.0) ** 0.9) ** 2
+
+        # Cúbica que liga 64/Re em Re = 2000 a Swamee-Jain (valor e derivada) em Re = 4000
+        ab = 5.74 / 4000.0 ** 0.9
+        y2 = eps / 3.7 + ab
+        y3 = -2.0 / math.log(10.0) * np.log(y2)
+        fa = 1.0 / y3 ** 2
+        fb = (2.0 - 1.5634601348517065795 * ab / (y2 * y3)) * fa
+        r = reynolds / 2000.0
+        transition = ((7.0 * fa - fb)
+                      + r * ((0.128 - 17.0 * fa + 2.5 * fb)
+                             + r * ((-0.128 + 13.0 * fa - 2.0 * fb)
+                                    + r * (0.032 - 3.0 * fa + 0.5 * fb))))
+        return np.where(reynolds < 2000.0, laminar,
+                        np.where(reynolds < 4000.0, transition, turbulent))
+
+    def _pump_gain(self, flow: np.ndarray, speed: np.ndarray):
+        """Ganho de carga de cada bomba e sua derivada em relação à vazão"""
+        flow = np.maximum(flow, 1.0e-6)
+        gain = np.zeros_like(flow)
+        slope = np.zeros_like(flow)
+        fit, curves, code = self.pump_curves, self.curves, self.pump_curve
+
+        power_law = self.pump_power_law
+        if power_law.any():
+            w, c = speed[power_law], fit.c[code[power_law]]
+            a, b = fit.a[code[power_law]], fit.b[code[power_law]]
+            qp = flow[power_law]
+            gain[power_law] = w ** 2 * a - b * w ** (2.0 - c) * qp ** c
+            slope[power_law] = -c * b * w ** (2.0 - c) * qp ** (c - 1.0)
+
+        linear = self.pump_has_curve & ~power_law
+        if linear.any():
+            # Curva por segmentos, com as leis de afinidade e extrapolação linear
+            w = np.maximum(speed[linear], 1.0e-6)
+            rows = code[linear]
+            q = flow[linear] / w
+            xs, ys, counts = curves.x[rows], curves.y[rows], curves.counts[rows]
+            right = np.clip((xs <= q[:, np.newaxis]).sum(axis=1), 1, np.maximum(counts - 1, 1))
+            k = np.arange(len(rows))
+            x0, x1, y0, y1 = xs[k, right - 1], xs[k, right], ys[k, right - 1], ys[k, right]
+            segment = np.where(x1 > x0, (y1 - y0) / np.where(x1 > x0, x1 - x0, 1.0), 0.0)
+            gain[linear] = w ** 2 * (y0 + segment * (q - x0))
+            slope[linear] = w * segment
+
+        constant_power = ~self.pump_has_curve
+        if constant_power.any():
+            energy = self.pump_power[constant_power] / GAMMA
+            qp = flow[constant_power]
+            gain[constant_power] = energy / qp
+            slope[constant_power] = -energy / qp ** 2
+        return gain, slope
+
+    def _valve_coefficients(self, p: np.ndarray, y: np.ndarray, state: _LinkState,
+                            heads: np.ndarray) -> None:
+        idx = self.valve_links
+        q = state.flows[idx]
+        aq = np.abs(q)
+        kind, status, setting = self.valve_type, state.valve_status, state.valve_setting
+
+        # Abertas (e TCV): perda localizada, ou resistência mínima sem ela
+        minor = state.valve_minor
+        with_loss = minor > 0
+        g = np.where(with_loss, 2.0 * minor * aq, CSMALL)
+        h = np.where(with_loss, minor * aq * q, CSMALL * q)
+        g = np.maximum(g, RQTOL)
+        vp, vy = 1.0 / g, h / g
+
+        # PBV: perda fixa igual à configuração enquanto a perda localizada for menor
+        pbv = (kind == PBV) & (setting > 0) & (minor * q * q <= setting)
+        vp[pbv] = CBIG
+        vy[pbv] = setting[pbv] * CBIG
+
+        # FCV ativa: vazão fixa igual à configuração
+        fcv = (kind == FCV) & (status == ACTIVE)
+        vp[fcv] = 1.0 / CBIG
+        vy[fcv] = q[fcv] - setting[fcv]
+
+        # PRV/PSV ativas: saem da matriz; a carga do nó de controle é imposta
+        # em _solve_heads e a vazão sai do balanço de massa desse nó
+        regulating = self.valve_regulates & (status == ACTIVE)
+        vp[regulating] = 0.0
+        vy[regulating] = 0.0
+
+        p[idx] = vp
+        y[idx] = vy
+
+    def _solve_heads(self, p: np.ndarray, y: np.ndarray, state: _LinkState,
+                     heads: np.ndarray, demands: np.ndarray) -> np.ndarray:
+        """Monta e resolve A21·P·A12·H = F para as cargas das junções"""
+        nj = self.n_junctions
+        if not nj:
+            return np.zeros(0)
+        a, b = self.from_nodes, self.to_nodes
+        # Parcela das cargas fixas e das vazões atuais no lado direito
+        fixed_a = np.where(a >= nj, heads[a], 0.0)
+        fixed_b = np.where(b >= nj, heads[b], 0.0)
+        w = state.flows - y + p * (fixed_a - fixed_b)
+        rhs = (np.bincount(b, weights=w, minlength=len(heads))
+               - np.bincount(a, weights=w, minlength=len(heads)))[:nj] - demands
+
+        data = np.bincount(self._link_positions, weights=self._entry_signs * p[self._entry_links],
+                           minlength=self._nnz)
+        regulating = self.valve_regulates & (state.valve_status == ACTIVE)
+        if regulating.any():
+            nodes = self.valve_control_node[regulating]
+            np.add.at(data, self._diagonal_positions[nodes], CBIG)
+            np.add.at(rhs, nodes, CBIG * state.valve_head_setting[regulating])
+
+        matrix = csc_matrix((data, self._indices, self._indptr), shape=(nj, nj))
+        try:
+            factor = splu(matrix, permc_spec="NATURAL", diag_pivot_thresh=0.0,
+                          options={"SymmetricMode": True})
+        except RuntimeError as e:
+            raise HydraulicError(f"Sistema hidráulico singular: {e}") from e
+        solution = factor.solve(rhs[self._inverse_order])
+        return solution[self._order]
+
+    def _regulated_flows(self, flows: np.ndarray, state: _LinkState, demands: np.ndarray) -> None:
+        """Vazão das PRV/PSV ativas pelo balanço de massa do nó de controle"""
+        regulating = np.flatnonzero(self.valve_regulates & (state.valve_status == ACTIVE))
+        if not len(regulating):
+            return
+        links = self.valve_links[regulating]
+        others = flows.copy()
+        others[links] = 0.0
+        n = len(self.elevations)
+        inflow = np.bincount(self.to_nodes, weights=others, minlength=n) \
+            - np.bincount(self.from_nodes, weights=others, minlength=n)
+        nodes = self.valve_control_node[regulating]
+        demand = np.concatenate([demands, np.zeros(n - self.n_junctions)])
+        is_psv = self.valve_type[regulating] == PSV
+        # PRV abastece o nó de jusante; PSV escoa o excesso do nó de montante
+        flows[links] = np.where(is_psv, inflow[nodes] - demand[nodes],
+                                demand[nodes] - inflow[nodes])
+
+    def _update_status(self, state: _LinkState, heads: np.ndarray, speed: np.ndarray) -> None:
+        """Mudanças de estado de válvulas e bombas, com as regras do EPANET"""
+        idx = self.valve_links
+        if len(idx):
+            status = state.valve_status
+            old = status.copy()
+            q = state.flows[idx]
+            h1, h2 = heads[self.from_nodes[idx]], heads[self.to_nodes[idx]]
+            hset = state.valve_head_setting
+            kind = self.valve_type
+
+            prv = self.valve_regulates & (kind == PRV)
+            psv = self.valve_regulates & (kind == PSV)
+            reverse = q < -QTOL
+            new = status.copy()
+            # PRV
+            new[prv & (status == ACTIVE) & reverse] = CLOSED
+            new[prv & (status == ACTIVE) & ~reverse & (h1 < hset - HTOL)] = OPEN
+            new[prv & (status == OPEN) & reverse] = CLOSED
+            new[prv & (status == OPEN) & ~reverse & (h2 >= hset + HTOL)] = ACTIVE
+            new[prv & (status == CLOSED) & (h1 >= hset + HTOL) & (h2 < hset - HTOL)] = ACTIVE
+            new[prv & (status == CLOSED) & (h1 < hset - HTOL) & (h1 > h2 + HTOL)] = OPEN
+            # PSV
+            new[psv & (status == ACTIVE) & reverse] = CLOSED
+            new[psv & (status == ACTIVE) & ~reverse & (h2 > hset + HTOL)] = OPEN
+            new[psv & (status == OPEN) & reverse] = CLOSED
+            new[psv & (status == OPEN) & ~reverse & (h1 < hset - HTOL)] = ACTIVE
+            new[psv & (status == CLOSED) & (h2 > hset + HTOL) & (h1 > h2 + HTOL)] = OPEN
+            new[psv & (status == CLOSED) & (h2 <= hset + HTOL) & (h1 >= hset + HTOL)
+                & (h1 > h2 + HTOL)] = ACTIVE
+            # FCV: abre (sem controle) com carga ou vazão invertida
+            fcv = kind == FCV
+            new[fcv & (status == ACTIVE) & ((h1 - h2 < -HTOL) | reverse)] = OPEN
+            new[fcv & (status == OPEN) & (q >= state.valve_setting)] = ACTIVE
+            state.valve_status = new
+            state.changed |= bool((new != old).any())
+
+        idx = self.pump_links
+        if len(idx):
+            # Bomba desliga se não vence a carga (vazão reversa) e religa
+            # quando a carga pedida volta a ficar abaixo do shutoff
+            q = state.flows[idx]
+            lift = heads[self.to_nodes[idx]] - heads[self.from_nodes[idx]]
+            shutoff, _ = self._pump_gain(np.zeros(len(idx)), speed)
+            closed = state.pump_closed.copy()
+            closed[~state.pump_closed & (q < -QTOL)] = True
+            closed[state.pump_closed & (lift < shutoff - HTOL)] = False
+            state.changed |= bool((closed != state.pump_closed).any())
+            state.pump_closed = closed
+
+    def _results(self, heads: np.ndarray, demands: np.ndarray, state: _LinkState,
+                 closed: np.ndarray, trials: int, converged: bool, relative_error: float,
+                 time: float) -> HydraulicResults:
+        nj = self.n_junctions
+        flows = state.flows
+        shut = closed.copy()
+        shut[self.pump_links[state.pump_closed]] = True
+        shut[self.valve_links[state.valve_status == CLOSED]] = True
+        flows = np.where(shut, 0.0, flows)
+        pressures = heads - self.elevations
+        pressures[nj:nj + len(self.reservoir_heads)] = 0.0
+        area = np.pi * self.link_diameter ** 2 / 4.0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            velocities = np.where(area > 0, np.abs(flows) / area, 0.0)
+        # Demanda dos nós de carga fixa = vazão que sai deles para a rede
+        n = len(heads)
+        outflow = np.bincount(self.from_nodes, weights=flows, minlength=n) \
+            - np.bincount(self.to_nodes, weights=flows, minlength=n)
+        node_demands = np.concatenate([demands, -outflow[nj:]])
+        return HydraulicResults(
+            node_ids=self.topology.node_ids,
+            link_ids=self.topology.link_ids,
+            heads=heads.copy(),
+            pressures=pressures,
+            demands=node_demands,
+            flows=flows,
+            headlosses=heads[self.from_nodes] - heads[self.to_nodes],
+            velocities=velocities,
+            iterations=trials,
+            converged=converged,
+            relative_error=relative_error,
+            time=time,
+        )
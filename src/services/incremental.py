@@ -0,0 +1,240 @@
+from typing import Dict, List, Optional, Set, Tuple
+
+from ..models.delta import NetworkDelta, diff_elements, diff_networks
+from ..models.network import WaterNetwork, Pattern, gc_paused
+from .inp_parser import (
+    InpParser, UnitConverter, CoordinateIndex, parse_energy, split_sections, _ELEMENT_SECTIONS,
+    _tokens
+)
+
+NODE_SECTIONS = ("[JUNCTIONS]", "[RESERVOIRS]", "[TANKS]")
+
+
+def _line_map(lines: List[str]) -> Dict[str, str]:
+    """id -> linha normalizada (sem comentários e espaços extras); a última vence"""
+    lines_by_id = {}
+    for line in lines:
+        words = _tokens(line)
+        if words:
+            lines_by_id[words[0]] = " ".join(words)
+    return lines_by_id
+
+
+def _line_groups(lines: List[str]) -> Dict[str, Tuple[str, ...]]:
+    """id -> linhas normalizadas, na ordem do arquivo (seções com várias por id)"""
+    groups: Dict[str, List[str]] = {}
+    for line in lines:
+        words = _tokens(line)
+        if words:
+            groups.setdefault(words[0], []).append(" ".join(words))
+    return {key: tuple(value) for key, value in groups.items()}
+
+
+def _changed_keys(old: Dict[str, object], new: Dict[str, object]) -> Set[str]:
+    """Chaves adicionadas, removidas ou com valor diferente entre dois mapas"""
+    changed = {key for key, value in new.items() if old.get(key) != value}
+    changed.update(key for key in old if key not in new)
+    return changed
+
+
+# Seções acompanhadas entre leituras e como cada uma é indexada por id
+_TRACKED_SECTIONS = {
+    **{section: _line_map for section in _ELEMENT_SECTIONS},
+    "[DEMANDS]": _line_groups,
+    "[STATUS]": _line_map,
+    "[ENERGY]": parse_energy,
+    "[COORDINATES]": _line_map,
+    "[VERTICES]": _line_groups,
+}
+
+
+class _ParseState:
+    """Linhas normalizadas da última leitura, usadas para detectar mudanças"""
+
+    def __init__(self, sections: Dict[str, List[str]], units: UnitConverter,
+                 network: WaterNetwork, previous: Optional["_ParseState"] = None):
+        """
+        Args:
+            sections: Seções do arquivo (split_sections)
+            units: Conversor de unidades da leitura
+            network: Rede lida
+            previous: Estado anterior; seções com as mesmas linhas brutas
+                reaproveitam os mapas já calculados
+        """
+        self.units = units
+        self.default_pattern = network.options.pattern
+        self.network = network
+        self.raw: Dict[str, List[str]] = {}
+        self.maps: Dict[str, Dict[str, object]] = {}
+        for section, build in _TRACKED_SECTIONS.items():
+            lines = sections.get(section, [])
+            self.raw[section] = lines
+            if previous is not None and previous.raw[section] == lines:
+                self.maps[section] = previous.maps[section]
+            else:
+                self.maps[section] = build(lines)
+        self.elements = {section: self.maps[section] for section in _ELEMENT_SECTIONS}
+        self.demands = self.maps["[DEMANDS]"]
+        self.status = self.maps["[STATUS]"]
+        self.efficiencies = self.maps["[ENERGY]"]
+        self.coordinates = self.maps["[COORDINATES]"]
+        self.vertices = self.maps["[VERTICES]"]
+
+
+class IncrementalParser:
+    """
+    Releitura incremental de um arquivo INP editado
+
+    Guarda as linhas normalizadas de cada elemento da última leitura. Em
+    update(), só os elementos cuja linha mudou (ou cuja demanda, status,
+    curva de eficiência, coordenada ou vértices mudou) são lidos de novo; os demais objetos são
+    reaproveitados da rede anterior. Mudanças nas unidades ou no padrão de
+    demanda padrão afetam todos os elementos e disparam uma leitura completa.
+
+    A rede retornada compartilha os elementos não alterados com a anterior.
+    """
+
+    def __init__(self, parser: Optional[InpParser] = None):
+        """
+        Args:
+            parser: InpParser usado nas leituras completas
+        """
+        self.parser = parser or InpParser()
+        self._state: Optional[_ParseState] = None
+
+    @property
+    def network(self) -> Optional[WaterNetwork]:
+        """Rede da última leitura"""
+        return self._state.network if self._state else None
+
+    def parse_file(self, inp_file_path: str) -> WaterNetwork:
+        """
+        Lê o arquivo por completo e guarda o estado para as próximas atualizações
+
+        Args:
+            inp_file_path: Caminho do arquivo .inp
+
+        Returns:
+            WaterNetwork: Rede lida
+        """
+        sections = self._read_sections(inp_file_path)
+        units, _, _, _ = self.parser.parse_header(sections)
+        network = self.parser.parse_sections(sections)
+        self._state = _ParseState(sections, units, network)
+        return network
+
+    def update(self, inp_file_path: str) -> Tuple[WaterNetwork, NetworkDelta]:
+        """
+        Relê o arquivo editado e calcula o delta em relação à leitura anterior
+
+        Sem leitura anterior, faz uma leitura completa e todos os elementos
+        aparecem como adicionados.
+
+        Args:
+            inp_file_path: Caminho do arquivo .inp (nova versão)
+
+        Returns:
+            Tuple: (rede atualizada, NetworkDelta da versão anterior para a nova)
+        """
+        previous = self._state
+        sections = self._read_sections(inp_file_path)
+        units, network, patterns, raw_curves = self.parser.parse_header(sections)
+
+        if (previous is None or previous.units != units
+                or previous.default_pattern != network.options.pattern):
+            old_network = previous.network if previous else WaterNetwork()
+            network = self.parser.parse_sections(sections)
+            self._state = _ParseState(sections, units, network)
+            return network, diff_networks(old_network, network)
+
+        state = _ParseState(sections, units, network, previous)
+        delta = NetworkDelta()
+        if previous.network.title != network.title:
+            delta.title = network.title
+        if previous.network.options.to_dict() != network.options.to_dict():
+            delta.options = network.options.to_dict()
+
+        # Elementos afetados por seções auxiliares
+        dirty_demands = _changed_keys(previous.demands, state.demands)
+        dirty_status = _changed_keys(previous.status, state.status)
+        dirty_efficiencies = _changed_keys(previous.efficiencies, state.efficiencies)
+        dirty_coordinates = _changed_keys(previous.coordinates, state.coordinates)
+        dirty_vertices = _changed_keys(previous.vertices, state.vertices)
+
+        with gc_paused():
+            for section, (name, parse, _, _) in _ELEMENT_SECTIONS.items():
+                old_lines, new_lines = previous.elements[section], state.elements[section]
+                dirty = dirty_coordinates if section in NODE_SECTIONS else dirty_vertices
+                if section == "[JUNCTIONS]":
+                    dirty = dirty | dirty_demands
+                elif section == "[PIPES]":
+                    dirty = dirty | dirty_status
+                elif section == "[PUMPS]":
+                    dirty = dirty | dirty_efficiencies
+
+                stale = [
+                    element_id for element_id, line in new_lines.items()
+                    if old_lines.get(element_id) != line or element_id in dirty
+                ]
+                old_elements = getattr(previous.network, name)
+                if not stale and list(old_lines) == list(new_lines):
+                    setattr(network, name, old_elements)
+                    continue
+
+                lines = [new_lines[element_id] for element_id in stale]
+                if section == "[JUNCTIONS]":
+                    fresh = parse(lines, units, network.options.pattern)
+                else:
+                    fresh = parse(lines, units)
+                self._apply_auxiliary(
+                    WaterNetwork(options=network.options, **{name: fresh}), section, stale, state, units
+                )
+
+                fresh_by_id = {e.id: e for e in fresh}
+                old_by_id = {e.id: e for e in old_elements}
+                elements = [
+                    fresh_by_id.get(element_id) or old_by_id[element_id]
+                    for element_id in new_lines
+                ]
+                setattr(network, name, elements)
+                diff_elements(delta.group(name),
+                              [old_by_id[i] for i in stale if i in old_by_id], fresh)
+                delta.group(name).removed.extend(i for i in old_lines if i not in new_lines)
+
+        network.patterns = [Pattern(id=name, multipliers=values) for name, values in patterns.items()]
+        network.curves = InpParser._build_curves(network, raw_curves, units)
+        diff_elements(delta.group("patterns"), previous.network.patterns, network.patterns)
+        diff_elements(delta.group("curves"), previous.network.curves, network.curves)
+
+        state.network = network
+        self._state = state
+        return network, delta
+
+    @staticmethod
+    def _apply_auxiliary(network: WaterNetwork, section: str, ids: List[str],
+                         state: _ParseState, units: UnitConverter) -> None:
+        """
+        Aplica demandas, status e coordenadas apenas aos elementos relidos
+
+        network contém somente os elementos relidos da seção.
+        """
+        if section == "[JUNCTIONS]":
+            demand_lines = [line for i in ids for line in state.demands.get(i, ())]
+            InpParser._apply_demands(network, demand_lines, units)
+        elif section == "[PIPES]":
+            InpParser._apply_status(network, [state.status[i] for i in ids if i in state.status])
+        elif section == "[PUMPS]":
+            InpParser._apply_efficiencies(network, state.efficiencies)
+        if section in NODE_SECTIONS:
+            nodes = {i: state.coordinates[i] for i in ids if i in state.coordinates}
+            index = CoordinateIndex.from_sections(list(nodes.values()), [])
+        else:
+            index = CoordinateIndex.from_sections(
+                [], [line for i in ids for line in state.vertices.get(i, ())]
+            )
+        index.attach(network)
+
+    @staticmethod
+    def _read_sections(inp_file_path: str) -> Dict[str, List[str]]:
+        with open(inp_file_path, "r", encoding="utf-8") as f:
+            return split_sections(f)
@@ -0,0 +1,795 @@
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import starmap
+from operator import attrgetter
+from typing import Any, Dict, List, Optional, Tuple, Iterable
+from ..models.network import WaterNetwork, Pattern, Curve, NetworkOptions, gc_paused
+from ..utils.profiling import stage
+from ..models.elements import (
+    Junction, Reservoir, Tank, Pipe, Pump, Valve, Coordinate
+)
+
+
+# Fatores de conversão de vazão para m³/s (mesmos valores usados pelo WNTR)
+FLOW_UNIT_FACTORS: Dict[str, float] = {
+    "CFS": 0.0283168466,
+    "GPM": 0.003785411784 / 60.0,
+    "MGD": 1e6 * 0.003785411784 / 86400.0,
+    "IMGD": 1e6 * 0.00454609 / 86400.0,
+    "AFD": 1233.48184 / 86400.0,
+    "LPS": 0.001,
+    "LPM": 0.001 / 60.0,
+    "MLD": 1e6 * 0.001 / 86400.0,
+    "CMH": 1.0 / 3600.0,
+    "CMD": 1.0 / 86400.0,
+}
+
+TRADITIONAL_UNITS = frozenset({"CFS", "GPM", "MGD", "IMGD", "AFD"})
+
+# Seções lidas pelo parser nativo; as demais são ignoradas
+KNOWN_SECTIONS = frozenset({
+    "[TITLE]", "[JUNCTIONS]", "[RESERVOIRS]", "[TANKS]", "[PIPES]", "[PUMPS]",
+    "[VALVES]", "[DEMANDS]", "[STATUS]", "[PATTERNS]", "[CURVES]", "[ENERGY]",
+    "[TIMES]", "[OPTIONS]", "[COORDINATES]", "[VERTICES]",
+    "[EMITTERS]", "[CONTROLS]", "[RULES]", "[QUALITY]", "[SOURCES]",
+    "[REACTIONS]", "[MIXING]", "[REPORT]", "[LABELS]", "[BACKDROP]", "[TAGS]",
+})
+
+_TIME_UNITS = {
+    "SEC": 1, "SECOND": 1, "SECONDS": 1,
+    "MIN": 60, "MINUTE": 60, "MINUTES": 60,
+    "HOUR": 3600, "HOURS": 3600,
+    "DAY": 86400, "DAYS": 86400,
+}
+
+_CLOCK_RE = re.compile(r"^(\d+):(\d+)(?::(\d+(?:\.\d*)?))?$")
+
+_STATUS_NAMES = {"OPEN": "Open", "CLOSED": "Closed", "ACTIVE": "Active", "CV": "Open"}
+
+
+class InpParseError(ValueError):
+    """Erro de sintaxe ou conteúdo inválido em um arquivo INP"""
+
+    def __init__(self, section: str, line: str, reason: str = ""):
+        self.section = section
+        self.line = line
+        self.reason = reason
+        message = f"Erro ao ler {section}: '{line}'"
+        if reason:
+            message += f" ({reason})"
+        super().__init__(message)
+
+    def __reduce__(self):
+        # Permite repassar o erro dos processos de leitura paralela
+        return type(self), (self.section, self.line, self.reason)
+
+
+@dataclass(frozen=True)
+class UnitConverter:
+    """Converte valores das unidades do arquivo INP para o SI (como o WNTR)"""
+    flow_units: str = "GPM"
+    darcy_weisbach: bool = False
+
+    @property
+    def traditional(self) -> bool:
+        return self.flow_units in TRADITIONAL_UNITS
+
+    @property
+    def flow(self) -> float:
+        return FLOW_UNIT_FACTORS[self.flow_units]
+
+    @property
+    def length(self) -> float:
+        return 0.3048 if self.traditional else 1.0
+
+    @property
+    def pipe_diameter(self) -> float:
+        return 0.0254 if self.traditional else 0.001
+
+    @property
+    def roughness(self) -> float:
+        if not self.darcy_weisbach:
+            return 1.0
+        return 0.001 * 0.3048 if self.traditional else 0.001
+
+    @property
+    def pressure(self) -> float:
+        return 0.3048 / 0.4333 if self.traditional else 1.0
+
+    @property
+    def power(self) -> float:
+        return 745.699872 if self.traditional else 1000.0
+
+    @property
+    def volume(self) -> float:
+        return 0.3048 ** 3 if self.traditional else 1.0
+
+
+def _tokens(line: str) -> List[str]:
+    """Separa uma linha em tokens, descartando comentários"""
+    if ";" in line:
+        line = line.split(";", 1)[0]
+    return line.split()
+
+
+def split_sections(lines: Iterable[str]) -> Dict[str, List[str]]:
+    """
+    Agrupa as linhas de um arquivo INP por seção
+
+    Args:
+        lines: Linhas do arquivo (por exemplo, o próprio objeto de arquivo)
+
+    Returns:
+        Dict: Nome da seção (ex: "[PIPES]") -> linhas não vazias da seção
+    """
+    sections: Dict[str, List[str]] = {}
+    current: Optional[List[str]] = None
+    for raw in lines:
+        line = raw.strip()
+        if not line or line[0] == ";":
+            continue
+        if line[0] == "[":
+            name = section_name(line)
+            if name == "[END]":
+                break
+            current = sections.setdefault(name, [])
+            continue
+        if current is None:
+            raise InpParseError("(sem seção)", line, "linha fora de uma seção")
+        current.append(line)
+    return sections
+
+
+def section_name(line: str) -> str:
+    """Nome normalizado da seção a partir da linha de cabeçalho (ex.: "[PIPE]" -> "[PIPES]")"""
+    name = line.split(None, 1)[0].upper()
+    if name not in KNOWN_SECTIONS and name.replace("]", "S]") in KNOWN_SECTIONS:
+        name = name.replace("]", "S]")
+    return name
+
+
+def parse_time(tokens: List[str]) -> int:
+    """Converte um valor de tempo do EPANET ("1:30", "2", "5 MIN") para segundos"""
+    value = tokens[0]
+    match = _CLOCK_RE.match(value)
+    if match:
+        hours, minutes, seconds = match.groups()
+        return int(hours) * 3600 + int(minutes) * 60 + int(round(float(seconds or 0)))
+    factor = 3600
+    if len(tokens) > 1:
+        factor = _TIME_UNITS.get(tokens[1].upper(), 3600)
+    return int(float(value) * factor)
+
+
+def parse_options(lines: List[str]) -> Tuple[UnitConverter, Dict[str, Optional[str]]]:
+    """Lê a seção [OPTIONS] e retorna o conversor de unidades e as opções brutas"""
+    flow_units = "GPM"
+    raw: Dict[str, Optional[str]] = {"headloss": "H-W", "pressure": "PSI", "pattern": None}
+    for line in lines:
+        words = _tokens(line)
+        if len(words) < 2:
+            continue
+        key = words[0].upper()
+        if key == "UNITS":
+            flow_units = words[1].upper()
+            if flow_units not in FLOW_UNIT_FACTORS:
+                raise InpParseError("[OPTIONS]", line, "unidade de vazão desconhecida")
+        elif key == "HEADLOSS":
+            raw["headloss"] = words[1].upper()
+        elif key == "PRESSURE" and len(words) == 2:
+            raw["pressure"] = words[1].upper()
+        elif key == "PATTERN":
+            raw["pattern"] = words[1]
+    units = UnitConverter(flow_units=flow_units, darcy_weisbach=raw["headloss"] == "D-W")
+    return units, raw
+
+
+def parse_times(lines: List[str], options: NetworkOptions) -> None:
+    """Lê a seção [TIMES] para as opções da rede (valores em segundos)"""
+    quality_set = False
+    for line in lines:
+        words = _tokens(line)
+        if len(words) < 2:
+            continue
+        key = words[0].upper()
+        try:
+            if key == "DURATION":
+                options.duration = float(parse_time(words[1:]))
+            elif key == "HYDRAULIC" and len(words) > 2:
+                options.hydraulic_timestep = float(parse_time(words[2:]))
+            elif key == "QUALITY" and len(words) > 2:
+                options.quality_timestep = float(parse_time(words[2:]))
+                quality_set = True
+        except ValueError as e:
+            raise InpParseError("[TIMES]", line, str(e)) from e
+    if not quality_set:
+        options.quality_timestep = options.hydraulic_timestep / 10.0
+
+
+def parse_patterns(lines: List[str]) -> Dict[str, List[float]]:
+    """Lê a seção [PATTERNS], concatenando padrões definidos em várias linhas"""
+    patterns: Dict[str, List[float]] = {}
+    for line in lines:
+        words = _tokens(line)
+        if not words:
+            continue
+        try:
+            values = [float(v) for v in words[1:]]
+        except ValueError as e:
+            raise InpParseError("[PATTERNS]", line, str(e)) from e
+        patterns.setdefault(words[0], []).extend(values)
+    return patterns
+
+
+def parse_curves(lines: List[str]) -> Dict[str, List[Tuple[float, float]]]:
+    """Lê os pontos da seção [CURVES] (sem conversão de unidades)"""
+    curves: Dict[str, List[Tuple[float, float]]] = {}
+    for line in lines:
+        words = _tokens(line)
+        if not words:
+            continue
+        try:
+            curves.setdefault(words[0], []).append((float(words[1]), float(words[2])))
+        except (ValueError, IndexError) as e:
+            raise InpParseError("[CURVES]", line, str(e)) from e
+    return curves
+
+
+def parse_energy(lines: List[str]) -> Dict[str, str]:
+    """Lê as curvas de eficiência das bombas na seção [ENERGY] (bomba -> curva)"""
+    efficiencies: Dict[str, str] = {}
+    for line in lines:
+        words = _tokens(line)
+        if len(words) > 3 and words[0].upper() == "PUMP" and words[2].upper() in ("EFFIC", "EFFICIENCY"):
+            efficiencies[words[1]] = words[3]
+    return efficiencies
+
+
+def parse_junctions(lines: List[str], units: UnitConverter,
+                    default_pattern: Optional[str]) -> List[Junction]:
+    """Lê a seção [JUNCTIONS]"""
+    junctions = []
+    append = junctions.append
+    length, flow = units.length, units.flow
+    for line in lines:
+        words = _tokens(line)
+        if not words:
+            continue
+        try:
+            append(Junction(
+                id=words[0],
+                elevation=float(words[1]) * length,
+                demand=float(words[2]) * flow if len(words) > 2 else 0.0,
+                demand_pattern=words[3] if len(words) > 3 else default_pattern
+            ))
+        except (ValueError, IndexError) as e:
+            raise InpParseError("[JUNCTIONS]", line, str(e)) from e
+    return junctions
+
+
+def parse_reservoirs(lines: List[str], units: UnitConverter) -> List[Reservoir]:
+    """Lê a seção [RESERVOIRS]"""
+    reservoirs = []
+    for line in lines:
+        words = _tokens(line)
+        if not words:
+            continue
+        try:
+            reservoirs.append(Reservoir(
+                id=words[0],
+                head=float(words[1]) * units.length,
+                head_pattern=words[2] if len(words) > 2 else None
+            ))
+        except (ValueError, IndexError) as e:
+            raise InpParseError("[RESERVOIRS]", line, str(e)) from e
+    return reservoirs
+
+
+def parse_tanks(lines: List[str], units: UnitConverter) -> List[Tank]:
+    """Lê a seção [TANKS]"""
+    tanks = []
+    length = units.length
+    for line in lines:
+        words = _tokens(line)
+        if not words:
+            continue
+        if len(words) < 6:
+            raise InpParseError("[TANKS]", line, "formato de tanque não reconhecido")
+        try:
+            min_volume = float(words[6]) if len(words) > 6 else 0.0
+            volume_curve = words[7] if len(words) > 7 and words[7] != "*" else None
+            tanks.append(Tank(
+                id=words[0],
+                elevation=float(words[1]) * length,
+                init_level=float(words[2]) * length,
+                min_level=float(words[3]) * length,
+                max_level=float(words[4]) * length,
+                diameter=float(words[5]) * length,
+                min_volume=min_volume * units.volume,
+                volume_curve=volume_curve
+            ))
+        except ValueError as e:
+            raise InpParseError("[TANKS]", line, str(e)) from e
+    return tanks
+
+
+def parse_pipes(lines: List[str], units: UnitConverter) -> List[Pipe]:
+    """Lê a seção [PIPES]"""
+    pipes = []
+    append = pipes.append
+    length, diameter, roughness = units.length, units.pipe_diameter, units.roughness
+    for line in lines:
+        words = _tokens(line)
+        if not words:
+            continue
+        try:
+            status = "Open"
+            if len(words) > 7:
+                status = _STATUS_NAMES[words[7].upper()]
+            append(Pipe(
+                id=words[0],
+                from_node=words[1],
+                to_node=words[2],
+                length=float(words[3]) * length,
+                diameter=float(words[4]) * diameter,
+                roughness=float(words[5]) * roughness,
+                minor_loss=float(words[6]) if len(words) > 6 else 0.0,
+                status=status
+            ))
+        except (ValueError, IndexError, KeyError) as e:
+            raise InpParseError("[PIPES]", line, str(e)) from e
+    return pipes
+
+
+def parse_pumps(lines: List[str], units: UnitConverter) -> List[Pump]:
+    """Lê a seção [PUMPS]"""
+    pumps = []
+    for line in lines:
+        words = _tokens(line)
+        if not words:
+            continue
+        if len(words) < 5:
+            raise InpParseError("[PUMPS]", line, "bomba sem curva ou potência")
+        pump = Pump(id=words[0], from_node=words[1], to_node=words[2])
+        try:
+            for i in range(3, len(words) - 1, 2):
+                keyword, value = words[i].upper(), words[i + 1]
+                if keyword == "HEAD":
+                    pump.pump_curve = value
+                elif keyword == "POWER":
+                    pump.power = float(value) * units.power or None
+                elif keyword == "SPEED":
+                    pump.speed = float(value)
+                elif keyword == "PATTERN":
+                    pump.pattern = value
+                else:
+                    raise InpParseError("[PUMPS]", line, f"palavra-chave desconhecida {keyword}")
+        except ValueError as e:
+            if isinstance(e, InpParseError):
+                raise
+            raise InpParseError("[PUMPS]", line, str(e)) from e
+        pumps.append(pump)
+    return pumps
+
+
+def parse_valves(lines: List[str], units: UnitConverter) -> List[Valve]:
+    """Lê a seção [VALVES]"""
+    valves = []
+    for line in lines:
+        words = _tokens(line)
+        if not words:
+            continue
+        if len(words) < 6:
+            raise InpParseError("[VALVES]", line, "válvulas devem ter 6 ou 7 valores")
+        valve_type = words[4].upper()
+        try:
+            if valve_type in ("PRV", "PSV", "PBV"):
+                setting = float(words[5]) * units.pressure
+            elif valve_type == "FCV":
+                setting = float(words[5]) * units.flow
+            elif valve_type == "TCV":
+                setting = float(words[5])
+            elif valve_type == "GPV":
+                # A configuração de uma GPV é o nome da curva de perda de carga
+                setting = 0.0
+            else:
+                raise InpParseError("[VALVES]", line, "tipo de válvula desconhecido")
+            valves.append(Valve(
+                id=words[0],
+                from_node=words[1],
+                to_node=words[2],
+                diameter=float(words[3]) * units.pipe_diameter,
+                valve_type=valve_type,
+                setting=setting,
+                minor_loss=float(words[6]) if len(words) > 6 else 0.0
+            ))
+        except ValueError as e:
+            if isinstance(e, InpParseError):
+                raise
+            raise InpParseError("[VALVES]", line, str(e)) from e
+    return valves
+
+
+class CoordinateIndex:
+    """Índice nome -> coordenadas de nós e vértices de links"""
+
+    def __init__(self,
+                 nodes: Optional[Dict[str, Tuple[float, float]]] = None,
+                 vertices: Optional[Dict[str, List[Tuple[float, float]]]] = None):
+        self.nodes: Dict[str, Tuple[float, float]] = nodes or {}
+        self.vertices: Dict[str, List[Tuple[float, float]]] = vertices or {}
+
+    @classmethod
+    def from_sections(cls, coordinate_lines: List[str], vertex_lines: List[str]) -> "CoordinateIndex":
+        """
+        Constrói o índice a partir das seções [COORDINATES] e [VERTICES]
+
+        Args:
+            coordinate_lines: Linhas da seção [COORDINATES]
+            vertex_lines: Linhas da seção [VERTICES]
+
+        Returns:
+            CoordinateIndex: Índice pronto para ser aplicado a uma rede
+        """
+        nodes: Dict[str, Tuple[float, float]] = {}
+        for line in coordinate_lines:
+            words = _tokens(line)
+            if not words:
+                continue
+            try:
+                nodes[words[0]] = (float(words[1]), float(words[2]))
+            except (ValueError, IndexError) as e:
+                raise InpParseError("[COORDINATES]", line, str(e)) from e
+
+        vertices: Dict[str, List[Tuple[float, float]]] = {}
+        for line in vertex_lines:
+            words = _tokens(line)
+            if not words:
+                continue
+            try:
+                vertices.setdefault(words[0], []).append((float(words[1]), float(words[2])))
+            except (ValueError, IndexError) as e:
+                raise InpParseError("[VERTICES]", line, str(e)) from e
+        return cls(nodes, vertices)
+
+    @classmethod
+    def from_wntr(cls, wn) -> "CoordinateIndex":
+        """Constrói o índice a partir de um WaterNetworkModel do WNTR"""
+        nodes = {
+            name: (float(node.coordinates[0]), float(node.coordinates[1]))
+            for name, node in wn.nodes()
+            if getattr(node, 'coordinates', None) is not None
+        }
+        vertices = {
+            name: [(float(x), float(y)) for x, y in link.vertices]
+            for name, link in wn.links()
+            if getattr(link, 'vertices', None)
+        }
+        return cls(nodes, vertices)
+
+    def attach(self, network: WaterNetwork) -> None:
+        """
+        Associa coordenadas aos nós e vértices aos links em uma única passada
+
+        Args:
+            network: Rede cujos elementos serão atualizados
+        """
+        nodes = self.nodes
+        for group in (network.junctions, network.reservoirs, network.tanks):
+            for node in group:
+                xy = nodes.get(node.id)
+                if xy is not None:
+                    node.coordinates = Coordinate(x=xy[0], y=xy[1])
+
+        if not self.vertices:
+            return
+        vertices = self.vertices
+        for group in (network.pipes, network.pumps, network.valves):
+            for link in group:
+                points = vertices.get(link.id)
+                if points:
+                    link.vertices = [Coordinate(x=x, y=y) for x, y in points]
+
+
+# Seções de elementos lidas em paralelo: atributo da rede, função de leitura,
+# classe e campos transferidos entre processos (coordenadas e vértices são
+# aplicados depois, pelo CoordinateIndex)
+_ELEMENT_SECTIONS = {
+    "[JUNCTIONS]": ("junctions", parse_junctions, Junction,
+                    ("id", "elevation", "demand", "demand_pattern")),
+    "[RESERVOIRS]": ("reservoirs", parse_reservoirs, Reservoir, ("id", "head", "head_pattern")),
+    "[TANKS]": ("tanks", parse_tanks, Tank,
+                ("id", "elevation", "init_level", "min_level", "max_level", "diameter",
+                 "min_volume", "volume_curve")),
+    "[PIPES]": ("pipes", parse_pipes, Pipe,
+                ("id", "from_node", "to_node", "length", "diameter", "roughness",
+                 "minor_loss", "status")),
+    "[PUMPS]": ("pumps", parse_pumps, Pump,
+                ("id", "from_node", "to_node", "pump_curve", "power", "speed", "pattern")),
+    "[VALVES]": ("valves", parse_valves, Valve,
+                 ("id", "from_node", "to_node", "diameter", "valve_type", "setting", "minor_loss")),
+}
+
+
+def _parse_rows(section: str, lines: List[str], units: UnitConverter,
+                default_pattern: Optional[str]) -> List[Tuple[Any, ...]]:
+    """
+    Lê um bloco de linhas de uma seção de elementos em um processo auxiliar
+
+    Retorna tuplas com os valores dos campos em vez dos objetos, pois tuplas
+    de str/float são transferidas entre processos bem mais rápido.
+    """
+    _, parse, _, fields = _ELEMENT_SECTIONS[section]
+    with gc_paused():
+        if section == "[JUNCTIONS]":
+            elements = parse(lines, units, default_pattern)
+        else:
+            elements = parse(lines, units)
+        return list(map(attrgetter(*fields), elements))
+
+
+def _parse_coordinates(coordinate_lines: List[str], vertex_lines: List[str]):
+    """Lê um bloco de [COORDINATES]/[VERTICES] em um processo auxiliar"""
+    index = CoordinateIndex.from_sections(coordinate_lines, vertex_lines)
+    return index.nodes, index.vertices
+
+
+def _chunks(lines: List[str], size: int) -> List[List[str]]:
+    return [lines[i:i + size] for i in range(0, len(lines), size)]
+
+
+class InpParser:
+    """
+    Parser nativo de arquivos INP, independente do WNTR
+
+    Com workers > 1, as seções de elementos e de coordenadas de redes grandes
+    são divididas em blocos de linhas lidos em paralelo por um pool de
+    processos; os blocos são reunidos na ordem do arquivo, então o resultado
+    é idêntico ao da leitura sequencial.
+    """
+
+    def __init__(self, workers: int = 1, chunk_lines: int = 50_000):
+        """
+        Args:
+            workers: Número de processos para a leitura das seções (1 = sequencial)
+            chunk_lines: Linhas por bloco enviado a cada processo; redes com
+                menos linhas de elementos que isso são lidas sequencialmente
+        """
+        self.workers = max(1, workers)
+        self.chunk_lines = chunk_lines
+
+    def parse_file(self, inp_file_path: str) -> WaterNetwork:
+        """
+        Lê um arquivo INP diretamente para um objeto WaterNetwork
+
+        Args:
+            inp_file_path: Caminho para o arquivo .inp
+
+        Returns:
+            WaterNetwork: Objeto contendo toda a rede
+        """
+        with stage("parser.split") as span:
+            with open(inp_file_path, "r", encoding="utf-8") as f:
+                sections = split_sections(f)
+            span.set_elements(sum(map(len, sections.values())))
+        return self.parse_sections(sections)
+
+    def parse_header(self, sections: Dict[str, List[str]]) -> Tuple[
+            UnitConverter, WaterNetwork, Dict[str, List[float]], Dict[str, List[Tuple[float, float]]]]:
+        """
+        Lê as seções globais: título, opções, tempos, padrões e curvas
+
+        Args:
+            sections: Resultado de split_sections
+
+        Returns:
+            Tuple: (unidades, rede sem elementos com título e opções,
+                padrões por id, pontos das curvas por id sem conversão)
+        """
+        get = lambda name: sections.get(name, [])
+
+        units, raw_options = parse_options(get("[OPTIONS]"))
+        patterns = parse_patterns(get("[PATTERNS]"))
+        raw_curves = parse_curves(get("[CURVES]"))
+        options = NetworkOptions(
+            headloss=raw_options["headloss"],
+            units=units.flow_units,
+            pressure=raw_options["pressure"],
+            pattern=self._default_pattern(raw_options["pattern"], patterns),
+            hydraulic_timestep=3600.0,
+            duration=0.0
+        )
+        parse_times(get("[TIMES]"), options)
+
+        network = WaterNetwork()
+        network.title = "\n".join(
+            t for t in (line.split(";", 1)[0].strip() for line in get("[TITLE]")) if t
+        )
+        network.options = options
+        return units, network, patterns, raw_curves
+
+    def parse_sections(self, sections: Dict[str, List[str]]) -> WaterNetwork:
+        """
+        Monta a rede a partir das linhas já agrupadas por seção
+
+        Args:
+            sections: Resultado de split_sections
+
+        Returns:
+            WaterNetwork: Objeto contendo toda a rede
+        """
+        get = lambda name: sections.get(name, [])
+        with stage("parser.header"):
+            units, network, patterns, raw_curves = self.parse_header(sections)
+        options = network.options
+
+        with gc_paused():
+            element_lines = sum(len(get(section)) for section in _ELEMENT_SECTIONS)
+            with stage("parser.elements", workers=self.workers) as span:
+                if self.workers > 1 and element_lines > self.chunk_lines:
+                    coordinates = self._parse_parallel(network, sections, units)
+                else:
+                    network.junctions = parse_junctions(get("[JUNCTIONS]"), units, options.pattern)
+                    network.reservoirs = parse_reservoirs(get("[RESERVOIRS]"), units)
+                    network.tanks = parse_tanks(get("[TANKS]"), units)
+                    network.pipes = parse_pipes(get("[PIPES]"), units)
+                    network.pumps = parse_pumps(get("[PUMPS]"), units)
+                    network.valves = parse_valves(get("[VALVES]"), units)
+                    coordinates = CoordinateIndex.from_sections(get("[COORDINATES]"), get("[VERTICES]"))
+                span.set_elements(element_lines)
+            self._check_links(network)
+
+            with stage("parser.attach"):
+                self._apply_demands(network, get("[DEMANDS]"), units)
+                self._apply_status(network, get("[STATUS]"))
+                self._apply_efficiencies(network, parse_energy(get("[ENERGY]")))
+                coordinates.attach(network)
+
+        network.patterns = [Pattern(id=name, multipliers=values) for name, values in patterns.items()]
+        network.curves = self._build_curves(network, raw_curves, units)
+        return network
+
+    def _parse_parallel(self, network: WaterNetwork, sections: Dict[str, List[str]],
+                        units: UnitConverter) -> CoordinateIndex:
+        """
+        Lê as seções de elementos e de coordenadas em blocos, em paralelo
+
+        Preenche as listas de elementos da rede e retorna o índice de
+        coordenadas. Os resultados são consumidos na ordem de envio, o que
+        mantém a ordem do arquivo.
+        """
+        size = self.chunk_lines
+        default_pattern = network.options.pattern
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            element_jobs = [
+                (section, [executor.submit(_parse_rows, section, chunk, units, default_pattern)
+                           for chunk in _chunks(sections.get(section, []), size)])
+                for section in _ELEMENT_SECTIONS
+            ]
+            coordinate_jobs = [
+                executor.submit(_parse_coordinates, chunk, [])
+                for chunk in _chunks(sections.get("[COORDINATES]", []), size)
+            ] + [
+                executor.submit(_parse_coordinates, [], chunk)
+                for chunk in _chunks(sections.get("[VERTICES]", []), size)
+            ]
+
+            for section, futures in element_jobs:
+                name, _, cls, _ = _ELEMENT_SECTIONS[section]
+                elements = []
+                for future in futures:
+                    elements.extend(starmap(cls, future.result()))
+                setattr(network, name, elements)
+
+            coordinates = CoordinateIndex()
+            for future in coordinate_jobs:
+                nodes, vertices = future.result()
+                coordinates.nodes.update(nodes)
+                for link_id, points in vertices.items():
+                    coordinates.vertices.setdefault(link_id, []).extend(points)
+        return coordinates
+
+    @staticmethod
+    def _check_links(network: WaterNetwork) -> None:
+        """Rejeita ligações cujos nós de extremidade não existem (erro 203 do EPANET)"""
+        node_ids = {node.id for node in network.junctions}
+        node_ids.update(node.id for node in network.reservoirs)
+        node_ids.update(node.id for node in network.tanks)
+        for section, links in (("[PIPES]", network.pipes), ("[PUMPS]", network.pumps),
+                               ("[VALVES]", network.valves)):
+            for link in links:
+                for node in (link.from_node, link.to_node):
+                    if node not in node_ids:
+                        raise InpParseError(section, f"{link.id} {link.from_node} {link.to_node}",
+                                            f"nó inexistente {node}")
+
+    @staticmethod
+    def _default_pattern(option: Optional[str], patterns: Dict[str, List[float]]) -> Optional[str]:
+        """Resolve o padrão de demanda padrão como o EPANET"""
+        if option is None:
+            return "1" if "1" in patterns else None
+        if option not in patterns:
+            if option != "1":
+                raise InpParseError("[OPTIONS]", f"PATTERN {option}", "padrão inexistente")
+            return None
+        return option
+
+    @staticmethod
+    def _apply_demands(network: WaterNetwork, lines: List[str], units: UnitConverter) -> None:
+        """Aplica a seção [DEMANDS], que substitui a demanda das junções"""
+        if not lines:
+            return
+        junctions = {j.id: j for j in network.junctions}
+        seen = set()
+        for line in lines:
+            words = _tokens(line)
+            if not words or words[0] in seen:
+                continue
+            seen.add(words[0])
+            try:
+                junction = junctions[words[0]]
+                junction.demand = float(words[1]) * units.flow
+            except (KeyError, ValueError, IndexError) as e:
+                raise InpParseError("[DEMANDS]", line, str(e)) from e
+            junction.demand_pattern = words[2] if len(words) > 2 else network.options.pattern
+
+    @staticmethod
+    def _apply_status(network: WaterNetwork, lines: List[str]) -> None:
+        """Aplica a seção [STATUS] ao estado inicial dos tubos"""
+        if not lines:
+            return
+        pipes = {p.id: p for p in network.pipes}
+        for line in lines:
+            words = _tokens(line)
+            if len(words) < 2:
+                continue
+            pipe = pipes.get(words[0])
+            status = _STATUS_NAMES.get(words[1].upper())
+            if pipe is not None and status is not None and words[1].upper() != "CV":
+                pipe.status = status
+
+    @staticmethod
+    def _apply_efficiencies(network: WaterNetwork, efficiencies: Dict[str, str]) -> None:
+        """Associa às bombas as curvas de eficiência lidas de [ENERGY] (parse_energy)"""
+        if not efficiencies:
+            return
+        for pump in network.pumps:
+            curve = efficiencies.get(pump.id)
+            if curve is not None:
+                pump.efficiency_curve = curve
+
+    @staticmethod
+    def _build_curves(network: WaterNetwork, raw_curves: Dict[str, List[Tuple[float, float]]],
+                      units: UnitConverter) -> List[Curve]:
+        """
+        Tipifica as curvas conforme o uso (tanques e bombas, já com as curvas
+        de eficiência aplicadas) e converte seus pontos para o SI
+        """
+        curve_types: Dict[str, str] = {}
+        for tank in network.tanks:
+            if tank.volume_curve:
+                curve_types[tank.volume_curve] = "VOLUME"
+        for pump in network.pumps:
+            if pump.pump_curve:
+                curve_types[pump.pump_curve] = "HEAD"
+            if pump.efficiency_curve:
+                curve_types[pump.efficiency_curve] = "EFFICIENCY"
+
+        factors = {
+            "VOLUME": (units.length, units.volume),
+            "HEAD": (units.flow, units.length),
+            "EFFICIENCY": (units.flow, 1.0),
+            "HEADLOSS": (units.flow, units.length),
+        }
+        curves = []
+        for name, points in raw_curves.items():
+            curve_type = curve_types.get(name)
+            fx, fy = factors.get(curve_type, (1.0, 1.0))
+            curves.append(Curve(
+                id=name,
+                curve_type=str(curve_type),
+                x_values=[x * fx for x, _ in points],
+                y_values=[y * fy for _, y in points]
+            ))
+        return curves
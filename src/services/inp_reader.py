@@ -1,16 +1,40 @@
-import wntr
 from typing import Optional
 from ..models.network import WaterNetwork, Pattern, Curve, NetworkOptions
 from ..models.elements import (
-    Junction, Reservoir, Tank, Pipe, Pump, Valve, Coordinate
+    Junction, Reservoir, Tank, Pipe, Pump, Valve
 )
+from .inp_parser import InpParser, InpParseError, CoordinateIndex
+from .parse_cache import ParseCache
+from ..utils.profiling import stage
+
+try:
+    import wntr
+except ImportError:  # o parser nativo não depende do WNTR
+    wntr = None
 
 
 class InpReader:
     """Classe para ler arquivos INP e converter para objetos Python"""
     
-    def __init__(self):
-        self.wn: Optional[wntr.network.WaterNetworkModel] = None
+    ENGINES = ("native", "wntr")
+    
+    def __init__(self, engine: str = "native", cache: Optional[ParseCache] = None,
+                 workers: int = 1):
+        """
+        Args:
+            engine: "native" usa o parser próprio (com fallback para o WNTR
+                em caso de erro de leitura); "wntr" força o uso do WNTR
+            cache: Cache em disco opcional; em um acerto o arquivo não é
+                lido por nenhuma das engines (e self.wn fica None)
+            workers: Processos usados pelo parser nativo para ler as seções
+                de redes grandes em paralelo (1 = sequencial)
+        """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Engine desconhecida: {engine}")
+        self.engine = engine
+        self.cache = cache
+        self.workers = workers
+        self.wn: Optional["wntr.network.WaterNetworkModel"] = None
     
     def read_inp_file(self, inp_file_path: str) -> WaterNetwork:
         """
@@ -22,8 +46,41 @@ class InpReader:
         Returns:
             WaterNetwork: Objeto contendo toda a rede
         """
+        self.wn = None
+        with stage("inp_reader.read", path=inp_file_path, engine=self.engine) as span:
+            if self.cache is None:
+                network = self._read(inp_file_path)
+            else:
+                key = self.cache.key_for(inp_file_path, self.engine)
+                with stage("cache.get"):
+                    network = self.cache.get(key)
+                span.set_attribute("cache_hit", network is not None)
+                if network is None:
+                    network = self._read(inp_file_path)
+                    with stage("cache.put"):
+                        self.cache.put(key, network)
+            stats = network.statistics()
+            span.set_elements(stats["total_nodes"] + stats["total_links"])
+        return network
+    
+    def _read(self, inp_file_path: str) -> WaterNetwork:
+        """Lê o arquivo com a engine configurada"""
+        if self.engine == "native":
+            try:
+                return InpParser(workers=self.workers).parse_file(inp_file_path)
+            except InpParseError:
+                if wntr is None:
+                    raise
+        return self._read_with_wntr(inp_file_path)
+    
+    def _read_with_wntr(self, inp_file_path: str) -> WaterNetwork:
+        """Lê o arquivo através do WaterNetworkModel do WNTR"""
+        if wntr is None:
+            raise ImportError("O pacote 'wntr' é necessário para engine='wntr'")
+        
         # Carrega o arquivo INP usando WNTR
-        self.wn = wntr.network.WaterNetworkModel(inp_file_path)
+        with stage("wntr.load"):
+            self.wn = wntr.network.WaterNetworkModel(inp_file_path)
         
         # Cria o objeto de rede
         network = WaterNetwork()
@@ -31,19 +88,29 @@ class InpReader:
         # Extrai informações básicas
         network.title = self._get_title()
         
-        # Extrai nós
-        network.junctions = self._extract_junctions()
-        network.reservoirs = self._extract_reservoirs()
-        network.tanks = self._extract_tanks()
+        # Extrai nós, links, padrões e curvas (uma etapa medida por seção)
+        for attr, extract in (
+            ("junctions", self._extract_junctions),
+            ("reservoirs", self._extract_reservoirs),
+            ("tanks", self._extract_tanks),
+            ("pipes", self._extract_pipes),
+            ("pumps", self._extract_pumps),
+            ("valves", self._extract_valves),
+        ):
+            with stage(f"extract.{attr}") as span:
+                setattr(network, attr, extract())
+                span.set_elements(len(getattr(network, attr)))
         
-        # Extrai links
-        network.pipes = self._extract_pipes()
-        network.pumps = self._extract_pumps()
-        network.valves = self._extract_valves()
+        # Associa coordenadas dos nós e vértices dos links
+        with stage("extract.coordinates"):
+            CoordinateIndex.from_wntr(self.wn).attach(network)
         
-        # Extrai padrões e curvas
-        network.patterns = self._extract_patterns()
-        network.curves = self._extract_curves()
+        with stage("extract.patterns") as span:
+            network.patterns = self._extract_patterns()
+            span.set_elements(len(network.patterns))
+        with stage("extract.curves") as span:
+            network.curves = self._extract_curves()
+            span.set_elements(len(network.curves))
         
         # Extrai opções
         network.options = self._extract_options()
@@ -52,19 +119,11 @@ class InpReader:
     
     def _get_title(self) -> str:
         """Extrai o título da rede"""
+        title = getattr(self.wn, 'title', None)
+        if title:
+            return "\n".join(title)
         return self.wn.name if hasattr(self.wn, 'name') else ""
     
-    def _get_coordinates(self, node_name: str) -> Optional[Coordinate]:
-        """Obtém as coordenadas de um nó"""
-        try:
-            node = self.wn.get_node(node_name)
-            if hasattr(node, 'coordinates') and node.coordinates is not None:
-                x, y = node.coordinates
-                return Coordinate(x=float(x), y=float(y))
-        except:
-            pass
-        return None
-    
     def _extract_junctions(self) -> list[Junction]:
         """Extrai todas as junções da rede"""
         junctions = []
@@ -75,8 +134,7 @@ class InpReader:
                 demand=float(junction.base_demand),
                 demand_pattern=junction.demand_timeseries_list[0].pattern_name 
                     if junction.demand_timeseries_list and 
-                       junction.demand_timeseries_list[0].pattern_name else None,
-                coordinates=self._get_coordinates(name)
+                       junction.demand_timeseries_list[0].pattern_name else None
             )
             junctions.append(j)
         return junctions
@@ -89,8 +147,7 @@ class InpReader:
                 id=name,
                 head=float(reservoir.head_timeseries.base_value),
                 head_pattern=reservoir.head_timeseries.pattern_name 
-                    if hasattr(reservoir.head_timeseries, 'pattern_name') else None,
-                coordinates=self._get_coordinates(name)
+                    if hasattr(reservoir.head_timeseries, 'pattern_name') else None
             )
             reservoirs.append(r)
         return reservoirs
@@ -107,8 +164,7 @@ class InpReader:
                 max_level=float(tank.max_level),
                 diameter=float(tank.diameter),
                 min_volume=float(tank.min_vol),
-                volume_curve=tank.vol_curve_name if hasattr(tank, 'vol_curve_name') else None,
-                coordinates=self._get_coordinates(name)
+                volume_curve=tank.vol_curve_name if hasattr(tank, 'vol_curve_name') else None
             )
             tanks.append(t)
         return tanks
@@ -143,7 +199,9 @@ class InpReader:
                 speed=float(pump.speed_timeseries.base_value) if hasattr(pump, 'speed_timeseries') else 1.0,
                 pattern=pump.speed_timeseries.pattern_name 
                     if hasattr(pump, 'speed_timeseries') and 
-                       hasattr(pump.speed_timeseries, 'pattern_name') else None
+                       hasattr(pump.speed_timeseries, 'pattern_name') else None,
+                efficiency_curve=pump.efficiency_curve.name
+                    if getattr(pump, 'efficiency_curve', None) is not None else None
             )
             pumps.append(pump_obj)
         return pumps
@@ -191,11 +249,16 @@ class InpReader:
     def _extract_options(self) -> NetworkOptions:
         """Extrai as opções da rede"""
         options = NetworkOptions()
+        hydraulic = self.wn.options.hydraulic
         
-        if hasattr(self.wn.options, 'headloss'):
-            options.headloss = str(self.wn.options.headloss)
-        if hasattr(self.wn.options.hydraulic, 'demand_model'):
-            options.units = str(self.wn.options.hydraulic.demand_model)
+        if getattr(hydraulic, 'headloss', None):
+            options.headloss = str(hydraulic.headloss)
+        if getattr(hydraulic, 'inpfile_units', None):
+            options.units = str(hydraulic.inpfile_units)
+        if getattr(hydraulic, 'inpfile_pressure_units', None):
+            options.pressure = str(hydraulic.inpfile_pressure_units).upper()
+        if getattr(hydraulic, 'pattern', None):
+            options.pattern = str(hydraulic.pattern)
         if hasattr(self.wn.options.time, 'hydraulic_timestep'):
             options.hydraulic_timestep = float(self.wn.options.time.hydraulic_timestep)
         if hasattr(self.wn.options.time, 'quality_timestep'):
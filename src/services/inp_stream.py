@@ -0,0 +1,380 @@
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple, Union
+import numpy as np
+
+from ..models.columnar import SCHEMAS, NODE_TABLES, LINK_TABLES, FLOAT, OPT_FLOAT
+from ..models.elements import Coordinate
+from ..models.network import WaterNetwork, Pattern, gc_paused
+from .inp_parser import (
+    InpParser, InpParseError, UnitConverter, CoordinateIndex, section_name,
+    parse_energy, parse_pumps, parse_tanks, _ELEMENT_SECTIONS, _STATUS_NAMES, _tokens
+)
+from .json_writer import JsonStreamWriter
+
+# Seção de cada tabela de elementos (ex.: "pipes" -> "[PIPES]")
+_SECTION_OF = {table: section for section, (table, *_) in _ELEMENT_SECTIONS.items()}
+
+# Seções lidas na passada inicial: globais, mais as que tipificam curvas
+# ([PUMPS], [TANKS], [ENERGY]) e as que alteram elementos ([DEMANDS], [STATUS])
+_HEADER_SECTIONS = frozenset({
+    "[TITLE]", "[OPTIONS]", "[TIMES]", "[PATTERNS]", "[CURVES]", "[ENERGY]",
+    "[PUMPS]", "[TANKS]", "[DEMANDS]", "[STATUS]",
+})
+
+Batch = Union[List[Any], np.ndarray]
+
+
+def to_records(table: str, elements: List[Any]) -> np.ndarray:
+    """
+    Converte um lote de elementos em um array estruturado do NumPy
+
+    Os campos seguem o esquema da ColumnarNetwork: números em float64
+    (None vira NaN), rótulos e nós como texto ("" para None) e, nos nós,
+    as coordenadas x e y (NaN quando ausentes). A largura dos campos de
+    texto é a do maior valor do lote.
+
+    Args:
+        table: Tabela dos elementos ("junctions", "pipes", ...)
+        elements: Lote de elementos do mesmo tipo
+
+    Returns:
+        np.ndarray: Um registro por elemento
+    """
+    _, schema = SCHEMAS[table]
+    columns: Dict[str, List[Any]] = {"id": [e.id for e in elements]}
+    dtype: List[Tuple[str, Any]] = []
+    for name, kind in (("id", None),) + schema:
+        if name != "id":
+            columns[name] = [getattr(e, name) for e in elements]
+        if kind in (FLOAT, OPT_FLOAT):
+            columns[name] = [np.nan if v is None else v for v in columns[name]]
+            dtype.append((name, np.float64))
+        else:
+            columns[name] = ["" if v is None else v for v in columns[name]]
+            dtype.append((name, f"U{max(map(len, columns[name]), default=1) or 1}"))
+    if table in NODE_TABLES:
+        coordinates = [e.coordinates for e in elements]
+        columns["x"] = [np.nan if c is None else c.x for c in coordinates]
+        columns["y"] = [np.nan if c is None else c.y for c in coordinates]
+        dtype += [("x", np.float64), ("y", np.float64)]
+    records = np.empty(len(elements), dtype=dtype)
+    for name, values in columns.items():
+        records[name] = values
+    return records
+
+
+class InpStreamReader:
+    """
+    Lê os elementos de um arquivo INP em lotes, sem montar a WaterNetwork
+
+    Uma passada inicial lê apenas as seções globais (opções, tempos,
+    padrões, curvas) e as pequenas seções que alteram ou tipificam
+    elementos ([PUMPS], [TANKS], [ENERGY], [DEMANDS], [STATUS]); cada
+    iteração depois percorre o arquivo e entrega lotes de até batch_size
+    elementos, com os mesmos valores do InpReader nativo. A memória usada
+    não cresce com o número de elementos.
+
+    Coordenadas e vértices ficam em seções separadas dos elementos; com
+    coordinates=True elas são indexadas na passada inicial e associadas a
+    cada lote, e a memória passa a crescer com o número de coordenadas
+    (mas não com o de elementos).
+
+    Uso:
+        reader = InpStreamReader("regional.inp", batch_size=50_000)
+        for batch in reader.iter_pipes(records=True):
+            banco.inserir(batch)
+    """
+
+    def __init__(self, inp_file_path: str, batch_size: int = 10_000,
+                 coordinates: bool = False):
+        """
+        Args:
+            inp_file_path: Caminho para o arquivo .inp
+            batch_size: Número máximo de elementos por lote
+            coordinates: Se True, associa coordenadas e vértices aos elementos
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size deve ser positivo")
+        self.path = inp_file_path
+        self.batch_size = batch_size
+        self.coordinates = coordinates
+        self._header: Optional[Tuple[UnitConverter, WaterNetwork]] = None
+        self._demands: Dict[str, Tuple[float, Optional[str]]] = {}
+        self._status: Dict[str, str] = {}
+        self._efficiencies: Dict[str, str] = {}
+        self._index: Optional[CoordinateIndex] = None
+        # Seção -> [[início, fim], ...] em bytes (uma seção pode se repetir)
+        self._ranges: Dict[str, List[List[int]]] = {}
+
+    def _scan(self) -> Dict[str, List[str]]:
+        """
+        Passada inicial sobre o arquivo: guarda as linhas das seções do
+        cabeçalho (e das coordenadas, se pedidas) e a posição em bytes de
+        cada seção, para que as iterações leiam apenas as seções pedidas
+        """
+        keep = _HEADER_SECTIONS | ({"[COORDINATES]", "[VERTICES]"} if self.coordinates else set())
+        sections: Dict[str, List[str]] = {}
+        ranges = self._ranges
+        current: Optional[str] = None
+        lines: Optional[List[str]] = None
+        position = 0
+        with open(self.path, "rb") as f:
+            for raw in f:
+                start, position = position, position + len(raw)
+                line = raw.strip()
+                if not line or line[:1] == b";":
+                    continue
+                if line[:1] == b"[":
+                    if current is not None:
+                        ranges[current][-1][1] = start
+                    current = section_name(line.decode("utf-8"))
+                    if current == "[END]":
+                        current = None
+                        break
+                    ranges.setdefault(current, []).append([position, None])
+                    lines = sections.setdefault(current, []) if current in keep else None
+                    continue
+                if current is None:
+                    raise InpParseError("(sem seção)", line.decode("utf-8"), "linha fora de uma seção")
+                if lines is not None:
+                    lines.append(line.decode("utf-8"))
+        if current is not None:
+            ranges[current][-1][1] = position
+        return sections
+
+    def _section_lines(self, start: int, end: int) -> Iterator[str]:
+        """Linhas não vazias de um trecho do arquivo (posições em bytes)"""
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            position = start
+            while position < end:
+                raw = f.readline()
+                if not raw:
+                    break
+                position += len(raw)
+                line = raw.strip()
+                if line and line[:1] != b";":
+                    yield line.decode("utf-8")
+
+    def _read_header(self) -> Tuple[UnitConverter, WaterNetwork]:
+        """Passada inicial: rede sem nós e links, com título, opções, padrões e curvas"""
+        if self._header is not None:
+            return self._header
+        sections = self._scan()
+        coordinate_lines = sections.pop("[COORDINATES]", [])
+        vertex_lines = sections.pop("[VERTICES]", [])
+
+        parser = InpParser()
+        units, network, patterns, raw_curves = parser.parse_header(sections)
+        # Bombas e tanques só são usados aqui para tipificar as curvas
+        typing = WaterNetwork(pumps=parse_pumps(sections.get("[PUMPS]", []), units),
+                              tanks=parse_tanks(sections.get("[TANKS]", []), units))
+        network.patterns = [Pattern(id=name, multipliers=values) for name, values in patterns.items()]
+        self._efficiencies = parse_energy(sections.get("[ENERGY]", []))
+        parser._apply_efficiencies(typing, self._efficiencies)
+        network.curves = parser._build_curves(typing, raw_curves, units)
+
+        # Mesma regra de InpParser._apply_demands: vale a primeira categoria
+        for line in sections.get("[DEMANDS]", []):
+            words = _tokens(line)
+            if not words or words[0] in self._demands:
+                continue
+            try:
+                self._demands[words[0]] = (float(words[1]) * units.flow,
+                                           words[2] if len(words) > 2 else network.options.pattern)
+            except (ValueError, IndexError) as e:
+                raise InpParseError("[DEMANDS]", line, str(e)) from e
+        for line in sections.get("[STATUS]", []):
+            words = _tokens(line)
+            if len(words) >= 2 and words[1].upper() in _STATUS_NAMES and words[1].upper() != "CV":
+                self._status[words[0]] = _STATUS_NAMES[words[1].upper()]
+        if self.coordinates:
+            self._index = CoordinateIndex.from_sections(coordinate_lines, vertex_lines)
+
+        self._header = (units, network)
+        return self._header
+
+    def header(self) -> WaterNetwork:
+        """
+        Rede sem nós nem links: título, opções, padrões e curvas
+
+        Returns:
+            WaterNetwork: Rede com as listas de elementos vazias
+        """
+        return self._read_header()[1]
+
+    def _finish(self, table: str, elements: List[Any]) -> None:
+        """Aplica [DEMANDS], [STATUS] e coordenadas a um lote"""
+        if table == "junctions" and self._demands:
+            for junction in elements:
+                override = self._demands.get(junction.id)
+                if override is not None:
+                    junction.demand, junction.demand_pattern = override
+        elif table == "pipes" and self._status:
+            for pipe in elements:
+                status = self._status.get(pipe.id)
+                if status is not None:
+                    pipe.status = status
+        elif table == "pumps":
+            InpParser._apply_efficiencies(WaterNetwork(pumps=elements), self._efficiencies)
+        if self._index is None:
+            return
+        if table in NODE_TABLES:
+            nodes = self._index.nodes
+            for node in elements:
+                xy = nodes.get(node.id)
+                if xy is not None:
+                    node.coordinates = Coordinate(x=xy[0], y=xy[1])
+        elif self._index.vertices:
+            vertices = self._index.vertices
+            for link in elements:
+                points = vertices.get(link.id)
+                if points:
+                    link.vertices = [Coordinate(x=x, y=y) for x, y in points]
+
+    def iter_batches(self, tables: Tuple[str, ...], records: bool = False) -> Iterator[Tuple[str, Batch]]:
+        """
+        Percorre o arquivo uma vez e entrega os lotes das tabelas pedidas,
+        na ordem em que aparecem no arquivo
+
+        Args:
+            tables: Tabelas a ler ("junctions", "reservoirs", "tanks",
+                "pipes", "pumps", "valves")
+            records: Se True, cada lote é um array estruturado (to_records);
+                senão, uma lista de elementos do modelo
+
+        Returns:
+            Iterator: Pares (tabela, lote); cada lote tem um único tipo
+        """
+        units, network = self._read_header()
+        default_pattern = network.options.pattern
+        wanted = {}
+        for table in tables:
+            if table not in _SECTION_OF:
+                raise ValueError(f"Tabela desconhecida: {table}")
+            wanted[_SECTION_OF[table]] = table
+
+        def flush(section: str, lines: List[str]) -> Tuple[str, Batch]:
+            table, parse = wanted[section], _ELEMENT_SECTIONS[section][1]
+            with gc_paused():
+                if section == "[JUNCTIONS]":
+                    elements = parse(lines, units, default_pattern)
+                else:
+                    elements = parse(lines, units)
+                self._finish(table, elements)
+            return table, to_records(table, elements) if records else elements
+
+        # Trechos das seções pedidas, na ordem do arquivo
+        parts = sorted((start, end, section) for section in wanted
+                       for start, end in self._ranges.get(section, ()))
+        for start, end, section in parts:
+            buffer = []
+            for line in self._section_lines(start, end):
+                buffer.append(line)
+                if len(buffer) >= self.batch_size:
+                    yield flush(section, buffer)
+                    buffer = []
+            if buffer:
+                yield flush(section, buffer)
+
+    def iter_table(self, table: str, records: bool = False) -> Iterator[Batch]:
+        """Lotes de uma única tabela (ver iter_batches)"""
+        for _, batch in self.iter_batches((table,), records):
+            yield batch
+
+    def iter_junctions(self, records: bool = False) -> Iterator[Batch]:
+        return self.iter_table("junctions", records)
+
+    def iter_reservoirs(self, records: bool = False) -> Iterator[Batch]:
+        return self.iter_table("reservoirs", records)
+
+    def iter_tanks(self, records: bool = False) -> Iterator[Batch]:
+        return self.iter_table("tanks", records)
+
+    def iter_pipes(self, records: bool = False) -> Iterator[Batch]:
+        return self.iter_table("pipes", records)
+
+    def iter_pumps(self, records: bool = False) -> Iterator[Batch]:
+        return self.iter_table("pumps", records)
+
+    def iter_valves(self, records: bool = False) -> Iterator[Batch]:
+        return self.iter_table("valves", records)
+
+    def iter_nodes(self, records: bool = False) -> Iterator[Tuple[str, Batch]]:
+        """Lotes de junções, reservatórios e tanques: pares (tabela, lote)"""
+        return self.iter_batches(NODE_TABLES, records)
+
+    def iter_links(self, records: bool = False) -> Iterator[Tuple[str, Batch]]:
+        """Lotes de tubos, bombas e válvulas: pares (tabela, lote)"""
+        return self.iter_batches(LINK_TABLES, records)
+
+    def write_json(self, stream: TextIO, indent: int = 2, compact: bool = False) -> None:
+        """
+        Escreve a rede em JSON lote a lote, com o JsonStreamWriter
+
+        Com coordinates=True o resultado é idêntico ao de
+        JsonConverter.network_to_file sobre a rede lida pelo InpReader.
+
+        Args:
+            stream: Arquivo (modo texto) de destino
+            indent: Indentação do JSON
+            compact: Se True, gera JSON sem indentação nem espaços
+        """
+        network = self.header()
+        # As contagens são preenchidas enquanto os lotes são escritos; a
+        # seção "statistics" vem por último e já as encontra completas
+        statistics = dict.fromkeys((
+            "total_junctions", "total_reservoirs", "total_tanks", "total_pipes",
+            "total_pumps", "total_valves", "total_nodes", "total_links"
+        ), 0)
+
+        def elements(table: str) -> Iterator[Any]:
+            group = "total_nodes" if table in NODE_TABLES else "total_links"
+            for batch in self.iter_table(table):
+                statistics[f"total_{table}"] += len(batch)
+                statistics[group] += len(batch)
+                yield from batch
+
+        JsonStreamWriter(stream, indent, compact=compact).write_value({
+            "title": network.title,
+            "nodes": {table: elements(table) for table in NODE_TABLES},
+            "links": {table: elements(table) for table in LINK_TABLES},
+            "patterns": network.patterns,
+            "curves": network.curves,
+            "options": network.options.to_dict(),
+            "statistics": statistics
+        })
+
+
+def iter_pipes(inp_file_path: str, batch_size: int = 10_000, records: bool = False,
+               coordinates: bool = False) -> Iterator[Batch]:
+    """
+    Lotes de tubos lidos diretamente do arquivo INP (ver InpStreamReader)
+
+    Args:
+        inp_file_path: Caminho para o arquivo .inp
+        batch_size: Número máximo de tubos por lote
+        records: Se True, cada lote é um array estruturado do NumPy
+        coordinates: Se True, inclui os vértices dos tubos
+
+    Returns:
+        Iterator: Listas de Pipe ou arrays estruturados
+    """
+    return InpStreamReader(inp_file_path, batch_size, coordinates).iter_pipes(records)
+
+
+def iter_nodes(inp_file_path: str, batch_size: int = 10_000, records: bool = False,
+               coordinates: bool = False) -> Iterator[Tuple[str, Batch]]:
+    """
+    Lotes de nós lidos diretamente do arquivo INP (ver InpStreamReader)
+
+    Args:
+        inp_file_path: Caminho para o arquivo .inp
+        batch_size: Número máximo de nós por lote
+        records: Se True, cada lote é um array estruturado do NumPy
+        coordinates: Se True, inclui as coordenadas dos nós
+
+    Returns:
+        Iterator: Pares (tabela, lote), com tabela "junctions",
+            "reservoirs" ou "tanks"
+    """
+    return InpStreamReader(inp_file_path, batch_size, coordinates).iter_nodes(records)
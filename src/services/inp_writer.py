@@ -0,0 +1,321 @@
+import io
+import os
+from operator import attrgetter
+from typing import Any, Callable, Iterable, List, Optional, Sequence, TextIO
+import numpy as np
+
+from ..models.network import WaterNetwork
+from .inp_parser import UnitConverter, FLOW_UNIT_FACTORS
+
+# Linhas formatadas por bloco: limita a memória das seções muito grandes
+CHUNK_ROWS = 100_000
+PATTERN_VALUES_PER_LINE = 6
+
+# Comentário de tipo das curvas, como nos arquivos gravados pelo EPANET 2.2
+_CURVE_LABELS = {"HEAD": "PUMP", "EFFICIENCY": "EFFICIENCY", "VOLUME": "VOLUME",
+                 "HEADLOSS": "HEADLOSS"}
+
+
+def to_file_units(values: Sequence[float], factor: float) -> List[float]:
+    """
+    Converte valores do SI para as unidades do arquivo (valor / fator)
+
+    Quando a divisão não volta exatamente ao valor original ao ser
+    multiplicada pelo fator (como faz o parser), o resultado é ajustado em
+    uma unidade de arredondamento, de modo que a releitura seja exata.
+
+    Args:
+        values: Valores no SI
+        factor: Fator de conversão do arquivo para o SI
+
+    Returns:
+        List: Valores nas unidades do arquivo
+    """
+    if factor == 1.0 or not len(values):
+        return list(values)
+    si = np.asarray(values, dtype=np.float64)
+    converted = si / factor
+    for direction in (np.inf, -np.inf):
+        wrong = converted * factor != si
+        if not wrong.any():
+            break
+        candidate = np.nextafter(converted[wrong], direction)
+        fixed = candidate * factor == si[wrong]
+        converted[np.flatnonzero(wrong)[fixed]] = candidate[fixed]
+    return converted.tolist()
+
+
+def format_time(seconds: float) -> str:
+    """Formata um tempo em segundos como H:MM:SS (formato do [TIMES])"""
+    seconds = int(round(seconds))
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def _column(elements: List[Any], name: str) -> List[Any]:
+    return list(map(attrgetter(name), elements))
+
+
+def _text(values: Iterable[Optional[str]]) -> List[str]:
+    """Colunas opcionais de texto (None vira campo vazio)"""
+    return ["" if v is None else v for v in values]
+
+
+class InpWriter:
+    """
+    Grava uma WaterNetwork como arquivo INP do EPANET
+
+    Os valores do modelo (SI) são convertidos de volta para as unidades de
+    NetworkOptions.units, de modo que InpReader lê o arquivo gravado e
+    obtém a mesma rede. As seções grandes são formatadas em bloco, coluna a
+    coluna, com str.format sobre os valores de cada bloco de linhas.
+
+    O modelo não guarda as seções de controles, regras, qualidade e
+    relatório, os dados de energia além das curvas de eficiência das bombas
+    nem o estado inicial de bombas/válvulas; essas informações não aparecem
+    no arquivo gravado. Também não guarda a curva de perda de carga das
+    GPVs, então redes com GPVs não podem ser gravadas (ValueError).
+    """
+
+    def __init__(self, chunk_rows: int = CHUNK_ROWS):
+        """
+        Args:
+            chunk_rows: Linhas formatadas por vez nas seções de elementos
+        """
+        self.chunk_rows = chunk_rows
+
+    def write_inp_file(self, network: WaterNetwork, inp_file_path: str) -> None:
+        """
+        Grava a rede em um arquivo INP (de forma atômica)
+
+        Args:
+            network: Rede a gravar
+            inp_file_path: Caminho do arquivo de saída
+        """
+        tmp_path = f"{inp_file_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+                self.write(network, f)
+            os.replace(tmp_path, inp_file_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def to_string(self, network: WaterNetwork) -> str:
+        """Retorna o conteúdo INP da rede como string"""
+        buffer = io.StringIO()
+        self.write(network, buffer)
+        return buffer.getvalue()
+
+    def write(self, network: WaterNetwork, stream: TextIO) -> None:
+        """
+        Grava todas as seções da rede em um stream de texto
+
+        Args:
+            network: Rede a gravar
+            stream: Stream de texto aberto para escrita
+        """
+        options = network.options
+        if options.units.upper() not in FLOW_UNIT_FACTORS:
+            raise ValueError(f"Unidade de vazão desconhecida: {options.units}")
+        units = UnitConverter(flow_units=options.units.upper(),
+                              darcy_weisbach=options.headloss.upper() == "D-W")
+        write = stream.write
+
+        write("[TITLE]\n")
+        if network.title:
+            write(network.title + "\n")
+        write("\n")
+        self._write_junctions(network, units, write)
+        self._write_reservoirs(network, units, write)
+        self._write_tanks(network, units, write)
+        self._write_pipes(network, units, write)
+        self._write_pumps(network, units, write)
+        self._write_valves(network, units, write)
+        self._write_patterns(network, write)
+        self._write_curves(network, units, write)
+        self._write_energy(network, write)
+        self._write_options(network, write)
+        self._write_coordinates(network, write)
+        write("[END]\n")
+
+    def _write_rows(self, write: Callable[[str], Any], header: str, template: str,
+                    columns: Sequence[List[Any]]) -> None:
+        """Grava uma seção formatando as linhas em blocos de chunk_rows"""
+        write(header)
+        count = len(columns[0]) if columns else 0
+        size = self.chunk_rows
+        for start in range(0, count, size):
+            block = [column[start:start + size] for column in columns]
+            write("\n".join(map(template.format, *block)))
+            write("\n")
+        write("\n")
+
+    def _write_junctions(self, network: WaterNetwork, units: UnitConverter, write) -> None:
+        junctions = network.junctions
+        self._write_rows(
+            write,
+            "[JUNCTIONS]\n;ID\tElev\tDemand\tPattern\n",
+            " {}\t{!r}\t{!r}\t{}",
+            [_column(junctions, "id"),
+             to_file_units(_column(junctions, "elevation"), units.length),
+             to_file_units(_column(junctions, "demand"), units.flow),
+             _text(_column(junctions, "demand_pattern"))],
+        )
+
+    def _write_reservoirs(self, network: WaterNetwork, units: UnitConverter, write) -> None:
+        reservoirs = network.reservoirs
+        self._write_rows(
+            write,
+            "[RESERVOIRS]\n;ID\tHead\tPattern\n",
+            " {}\t{!r}\t{}",
+            [_column(reservoirs, "id"),
+             to_file_units(_column(reservoirs, "head"), units.length),
+             _text(_column(reservoirs, "head_pattern"))],
+        )
+
+    def _write_tanks(self, network: WaterNetwork, units: UnitConverter, write) -> None:
+        tanks = network.tanks
+        self._write_rows(
+            write,
+            "[TANKS]\n;ID\tElevation\tInitLevel\tMinLevel\tMaxLevel\tDiameter\tMinVol\tVolCurve\n",
+            " {}\t{!r}\t{!r}\t{!r}\t{!r}\t{!r}\t{!r}\t{}",
+            [_column(tanks, "id")]
+            + [to_file_units(_column(tanks, name), units.length)
+               for name in ("elevation", "init_level", "min_level", "max_level", "diameter")]
+            + [to_file_units(_column(tanks, "min_volume"), units.volume),
+               _text(_column(tanks, "volume_curve"))],
+        )
+
+    def _write_pipes(self, network: WaterNetwork, units: UnitConverter, write) -> None:
+        pipes = network.pipes
+        self._write_rows(
+            write,
+            "[PIPES]\n;ID\tNode1\tNode2\tLength\tDiameter\tRoughness\tMinorLoss\tStatus\n",
+            " {}\t{}\t{}\t{!r}\t{!r}\t{!r}\t{!r}\t{}",
+            [_column(pipes, "id"), _column(pipes, "from_node"), _column(pipes, "to_node"),
+             to_file_units(_column(pipes, "length"), units.length),
+             to_file_units(_column(pipes, "diameter"), units.pipe_diameter),
+             to_file_units(_column(pipes, "roughness"), units.roughness),
+             [float(v) for v in _column(pipes, "minor_loss")],
+             _column(pipes, "status")],
+        )
+
+    def _write_pumps(self, network: WaterNetwork, units: UnitConverter, write) -> None:
+        pumps = network.pumps
+        powers = to_file_units([p.power or 0.0 for p in pumps], units.power)
+        rows = []
+        for pump, power in zip(pumps, powers):
+            parameters = []
+            if pump.pump_curve:
+                parameters.append(f"HEAD {pump.pump_curve}")
+            if pump.power:
+                parameters.append(f"POWER {power!r}")
+            if pump.speed != 1.0:
+                parameters.append(f"SPEED {pump.speed!r}")
+            if pump.pattern:
+                parameters.append(f"PATTERN {pump.pattern}")
+            rows.append(" ".join(parameters))
+        self._write_rows(
+            write,
+            "[PUMPS]\n;ID\tNode1\tNode2\tParameters\n",
+            " {}\t{}\t{}\t{}",
+            [_column(pumps, "id"), _column(pumps, "from_node"), _column(pumps, "to_node"), rows],
+        )
+
+    def _write_valves(self, network: WaterNetwork, units: UnitConverter, write) -> None:
+        valves = network.valves
+        settings = []
+        for valve in valves:
+            valve_type = valve.valve_type.upper()
+            if valve_type == "GPV":
+                raise ValueError(f"GPV {valve.id}: o modelo não guarda a curva de perda de carga")
+            if valve_type in ("PRV", "PSV", "PBV"):
+                settings.append(to_file_units([valve.setting], units.pressure)[0])
+            elif valve_type == "FCV":
+                settings.append(to_file_units([valve.setting], units.flow)[0])
+            else:
+                settings.append(float(valve.setting))
+        self._write_rows(
+            write,
+            "[VALVES]\n;ID\tNode1\tNode2\tDiameter\tType\tSetting\tMinorLoss\n",
+            " {}\t{}\t{}\t{!r}\t{}\t{!r}\t{!r}",
+            [_column(valves, "id"), _column(valves, "from_node"), _column(valves, "to_node"),
+             to_file_units(_column(valves, "diameter"), units.pipe_diameter),
+             [v.valve_type.upper() for v in valves], settings,
+             [float(v) for v in _column(valves, "minor_loss")]],
+        )
+
+    def _write_patterns(self, network: WaterNetwork, write) -> None:
+        ids, values = [], []
+        step = PATTERN_VALUES_PER_LINE
+        for pattern in network.patterns:
+            multipliers = pattern.multipliers or []
+            for start in range(0, max(len(multipliers), 1), step):
+                ids.append(pattern.id)
+                values.append("\t".join(map(repr, map(float, multipliers[start:start + step]))))
+        self._write_rows(write, "[PATTERNS]\n;ID\tMultipliers\n", " {}\t{}", [ids, values])
+
+    def _write_curves(self, network: WaterNetwork, units: UnitConverter, write) -> None:
+        """
+        Grava as curvas nas unidades do arquivo
+
+        O parser tipifica as curvas pelo uso (bombas e tanques); curvas sem
+        esse uso são relidas sem conversão, então são gravadas como estão.
+        """
+        used = {p.pump_curve: "HEAD" for p in network.pumps if p.pump_curve}
+        used.update((p.efficiency_curve, "EFFICIENCY") for p in network.pumps if p.efficiency_curve)
+        used.update((t.volume_curve, "VOLUME") for t in network.tanks if t.volume_curve)
+        factors = {"HEAD": (units.flow, units.length), "EFFICIENCY": (units.flow, 1.0),
+                   "VOLUME": (units.length, units.volume)}
+        write("[CURVES]\n;ID\tX-Value\tY-Value\n")
+        for curve in network.curves:
+            fx, fy = factors.get(used.get(curve.id), (1.0, 1.0))
+            label = _CURVE_LABELS.get(str(curve.curve_type).upper())
+            if label:
+                write(f";{label}:\n")
+            xs, ys = to_file_units(curve.x_values, fx), to_file_units(curve.y_values, fy)
+            write("".join(f" {curve.id}\t{x!r}\t{y!r}\n" for x, y in zip(xs, ys)))
+        write("\n")
+
+    def _write_energy(self, network: WaterNetwork, write) -> None:
+        pumps = [p for p in network.pumps if p.efficiency_curve]
+        self._write_rows(
+            write,
+            "[ENERGY]\n",
+            " Pump\t{}\tEfficiency\t{}",
+            [_column(pumps, "id"), _column(pumps, "efficiency_curve")],
+        )
+
+    def _write_options(self, network: WaterNetwork, write) -> None:
+        options = network.options
+        write("[TIMES]\n")
+        write(f" Duration\t{format_time(options.duration)}\n")
+        write(f" Hydraulic Timestep\t{format_time(options.hydraulic_timestep)}\n")
+        write(f" Quality Timestep\t{format_time(options.quality_timestep)}\n")
+        write("\n[OPTIONS]\n")
+        write(f" Units\t{options.units.upper()}\n")
+        write(f" Headloss\t{options.headloss.upper()}\n")
+        write(f" Pressure\t{options.pressure.upper()}\n")
+        if options.pattern:
+            write(f" Pattern\t{options.pattern}\n")
+        write("\n")
+
+    def _write_coordinates(self, network: WaterNetwork, write) -> None:
+        nodes = [n for group in (network.junctions, network.reservoirs, network.tanks)
+                 for n in group if n.coordinates is not None]
+        self._write_rows(
+            write,
+            "[COORDINATES]\n;Node\tX-Coord\tY-Coord\n",
+            " {}\t{!r}\t{!r}",
+            [[n.id for n in nodes], [float(n.coordinates.x) for n in nodes],
+             [float(n.coordinates.y) for n in nodes]],
+        )
+        ids, xs, ys = [], [], []
+        for group in (network.pipes, network.pumps, network.valves):
+            for link in group:
+                for vertex in link.vertices:
+                    ids.append(link.id)
+                    xs.append(float(vertex.x))
+                    ys.append(float(vertex.y))
+        self._write_rows(write, "[VERTICES]\n;Link\tX-Coord\tY-Coord\n", " {}\t{!r}\t{!r}",
+                         [ids, xs, ys])
@@ -1,39 +1,83 @@
-import json
-from typing import Dict, Any
-from ..models.network import WaterNetwork
+from typing import Dict, Any, Optional
+from ..models.network import WaterNetwork, gc_paused
+from ..utils.json_backend import get_backend
+from ..utils.profiling import stage
+from .json_index import NetworkJsonIndex
+from .json_writer import JsonStreamWriter
 
 
 class JsonConverter:
     """Classe para converter objetos de rede para JSON"""
     
     @staticmethod
-    def network_to_json(network: WaterNetwork, indent: int = 2) -> str:
+    def network_to_json(network: WaterNetwork, indent: int = 2, compact: bool = False,
+                        backend: Optional[str] = None) -> str:
         """
         Converte um objeto WaterNetwork para JSON
         
         Args:
             network: Objeto WaterNetwork
             indent: Indentação do JSON
+            compact: Se True, gera JSON sem indentação nem espaços
+            backend: "orjson", "msgspec", "json" ou None para o mais rápido instalado
             
         Returns:
             str: String JSON formatada
         """
-        network_dict = network.to_dict()
-        return json.dumps(network_dict, indent=indent, ensure_ascii=False)
+        json_backend = get_backend(backend)
+        with stage("json.dumps", backend=json_backend.name) as span:
+            text = json_backend.dumps(network, indent=indent, compact=compact)
+            stats = network.statistics()
+            span.set_elements(stats["total_nodes"] + stats["total_links"])
+        return text
     
     @staticmethod
-    def network_to_file(network: WaterNetwork, output_path: str, indent: int = 2) -> None:
+    def network_to_bytes(network: WaterNetwork, indent: int = 2, compact: bool = False,
+                         backend: Optional[str] = None) -> bytes:
+        """
+        Converte um objeto WaterNetwork para JSON codificado em UTF-8
+        
+        Evita a decodificação para str quando o destino é uma resposta HTTP
+        ou um arquivo binário.
+        
+        Args:
+            network: Objeto WaterNetwork
+            indent: Indentação do JSON
+            compact: Se True, gera JSON sem indentação nem espaços
+            backend: "orjson", "msgspec", "json" ou None para o mais rápido instalado
+            
+        Returns:
+            bytes: JSON em UTF-8
+        """
+        json_backend = get_backend(backend)
+        with stage("json.dumps", backend=json_backend.name) as span:
+            data = json_backend.dumpb(network, indent=indent, compact=compact)
+            stats = network.statistics()
+            span.set_elements(stats["total_nodes"] + stats["total_links"])
+            span.set_attribute("bytes", len(data))
+        return data
+    
+    @staticmethod
+    def network_to_file(network: WaterNetwork, output_path: str, indent: int = 2,
+                        compact: bool = False) -> None:
         """
         Salva a rede em um arquivo JSON
         
+        Os elementos são escritos um a um, sem montar o documento inteiro em
+        memória; o conteúdo é idêntico ao de network_to_json com o backend
+        da biblioteca padrão.
+        
         Args:
             network: Objeto WaterNetwork
             output_path: Caminho do arquivo de saída
             indent: Indentação do JSON
+            compact: Se True, gera JSON sem indentação nem espaços
         """
-        json_str = JsonConverter.network_to_json(network, indent)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(json_str)
+        with stage("json.write_file", path=output_path) as span:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                JsonStreamWriter(f, indent, compact=compact).write_network(network)
+            stats = network.statistics()
+            span.set_elements(stats["total_nodes"] + stats["total_links"])
     
     @staticmethod
     def json_to_dict(json_str: str) -> Dict[str, Any]:
@@ -46,7 +90,8 @@ class JsonConverter:
         Returns:
             Dict: Dicionário Python
         """
-        return json.loads(json_str)
+        with stage("json.loads"):
+            return get_backend().loads(json_str)
     
     @staticmethod
     def file_to_dict(json_path: str) -> Dict[str, Any]:
@@ -59,5 +104,54 @@ class JsonConverter:
         Returns:
             Dict: Dicionário Python
         """
-        with open(json_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with stage("json.loads", path=json_path):
+            with open(json_path, 'rb') as f:
+                return get_backend().loads(f.read())
+    
+    @staticmethod
+    def network_from_json(json_str: str) -> WaterNetwork:
+        """
+        Reconstrói a rede a partir de uma string JSON gerada por network_to_json
+        
+        Args:
+            json_str: String (ou bytes) JSON
+            
+        Returns:
+            WaterNetwork: Objeto da rede
+        """
+        with gc_paused():
+            data = JsonConverter.json_to_dict(json_str)
+            with stage("network.from_dict"):
+                return WaterNetwork.from_dict(data)
+    
+    @staticmethod
+    def network_from_file(json_path: str) -> WaterNetwork:
+        """
+        Reconstrói a rede a partir de um arquivo JSON gerado por network_to_file,
+        sem precisar reler o arquivo INP original
+        
+        Args:
+            json_path: Caminho do arquivo JSON
+            
+        Returns:
+            WaterNetwork: Objeto da rede
+        """
+        with gc_paused():
+            data = JsonConverter.file_to_dict(json_path)
+            with stage("network.from_dict"):
+                return WaterNetwork.from_dict(data)
+    
+    @staticmethod
+    def open_index(json_path: str, use_sidecar: bool = True) -> NetworkJsonIndex:
+        """
+        Abre um arquivo JSON para leitura sob demanda de seções e elementos,
+        sem carregar o arquivo inteiro
+        
+        Args:
+            json_path: Caminho do arquivo JSON
+            use_sidecar: Se True, reaproveita/grava o índice em json_path + ".idx"
+            
+        Returns:
+            NetworkJsonIndex: Índice do arquivo (feche com close() ou use em with)
+        """
+        return NetworkJsonIndex(json_path, use_sidecar)
@@ -0,0 +1,268 @@
+import json
+import mmap
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from ..utils.json_backend import get_backend
+
+# Tokens estruturais: chave ("...":), string ou delimitador de contêiner
+_TOKEN_RE = re.compile(rb'"(?:[^"\\]|\\.)*"\s*:|"(?:[^"\\]|\\.)*"|[{}\[\]]')
+_STRING_RE = re.compile(rb'"(?:[^"\\]|\\.)*"')
+_WS_RE = re.compile(rb'\s*')
+_LITERAL_RE = re.compile(rb'[^,}\]\s]+')
+_SEP_RE = re.compile(r'[\s,]*')
+
+# Tamanho dos blocos de texto decodificados ao indexar arrays de elementos
+_CHUNK_SIZE = 1 << 20
+
+# Grupos de elementos: seção de topo que os contém (None = o próprio topo)
+ELEMENT_GROUPS = {
+    "junctions": "nodes", "reservoirs": "nodes", "tanks": "nodes",
+    "pipes": "links", "pumps": "links", "valves": "links",
+    "patterns": None, "curves": None,
+}
+
+INDEX_VERSION = 1
+
+
+def _decode_key(token: bytes) -> str:
+    raw = token[:token.rindex(b'"') + 1]
+    if b"\\" in raw:
+        return json.loads(raw)
+    return raw[1:-1].decode("utf-8")
+
+
+class NetworkJsonIndex:
+    """
+    Acesso indexado a um JSON de rede sem carregar o arquivo inteiro
+
+    Na abertura, o arquivo é mapeado em memória (mmap) e percorrido uma vez
+    para registrar o intervalo de bytes de cada seção de topo e de cada
+    elemento (por grupo e id). O índice pode ser salvo em um arquivo auxiliar
+    (<arquivo>.idx), reaproveitado enquanto o JSON não mudar.
+    """
+
+    def __init__(self, json_path: str, use_sidecar: bool = True):
+        """
+        Args:
+            json_path: Caminho do arquivo JSON gerado pelo JsonConverter
+            use_sidecar: Se True, lê/grava o índice em json_path + ".idx"
+        """
+        self.json_path = json_path
+        self.sidecar_path = json_path + ".idx"
+        self._backend = get_backend()
+        self._decoder = json.JSONDecoder()
+        self._file = open(json_path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.sections: Dict[str, Tuple[int, int]] = {}
+        self.elements: Dict[str, Dict[str, Tuple[int, int]]] = {}
+
+        if not (use_sidecar and self._load_sidecar()):
+            self._build()
+            if use_sidecar:
+                self._save_sidecar()
+
+    def __enter__(self) -> "NetworkJsonIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Libera o mapeamento de memória e o arquivo"""
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._file.close()
+
+    def section(self, name: str) -> Any:
+        """
+        Retorna uma seção de topo ("title", "nodes", "links", "patterns",
+        "curves", "options" ou "statistics") já desserializada
+
+        Args:
+            name: Nome da seção
+
+        Returns:
+            Any: Valor da seção
+        """
+        start, end = self.sections[name]
+        return self._backend.loads(self._mm[start:end])
+
+    def element(self, group: str, element_id: str) -> Dict[str, Any]:
+        """
+        Retorna um único elemento (como dicionário) pelo grupo e id
+
+        Args:
+            group: "junctions", "pipes", "patterns", etc.
+            element_id: Id do elemento
+
+        Returns:
+            Dict: Elemento no mesmo formato do to_dict()
+        """
+        start, end = self.elements[group][element_id]
+        return self._backend.loads(self._mm[start:end])
+
+    def find(self, element_id: str) -> Optional[Dict[str, Any]]:
+        """Procura um id em todos os grupos, retornando o primeiro encontrado"""
+        for group, offsets in self.elements.items():
+            if element_id in offsets:
+                return self.element(group, element_id)
+        return None
+
+    def ids(self, group: str) -> List[str]:
+        """Lista os ids de um grupo na ordem do arquivo"""
+        return list(self.elements.get(group, {}))
+
+    def _signature(self) -> Dict[str, int]:
+        stat = os.stat(self.json_path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def _load_sidecar(self) -> bool:
+        """Carrega o índice auxiliar, se existir e corresponder ao JSON atual"""
+        try:
+            with open(self.sidecar_path, "rb") as f:
+                data = self._backend.loads(f.read())
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != INDEX_VERSION or data.get("source") != self._signature():
+            return False
+        self.sections = {name: tuple(span) for name, span in data["sections"].items()}
+        self.elements = {
+            group: dict(zip(entry["ids"], zip(entry["starts"], entry["ends"])))
+            for group, entry in data["elements"].items()
+        }
+        return True
+
+    def _save_sidecar(self) -> None:
+        """Grava o índice auxiliar de forma atômica"""
+        data = {
+            "version": INDEX_VERSION,
+            "source": self._signature(),
+            "sections": self.sections,
+            "elements": {
+                group: {
+                    "ids": list(offsets),
+                    "starts": [span[0] for span in offsets.values()],
+                    "ends": [span[1] for span in offsets.values()],
+                }
+                for group, offsets in self.elements.items()
+            },
+        }
+        tmp_path = f"{self.sidecar_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(self._backend.dumpb(data, compact=True))
+            os.replace(tmp_path, self.sidecar_path)
+        except OSError:
+            # Sem permissão de escrita: o índice continua válido em memória
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _build(self) -> None:
+        """
+        Percorre o arquivo uma vez registrando os intervalos de bytes
+
+        A estrutura de topo é lida por tokens; os arrays de elementos são
+        delegados a _index_group, que decodifica elemento por elemento.
+        """
+        mm = self._mm
+        search = _TOKEN_RE.search
+        depth = 0
+        top_key: Optional[str] = None    # chave de topo atual
+        top_start = -1                   # início do valor da seção atual
+        pos = 0
+
+        while True:
+            match = search(mm, pos)
+            if match is None:
+                break
+            token = match.group()
+            pos = match.end()
+            first = token[:1]
+            if first == b"{" or first == b"[":
+                depth += 1
+            elif first == b"}" or first == b"]":
+                if depth == 2 and top_key is not None:
+                    self.sections[top_key] = (top_start, pos)
+                    top_key = None
+                depth -= 1
+            elif token[-1:] == b":":
+                key = _decode_key(token)
+                start = _WS_RE.match(mm, pos).end()
+                lead = mm[start:start + 1]
+                if depth == 1:
+                    if lead not in (b"{", b"["):
+                        scalar = _STRING_RE.match(mm, start) or _LITERAL_RE.match(mm, start)
+                        pos = scalar.end()
+                        self.sections[key] = (start, pos)
+                    elif lead == b"[" and key in ELEMENT_GROUPS and ELEMENT_GROUPS[key] is None:
+                        self.elements[key], pos = self._index_group(start)
+                        self.sections[key] = (start, pos)
+                    else:
+                        top_key, top_start = key, start
+                elif depth == 2 and lead == b"[" and top_key is not None \
+                        and ELEMENT_GROUPS.get(key) == top_key:
+                    self.elements[key], pos = self._index_group(start)
+
+    def _index_group(self, start: int) -> Tuple[Dict[str, Tuple[int, int]], int]:
+        """
+        Indexa os objetos de um array de elementos
+
+        O array é decodificado em blocos de texto e cada elemento com o
+        decodificador JSON em C (raw_decode), registrando os bytes de início e
+        fim de cada um pelo seu id.
+
+        Args:
+            start: Posição do "[" que abre o array
+
+        Returns:
+            Tuple: (offsets por id, posição logo após o "]")
+        """
+        mm = self._mm
+        size = len(mm)
+        decode = self._decoder.raw_decode
+        offsets: Dict[str, Tuple[int, int]] = {}
+        chunk = _CHUNK_SIZE
+
+        base = start + 1                 # byte correspondente a text[0]
+        text, ascii_text, text_bytes = self._read_text(base, chunk)
+        i = 0
+        cursor_char = cursor_byte = 0    # posição já convertida para bytes
+        while True:
+            i = _SEP_RE.match(text, i).end()
+            if not ascii_text:
+                cursor_byte += len(text[cursor_char:i].encode("utf-8"))
+                cursor_char = i
+            element_start = base + (i if ascii_text else cursor_byte)
+            if i < len(text) and text[i] == "]":
+                return offsets, element_start + 1
+            try:
+                if i >= len(text):
+                    raise json.JSONDecodeError("Fim do bloco", text, i)
+                obj, end = decode(text, i)
+            except json.JSONDecodeError:
+                # Elemento cortado no fim do bloco: relê a partir dele
+                if base + text_bytes >= size:
+                    raise
+                if i == 0:
+                    chunk *= 2
+                base = element_start
+                text, ascii_text, text_bytes = self._read_text(base, chunk)
+                i = cursor_char = cursor_byte = 0
+                continue
+            if not ascii_text:
+                cursor_byte += len(text[cursor_char:end].encode("utf-8"))
+                cursor_char = end
+            offsets[obj["id"]] = (element_start, base + (end if ascii_text else cursor_byte))
+            i = end
+
+    def _read_text(self, start: int, length: int) -> Tuple[str, bool, int]:
+        """Decodifica um bloco do arquivo sem cortar caracteres UTF-8 ao meio"""
+        mm = self._mm
+        end = min(start + length, len(mm))
+        if end < len(mm):
+            while end > start and mm[end] & 0xC0 == 0x80:
+                end -= 1
+        text = mm[start:end].decode("utf-8")
+        return text, len(text) == end - start, end - start
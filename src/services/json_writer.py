@@ -0,0 +1,111 @@
+import json
+from typing import Any, Dict, Iterable, Optional, TextIO, Union
+from ..models.network import WaterNetwork
+
+
+class JsonStreamWriter:
+    """
+    Escreve a rede em JSON elemento por elemento, direto no arquivo
+
+    A saída é idêntica (byte a byte) à de json.dumps(network.to_dict(),
+    indent=indent, ensure_ascii=False), mas apenas um elemento é convertido
+    para dicionário por vez, de modo que a memória não cresce com a rede.
+    """
+
+    def __init__(self, stream: TextIO, indent: Optional[Union[int, str]] = 2,
+                 compact: bool = False):
+        """
+        Args:
+            stream: Arquivo (modo texto) de destino
+            indent: Indentação do JSON
+            compact: Se True, ignora indent e escreve sem espaços
+                (separadores "," e ":"), para consumo por máquinas
+        """
+        self.stream = stream
+        self.indent = None if compact else indent
+        if compact:
+            self._unit = None
+            self._item_sep, self._key_sep = ",", ":"
+        elif indent is None:
+            self._unit = None
+            self._item_sep, self._key_sep = ", ", ": "
+        else:
+            self._unit = " " * indent if isinstance(indent, int) else indent
+            self._item_sep, self._key_sep = ",", ": "
+        self._encoder = json.JSONEncoder(
+            indent=self.indent, ensure_ascii=False,
+            separators=(self._item_sep, self._key_sep)
+        )
+
+    def write_network(self, network: WaterNetwork) -> None:
+        """
+        Escreve a rede completa no stream
+
+        Args:
+            network: Objeto WaterNetwork
+        """
+        self.write_value(network.to_shallow_dict())
+
+    def write_value(self, value: Any, depth: int = 0) -> None:
+        """
+        Escreve um valor: dicionários e iteráveis de elementos são escritos
+        incrementalmente; os demais valores via json.dumps
+
+        Args:
+            value: Dicionário, iterável de objetos com to_dict() ou valor JSON
+            depth: Nível de aninhamento atual
+        """
+        if isinstance(value, dict):
+            self._write_dict(value, depth)
+        elif isinstance(value, (str, int, float, bool)) or value is None:
+            self.stream.write(self._encoder.encode(value))
+        else:
+            self._write_items(value, depth)
+
+    def _newline(self, depth: int) -> str:
+        if self._unit is None:
+            return ""
+        return "\n" + self._unit * depth
+
+    def _write_dict(self, value: Dict[str, Any], depth: int) -> None:
+        write = self.stream.write
+        if not value:
+            write("{}")
+            return
+        write("{")
+        inner = self._newline(depth + 1)
+        first = True
+        for key, item in value.items():
+            if not first:
+                write(self._item_sep)
+            first = False
+            write(inner)
+            write(json.dumps(key, ensure_ascii=False))
+            write(self._key_sep)
+            self.write_value(item, depth + 1)
+        write(self._newline(depth))
+        write("}")
+
+    def _write_items(self, items: Iterable[Any], depth: int) -> None:
+        write = self.stream.write
+        inner = self._newline(depth + 1)
+        first = True
+        for item in items:
+            write("[" if first else self._item_sep)
+            first = False
+            write(inner)
+            self._write_element(item, depth + 1)
+        if first:
+            write("[]")
+            return
+        write(self._newline(depth))
+        write("]")
+
+    def _write_element(self, item: Any, depth: int) -> None:
+        data = item.to_dict() if hasattr(item, "to_dict") else item
+        text = self._encoder.encode(data)
+        if self._unit is not None and depth:
+            # json.dumps escapa quebras de linha dentro de strings, então toda
+            # quebra de linha do texto é estrutural
+            text = text.replace("\n", self._newline(depth))
+        self.stream.write(text)
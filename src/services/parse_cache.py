@@ -0,0 +1,193 @@
+import hashlib
+import os
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Optional
+
+from ..models.network import WaterNetwork
+from .snapshot import NetworkSnapshot, SnapshotError, SNAPSHOT_VERSION
+
+# Versão da saída do leitor: incrementar sempre que a conversão INP -> modelo
+# mudar, para que entradas antigas do cache deixem de ser usadas
+READER_VERSION = 1
+
+_ENTRY_SUFFIX = ".snap"
+_TMP_SUFFIX = ".tmp"
+_STALE_TMP_SECONDS = 3600
+_HASH_BLOCK = 1 << 20
+
+
+@dataclass
+class CacheStats:
+    """Contadores de uso do cache (por processo)"""
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    errors: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["hit_rate"] = self.hit_rate
+        return data
+
+
+class ParseCache:
+    """
+    Cache em disco de redes já lidas, indexado pelo conteúdo do arquivo INP
+
+    Cada entrada é um snapshot binário (NetworkSnapshot) cujo nome é o hash
+    SHA-256 do conteúdo do arquivo, da engine e das versões do leitor e do
+    snapshot. As gravações são atômicas (arquivo temporário + os.replace), de
+    modo que vários processos podem compartilhar o mesmo diretório. Quando o
+    tamanho total passa de max_bytes, as entradas usadas há mais tempo
+    (pelo mtime, atualizado a cada acerto) são removidas.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 1 << 30):
+        """
+        Args:
+            directory: Diretório do cache (criado se não existir)
+            max_bytes: Tamanho máximo total das entradas
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        os.makedirs(directory, exist_ok=True)
+
+    def key_for(self, inp_file_path: str, engine: str = "native") -> str:
+        """
+        Calcula a chave de cache de um arquivo INP
+
+        Args:
+            inp_file_path: Caminho do arquivo
+            engine: Engine de leitura usada pelo InpReader
+
+        Returns:
+            str: Hash hexadecimal da entrada
+        """
+        digest = hashlib.sha256(f"{READER_VERSION}:{SNAPSHOT_VERSION}:{engine}:".encode("utf-8"))
+        if engine == "wntr":
+            # Sem [TITLE], o WNTR usa o nome do arquivo como título
+            digest.update(os.path.abspath(inp_file_path).encode("utf-8") + b"\0")
+        with open(inp_file_path, "rb") as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[WaterNetwork]:
+        """
+        Retorna a rede armazenada para a chave, ou None se não houver
+
+        Entradas corrompidas são descartadas e contadas como falha.
+        """
+        path = self._entry_path(key)
+        try:
+            network = NetworkSnapshot.load_network(path)
+        except FileNotFoundError:
+            self.stats.misses += 1
+            return None
+        except (OSError, SnapshotError, KeyError, ValueError):
+            self.stats.errors += 1
+            self.stats.misses += 1
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)  # marca como usada recentemente (LRU)
+        except OSError:
+            pass
+        self.stats.hits += 1
+        return network
+
+    def put(self, key: str, network: WaterNetwork) -> None:
+        """
+        Armazena a rede e aplica o limite de tamanho do cache
+
+        Falhas ao gravar (disco, ou uma rede que o snapshot não representa)
+        são apenas contadas: o cache nunca impede a leitura.
+        """
+        path = self._entry_path(key)
+        try:
+            NetworkSnapshot.save(network, path)
+        except Exception:
+            self.stats.errors += 1
+            self._remove(path)
+            return
+        self.stats.stores += 1
+        self.evict(keep=key)
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """
+        Remove as entradas menos usadas até o cache caber em max_bytes
+
+        Args:
+            keep: Chave que não deve ser removida (a recém-gravada)
+
+        Returns:
+            int: Número de entradas removidas
+        """
+        entries = []
+        total = 0
+        now = time.time()
+        for entry in os.scandir(self.directory):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue  # removida por outro processo
+            if entry.name.endswith(_TMP_SUFFIX):
+                # Temporário abandonado por um processo interrompido
+                if now - stat.st_mtime > _STALE_TMP_SECONDS:
+                    self._remove(entry.path)
+                continue
+            if not entry.name.endswith(_ENTRY_SUFFIX):
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        removed = 0
+        keep_path = self._entry_path(keep) if keep else None
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep_path:
+                continue
+            if self._remove(path):
+                removed += 1
+            total -= size
+        self.stats.evictions += removed
+        return removed
+
+    def clear(self) -> None:
+        """Remove todas as entradas do cache"""
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(_ENTRY_SUFFIX):
+                self._remove(entry.path)
+
+    @property
+    def size_bytes(self) -> int:
+        """Tamanho total atual das entradas em disco"""
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(_ENTRY_SUFFIX):
+                try:
+                    total += entry.stat().st_size
+                except FileNotFoundError:
+                    pass
+        return total
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _ENTRY_SUFFIX)
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            # Já removida por outro processo ou ainda aberta (Windows)
+            return False
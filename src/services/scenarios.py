@@ -0,0 +1,442 @@
+import json
+import os
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Generator, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+from ..models.network import WaterNetwork
+from ..utils.json_backend import get_backend
+from .hydraulics import HydraulicSolver
+from .snapshot import NetworkSnapshot
+
+# Alteração de um atributo: array com um valor por elemento (na ordem da rede)
+# ou dicionário {id: valor} apenas com os elementos alterados
+Override = Union[np.ndarray, Sequence[float], Dict[str, float]]
+
+RESULT_FORMATS = ("jsonl", "binary")
+_RESULT_FIELDS = ("heads", "pressures", "flows")
+
+
+@dataclass
+class Scenario:
+    """
+    Alterações de um cenário sobre a rede base
+
+    Nada da rede é copiado: cada alteração é um array compacto ou um
+    dicionário esparso, aplicado pelo solver apenas durante o solve().
+    """
+    id: str
+    demands: Optional[Override] = None         # demanda base por junção (m³/s), antes do padrão
+    roughness: Optional[Override] = None       # por tubo (unidades do modelo)
+    valve_settings: Optional[Override] = None  # por válvula (unidades do modelo)
+    closed_links: Sequence[str] = ()
+    time: float = 0.0
+
+
+@dataclass
+class ScenarioResult:
+    """Resultado de um cenário, com arrays na ordem da topologia da rede"""
+    scenario_id: str
+    converged: bool = False
+    iterations: int = 0
+    relative_error: float = 0.0
+    heads: Optional[np.ndarray] = None
+    pressures: Optional[np.ndarray] = None
+    flows: Optional[np.ndarray] = None
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "scenario": self.scenario_id,
+            "converged": self.converged,
+            "iterations": self.iterations,
+            "relative_error": self.relative_error,
+            "seconds": self.seconds,
+            "error": self.error,
+            "heads": self.heads,
+            "pressures": self.pressures,
+            "flows": self.flows,
+        }
+
+
+@dataclass
+class ScenarioSummary:
+    """Resumo de uma execução de cenários"""
+    scenarios: int = 0
+    failed: List[str] = field(default_factory=list)
+    not_converged: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+    workers: int = 1
+    output_path: Optional[str] = None
+
+    @property
+    def scenarios_per_second(self) -> float:
+        return self.scenarios / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "scenarios": self.scenarios,
+            "failed": self.failed,
+            "not_converged": self.not_converged,
+            "elapsed": self.elapsed,
+            "workers": self.workers,
+            "scenarios_per_second": self.scenarios_per_second,
+            "output_path": self.output_path,
+        }
+
+    def format(self) -> str:
+        """Resumo legível da execução"""
+        return (
+            f"{self.scenarios - len(self.failed)}/{self.scenarios} cenários resolvidos em "
+            f"{self.elapsed:.2f}s com {self.workers} processo(s) - "
+            f"{self.scenarios_per_second:.1f} cenários/s, "
+            f"{len(self.not_converged)} sem convergência"
+        )
+
+
+def _resolve(base: np.ndarray, override: Optional[Override], positions: Dict[str, int],
+             kind: str) -> Optional[np.ndarray]:
+    """Converte uma alteração (array ou {id: valor}) em um array completo"""
+    if override is None:
+        return None
+    if isinstance(override, dict):
+        values = base.copy()
+        for element_id, value in override.items():
+            if element_id not in positions:
+                raise KeyError(f"Id inexistente ({kind}): {element_id}")
+            values[positions[element_id]] = value
+        return values
+    values = np.asarray(override, dtype=np.float64)
+    if values.shape != base.shape:
+        raise ValueError(f"Esperado um valor por {kind} ({len(base)}), recebidos {len(values)}")
+    return values
+
+
+class _ScenarioSolver:
+    """HydraulicSolver da rede base e os índices para aplicar as alterações"""
+
+    def __init__(self, network: WaterNetwork, accuracy: float, max_trials: int):
+        self.solver = solver = HydraulicSolver(network, accuracy=accuracy, max_trials=max_trials)
+        ids = solver.topology.node_ids
+        self.junctions = {node_id: i for i, node_id in enumerate(ids[:solver.n_junctions])}
+        link_ids = solver.topology.link_ids
+        self.pipes = {link_id: i for i, link_id in enumerate(link_ids[:len(solver.pipe_links)])}
+        first_valve = len(link_ids) - len(solver.valve_links)
+        self.valves = {link_id: i for i, link_id in enumerate(link_ids[first_valve:])}
+
+    def run(self, scenario: Scenario) -> ScenarioResult:
+        """Resolve um cenário, capturando qualquer erro no resultado"""
+        start = time.perf_counter()
+        solver = self.solver
+        try:
+            demands = _resolve(solver.base_demands, scenario.demands, self.junctions, "junção")
+            if demands is not None:
+                demands = demands * solver.patterns.values(solver.demand_pattern, [scenario.time])[:, 0]
+            results = solver.solve(
+                time=scenario.time,
+                demands=demands,
+                closed_links=scenario.closed_links or None,
+                roughness=_resolve(solver.pipe_roughness, scenario.roughness, self.pipes, "tubo"),
+                valve_settings=_resolve(solver.valve_setting, scenario.valve_settings,
+                                        self.valves, "válvula"),
+            )
+        except Exception as e:
+            return ScenarioResult(scenario.id, seconds=time.perf_counter() - start,
+                                  error=f"{type(e).__name__}: {e}")
+        return ScenarioResult(
+            scenario.id, results.converged, results.iterations, results.relative_error,
+            results.heads, results.pressures, results.flows, time.perf_counter() - start,
+        )
+
+
+# Solver de cada processo do pool, criado uma única vez pelo initializer
+_worker_solver: Optional[_ScenarioSolver] = None
+
+
+def _init_worker(snapshot_path: str, accuracy: float, max_trials: int) -> None:
+    global _worker_solver
+    _worker_solver = _ScenarioSolver(NetworkSnapshot.load_network(snapshot_path), accuracy, max_trials)
+
+
+def _run_in_worker(scenario: Scenario) -> ScenarioResult:
+    return _worker_solver.run(scenario)
+
+
+class JsonLinesResultWriter:
+    """
+    Grava os resultados em JSON Lines
+
+    A primeira linha traz os ids dos nós e links ({"nodes": [...],
+    "links": [...]}); cada linha seguinte é um ScenarioResult.to_dict(), com
+    os arrays na mesma ordem dos ids.
+    """
+
+    def __init__(self, path: str, node_ids: List[str], link_ids: List[str],
+                 backend: Optional[str] = None):
+        self.path = path
+        self._backend = get_backend(backend)
+        self._file = open(path, "wb")
+        self._write({"nodes": node_ids, "links": link_ids})
+
+    def _write(self, obj: Any) -> None:
+        self._file.write(self._backend.dumpb(obj, compact=True))
+        self._file.write(b"\n")
+
+    def write(self, result: ScenarioResult) -> None:
+        self._write(result.to_dict())
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class BinaryResultWriter:
+    """
+    Grava os resultados em registros binários de tamanho fixo
+
+    Cada cenário ocupa um registro float64 little-endian com cargas,
+    pressões e vazões (NaN para cenários com erro). Os ids, o layout e o
+    estado de cada cenário ficam em um arquivo JSON ao lado (<path>.json),
+    gravado em close(). load() abre os resultados via np.memmap.
+    """
+
+    def __init__(self, path: str, node_ids: List[str], link_ids: List[str]):
+        self.path = path
+        self.node_ids = node_ids
+        self.link_ids = link_ids
+        self.scenarios: List[Dict[str, Any]] = []
+        self._empty = np.full(2 * len(node_ids) + len(link_ids), np.nan, dtype="<f8")
+        self._file = open(path, "wb")
+
+    def write(self, result: ScenarioResult) -> None:
+        if result.ok:
+            record = np.concatenate([result.heads, result.pressures, result.flows]).astype("<f8")
+        else:
+            record = self._empty
+        self._file.write(record.tobytes())
+        meta = result.to_dict()
+        for name in _RESULT_FIELDS:
+            del meta[name]
+        self.scenarios.append(meta)
+
+    def close(self) -> None:
+        self._file.close()
+        meta = {
+            "dtype": "<f8",
+            "fields": {"heads": len(self.node_ids), "pressures": len(self.node_ids),
+                       "flows": len(self.link_ids)},
+            "nodes": self.node_ids,
+            "links": self.link_ids,
+            "scenarios": self.scenarios,
+        }
+        with open(f"{self.path}.json", "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+    @staticmethod
+    def load(path: str) -> Dict[str, Any]:
+        """
+        Abre resultados binários sem carregá-los na memória
+
+        Returns:
+            Dict: Metadados (nodes, links, scenarios) e uma matriz
+                cenários x elementos (np.memmap) por campo
+        """
+        with open(f"{path}.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        sizes = meta["fields"]
+        width = sum(sizes.values())
+        count = len(meta["scenarios"])
+        data = {"nodes": meta["nodes"], "links": meta["links"], "scenarios": meta["scenarios"]}
+        if not count or not width:
+            for name, size in sizes.items():
+                data[name] = np.empty((count, size))
+            return data
+        records = np.memmap(path, dtype=meta["dtype"], mode="r", shape=(count, width))
+        offset = 0
+        for name in _RESULT_FIELDS:
+            data[name] = records[:, offset:offset + sizes[name]]
+            offset += sizes[name]
+        return data
+
+
+class ScenarioRunner:
+    """
+    Executa muitos cenários sobre uma mesma rede base
+
+    A rede base nunca é copiada por cenário. Com mais de um processo, ela é
+    gravada uma vez como NetworkSnapshot em memória compartilhada (/dev/shm,
+    quando existir) e cada processo do pool a mapeia e monta o seu
+    HydraulicSolver uma única vez; os cenários levam apenas as alterações.
+    Os resultados são gravados à medida que ficam prontos.
+
+    O solver da rede base é montado primeiro no processo principal, de modo
+    que erros da rede (ex.: junção isolada, curva inexistente) são lançados
+    com o tipo original. Se um processo do pool morrer, os cenários que
+    estavam em andamento são refeitos isoladamente e o restante continua em
+    um novo pool.
+    """
+
+    def __init__(self, network: WaterNetwork, workers: Optional[int] = None,
+                 accuracy: float = 0.001, max_trials: int = 200,
+                 shared_dir: Optional[str] = None):
+        """
+        Args:
+            network: Rede base (não é alterada)
+            workers: Número de processos (padrão: número de CPUs); com 1, os
+                cenários rodam no próprio processo
+            accuracy: Critério de convergência do solver
+            max_trials: Número máximo de iterações por cenário
+            shared_dir: Diretório do snapshot compartilhado (padrão:
+                /dev/shm, ou o diretório temporário do sistema)
+        """
+        self.network = network
+        self.workers = workers or os.cpu_count() or 1
+        self.accuracy = accuracy
+        self.max_trials = max_trials
+        if shared_dir is None:
+            shared_dir = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+        self.shared_dir = shared_dir
+        self._local: Optional[_ScenarioSolver] = None
+
+    def _local_solver(self) -> _ScenarioSolver:
+        if self._local is None:
+            self._local = _ScenarioSolver(self.network, self.accuracy, self.max_trials)
+        return self._local
+
+    def iter_results(self, scenarios: Iterable[Scenario]) -> Iterator[ScenarioResult]:
+        """
+        Resolve os cenários, entregando cada resultado assim que fica pronto
+
+        Com vários processos, a ordem é a de conclusão; no máximo
+        2 * workers cenários ficam enviados ao pool ao mesmo tempo.
+        """
+        # Valida a rede base aqui: no initializer do pool, um erro viraria
+        # apenas BrokenProcessPool
+        solver = self._local_solver()
+        if self.workers == 1:
+            for scenario in scenarios:
+                yield solver.run(scenario)
+            return
+
+        fd, snapshot_path = tempfile.mkstemp(suffix=".snap", dir=self.shared_dir)
+        os.close(fd)
+        try:
+            NetworkSnapshot.save(self.network, snapshot_path)
+            pending = iter(scenarios)
+            retry: Deque[Scenario] = deque()
+            exhausted = False
+            while not exhausted or retry:
+                suspects, exhausted = yield from self._run_pool(pending, retry, snapshot_path)
+                # Os cenários em execução quando o pool caiu são refeitos um a
+                # um, cada um em um processo próprio, para achar o responsável
+                for scenario in suspects:
+                    yield self._run_isolated(scenario, snapshot_path)
+        finally:
+            os.remove(snapshot_path)
+
+    def _executor(self, snapshot_path: str, workers: int) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(snapshot_path, self.accuracy, self.max_trials))
+
+    def _run_pool(self, pending: Iterator[Scenario], retry: Deque[Scenario],
+                  snapshot_path: str) -> Generator[ScenarioResult, None, Tuple[List[Scenario], bool]]:
+        """
+        Consome os cenários em um pool de processos até o fim ou até o pool cair
+
+        Args:
+            pending: Cenários ainda não enviados
+            retry: Cenários que não chegaram a rodar no pool anterior (enviados primeiro)
+            snapshot_path: Snapshot da rede base
+
+        Returns:
+            Tuple: Cenários em andamento quando o pool caiu e se pending acabou
+        """
+        suspects: List[Scenario] = []
+        in_flight: Dict[Future, Scenario] = {}
+        broken = exhausted = False
+        with self._executor(snapshot_path, self.workers) as executor:
+            while in_flight or not (broken or (exhausted and not retry)):
+                while not broken and len(in_flight) < 2 * self.workers:
+                    scenario = retry.popleft() if retry else None if exhausted else next(pending, None)
+                    if scenario is None:
+                        exhausted = True
+                        break
+                    try:
+                        in_flight[executor.submit(_run_in_worker, scenario)] = scenario
+                    except BrokenProcessPool:
+                        broken = True
+                        retry.appendleft(scenario)
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in [f for f in in_flight if f in done]:
+                    scenario = in_flight.pop(future)
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool:
+                        broken = True
+                        suspects.append(scenario)
+                        continue
+                    yield result
+        return suspects, exhausted
+
+    def _run_isolated(self, scenario: Scenario, snapshot_path: str) -> ScenarioResult:
+        """Resolve um único cenário em um processo exclusivo"""
+        start = time.perf_counter()
+        with self._executor(snapshot_path, 1) as executor:
+            try:
+                return executor.submit(_run_in_worker, scenario).result()
+            except BrokenProcessPool:
+                return ScenarioResult(scenario.id, seconds=time.perf_counter() - start,
+                                      error="Processo do cenário encerrado inesperadamente")
+
+    def run(self, scenarios: Iterable[Scenario], output_path: Optional[str] = None,
+            format: str = "jsonl", progress=None) -> ScenarioSummary:
+        """
+        Resolve os cenários e grava os resultados em arquivo
+
+        Args:
+            scenarios: Cenários (pode ser um gerador)
+            output_path: Arquivo de saída; sem ele, os resultados só passam
+                por progress
+            format: "jsonl" (JsonLinesResultWriter) ou "binary"
+                (BinaryResultWriter)
+            progress: Função opcional chamada com cada ScenarioResult
+
+        Returns:
+            ScenarioSummary: Contagens, falhas e vazão da execução
+        """
+        if format not in RESULT_FORMATS:
+            raise ValueError(f"Formato desconhecido: {format}")
+        summary = ScenarioSummary(workers=self.workers, output_path=output_path)
+        start = time.perf_counter()
+        writer = None
+        if output_path is not None:
+            topology = self._local_solver().solver.topology
+            writer_class = JsonLinesResultWriter if format == "jsonl" else BinaryResultWriter
+            writer = writer_class(output_path, topology.node_ids, topology.link_ids)
+        try:
+            for result in self.iter_results(scenarios):
+                summary.scenarios += 1
+                if not result.ok:
+                    summary.failed.append(result.scenario_id)
+                elif not result.converged:
+                    summary.not_converged.append(result.scenario_id)
+                if writer is not None:
+                    writer.write(result)
+                if progress is not None:
+                    progress(result)
+        finally:
+            if writer is not None:
+                writer.close()
+        summary.elapsed = time.perf_counter() - start
+        return summary
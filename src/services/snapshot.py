@@ -0,0 +1,220 @@
+import json
+import mmap
+import os
+import struct
+from typing import Any, Dict, List, Tuple, Union
+import numpy as np
+
+from ..models.columnar import (
+    ColumnarNetwork, ColumnTable, LabelTable, NODE_TABLES, SCHEMAS, _encode_ids
+)
+from ..models.network import WaterNetwork, Pattern, Curve, NetworkOptions
+
+# Cabeçalho fixo: magic, versão, flags (reservado), offset e tamanho do diretório
+SNAPSHOT_MAGIC = b"PYEPASNP"
+SNAPSHOT_VERSION = 1
+_HEADER = struct.Struct("<8sHHQQ")
+_HEADER_SIZE = 32
+_ALIGNMENT = 8
+
+
+class SnapshotError(ValueError):
+    """Arquivo de snapshot inválido ou de versão não suportada"""
+
+
+def _file_dtype(array: np.ndarray) -> str:
+    """Dtype com que o array é gravado (sempre little-endian)"""
+    if array.dtype.kind == "S":
+        return array.dtype.str
+    return array.dtype.newbyteorder("<").str
+
+
+def _string_table(values: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Codifica uma lista de strings como (offsets int64, bytes concatenados)"""
+    encoded = [v.encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+def _decode_ids(ids: np.ndarray) -> List[str]:
+    return [i.decode("utf-8") for i in ids.tolist()]
+
+
+def _read_string_table(offsets: np.ndarray, data: np.ndarray) -> List[str]:
+    blob = data.tobytes()
+    bounds = offsets.tolist()
+    return [blob[bounds[i]:bounds[i + 1]].decode("utf-8") for i in range(len(bounds) - 1)]
+
+
+class NetworkSnapshot:
+    """
+    Formato binário de snapshot de uma rede, carregado via mmap
+
+    Layout do arquivo:
+        - cabeçalho fixo de 32 bytes (magic, versão, offset/tamanho do diretório)
+        - colunas numéricas e de ids, alinhadas em 8 bytes e em little-endian
+        - diretório JSON com título, opções e o offset, dtype e tamanho de cada
+          coluna, agrupadas por seção ("pipes.length", "labels.offsets", ...)
+
+    Os ids ficam em arrays de largura fixa (como na ColumnarNetwork) e os
+    rótulos (padrões, curvas, status, tipos de válvula) em uma tabela de
+    strings. Na leitura as colunas são arrays NumPy sobre o mmap, sem cópia.
+    """
+
+    @staticmethod
+    def save(network: Union[WaterNetwork, ColumnarNetwork], path: str) -> None:
+        """
+        Grava o snapshot de uma rede (de forma atômica)
+
+        Args:
+            network: WaterNetwork ou ColumnarNetwork
+            path: Caminho do arquivo de saída
+        """
+        columnar = network if isinstance(network, ColumnarNetwork) else ColumnarNetwork.from_network(network)
+        arrays = NetworkSnapshot._collect_arrays(columnar)
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(b"\0" * _HEADER_SIZE)
+                directory: Dict[str, List[Any]] = {}
+                position = _HEADER_SIZE
+                for name, array in arrays.items():
+                    padding = -position % _ALIGNMENT
+                    f.write(b"\0" * padding)
+                    position += padding
+                    dtype = _file_dtype(array)
+                    data = np.ascontiguousarray(array, dtype=dtype).tobytes()
+                    f.write(data)
+                    directory[name] = [position, dtype, len(array)]
+                    position += len(data)
+
+                meta = json.dumps({
+                    "title": columnar.title,
+                    "options": columnar.options.to_dict(),
+                    "arrays": directory,
+                }, ensure_ascii=False).encode("utf-8")
+                f.write(meta)
+                f.seek(0)
+                f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, position, len(meta)))
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @staticmethod
+    def load(path: str) -> ColumnarNetwork:
+        """
+        Abre um snapshot como ColumnarNetwork, mapeando o arquivo em memória
+
+        As colunas são visões sem cópia do arquivo (mmap copy-on-write):
+        podem ser alteradas em memória sem modificar o snapshot.
+
+        Args:
+            path: Caminho do snapshot
+
+        Returns:
+            ColumnarNetwork: Rede colunar sobre o arquivo mapeado
+        """
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < _HEADER_SIZE:
+                raise SnapshotError(f"Arquivo muito pequeno para um snapshot: {path}")
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        magic, version, _, meta_offset, meta_length = _HEADER.unpack_from(mm, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise SnapshotError(f"Arquivo não é um snapshot de rede: {path}")
+        if version != SNAPSHOT_VERSION:
+            raise SnapshotError(f"Versão de snapshot não suportada: {version} (esperada {SNAPSHOT_VERSION})")
+        if meta_offset + meta_length > size:
+            raise SnapshotError(f"Snapshot truncado: {path}")
+        meta = json.loads(mm[meta_offset:meta_offset + meta_length].decode("utf-8"))
+        directory = meta["arrays"]
+
+        def array(name: str) -> np.ndarray:
+            offset, dtype, count = directory[name]
+            if count == 0:
+                return np.empty(0, dtype=dtype)
+            return np.frombuffer(mm, dtype=dtype, count=count, offset=offset)
+
+        columnar = ColumnarNetwork()
+        columnar.title = meta["title"]
+        columnar.options = NetworkOptions.from_dict(meta["options"])
+        columnar.labels = LabelTable(_read_string_table(array("labels.offsets"), array("labels.data")))
+
+        for name, (_, schema) in SCHEMAS.items():
+            extra = ("x", "y") if name in NODE_TABLES else ("vertex_offsets", "vertex_x", "vertex_y")
+            columns = {column: array(f"{name}.{column}") for column in [f for f, _ in schema] + list(extra)}
+            columnar.tables[name] = ColumnTable(columnar, name, array(f"{name}.ids"), columns)
+
+        labels = columnar.labels.labels
+        pattern_offsets = array("patterns.offsets").tolist()
+        pattern_values = array("patterns.values").tolist()
+        columnar.patterns = [
+            Pattern(pattern_id, pattern_values[pattern_offsets[i]:pattern_offsets[i + 1]])
+            for i, pattern_id in enumerate(_decode_ids(array("patterns.ids")))
+        ]
+        curve_offsets = array("curves.offsets").tolist()
+        curve_x = array("curves.x").tolist()
+        curve_y = array("curves.y").tolist()
+        curve_types = array("curves.type").tolist()
+        columnar.curves = [
+            Curve(curve_id, labels[curve_types[i]],
+                  curve_x[curve_offsets[i]:curve_offsets[i + 1]],
+                  curve_y[curve_offsets[i]:curve_offsets[i + 1]])
+            for i, curve_id in enumerate(_decode_ids(array("curves.ids")))
+        ]
+        return columnar
+
+    @staticmethod
+    def load_network(path: str) -> WaterNetwork:
+        """Lê um snapshot e materializa a WaterNetwork baseada em listas"""
+        return NetworkSnapshot.load(path).to_network()
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any], path: str) -> None:
+        """
+        Grava um snapshot a partir do dicionário/JSON gerado por to_dict()
+
+        Args:
+            data: Dicionário da rede
+            path: Caminho do snapshot
+        """
+        NetworkSnapshot.save(WaterNetwork.from_dict(data), path)
+
+    @staticmethod
+    def to_dict(path: str) -> Dict[str, Any]:
+        """Lê um snapshot e retorna o mesmo dicionário de WaterNetwork.to_dict()"""
+        return NetworkSnapshot.load_network(path).to_dict()
+
+    @staticmethod
+    def _collect_arrays(columnar: ColumnarNetwork) -> Dict[str, np.ndarray]:
+        """Reúne todas as colunas do snapshot, nomeadas por seção"""
+        arrays: Dict[str, np.ndarray] = {}
+        # Os tipos de curva entram em uma cópia da tabela de rótulos
+        labels = LabelTable(columnar.labels.labels)
+        curve_types = np.array([labels.code(c.curve_type) for c in columnar.curves], dtype=np.int32)
+
+        for name, table in columnar.tables.items():
+            arrays[f"{name}.ids"] = table.ids
+            for column, values in table.columns.items():
+                arrays[f"{name}.{column}"] = values
+
+        pattern_sizes = [len(p.multipliers) for p in columnar.patterns]
+        arrays["patterns.ids"] = _encode_ids([p.id for p in columnar.patterns])
+        arrays["patterns.offsets"] = np.concatenate(([0], np.cumsum(pattern_sizes, dtype=np.int64)))
+        arrays["patterns.values"] = np.array(
+            [m for p in columnar.patterns for m in p.multipliers], dtype=np.float64
+        )
+        curve_sizes = [len(c.x_values) for c in columnar.curves]
+        arrays["curves.ids"] = _encode_ids([c.id for c in columnar.curves])
+        arrays["curves.type"] = curve_types
+        arrays["curves.offsets"] = np.concatenate(([0], np.cumsum(curve_sizes, dtype=np.int64)))
+        arrays["curves.x"] = np.array([x for c in columnar.curves for x in c.x_values], dtype=np.float64)
+        arrays["curves.y"] = np.array([y for c in columnar.curves for y in c.y_values], dtype=np.float64)
+
+        arrays["labels.offsets"], arrays["labels.data"] = _string_table(labels.labels)
+        return arrays
+
@@ -3,7 +3,16 @@ Utilitários para serialização de dados
 """
 
 from .serializer import NetworkSerializer
+from .json_backend import JsonBackend, get_backend
+from .profiling import Profiler, ProfileReport, Span, OpenTelemetryBridge, stage
 
 __all__ = [
-    'NetworkSerializer'
+    'NetworkSerializer',
+    'JsonBackend',
+    'get_backend',
+    'Profiler',
+    'ProfileReport',
+    'Span',
+    'OpenTelemetryBridge',
+    'stage'
 ]
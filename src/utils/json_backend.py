@@ -0,0 +1,174 @@
+import json
+from typing import Any, Dict, Optional, Type
+
+from ..models.network import WaterNetwork
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def encode_default(obj: Any) -> Any:
+    """
+    Converte objetos do modelo para tipos JSON sob demanda
+
+    A rede vira a sua estrutura rasa (to_shallow_dict) e cada elemento só é
+    convertido com to_dict() no momento em que o encoder chega nele.
+    """
+    if isinstance(obj, WaterNetwork):
+        return obj.to_shallow_dict()
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    if hasattr(obj, "tolist"):  # arrays e escalares NumPy
+        return obj.tolist()
+    raise TypeError(f"Objeto do tipo {type(obj).__name__} não é serializável em JSON")
+
+
+def _stdlib_dumps(obj: Any, indent: Optional[int] = 2, compact: bool = False) -> str:
+    """Serialização com o json da biblioteca padrão (também usada como fallback)"""
+    if compact:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=encode_default)
+    return json.dumps(obj, indent=indent, ensure_ascii=False, default=encode_default)
+
+
+class JsonBackend:
+    """Backend JSON da biblioteca padrão (sempre disponível)"""
+    name = "json"
+
+    def dumps(self, obj: Any, indent: Optional[int] = 2, compact: bool = False) -> str:
+        """
+        Serializa um objeto (inclusive objetos do modelo) para JSON
+
+        Args:
+            obj: Objeto a serializar
+            indent: Indentação do JSON
+            compact: Se True, gera JSON sem indentação nem espaços
+
+        Returns:
+            str: String JSON
+        """
+        return _stdlib_dumps(obj, indent, compact)
+
+    def dumpb(self, obj: Any, indent: Optional[int] = 2, compact: bool = False) -> bytes:
+        """Igual a dumps, mas retorna bytes UTF-8"""
+        return self.dumps(obj, indent, compact).encode("utf-8")
+
+    def loads(self, data: Any) -> Any:
+        return json.loads(data)
+
+
+class OrjsonBackend(JsonBackend):
+    """Backend baseado no orjson; serializa os objetos do modelo diretamente"""
+    name = "orjson"
+
+    def dumpb(self, obj: Any, indent: Optional[int] = 2, compact: bool = False) -> bytes:
+        option = orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_SERIALIZE_NUMPY
+        if not compact:
+            if indent != 2:
+                # O orjson só suporta indentação de 2 espaços
+                return _stdlib_dumps(obj, indent, compact).encode("utf-8")
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=encode_default, option=option)
+
+    def dumps(self, obj: Any, indent: Optional[int] = 2, compact: bool = False) -> str:
+        return self.dumpb(obj, indent, compact).decode("utf-8")
+
+    def loads(self, data: Any) -> Any:
+        return orjson.loads(data)
+
+
+class MsgspecBackend(JsonBackend):
+    """Backend baseado no msgspec"""
+    name = "msgspec"
+
+    def __init__(self):
+        self._encoder = msgspec.json.Encoder(enc_hook=encode_default)
+
+    def dumpb(self, obj: Any, indent: Optional[int] = 2, compact: bool = False) -> bytes:
+        if not compact and indent == 0:
+            # msgspec.json.format com indent=0 não quebra linhas, ao contrário do json
+            return _stdlib_dumps(obj, indent, compact).encode("utf-8")
+        buffer = bytearray()
+        self._encode_into(obj, buffer)
+        if compact:
+            return bytes(buffer)
+        return msgspec.json.format(buffer, indent=indent or 0)
+
+    def _encode_into(self, value: Any, buffer: bytearray) -> None:
+        """
+        Acrescenta o JSON compacto de value ao buffer
+
+        O msgspec serializa dataclasses pelos seus campos (sem passar pelo
+        enc_hook), o que não corresponde ao layout de to_dict. Por isso a rede
+        é percorrida pela estrutura rasa e cada elemento é convertido com
+        to_dict apenas no momento de ser codificado.
+        """
+        if isinstance(value, WaterNetwork):
+            value = value.to_shallow_dict()
+        if isinstance(value, dict):
+            buffer += b"{"
+            for i, (key, item) in enumerate(value.items()):
+                if i:
+                    buffer += b","
+                self._encoder.encode_into(key, buffer, -1)
+                buffer += b":"
+                self._encode_into(item, buffer)
+            buffer += b"}"
+        elif isinstance(value, list):
+            buffer += b"["
+            for i, item in enumerate(value):
+                if i:
+                    buffer += b","
+                self._encode_into(item, buffer)
+            buffer += b"]"
+        elif hasattr(value, "to_dict"):
+            self._encoder.encode_into(value.to_dict(), buffer, -1)
+        else:
+            self._encoder.encode_into(value, buffer, -1)
+
+    def dumps(self, obj: Any, indent: Optional[int] = 2, compact: bool = False) -> str:
+        return self.dumpb(obj, indent, compact).decode("utf-8")
+
+    def loads(self, data: Any) -> Any:
+        return msgspec.json.decode(data)
+
+
+BACKENDS: Dict[str, Type[JsonBackend]] = {
+    "orjson": OrjsonBackend,
+    "msgspec": MsgspecBackend,
+    "json": JsonBackend,
+}
+
+_AVAILABLE = {
+    "orjson": orjson is not None,
+    "msgspec": msgspec is not None,
+    "json": True,
+}
+
+
+def get_backend(name: Optional[str] = None) -> JsonBackend:
+    """
+    Retorna um backend JSON
+
+    Args:
+        name: "orjson", "msgspec", "json" ou None/"auto" para escolher o mais
+            rápido instalado (orjson, depois msgspec, depois a biblioteca padrão)
+
+    Returns:
+        JsonBackend: Backend escolhido
+    """
+    if name is None or name == "auto":
+        for candidate in ("orjson", "msgspec", "json"):
+            if _AVAILABLE[candidate]:
+                return BACKENDS[candidate]()
+    if name not in BACKENDS:
+        raise ValueError(f"Backend JSON desconhecido: {name}")
+    if not _AVAILABLE[name]:
+        raise ImportError(f"O pacote '{name}' não está instalado")
+    return BACKENDS[name]()
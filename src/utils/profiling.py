@@ -0,0 +1,349 @@
+import sys
+import time
+import tracemalloc
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+try:
+    import resource
+except ImportError:  # indisponível no Windows: o pico de RSS fica sem medição
+    resource = None
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # a ponte com o OpenTelemetry é opcional
+    otel_trace = None
+
+
+def peak_rss() -> Optional[int]:
+    """Pico de memória residente do processo até agora, em bytes"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass
+class Span:
+    """
+    Uma etapa medida: tempo de parede, elementos processados e memória
+
+    Segue o modelo de spans do OpenTelemetry (nome, início e fim em ns,
+    atributos e filhos). peak_traced é o pico de memória alocada pelo
+    Python durante a etapa (apenas com trace_memory); peak_rss é o pico de
+    memória residente do processo ao final da etapa.
+    """
+    name: str
+    start_ns: int = 0
+    end_ns: int = 0
+    elements: int = 0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    peak_traced: Optional[int] = None
+    peak_rss: Optional[int] = None
+    calls: int = 1
+    children: List["Span"] = field(default_factory=list)
+    parent: Optional["Span"] = field(default=None, repr=False, compare=False)
+
+    @property
+    def seconds(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+    @property
+    def elements_per_second(self) -> float:
+        return self.elements / self.seconds if self.elements and self.seconds else 0.0
+
+    def set_elements(self, count: int) -> None:
+        self.elements = int(count)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "seconds": self.seconds,
+            "calls": self.calls,
+            "elements": self.elements,
+            "elements_per_second": self.elements_per_second,
+            "peak_traced": self.peak_traced,
+            "peak_rss": self.peak_rss,
+            "attributes": self.attributes,
+            "children": [child.to_dict() for child in self.children],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Span":
+        span = cls(
+            name=data["name"],
+            end_ns=int(round(data["seconds"] * 1e9)),
+            elements=data.get("elements", 0),
+            attributes=dict(data.get("attributes", {})),
+            peak_traced=data.get("peak_traced"),
+            peak_rss=data.get("peak_rss"),
+            calls=data.get("calls", 1),
+        )
+        for child in data.get("children", []):
+            child_span = cls.from_dict(child)
+            child_span.parent = span
+            span.children.append(child_span)
+        return span
+
+
+class _NullSpan:
+    """Span usado quando não há profiler ativo: todas as operações são vazias"""
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+    def set_elements(self, count: int) -> None:
+        pass
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+_active: ContextVar[Optional["Profiler"]] = ContextVar("pyinterface_profiler", default=None)
+
+
+class _StageContext:
+    """Abre e fecha um Span no profiler ativo"""
+    __slots__ = ("profiler", "span")
+
+    def __init__(self, profiler: "Profiler", name: str, attributes: Dict[str, Any]):
+        self.profiler = profiler
+        self.span = Span(name, attributes=attributes)
+
+    def __enter__(self) -> Span:
+        self.profiler._start(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.span.attributes["error"] = exc_type.__name__
+        self.profiler._end(self.span)
+
+
+def stage(name: str, **attributes: Any):
+    """
+    Mede uma etapa no profiler ativo (ou não faz nada, se não houver)
+
+    Sem profiler ativo o custo é uma consulta a um ContextVar, e o objeto
+    retornado ignora set_elements/set_attribute.
+
+    Args:
+        name: Nome da etapa (ex.: "inp_reader.read")
+        **attributes: Atributos da etapa (ex.: path, engine)
+
+    Returns:
+        Context manager que entrega o Span (ou um span vazio)
+    """
+    profiler = _active.get()
+    if profiler is None:
+        return _NULL_SPAN
+    return _StageContext(profiler, name, attributes)
+
+
+def profiling_enabled() -> bool:
+    """Indica se há um profiler ativo no contexto atual"""
+    return _active.get() is not None
+
+
+@dataclass
+class ProfileReport:
+    """Relatório estruturado de uma execução: árvore de etapas"""
+    spans: List[Span] = field(default_factory=list)
+
+    @property
+    def seconds(self) -> float:
+        return sum(span.seconds for span in self.spans)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"seconds": self.seconds, "spans": [span.to_dict() for span in self.spans]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ProfileReport":
+        return cls([Span.from_dict(span) for span in data.get("spans", [])])
+
+    def iter_spans(self) -> Iterable[Span]:
+        """Todas as etapas, em pré-ordem"""
+        stack = list(reversed(self.spans))
+        while stack:
+            span = stack.pop()
+            yield span
+            stack.extend(reversed(span.children))
+
+    @classmethod
+    def merge(cls, reports: Iterable["ProfileReport"]) -> "ProfileReport":
+        """
+        Soma relatórios (ex.: um por arquivo) agrupando as etapas pelo caminho
+
+        Tempos, chamadas e elementos são somados; os picos de memória ficam
+        com o maior valor.
+        """
+        merged = cls()
+
+        def add(into: List[Span], span: Span, parent: Optional[Span]) -> None:
+            target = next((s for s in into if s.name == span.name), None)
+            if target is None:
+                target = Span(span.name, calls=0, parent=parent)
+                into.append(target)
+            target.end_ns += span.end_ns - span.start_ns
+            target.calls += span.calls
+            target.elements += span.elements
+            for attr in ("peak_traced", "peak_rss"):
+                value = getattr(span, attr)
+                if value is not None:
+                    setattr(target, attr, max(value, getattr(target, attr) or 0))
+            for child in span.children:
+                add(target.children, child, target)
+
+        for report in reports:
+            for span in report.spans:
+                add(merged.spans, span, None)
+        return merged
+
+    def format(self) -> str:
+        """Tabela legível: etapa (indentada), tempo, elementos, vazão e memória"""
+        lines = [f"{'Etapa':<40} {'Tempo (s)':>10} {'Chamadas':>8} {'Elementos':>11} "
+                 f"{'Elem/s':>12} {'Pico (MB)':>10}"]
+
+        def visit(span: Span, depth: int) -> None:
+            peak = span.peak_traced if span.peak_traced is not None else span.peak_rss
+            lines.append(
+                f"{'  ' * depth + span.name:<40} {span.seconds:>10.4f} {span.calls:>8} "
+                f"{span.elements:>11,} {span.elements_per_second:>12,.0f} "
+                f"{(peak / 2 ** 20 if peak is not None else float('nan')):>10.1f}"
+            )
+            for child in span.children:
+                visit(child, depth + 1)
+
+        for span in self.spans:
+            visit(span, 0)
+        return "\n".join(lines)
+
+
+class Profiler:
+    """
+    Coleta as etapas instrumentadas (stage) executadas no seu contexto
+
+    Uso:
+        with Profiler() as profiler:
+            network = InpReader().read_inp_file("rede.inp")
+            JsonConverter.network_to_file(network, "rede.json")
+        print(profiler.report().format())
+
+    O profiler ativo é guardado em um ContextVar, então vale para a thread
+    (ou tarefa asyncio) atual. Com trace_memory=True, o tracemalloc mede o
+    pico de memória de cada etapa, ao custo de deixar a execução mais lenta.
+    """
+
+    def __init__(self, trace_memory: bool = False,
+                 on_start: Optional[Callable[[Span], None]] = None,
+                 on_end: Optional[Callable[[Span], None]] = None):
+        """
+        Args:
+            trace_memory: Se True, mede o pico de memória por etapa (tracemalloc)
+            on_start: Função chamada com cada Span ao iniciar
+            on_end: Função chamada com cada Span ao terminar
+        """
+        self.trace_memory = trace_memory
+        self.on_start = on_start
+        self.on_end = on_end
+        self.spans: List[Span] = []
+        self._stack: List[Span] = []
+        self._peaks: List[int] = []
+        self._token = None
+        self._started_tracemalloc = False
+
+    def __enter__(self) -> "Profiler":
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._token = _active.set(self)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        _active.reset(self._token)
+        self._token = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def stage(self, name: str, **attributes: Any) -> _StageContext:
+        """Mede uma etapa neste profiler, mesmo fora do seu contexto"""
+        return _StageContext(self, name, attributes)
+
+    def _start(self, span: Span) -> None:
+        parent = self._stack[-1] if self._stack else None
+        span.parent = parent
+        (parent.children if parent is not None else self.spans).append(span)
+        if self.trace_memory:
+            # O pico da etapa pai até aqui é guardado antes de zerar o pico
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            self._peaks.append(0)
+        self._stack.append(span)
+        if self.on_start is not None:
+            self.on_start(span)
+        span.start_ns = time.perf_counter_ns()
+
+    def _end(self, span: Span) -> None:
+        span.end_ns = time.perf_counter_ns()
+        self._stack.pop()
+        if self.trace_memory:
+            span.peak_traced = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], span.peak_traced)
+            tracemalloc.reset_peak()
+        span.peak_rss = peak_rss()
+        if self.on_end is not None:
+            self.on_end(span)
+
+    def report(self) -> ProfileReport:
+        return ProfileReport(list(self.spans))
+
+
+class OpenTelemetryBridge:
+    """
+    Reproduz as etapas como spans do OpenTelemetry (requer opentelemetry-api)
+
+    Uso:
+        bridge = OpenTelemetryBridge()
+        with Profiler(on_start=bridge.on_start, on_end=bridge.on_end):
+            ...
+    """
+
+    def __init__(self, tracer=None):
+        """
+        Args:
+            tracer: Tracer do OpenTelemetry (padrão: trace.get_tracer("pyinterface"))
+        """
+        if otel_trace is None:
+            raise ImportError("O pacote 'opentelemetry-api' é necessário para OpenTelemetryBridge")
+        self.tracer = tracer or otel_trace.get_tracer("pyinterface")
+        self._spans: Dict[int, Any] = {}
+
+    def on_start(self, span: Span) -> None:
+        context = None
+        if span.parent is not None and id(span.parent) in self._spans:
+            context = otel_trace.set_span_in_context(self._spans[id(span.parent)])
+        self._spans[id(span)] = self.tracer.start_span(span.name, context=context,
+                                                       attributes=dict(span.attributes))
+
+    def on_end(self, span: Span) -> None:
+        otel_span = self._spans.pop(id(span), None)
+        if otel_span is None:
+            return
+        otel_span.set_attribute("elements", span.elements)
+        for key, value in span.attributes.items():
+            otel_span.set_attribute(key, value)
+        if span.peak_traced is not None:
+            otel_span.set_attribute("memory.peak_traced", span.peak_traced)
+        otel_span.end()
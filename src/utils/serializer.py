@@ -1,24 +1,24 @@
-from typing import Any, Dict
-import json
+from typing import Any, Dict, Optional
+from .json_backend import get_backend
 
 
 class NetworkSerializer:
     """Utilitários para serialização e desserialização de dados de rede"""
     
     @staticmethod
-    def serialize(obj: Any) -> str:
+    def serialize(obj: Any, compact: bool = False, backend: Optional[str] = None) -> str:
         """
         Serializa um objeto para JSON
         
         Args:
-            obj: Objeto com método to_dict()
+            obj: Objeto com método to_dict() ou valor JSON
+            compact: Se True, gera JSON sem indentação nem espaços
+            backend: "orjson", "msgspec", "json" ou None para o mais rápido instalado
             
         Returns:
             str: String JSON
         """
-        if hasattr(obj, 'to_dict'):
-            return json.dumps(obj.to_dict(), indent=2, ensure_ascii=False)
-        return json.dumps(obj, indent=2, ensure_ascii=False)
+        return get_backend(backend).dumps(obj, indent=2, compact=compact)
     
     @staticmethod
     def deserialize(json_str: str) -> Dict[str, Any]:
@@ -31,20 +31,23 @@ class NetworkSerializer:
         Returns:
             Dict: Dicionário Python
         """
-        return json.loads(json_str)
+        return get_backend().loads(json_str)
     
     @staticmethod
-    def save_to_file(obj: Any, file_path: str) -> None:
+    def save_to_file(obj: Any, file_path: str, compact: bool = False,
+                     backend: Optional[str] = None) -> None:
         """
         Salva um objeto em arquivo JSON
         
         Args:
             obj: Objeto a ser salvo
             file_path: Caminho do arquivo
+            compact: Se True, gera JSON sem indentação nem espaços
+            backend: "orjson", "msgspec", "json" ou None para o mais rápido instalado
         """
-        json_str = NetworkSerializer.serialize(obj)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(json_str)
+        data = get_backend(backend).dumpb(obj, indent=2, compact=compact)
+        with open(file_path, 'wb') as f:
+            f.write(data)
     
     @staticmethod
     def load_from_file(file_path: str) -> Dict[str, Any]:
@@ -57,5 +60,5 @@ class NetworkSerializer:
         Returns:
             Dict: Dicionário com os dados
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(file_path, 'rb') as f:
+            return get_backend().loads(f.read())
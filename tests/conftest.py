@@ -0,0 +1,46 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.services.inp_reader import InpReader
+
+try:
+    import wntr
+except ImportError:
+    wntr = None
+
+LIBRARY_NETWORKS = ("Net1", "Net2", "Net3", "Net6", "ky4", "ky10")
+
+
+def library_path(name: str) -> str:
+    """Caminho de uma rede da biblioteca do wntr (ex.: "Net1")"""
+    if wntr is None:
+        pytest.skip("wntr não está instalado")
+    return os.path.join(os.path.dirname(wntr.__file__), "library", "networks", f"{name}.inp")
+
+
+def network_for_testing(name: str) -> str:
+    """Caminho de uma rede de testes do wntr (ex.: "Anytown")"""
+    if wntr is None:
+        pytest.skip("wntr não está instalado")
+    return os.path.join(os.path.dirname(wntr.__file__), "tests", "networks_for_testing", f"{name}.inp")
+
+
+@pytest.fixture(scope="session")
+def read_library():
+    """Lê (uma vez por sessão) uma rede da biblioteca do wntr"""
+    networks = {}
+
+    def read(name: str):
+        if name not in networks:
+            networks[name] = InpReader().read_inp_file(library_path(name))
+        return networks[name]
+    return read
+
+
+@pytest.fixture
+def net1(read_library):
+    return read_library("Net1")
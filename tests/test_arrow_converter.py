@@ -0,0 +1,41 @@
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from src.services.arrow_converter import ArrowConverter
+
+from .conftest import LIBRARY_NETWORKS
+
+
+@pytest.mark.parametrize("name", LIBRARY_NETWORKS)
+def test_tables_round_trip(read_library, name):
+    network = read_library(name)
+    tables = ArrowConverter.network_to_tables(network)
+    assert pa.types.is_dictionary(tables["pipes"].schema.field("id").type)
+    assert pa.types.is_dictionary(tables["pipes"].schema.field("status").type)
+    assert ArrowConverter.tables_to_network(tables).to_dict() == network.to_dict()
+
+
+@pytest.mark.parametrize("kind", ["parquet", "ipc"])
+def test_files_round_trip(read_library, kind, tmp_path):
+    network = read_library("Net3")
+    getattr(ArrowConverter, f"network_to_{kind}")(network, str(tmp_path))
+    back = getattr(ArrowConverter, f"network_from_{kind}")(str(tmp_path))
+    assert back.to_dict() == network.to_dict()
+
+
+@pytest.mark.parametrize("name", ["Net1", "Net3"])
+def test_pandas_round_trip(read_library, name):
+    pytest.importorskip("pandas")
+    network = read_library(name)
+    tables = {
+        table_name: pa.Table.from_pandas(table.to_pandas(), preserve_index=False)
+        for table_name, table in ArrowConverter.network_to_tables(network).items()
+    }
+    # Colunas só com listas vazias (ou tabelas vazias) perdem o tipo no pandas
+    assert pa.types.is_null(tables["pumps"].schema.field("vertices").type.value_type)
+
+    expected, result = network.to_dict(), ArrowConverter.tables_to_network(tables).to_dict()
+    # Título e opções ficam nos metadados do Arrow, que o pandas não preserva
+    for key in ("nodes", "links", "patterns", "curves"):
+        assert result[key] == expected[key]
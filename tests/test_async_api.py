@@ -0,0 +1,106 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.models import WaterNetwork
+from src.services.async_api import AsyncConverter
+from src.services.json_converter import JsonConverter
+
+from .conftest import library_path
+
+
+class _CountingExecutor(ThreadPoolExecutor):
+    """Registra o maior número de tarefas executando ao mesmo tempo"""
+
+    def __init__(self):
+        super().__init__(max_workers=8)
+        self._lock = threading.Lock()
+        self.active = self.peak = 0
+
+    def submit(self, fn, *args):
+        def run():
+            with self._lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self.active -= 1
+        return super().submit(run)
+
+
+class _Gate:
+    """Elemento cuja serialização espera a liberação do teste"""
+
+    def __init__(self):
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def to_dict(self):
+        self.entered.set()
+        self.release.wait(5)
+        return {"id": "P"}
+
+
+def test_convert_file_matches_sync(net1, tmp_path):
+    output = tmp_path / "net1.json"
+    expected = tmp_path / "expected.json"
+    JsonConverter.network_to_file(net1, str(expected))
+
+    async def main():
+        async with AsyncConverter() as converter:
+            return await converter.convert_file(library_path("Net1"), str(output))
+
+    network = asyncio.run(main())
+    assert network.to_dict() == net1.to_dict()
+    assert output.read_bytes() == expected.read_bytes()
+
+
+def test_read_inp_stream(net1):
+    async def chunks():
+        with open(library_path("Net1"), "rb") as f:
+            for block in iter(lambda: f.read(1000), b""):
+                yield block
+
+    async def main():
+        async with AsyncConverter() as converter:
+            return await converter.read_inp_stream(chunks())
+
+    assert asyncio.run(main()).to_dict() == net1.to_dict()
+
+
+def test_concurrency_limit(net1):
+    executor = _CountingExecutor()
+
+    async def main():
+        converter = AsyncConverter(max_concurrency=2, executor=executor)
+        return await asyncio.gather(*(converter.network_to_bytes(net1) for _ in range(8)))
+
+    results = asyncio.run(main())
+    executor.shutdown()
+    assert len(set(results)) == 1
+    assert executor.peak <= 2
+
+
+def test_cancelled_write_leaves_no_files(net1, tmp_path):
+    gate = _Gate()
+    output = tmp_path / "rede.json"
+
+    async def main():
+        async with AsyncConverter(max_concurrency=1) as converter:
+            task = asyncio.create_task(
+                converter.network_to_file(WaterNetwork(pipes=[gate, gate]), str(output)))
+            await asyncio.get_running_loop().run_in_executor(None, gate.entered.wait, 5)
+            task.cancel()
+            gate.release.set()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            # A vaga volta quando o worker termina
+            return await converter.network_to_bytes(net1)
+
+    assert asyncio.run(main()) == JsonConverter.network_to_bytes(net1)
+    assert os.listdir(str(tmp_path)) == []
@@ -0,0 +1,47 @@
+import os
+import shutil
+
+from src.services.batch import BatchConverter, collect_inputs
+from src.services.json_converter import JsonConverter
+
+from .conftest import library_path
+
+
+def _copy(name, target):
+    os.makedirs(os.path.dirname(str(target)), exist_ok=True)
+    shutil.copy(library_path(name), str(target))
+    return str(target)
+
+
+def test_batch_output_matches_single_conversion(net1, tmp_path):
+    source = _copy("Net1", tmp_path / "in" / "Net1.inp")
+    summary = BatchConverter(str(tmp_path / "out"), workers=1).convert([source])
+    assert [r.ok for r in summary.results] == [True]
+
+    expected = tmp_path / "expected.json"
+    JsonConverter.network_to_file(net1, str(expected))
+    assert (tmp_path / "out" / "Net1.json").read_bytes() == expected.read_bytes()
+
+
+def test_same_file_name_in_different_folders(tmp_path):
+    first = _copy("Net1", tmp_path / "a" / "net.inp")
+    second = _copy("Net2", tmp_path / "b" / "net.inp")
+    assert [relative for _, relative in collect_inputs([first, second])] == [
+        os.path.join("a", "net.inp"), os.path.join("b", "net.inp")
+    ]
+
+    out = tmp_path / "out"
+    summary = BatchConverter(str(out), workers=1).convert([first, second])
+    assert len(summary.succeeded) == 2
+    assert JsonConverter.file_to_dict(str(out / "a" / "net.json"))["title"] != \
+        JsonConverter.file_to_dict(str(out / "b" / "net.json"))["title"]
+
+
+def test_colliding_outputs_fail_instead_of_overwriting(tmp_path):
+    folder = tmp_path / "in"
+    _copy("Net1", folder / "net.inp")
+    _copy("Net2", folder / "net.INP")
+    summary = BatchConverter(str(tmp_path / "out"), workers=1).convert([str(folder)])
+    assert len(summary.succeeded) == 1
+    assert len(summary.failed) == 1
+    assert "já gerada" in summary.failed[0].error
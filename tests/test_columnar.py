@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from src.models import ColumnarNetwork, Coordinate, WaterNetwork
+
+from .conftest import LIBRARY_NETWORKS
+
+
+@pytest.mark.parametrize("name", LIBRARY_NETWORKS)
+def test_columnar_round_trip(read_library, name):
+    network = read_library(name)
+    columnar = ColumnarNetwork.from_network(network)
+    assert columnar.to_network().to_dict() == network.to_dict()
+
+
+def test_row_views(read_library):
+    network = read_library("Net3")
+    columnar = ColumnarNetwork.from_network(network)
+    pipe = network.pipes[5]
+    view = columnar.pipes.get(pipe.id)
+    assert view.to_dict() == pipe.to_dict()
+    assert view.from_node == pipe.from_node
+    np.testing.assert_array_equal(columnar.pipes.length, [p.length for p in network.pipes])
+    assert columnar.node_count == len(network.junctions) + len(network.reservoirs) + len(network.tanks)
+
+
+def test_row_view_writes_to_columns(read_library):
+    network = WaterNetwork.from_dict(read_library("Net1").to_dict())
+    columnar = ColumnarNetwork.from_network(network)
+    target = network.junctions[0].id
+    view = columnar.pipes[0]
+    view.length = 123.0
+    view.to_node = target
+    columnar.junctions[1].coordinates = None
+    columnar.junctions[2].demand_pattern = "novo"
+
+    assert columnar.pipes.length[0] == 123.0
+    result = columnar.to_network()
+    assert result.pipes[0].length == 123.0
+    assert result.pipes[0].to_node == target
+    assert result.junctions[1].coordinates is None
+    assert result.junctions[2].demand_pattern == "novo"
+    with pytest.raises(AttributeError):
+        view.vertices = [Coordinate(0.0, 0.0)]
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from src.models import ColumnarNetwork, compact_network
+from src.services.inp_writer import InpWriter
+
+
+@pytest.mark.parametrize("name", ["Net6", "ky10"])
+def test_compact_network_matches_original(read_library, name):
+    network = read_library(name)
+    compact = compact_network(network)
+    assert compact.to_dict() == network.to_dict()
+    assert [p.vertices for p in compact.pipes] == [p.vertices for p in network.pipes]
+
+
+def test_compact_network_feeds_consumers(read_library, tmp_path):
+    network = read_library("ky10")
+    compact = compact_network(network)
+
+    expected = ColumnarNetwork.from_network(network)
+    result = ColumnarNetwork.from_network(compact)
+    for column in ("vertex_x", "vertex_y", "vertex_offsets"):
+        np.testing.assert_array_equal(getattr(result.pipes, column), getattr(expected.pipes, column))
+
+    bbox = network.spatial_index().bounds
+    assert compact.spatial_index().links_in_bbox(bbox) == network.spatial_index().links_in_bbox(bbox)
+
+    assert InpWriter().to_string(compact) == InpWriter().to_string(network)
+
+
+def test_compact_vertices_setter(read_library):
+    compact = compact_network(read_library("ky4"))
+    pipe = next(p for p in compact.pipes if p.vertices)
+    pipe.vertices = pipe.vertices[:1]
+    assert len(pipe.flat_vertices) == 2
+    assert pipe.to_dict()["vertices"] == [pipe.vertices[0].to_dict()]
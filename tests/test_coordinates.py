@@ -0,0 +1,29 @@
+from src.models import Coordinate, Junction, Pipe, WaterNetwork
+from src.services.inp_parser import CoordinateIndex
+from src.services.inp_reader import InpReader
+
+from .conftest import library_path
+
+
+def test_wntr_coordinates_match_model():
+    reader = InpReader(engine="wntr")
+    network = reader.read_inp_file(library_path("ky10"))
+    wn = reader.wn
+    for node in network.junctions + network.reservoirs + network.tanks:
+        x, y = wn.get_node(node.id).coordinates
+        assert (node.coordinates.x, node.coordinates.y) == (x, y)
+    for link in network.pipes + network.pumps + network.valves:
+        expected = [tuple(v) for v in wn.get_link(link.id).vertices]
+        assert [(v.x, v.y) for v in link.vertices] == expected
+
+
+def test_attach_leaves_missing_entries_untouched():
+    network = WaterNetwork(
+        junctions=[Junction("A", 0.0, 0.0), Junction("B", 0.0, 0.0)],
+        pipes=[Pipe("P1", "A", "B", 1.0, 0.1, 100.0), Pipe("P2", "B", "A", 1.0, 0.1, 100.0)]
+    )
+    CoordinateIndex({"A": (1.0, 2.0)}, {"P2": [(3.0, 4.0)]}).attach(network)
+    assert network.junctions[0].coordinates == Coordinate(1.0, 2.0)
+    assert network.junctions[1].coordinates is None
+    assert network.pipes[0].vertices == []
+    assert network.pipes[1].vertices == [Coordinate(3.0, 4.0)]
@@ -0,0 +1,117 @@
+import re
+
+import pytest
+
+from src.models.elements import Junction
+from src.models.network import WaterNetwork
+from src.services.hydraulics import HydraulicError, HydraulicSolver
+from src.services.inp_reader import InpReader
+from src.services.inp_writer import InpWriter
+
+from .conftest import library_path
+
+pytest.importorskip("scipy")
+wntr = pytest.importorskip("wntr")
+
+TOLERANCE = 1e-4  # m
+
+# O wntr avisa ao ler redes D-W que a rugosidade não é convertida
+pytestmark = pytest.mark.filterwarnings("ignore:Changing the headloss formula")
+
+VALVES = """[TITLE]
+Valvulas reguladoras
+
+[JUNCTIONS]
+ J1  40  0
+ J2  20  0
+ J3  10  20
+ J4  12  10
+ J5  30  0
+ J6  25  0
+
+[RESERVOIRS]
+ R1  100
+ R2  80
+
+[PIPES]
+ P1  R1  J1  1000  300  {smooth}  0  Open
+ P2  J2  J3  800  250  {rough}  0  Open
+ P3  J3  J4  500  150  {roughest}  2  Open
+ P4  R2  J5  600  200  {smooth}  0  Open
+ P5  J6  J3  700  200  {rough}  0  Open
+
+[VALVES]
+ V1  J1  J2  300  PRV  30  0
+ V2  J5  J6  200  FCV  5  0
+
+[OPTIONS]
+ Units  LPS
+ Headloss  {headloss}
+
+[END]
+"""
+
+
+def _without_controls(path, tmp_path):
+    """Cópia da rede sem [CONTROLS], [STATUS] e [RULES] (o solver é de regime permanente)"""
+    with open(path) as f:
+        text = re.sub(r"(?ims)^\[(CONTROLS|STATUS|RULES)\].*?(?=^\[)", "", f.read())
+    target = tmp_path / "sem_controles.inp"
+    target.write_text(text)
+    return str(target)
+
+
+def _assert_matches_epanet(path, tmp_path):
+    wn = wntr.network.WaterNetworkModel(path)
+    wn.options.time.duration = 0
+    reference = wntr.sim.EpanetSimulator(wn).run_sim(file_prefix=str(tmp_path / "epanet"))
+    heads = reference.node["head"].iloc[0]
+    flows = reference.link["flowrate"].iloc[0]
+
+    results = HydraulicSolver(InpReader().read_inp_file(path)).solve()
+    assert results.converged
+    for node_id, head in zip(results.node_ids, results.heads.tolist()):
+        assert abs(head - heads[node_id]) < TOLERANCE, node_id
+    for link_id, flow in zip(results.link_ids, results.flows.tolist()):
+        assert abs(flow - flows[link_id]) < 1e-5, link_id
+    return results
+
+
+@pytest.mark.parametrize("name", ["Net1", "Net2", "Net3"])
+def test_hazen_williams_matches_epanet(name, tmp_path):
+    _assert_matches_epanet(_without_controls(library_path(name), tmp_path), tmp_path)
+
+
+def test_darcy_weisbach_matches_epanet(read_library, tmp_path):
+    network = WaterNetwork.from_dict(read_library("Net1").to_dict())
+    network.options.headloss = "D-W"
+    for pipe in network.pipes:
+        pipe.roughness = 0.00015  # m
+    path = str(tmp_path / "net1_dw.inp")
+    InpWriter().write_inp_file(network, path)
+    _assert_matches_epanet(_without_controls(path, tmp_path), tmp_path)
+
+
+@pytest.mark.parametrize("headloss, roughness", [
+    ("H-W", (130, 120, 110)),
+    ("D-W", (0.1, 0.2, 0.05)),  # mm
+])
+def test_regulating_valves_match_epanet(headloss, roughness, tmp_path):
+    path = tmp_path / "valvulas.inp"
+    smooth, rough, roughest = roughness
+    path.write_text(VALVES.format(headloss=headloss, smooth=smooth, rough=rough,
+                                  roughest=roughest))
+    results = _assert_matches_epanet(str(path), tmp_path)
+
+    # As duas válvulas regulam: carga a jusante da PRV e vazão da FCV fixadas
+    heads = dict(zip(results.node_ids, results.heads.tolist()))
+    flows = dict(zip(results.link_ids, results.flows.tolist()))
+    assert heads["J2"] == pytest.approx(20 + 30, abs=TOLERANCE)
+    assert flows["V2"] == pytest.approx(0.005, abs=1e-6)
+
+
+def test_orphan_junction_is_rejected(read_library):
+    network = WaterNetwork.from_dict(read_library("Net1").to_dict())
+    network.junctions.append(Junction("orfa", 10.0, 0.001))
+    with pytest.raises(HydraulicError, match="orfa"):
+        HydraulicSolver(network).solve()
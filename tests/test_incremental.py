@@ -0,0 +1,98 @@
+import re
+
+import pytest
+
+from src.models import NetworkDelta
+from src.services.incremental import IncrementalParser
+from src.services.inp_parser import InpParser
+
+from .conftest import library_path
+
+
+def _replace(section, pattern, replacement):
+    """Edição: troca a primeira linha da seção que casa com pattern"""
+    def edit(lines):
+        for i in _section_range(lines, section):
+            if re.match(pattern, lines[i]):
+                lines[i] = re.sub(pattern, replacement, lines[i])
+                return
+        raise AssertionError(f"{pattern} não encontrado em {section}")
+    return edit
+
+
+def _insert(section, *rows):
+    """Edição: acrescenta linhas no fim da seção"""
+    def edit(lines):
+        end = _section_range(lines, section).stop
+        lines[end:end] = list(rows)
+    return edit
+
+
+def _section_range(lines, section):
+    start = lines.index(section) + 1
+    end = next(i for i in range(start, len(lines)) if lines[i].startswith("["))
+    return range(start, end)
+
+
+EDITS = {
+    "title": [_insert("[TITLE]", "Versão editada")],
+    "junction": [_replace("[JUNCTIONS]", r"( 15\s+)32\b", r"\g<1>33")],
+    "added_elements": [_insert("[JUNCTIONS]", " J_NEW\t10\t2"),
+                       _insert("[PIPES]", " P_NEW\t15\tJ_NEW\t100\t12\t100\t0\tOpen")],
+    "reservoir": [_replace("[RESERVOIRS]", r"( Lake\s+)167.0", r"\g<1>170.5")],
+    "tank": [_replace("[TANKS]", r"( 1\s+131.9\s+)13.1", r"\g<1>14.0")],
+    "pipe": [_replace("[PIPES]", r"( 20\s+3\s+20\s+99\s+)99", r"\g<1>100")],
+    "removed_pipe": [_replace("[PIPES]", r" 40\s.*", ";removido")],
+    "pump": [_replace("[PUMPS]", r"(.*)HEAD 2", r"\g<1>HEAD 1")],
+    "valve": [_insert("[VALVES]", " V1\t15\t20\t12\tPRV\t50\t0")],
+    "pattern": [_replace("[PATTERNS]", r"( 1\s+)1.34", r"\g<1>1.5")],
+    "curve": [_replace("[CURVES]", r"( 1\s+0\s+)104.", r"\g<1>110.")],
+    "efficiency_curve": [_insert("[CURVES]", " E1\t0\t50", " E1\t1000\t80"),
+                         _insert("[ENERGY]", " Pump 10 Efficiency E1")],
+    "coordinates": [_replace("[COORDINATES]", r"(10\s+)9.000", r"\g<1>10.000")],
+    "vertices": [_insert("[VERTICES]", " 20\t5.0\t5.0", " 20\t6.0\t6.0")],
+    "status": [_insert("[STATUS]", " 20\tClosed")],
+    "demands": [_insert("[DEMANDS]", " 15\t3\t2")],
+    "units": [_replace("[OPTIONS]", r"( Units\s+)GPM", r"\g<1>LPS")],
+}
+
+
+def _write(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+@pytest.fixture(scope="module")
+def net3_lines():
+    with open(library_path("Net3"), encoding="utf-8") as f:
+        return [line.rstrip("\r\n") for line in f]
+
+
+@pytest.mark.parametrize("edit", sorted(EDITS))
+def test_update_matches_full_parse(net3_lines, edit, tmp_path):
+    path = tmp_path / "net3.inp"
+    _write(path, net3_lines)
+    inc = IncrementalParser()
+    before = inc.parse_file(str(path)).to_dict()
+
+    lines = list(net3_lines)
+    for change in EDITS[edit]:
+        change(lines)
+    _write(path, lines)
+    network, delta = inc.update(str(path))
+
+    expected = InpParser().parse_file(str(path)).to_dict()
+    assert network.to_dict() == expected
+    assert not delta.is_empty
+    # O delta (também após ida e volta pelo dicionário) leva a versão
+    # anterior à nova
+    assert NetworkDelta.from_dict(delta.to_dict()).apply(before) == expected
+
+
+def test_update_without_changes_is_empty(tmp_path):
+    path = tmp_path / "net1.inp"
+    path.write_bytes(open(library_path("Net1"), "rb").read())
+    inc = IncrementalParser()
+    first = inc.parse_file(str(path))
+    network, delta = inc.update(str(path))
+    assert delta.is_empty
+    assert network.to_dict() == first.to_dict()
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from src.services.inp_reader import InpReader
+from src.services.inp_stream import InpStreamReader, iter_nodes, iter_pipes
+from src.services.json_converter import JsonConverter
+
+from .conftest import LIBRARY_NETWORKS, library_path, network_for_testing
+
+# [PIPES] em dois trechos, com [STATUS] e [DEMANDS] alterando elementos
+SPLIT = """[JUNCTIONS]
+ J1  10  1
+ J2  12  2  P1
+[RESERVOIRS]
+ R1  50
+[PIPES]
+ T1  R1  J1  100  200  100
+[PATTERNS]
+ P1  1.0  1.5
+[PIPES]
+ T2  J1  J2  150  150  110  0  Open
+ T3  R1  J2  300  100  120
+[STATUS]
+ T3  Closed
+[DEMANDS]
+ J1  4  P1
+[COORDINATES]
+ J1  1  2
+ R1  0  0
+[VERTICES]
+ T2  3  4
+[END]
+"""
+
+
+def _assert_json_matches(network, path, tmp_path, batch_size, compact=False):
+    """write_json(coordinates=True) gera o mesmo arquivo que JsonConverter.network_to_file"""
+    expected, streamed = tmp_path / "convertido.json", tmp_path / "stream.json"
+    JsonConverter.network_to_file(network, str(expected), compact=compact)
+    with open(streamed, "w", encoding="utf-8") as f:
+        InpStreamReader(path, batch_size, coordinates=True).write_json(f, compact=compact)
+    assert streamed.read_text(encoding="utf-8") == expected.read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("name", LIBRARY_NETWORKS)
+def test_write_json_matches_json_converter(read_library, name, compact, tmp_path):
+    _assert_json_matches(read_library(name), library_path(name), tmp_path, 500, compact)
+
+
+def test_write_json_with_split_and_auxiliary_sections(tmp_path):
+    path = tmp_path / "split.inp"
+    path.write_text(SPLIT)
+    _assert_json_matches(InpReader().read_inp_file(str(path)), str(path), tmp_path, 2)
+
+
+def test_write_json_keeps_efficiency_curves(tmp_path):
+    path = network_for_testing("Anytown")
+    _assert_json_matches(InpReader().read_inp_file(path), path, tmp_path, 7)
+
+
+@pytest.mark.parametrize("batch_size", [1, 7, 1_000_000])
+@pytest.mark.parametrize("name", ["Net3", "ky10"])
+def test_iter_pipes_matches_reader(read_library, name, batch_size):
+    expected = [pipe.to_dict() for pipe in read_library(name).pipes]
+    batches = list(iter_pipes(library_path(name), batch_size, coordinates=True))
+    assert all(0 < len(batch) <= batch_size for batch in batches)
+    assert len(batches) == -(-len(expected) // batch_size)
+    assert [pipe.to_dict() for batch in batches for pipe in batch] == expected
+
+
+@pytest.mark.parametrize("batch_size", [1, 7, 1_000_000])
+def test_iter_pipes_records_match_reader(read_library, batch_size):
+    pipes = read_library("Net3").pipes
+    records = np.concatenate(list(iter_pipes(library_path("Net3"), batch_size, records=True)))
+    assert records["id"].tolist() == [p.id for p in pipes]
+    assert records["to_node"].tolist() == [p.to_node for p in pipes]
+    assert records["status"].tolist() == [p.status for p in pipes]
+    np.testing.assert_array_equal(records["roughness"], [p.roughness for p in pipes])
+    np.testing.assert_array_equal(records["length"], [p.length for p in pipes])
+
+
+def test_iter_nodes_matches_reader(read_library):
+    network = read_library("Net3")
+    nodes = {"junctions": [], "reservoirs": [], "tanks": []}
+    for table, batch in iter_nodes(library_path("Net3"), 7, coordinates=True):
+        nodes[table].extend(node.to_dict() for node in batch)
+    for table, elements in nodes.items():
+        assert elements == [node.to_dict() for node in getattr(network, table)]
@@ -0,0 +1,36 @@
+import json
+
+import pytest
+
+from src.services.json_converter import JsonConverter
+from src.utils.json_backend import BACKENDS, _AVAILABLE, get_backend
+
+INSTALLED = [name for name in BACKENDS if _AVAILABLE[name]]
+
+
+def _layout(text: str):
+    """Indentação de cada linha (a formatação de floats varia entre backends)"""
+    return [len(line) - len(line.lstrip(" ")) for line in text.split("\n")]
+
+
+@pytest.mark.parametrize("backend", INSTALLED)
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("indent", [None, 0, 2, 4])
+def test_dumps_matches_stdlib(net1, backend, indent, compact):
+    expected = json.dumps(net1.to_dict(), indent=None if compact else indent,
+                          separators=(",", ":") if compact else None, ensure_ascii=False)
+
+    text = JsonConverter.network_to_json(net1, indent=indent, compact=compact, backend=backend)
+    data = JsonConverter.network_to_bytes(net1, indent=indent, compact=compact, backend=backend)
+
+    assert json.loads(text) == net1.to_dict()
+    assert data.decode("utf-8") == text
+    assert _layout(text) == _layout(expected)
+    if compact:
+        assert ", " not in text and ": " not in text
+
+
+@pytest.mark.parametrize("backend", INSTALLED)
+def test_dumps_element(net1, backend):
+    pipe = net1.pipes[0]
+    assert json.loads(get_backend(backend).dumps(pipe)) == pipe.to_dict()
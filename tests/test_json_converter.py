@@ -0,0 +1,33 @@
+import pytest
+
+from src.models import WaterNetwork
+from src.services.json_converter import JsonConverter
+from src.utils.json_backend import BACKENDS, _AVAILABLE
+
+from .conftest import LIBRARY_NETWORKS
+
+INSTALLED = [name for name in BACKENDS if _AVAILABLE[name]]
+
+
+@pytest.mark.parametrize("name", LIBRARY_NETWORKS)
+def test_file_round_trip(read_library, name, tmp_path):
+    network = read_library(name)
+    path = tmp_path / f"{name}.json"
+    JsonConverter.network_to_file(network, str(path))
+    result = JsonConverter.network_from_file(str(path))
+    assert result.to_dict() == network.to_dict()
+    assert result.options == network.options
+
+
+@pytest.mark.parametrize("backend", INSTALLED)
+def test_string_round_trip(net1, backend):
+    text = JsonConverter.network_to_json(net1, backend=backend)
+    assert JsonConverter.network_from_json(text).to_dict() == net1.to_dict()
+
+
+def test_empty_network_round_trip():
+    network = WaterNetwork()
+    result = JsonConverter.network_from_json(JsonConverter.network_to_json(network))
+    assert result.to_dict() == network.to_dict()
+    # Chaves ausentes usam os valores padrão
+    assert WaterNetwork.from_dict({}).to_dict() == network.to_dict()
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from src.services.json_converter import JsonConverter
+
+
+@pytest.fixture
+def net3_json(read_library, tmp_path):
+    path = tmp_path / "net3.json"
+    JsonConverter.network_to_file(read_library("Net3"), str(path))
+    return path
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_index_lookups_match_full_load(read_library, tmp_path, compact):
+    network = read_library("ky4")
+    path = tmp_path / "ky4.json"
+    JsonConverter.network_to_file(network, str(path), compact=compact)
+    data = json.loads(path.read_text(encoding="utf-8"))
+
+    with JsonConverter.open_index(str(path)) as index:
+        for name in data:
+            assert index.section(name) == data[name]
+        pipe = network.pipes[10]
+        assert index.element("pipes", pipe.id) == pipe.to_dict()
+        assert index.find(network.tanks[0].id) == network.tanks[0].to_dict()
+        assert index.element("patterns", network.patterns[0].id) == network.patterns[0].to_dict()
+        assert index.ids("junctions") == [j.id for j in network.junctions]
+        assert index.find("inexistente") is None
+
+
+def test_sidecar_is_reused_and_refreshed(read_library, net3_json):
+    with JsonConverter.open_index(str(net3_json)) as index:
+        sections = index.sections
+    assert (net3_json.parent / "net3.json.idx").exists()
+
+    with JsonConverter.open_index(str(net3_json)) as index:
+        assert index.sections == sections
+
+    # Um JSON diferente invalida o índice salvo
+    JsonConverter.network_to_file(read_library("Net1"), str(net3_json))
+    net1 = read_library("Net1")
+    with JsonConverter.open_index(str(net3_json)) as index:
+        assert index.element("pipes", net1.pipes[0].id) == net1.pipes[0].to_dict()
@@ -0,0 +1,38 @@
+import io
+import json
+
+import pytest
+
+from src.models import WaterNetwork
+from src.services.json_converter import JsonConverter
+from src.services.json_writer import JsonStreamWriter
+
+
+def _expected(network, indent, compact):
+    return json.dumps(network.to_dict(), indent=None if compact else indent,
+                      separators=(",", ":") if compact else None, ensure_ascii=False)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("indent", [None, 0, 2, "\t"])
+@pytest.mark.parametrize("name", ["Net1", "ky4"])
+def test_stream_matches_json_dumps(read_library, name, indent, compact):
+    network = read_library(name)
+    stream = io.StringIO()
+    JsonStreamWriter(stream, indent, compact=compact).write_network(network)
+    assert stream.getvalue() == _expected(network, indent, compact)
+
+
+@pytest.mark.parametrize("indent", [None, 0, 2, "\t"])
+def test_stream_edge_cases(indent):
+    # Rede vazia (listas vazias) e texto com quebra de linha e acentos
+    network = WaterNetwork(title="Rede de teste\nsegunda linha — ação")
+    stream = io.StringIO()
+    JsonStreamWriter(stream, indent).write_network(network)
+    assert stream.getvalue() == _expected(network, indent, False)
+
+
+def test_network_to_file_matches_json_dumps(net1, tmp_path):
+    path = tmp_path / "net1.json"
+    JsonConverter.network_to_file(net1, str(path))
+    assert path.read_bytes() == _expected(net1, 2, False).encode("utf-8")
@@ -0,0 +1,58 @@
+from src.models.elements import Junction, Pipe
+from src.models.statistics import NetworkStatistics
+
+
+def _copy(read_library, name):
+    network = read_library(name)
+    return type(network).from_dict(network.to_dict())  # cópia: a fixture é compartilhada
+
+
+def test_aggregates_detect_list_changes(read_library):
+    network = _copy(read_library, "Net3")
+    first = network.aggregates()
+    assert network.aggregates() is first
+
+    pipe = network.pipes[0]
+    network.pipes.append(Pipe("novo", pipe.from_node, pipe.to_node, 500.0, 0.3, 100.0))
+    added = network.aggregates()
+    assert added is not first
+    assert added.pipes["total_length"] == first.pipes["total_length"] + 500.0
+
+    network.pipes.pop()
+    assert network.aggregates().pipes["total_length"] == first.pipes["total_length"]
+
+    network.junctions = network.junctions + [Junction("J", 10.0, 0.0)]
+    assert network.aggregates().counts["total_junctions"] == first.counts["total_junctions"] + 1
+
+
+def test_aggregates_follow_element_edits_after_invalidation(read_library):
+    network = _copy(read_library, "Net3")
+    first = network.aggregates()
+
+    network.pipes[0].length += 10000
+    pipe = network.pipes[1]
+    network.pipes[1] = Pipe(pipe.id, pipe.from_node, pipe.to_node, pipe.length + 5,
+                            pipe.diameter, pipe.roughness)
+    network.junctions[0].demand_pattern = "novo"
+    # Alterações em elementos existentes exigem invalidate_caches()
+    assert network.aggregates() is first
+
+    network.invalidate_caches()
+    edited = network.aggregates()
+    assert abs(edited.pipes["total_length"] - first.pipes["total_length"] - 10005) < 1e-6
+    assert "novo" in {p["pattern"] for p in edited.demand["by_pattern"]}
+    assert edited.to_dict() == NetworkStatistics.compute(network).to_dict()
+
+
+def test_spatial_index_follows_coordinate_edits_after_invalidation(read_library):
+    network = _copy(read_library, "Net3")
+    index = network.spatial_index()
+    assert network.spatial_index() is index
+
+    junction = network.junctions[0]
+    junction.coordinates.x += 1e6
+    network.invalidate_caches()
+    x, y = junction.coordinates.x, junction.coordinates.y
+    rebuilt = network.spatial_index()
+    assert rebuilt is not index
+    assert rebuilt.nodes_in_bbox((x - 1, y - 1, x + 1, y + 1)) == [junction.id]
@@ -0,0 +1,58 @@
+import os
+
+from src.models import Junction, Pipe, WaterNetwork
+from src.services.inp_reader import InpReader
+from src.services.parse_cache import ParseCache
+from src.services.snapshot import NetworkSnapshot
+
+from .conftest import library_path
+
+
+def test_second_read_is_a_hit(net1, tmp_path):
+    cache = ParseCache(str(tmp_path))
+    first = InpReader(cache=cache).read_inp_file(library_path("Net1"))
+    second = InpReader(cache=cache).read_inp_file(library_path("Net1"))
+    assert cache.stats.to_dict()["hits"] == 1
+    assert cache.stats.stores == 1
+    assert second.to_dict() == first.to_dict() == net1.to_dict()
+
+
+def test_corrupted_entry_is_discarded(tmp_path):
+    cache = ParseCache(str(tmp_path))
+    key = cache.key_for(library_path("Net1"))
+    with open(os.path.join(str(tmp_path), key + ".snap"), "wb") as f:
+        f.write(b"lixo")
+    assert cache.get(key) is None
+    assert cache.stats.errors == 1
+    assert cache.size_bytes == 0
+
+
+def test_failed_store_is_counted(tmp_path):
+    # Um link com nó inexistente não pode ser gravado no snapshot
+    network = WaterNetwork(junctions=[Junction("A", 0.0, 0.0)],
+                           pipes=[Pipe("P1", "A", "B", 1.0, 0.1, 100.0)])
+    cache = ParseCache(str(tmp_path))
+    cache.put("chave", network)
+    assert cache.stats.errors == 1
+    assert cache.stats.stores == 0
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_reader_survives_cache_failures(net1, tmp_path, monkeypatch):
+    def fail(network, path):
+        raise KeyError("node1")
+
+    monkeypatch.setattr(NetworkSnapshot, "save", staticmethod(fail))
+    cache = ParseCache(str(tmp_path))
+    network = InpReader(cache=cache).read_inp_file(library_path("Net1"))
+    assert network.to_dict() == net1.to_dict()
+    assert cache.stats.errors == 1
+
+
+def test_eviction_keeps_newest_entry(tmp_path):
+    cache = ParseCache(str(tmp_path), max_bytes=1)
+    reader = InpReader(cache=cache)
+    reader.read_inp_file(library_path("Net1"))
+    reader.read_inp_file(library_path("Net2"))
+    assert cache.stats.evictions == 1
+    assert os.listdir(str(tmp_path)) == [cache.key_for(library_path("Net2")) + ".snap"]
@@ -0,0 +1,106 @@
+import pytest
+
+from src.services.inp_reader import InpReader
+from src.services.json_converter import JsonConverter
+from src.utils.profiling import ProfileReport, Profiler, profiling_enabled, stage
+
+from .conftest import library_path
+
+
+def _tree(spans):
+    return [(span.name, _tree(span.children)) for span in spans]
+
+
+def test_nested_stages_build_a_tree():
+    started, ended = [], []
+    with Profiler(on_start=lambda s: started.append(s.name),
+                  on_end=lambda s: ended.append(s.name)) as profiler:
+        assert profiling_enabled()
+        with stage("a", path="x") as a:
+            a.set_elements(10)
+            with stage("a.1"):
+                pass
+            with stage("a.2") as a2:
+                with stage("a.2.i"):
+                    pass
+            a2.set_attribute("chunks", 3)
+        with pytest.raises(KeyError):
+            with stage("b"):
+                raise KeyError("x")
+
+    spans = profiler.report().spans
+    assert _tree(spans) == [("a", [("a.1", []), ("a.2", [("a.2.i", [])])]), ("b", [])]
+    a, b = spans
+    assert a.elements == 10 and a.attributes == {"path": "x"}
+    assert a.children[1].attributes == {"chunks": 3}
+    assert a.children[1].children[0].parent is a.children[1]
+    assert b.attributes == {"error": "KeyError"}
+    for parent in (a, a.children[1]):
+        assert all(parent.start_ns <= child.start_ns <= child.end_ns <= parent.end_ns
+                   for child in parent.children)
+    assert started == ["a", "a.1", "a.2", "a.2.i", "b"]
+    assert ended == ["a.1", "a.2.i", "a.2", "a", "b"]
+
+
+def test_stage_is_a_no_op_without_profiler():
+    assert not profiling_enabled()
+    span = stage("ignorada", path="x")
+    assert stage("outra") is span  # objeto compartilhado, sem alocação por chamada
+    with span as inner:
+        inner.set_elements(5)
+        inner.set_attribute("k", "v")
+
+    with Profiler() as profiler:
+        with stage("medida"):
+            pass
+    # Depois do contexto, o profiler não recebe mais etapas
+    with stage("depois"):
+        pass
+    assert not profiling_enabled()
+    assert _tree(profiler.report().spans) == [("medida", [])]
+
+
+def test_reader_and_writer_stages(tmp_path):
+    with Profiler() as profiler:
+        network = InpReader().read_inp_file(library_path("Net1"))
+        JsonConverter.network_to_file(network, str(tmp_path / "net1.json"))
+
+    read, write = profiler.report().spans
+    assert read.name == "inp_reader.read" and write.name == "json.write_file"
+    assert [child.name for child in read.children] == [
+        "parser.split", "parser.header", "parser.elements", "parser.attach"
+    ]
+    statistics = network.statistics()
+    assert read.elements == write.elements == statistics["total_nodes"] + statistics["total_links"]
+
+
+def test_memory_peaks_are_nested():
+    with Profiler(trace_memory=True) as profiler:
+        with stage("pai"):
+            with stage("filho"):
+                data = bytearray(8 * 2 ** 20)
+            del data
+
+    parent = profiler.report().spans[0]
+    child = parent.children[0]
+    assert child.peak_traced >= 8 * 2 ** 20
+    assert parent.peak_traced >= child.peak_traced
+
+
+def test_report_round_trip_and_merge():
+    reports = []
+    for elements in (3, 4):
+        with Profiler() as profiler:
+            with stage("ler") as span:
+                span.set_elements(elements)
+                with stage("ler.secoes"):
+                    pass
+        reports.append(profiler.report())
+
+    data = reports[0].to_dict()
+    assert ProfileReport.from_dict(data).to_dict() == data
+
+    merged = ProfileReport.merge(reports)
+    assert _tree(merged.spans) == [("ler", [("ler.secoes", [])])]
+    assert merged.spans[0].calls == 2 and merged.spans[0].elements == 7
+    assert merged.seconds == pytest.approx(sum(r.seconds for r in reports))
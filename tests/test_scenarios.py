@@ -0,0 +1,48 @@
+import os
+
+import numpy as np
+import pytest
+
+from src.models.elements import Junction
+from src.models.network import WaterNetwork
+from src.services.hydraulics import HydraulicError
+from src.services.scenarios import Scenario, ScenarioRunner
+
+
+class _KillWorker:
+    """Encerra o processo que tentar desserializar o cenário"""
+
+    def __reduce__(self):
+        return os._exit, (1,)
+
+
+def _scenarios(count):
+    return [Scenario(f"s{i}", roughness={"10": 80.0 + i}) for i in range(count)]
+
+
+def test_parallel_results_match_local(read_library):
+    network = read_library("Net1")
+    local = {r.scenario_id: r for r in ScenarioRunner(network, workers=1).iter_results(_scenarios(6))}
+    parallel = {r.scenario_id: r for r in ScenarioRunner(network, workers=2).iter_results(_scenarios(6))}
+    assert parallel.keys() == local.keys()
+    for scenario_id, result in parallel.items():
+        assert result.ok
+        np.testing.assert_allclose(result.heads, local[scenario_id].heads)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_base_network_errors_keep_their_type(read_library, workers):
+    network = WaterNetwork.from_dict(read_library("Net1").to_dict())
+    network.junctions.append(Junction("orfa", 10.0, 0.001))
+    with pytest.raises(HydraulicError):
+        list(ScenarioRunner(network, workers=workers).iter_results(_scenarios(2)))
+
+
+def test_dead_worker_fails_only_its_scenario(read_library):
+    scenarios = _scenarios(6)
+    scenarios.insert(2, Scenario("crash", demands=_KillWorker()))
+    results = {r.scenario_id: r for r in
+               ScenarioRunner(read_library("Net1"), workers=2).iter_results(scenarios)}
+    assert set(results) == {s.id for s in scenarios}
+    assert results["crash"].error == "Processo do cenário encerrado inesperadamente"
+    assert all(r.ok for scenario_id, r in results.items() if scenario_id != "crash")
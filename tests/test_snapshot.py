@@ -0,0 +1,46 @@
+import pytest
+
+from src.models import WaterNetwork
+from src.services.snapshot import NetworkSnapshot, SnapshotError
+
+from .conftest import LIBRARY_NETWORKS
+
+
+@pytest.mark.parametrize("name", LIBRARY_NETWORKS)
+def test_snapshot_round_trip(read_library, name, tmp_path):
+    network = read_library(name)
+    path = str(tmp_path / f"{name}.snap")
+    NetworkSnapshot.save(network, path)
+    assert NetworkSnapshot.to_dict(path) == network.to_dict()
+
+
+def test_empty_network_snapshot(tmp_path):
+    path = str(tmp_path / "empty.snap")
+    NetworkSnapshot.save(WaterNetwork(), path)
+    assert NetworkSnapshot.to_dict(path) == WaterNetwork().to_dict()
+
+
+def test_loaded_columns_are_copy_on_write(net1, tmp_path):
+    path = str(tmp_path / "net1.snap")
+    NetworkSnapshot.save(net1, path)
+    columnar = NetworkSnapshot.load(path)
+    columnar.pipes.length[0] = -1.0
+    assert NetworkSnapshot.load(path).pipes.length[0] == net1.pipes[0].length
+
+
+def test_invalid_files_are_rejected(net1, tmp_path):
+    short = tmp_path / "short.snap"
+    short.write_bytes(b"abc")
+    with pytest.raises(SnapshotError):
+        NetworkSnapshot.load(str(short))
+
+    other = tmp_path / "other.snap"
+    other.write_bytes(b"x" * 4096)
+    with pytest.raises(SnapshotError):
+        NetworkSnapshot.load(str(other))
+
+    path = tmp_path / "net1.snap"
+    NetworkSnapshot.save(net1, str(path))
+    path.write_bytes(path.read_bytes()[:-10])
+    with pytest.raises(SnapshotError):
+        NetworkSnapshot.load(str(path))
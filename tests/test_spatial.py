@@ -0,0 +1,96 @@
+import math
+import random
+
+import pytest
+
+from src.models import Junction, Pipe, WaterNetwork
+
+
+def _polylines(network):
+    """Pontos conhecidos de cada link: nó inicial, vértices, nó final"""
+    coordinates = {n.id: n.coordinates for n in network.junctions + network.reservoirs + network.tanks}
+    lines = {}
+    for link in network.pipes + network.pumps + network.valves:
+        points = [(v.x, v.y) for v in link.vertices]
+        start, end = coordinates.get(link.from_node), coordinates.get(link.to_node)
+        if start is not None:
+            points.insert(0, (start.x, start.y))
+        if end is not None:
+            points.append((end.x, end.y))
+        if points:
+            lines[link.id] = points if len(points) > 1 else points * 2
+    return lines
+
+
+def _segment_distance(x, y, a, b):
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    length = dx * dx + dy * dy
+    t = 0.0 if length == 0 else max(0.0, min(1.0, ((x - a[0]) * dx + (y - a[1]) * dy) / length))
+    return math.hypot(x - a[0] - t * dx, y - a[1] - t * dy)
+
+
+def _crosses(a, b, bbox):
+    """Liang-Barsky: o segmento ab toca a caixa?"""
+    t0, t1 = 0.0, 1.0
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    for p, q in ((-dx, a[0] - bbox[0]), (dx, bbox[2] - a[0]), (-dy, a[1] - bbox[1]), (dy, bbox[3] - a[1])):
+        if p == 0:
+            if q < 0:
+                return False
+        elif p < 0:
+            t0 = max(t0, q / p)
+        else:
+            t1 = min(t1, q / p)
+    return t0 <= t1
+
+
+def _queries(index, count=30, seed=7):
+    rng = random.Random(seed)
+    min_x, min_y, max_x, max_y = index.bounds
+    width, height = max_x - min_x, max_y - min_y
+    for _ in range(count):
+        x = rng.uniform(min_x - 0.1 * width, max_x + 0.1 * width)
+        y = rng.uniform(min_y - 0.1 * height, max_y + 0.1 * height)
+        yield x, y, rng.uniform(0.01, 0.2) * width, rng.uniform(0.01, 0.2) * height
+
+
+@pytest.mark.parametrize("name", ["Net3", "ky10"])
+def test_bbox_queries_match_brute_force(read_library, name):
+    network = read_library(name)
+    index = network.spatial_index()
+    nodes = [n for n in network.junctions + network.reservoirs + network.tanks if n.coordinates]
+    lines = _polylines(network)
+    for x, y, w, h in _queries(index):
+        bbox = (x, y, x + w, y + h)
+        expected_nodes = {n.id for n in nodes
+                          if bbox[0] <= n.coordinates.x <= bbox[2] and bbox[1] <= n.coordinates.y <= bbox[3]}
+        assert set(index.nodes_in_bbox(bbox)) == expected_nodes
+        expected_links = {i for i, points in lines.items()
+                          if any(_crosses(a, b, bbox) for a, b in zip(points, points[1:]))}
+        assert set(index.links_in_bbox(bbox)) == expected_links
+
+
+@pytest.mark.parametrize("name", ["Net3", "ky10"])
+def test_nearest_match_brute_force(read_library, name):
+    network = read_library(name)
+    index = network.spatial_index()
+    nodes = [n for n in network.junctions + network.reservoirs + network.tanks if n.coordinates]
+    lines = _polylines(network)
+    for x, y, radius, _ in _queries(index, count=15):
+        node_distances = sorted(math.hypot(n.coordinates.x - x, n.coordinates.y - y) for n in nodes)
+        found = index.nearest_nodes(x, y, k=5)
+        assert [d for _, d in found] == pytest.approx(node_distances[:5])
+        assert len(index.nodes_within(x, y, radius)) == sum(d <= radius for d in node_distances)
+
+        link_distances = sorted(min(_segment_distance(x, y, a, b) for a, b in zip(p, p[1:]))
+                                for p in lines.values())
+        found = index.nearest_links(x, y, k=5)
+        assert [d for _, d in found] == pytest.approx(link_distances[:5])
+
+
+def test_index_over_network_without_coordinates():
+    network = WaterNetwork(junctions=[Junction("A", 0.0, 0.0), Junction("B", 0.0, 0.0)],
+                           pipes=[Pipe("P1", "A", "B", 1.0, 0.1, 100.0)])
+    index = network.spatial_index()
+    assert index.nodes_in_bbox((-1e9, -1e9, 1e9, 1e9)) == []
+    assert index.nearest_links(0.0, 0.0) == []
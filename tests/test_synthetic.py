@@ -0,0 +1,21 @@
+import pytest
+
+from benchmarks.synthetic import generate_network, write_synthetic_inp
+from src.services.inp_reader import InpReader
+
+
+@pytest.mark.parametrize("units", ["LPS", "GPM", "CMH", "MGD"])
+@pytest.mark.parametrize("topology", ["grid", "tree"])
+def test_native_and_wntr_read_the_same_network(topology, units, tmp_path):
+    pytest.importorskip("wntr")
+    path = str(tmp_path / "sintetica.inp")
+    network = write_synthetic_inp(path, 3000, topology=topology, seed=7, units=units)
+    expected = network.to_dict()
+    assert InpReader().read_inp_file(path).to_dict() == expected
+    assert InpReader(engine="wntr").read_inp_file(path).to_dict() == expected
+
+
+def test_same_seed_same_network():
+    first = generate_network(2000, topology="tree", seed=3).to_dict()
+    assert generate_network(2000, topology="tree", seed=3).to_dict() == first
+    assert generate_network(2000, topology="tree", seed=4).to_dict() != first
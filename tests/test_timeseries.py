@@ -0,0 +1,93 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.models import Curve, CurveTable, Pattern, PatternTable, PumpCurves, demand_matrix
+from src.services.inp_reader import InpReader
+
+from .conftest import library_path
+
+TIMES = np.arange(0.0, 3 * 86400.0, 900.0)
+
+
+def _multiplier(pattern, time, timestep=3600.0, start=0.0):
+    if pattern is None or not pattern.multipliers:
+        return 1.0
+    period = int(math.floor((time + start) / timestep + 1e-9))
+    return pattern.multipliers[period % len(pattern.multipliers)]
+
+
+@pytest.mark.parametrize("timestep,start", [(3600.0, 0.0), (1800.0, 7200.0)])
+@pytest.mark.parametrize("name", ["Net1", "Net3", "ky10"])
+def test_pattern_at_matches_loop(read_library, name, timestep, start):
+    network = read_library(name)
+    table = PatternTable.from_network(network, timestep, start)
+    values = table.at(TIMES)
+    for i, pattern in enumerate(network.patterns):
+        expected = [_multiplier(pattern, t, timestep, start) for t in TIMES]
+        np.testing.assert_array_equal(values[i], expected)
+    np.testing.assert_array_equal(values[-1], 1.0)
+
+
+def test_empty_pattern_is_constant():
+    table = PatternTable([Pattern("vazio", []), Pattern("p", [0.5, 2.0])])
+    np.testing.assert_array_equal(table.values(["vazio", None, "p"], [0.0, 3600.0]),
+                                  [[1.0, 1.0], [1.0, 1.0], [0.5, 2.0]])
+    with pytest.raises(KeyError):
+        table.codes(["inexistente"])
+
+
+@pytest.mark.parametrize("name", ["Net1", "Net3"])
+def test_demand_matrix_matches_loop(read_library, name):
+    network = read_library(name)
+    patterns = {p.id: p for p in network.patterns}
+    matrix = demand_matrix(network, TIMES)
+    for row, junction in zip(matrix, network.junctions):
+        pattern = patterns.get(junction.demand_pattern)
+        expected = [junction.demand * _multiplier(pattern, t) for t in TIMES]
+        np.testing.assert_allclose(row, expected, rtol=0, atol=0)
+
+
+@pytest.mark.parametrize("name", ["Net3", "Net6", "ky10"])
+def test_interpolate_matches_np_interp(read_library, name):
+    curves = read_library(name).curves
+    table = CurveTable(curves)
+    for curve in curves:
+        span = max(curve.x_values) - min(curve.x_values) or 1.0
+        x = np.linspace(min(curve.x_values) - 0.2 * span, max(curve.x_values) + 0.2 * span, 101)
+        np.testing.assert_allclose(table.interpolate(curve.id, x),
+                                   np.interp(x, curve.x_values, curve.y_values), rtol=1e-12)
+
+
+def test_interpolate_mixed_curves():
+    a = Curve("a", "VOLUME", [0.0, 1.0, 4.0], [0.0, 10.0, 40.0])
+    b = Curve("b", "VOLUME", [2.0], [7.0])
+    table = CurveTable([a, b])
+    x = np.array([[0.5, 3.0], [10.0, -1.0]])
+    ids = np.array([[0, 1], [0, 1]])
+    expected = [[np.interp(0.5, a.x_values, a.y_values), 7.0],
+                [np.interp(10.0, a.x_values, a.y_values), 7.0]]
+    np.testing.assert_allclose(table.interpolate(ids, x), expected)
+
+
+def test_tank_volumes(read_library):
+    network = read_library("Net3")
+    table = CurveTable.from_network(network)
+    levels = [t.max_level for t in network.tanks]
+    expected = [t.min_volume + math.pi * t.diameter ** 2 / 4 * (t.max_level - t.min_level)
+                if t.min_volume > 0 else math.pi * t.diameter ** 2 / 4 * t.max_level
+                for t in network.tanks]
+    np.testing.assert_allclose(table.tank_volumes(network, levels), expected)
+
+
+@pytest.mark.filterwarnings("ignore::scipy.optimize.OptimizeWarning")
+def test_pump_curves_match_wntr():
+    reader = InpReader(engine="wntr")
+    network = reader.read_inp_file(library_path("Net3"))
+    pumps = PumpCurves.from_network(network)
+    flows = np.linspace(0.0, 0.5, 11)
+    for pump in network.pumps:
+        a, b, c = reader.wn.get_link(pump.id).get_head_curve_coefficients()
+        np.testing.assert_allclose(pumps.head([pump.pump_curve] * len(flows), flows),
+                                   a - b * flows ** c, rtol=1e-9)
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from src.models import ColumnarNetwork, Junction, Pipe, WaterNetwork
+from src.models import topology
+from src.models.topology import build_topology
+
+nx = pytest.importorskip("networkx")
+
+
+def _graph(network):
+    graph = nx.MultiGraph()
+    for group in (network.junctions, network.reservoirs, network.tanks):
+        graph.add_nodes_from(node.id for node in group)
+    for pipe in network.pipes:
+        graph.add_edge(pipe.from_node, pipe.to_node, weight=pipe.length)
+    for link in network.pumps + network.valves:
+        graph.add_edge(link.from_node, link.to_node, weight=0.0)
+    return graph
+
+
+@pytest.fixture
+def split_network(read_library):
+    # Net3 com dois tubos a menos e uma junção isolada: mais de um componente
+    network = WaterNetwork.from_dict(read_library("Net3").to_dict())
+    network.pipes = [p for p in network.pipes if p.id not in ("20", "40")]
+    network.junctions.append(Junction("solta", 0.0, 0.0))
+    return network
+
+
+@pytest.mark.parametrize("name", ["Net3", "ky10"])
+def test_neighbors_match_networkx(read_library, name):
+    network = read_library(name)
+    index = build_topology(network)
+    graph = _graph(network)
+    for node in graph.nodes:
+        assert sorted(index.neighbors(node)) == sorted(set(graph.neighbors(node)))
+        assert index.degree(node) == graph.degree(node)
+
+
+def test_components_match_networkx(split_network, monkeypatch):
+    graph = _graph(split_network)
+    expected = sorted(sorted(c) for c in nx.connected_components(graph))
+    assert sorted(sorted(c) for c in build_topology(split_network).connected_components()) == expected
+    isolated = build_topology(split_network).isolated_nodes()
+    assert "solta" in isolated
+    assert sorted(isolated) == sorted(nx.isolates(graph))
+
+    # Implementação em NumPy, sem SciPy
+    monkeypatch.setattr(topology, "csr_matrix", None)
+    labels = build_topology(split_network).component_labels()
+    assert sorted(sorted(c) for c in build_topology(split_network).connected_components()) == expected
+    np.testing.assert_array_equal(labels, build_topology(split_network).component_labels())
+
+
+def test_shortest_path_and_bfs_match_networkx(read_library):
+    network = read_library("Net3")
+    index = build_topology(network)
+    graph = nx.Graph()
+    for u, v, data in _graph(network).edges(data=True):
+        if not graph.has_edge(u, v) or graph[u][v]["weight"] > data["weight"]:
+            graph.add_edge(u, v, weight=data["weight"])
+
+    source = network.reservoirs[0].id
+    lengths = nx.single_source_dijkstra_path_length(graph, source)
+    for target in [network.tanks[-1].id, network.junctions[50].id]:
+        path, length = index.shortest_path(source, target)
+        assert length == pytest.approx(lengths[target])
+        assert path[0] == source and path[-1] == target
+
+    hops = nx.single_source_shortest_path_length(graph, source)
+    depths = index.bfs_depths(source)
+    assert {index.node_ids[i]: int(d) for i, d in enumerate(depths) if d >= 0} == hops
+
+
+def test_columnar_topology_matches(read_library):
+    network = read_library("ky10")
+    a = build_topology(network)
+    b = build_topology(ColumnarNetwork.from_network(network))
+    np.testing.assert_array_equal(a.indptr, b.indptr)
+    np.testing.assert_array_equal(a.indices, b.indices)
+    np.testing.assert_array_equal(a.edges, b.edges)
+
+
+def test_unreachable_target():
+    network = WaterNetwork(
+        junctions=[Junction("A", 0.0, 0.0), Junction("B", 0.0, 0.0), Junction("C", 0.0, 0.0)],
+        pipes=[Pipe("P1", "A", "B", 10.0, 0.1, 100.0)]
+    )
+    assert build_topology(network).shortest_path("A", "C") == ([], float("inf"))